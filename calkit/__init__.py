@@ -37,10 +37,12 @@ if TYPE_CHECKING:
         ops,
         overleaf,
         pipeline,
+        profiling,
         releases,
         resources,
         schema,
         server,
+        sessions,
         templates,
     )
 
@@ -70,6 +72,7 @@ _SUBMODULES = {
     "notebooks",
     "environments",
     "pipeline",
+    "profiling",
     "matlab",
     "datasets",
     "dependencies",
@@ -81,6 +84,7 @@ _SUBMODULES = {
     "ops",
     "schema",
     "server",
+    "sessions",
 }
 
 
@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Annotated, Literal
+import ast
+import bisect
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Annotated, Any, Literal
 
 from pydantic import BaseModel, Discriminator, model_validator
 
+if TYPE_CHECKING:
+    import numpy as np
+
 DTYPES = {"int": int, "float": float, "str": str}
+# NumPy dtype names corresponding to ``DTYPES``, used for batch evaluation
+NP_DTYPES = {"int": "int64", "float": "float64", "str": "str"}
 DEFAULT_IN_TYPE = "float"
 DEFAULT_OUT_TYPE = "float"
+# Persistent cache of evaluation results, private to the machine
+CALC_CACHE_PATH = ".calkit/local/calc-cache.sqlite"
+# Least recently used entries beyond this many are evicted
+DEFAULT_CALC_CACHE_MAX_ENTRIES = 1000
+# A cache hit only records its use time if the stored one is older than this
+CALC_CACHE_TOUCH_INTERVAL_S = 60.0
 
 
 class Input(BaseModel):
@@ -84,11 +104,46 @@ class Calculation(BaseModel):
             v = DTYPES[input_def.dtype](v)
             inputs[k] = v
             if input_def.min is not None and v < input_def.min:
-                raise ValueError(f"Input value {k} = {v} it too small")
+                raise ValueError(f"Input value {k} = {v} is too small")
             if input_def.max is not None and v > input_def.max:
                 raise ValueError(f"Input value {k} = {v} is too large")
         return inputs
 
+    def check_inputs_many(self, **inputs) -> dict[str, np.ndarray]:
+        """Check and coerce columns of inputs for batch evaluation.
+
+        Each input may be a scalar or any array-like, e.g., a list, NumPy
+        array, or pandas series. Values are converted to NumPy arrays of the
+        declared dtype and broadcast against each other, so scalars can be
+        mixed with columns.
+        """
+        import numpy as np
+
+        inputs_dict = self.inputs_dict
+        for k in inputs_dict:
+            if k not in inputs:
+                raise ValueError(f"Missing input {k}")
+        arrays = {}
+        for k, v in inputs.items():
+            if k not in inputs_dict:
+                raise ValueError(f"{k} is not in declared inputs")
+            input_def = inputs_dict[k]
+            arr = np.asarray(v, dtype=NP_DTYPES[input_def.dtype])
+            if input_def.min is not None:
+                too_small = arr < input_def.min
+                if too_small.any():
+                    v = arr[too_small].flat[0]
+                    raise ValueError(f"Input value {k} = {v} is too small")
+            if input_def.max is not None:
+                too_large = arr > input_def.max
+                if too_large.any():
+                    v = arr[too_large].flat[0]
+                    raise ValueError(f"Input value {k} = {v} is too large")
+            arrays[k] = arr
+        if not arrays:
+            return arrays
+        return dict(zip(arrays.keys(), np.broadcast_arrays(*arrays.values())))
+
     def calculate(self, **inputs):
         """This is the method to override to implement custom logic.
 
@@ -96,19 +151,64 @@ class Calculation(BaseModel):
         """
         raise NotImplementedError
 
+    def calculate_many(self, **inputs: np.ndarray) -> Any:
+        """Calculate outputs for arrays of inputs.
+
+        Subclasses that can operate on whole arrays at once should override
+        this. By default, ``calculate`` is called once per element.
+        """
+        import numpy as np
+
+        if not inputs:
+            return self.calculate()
+        shape = next(iter(inputs.values())).shape
+        out = [
+            self.calculate(**{k: v[idx].item() for k, v in inputs.items()})
+            for idx in np.ndindex(shape)
+        ]
+        return np.array(out, dtype=object).reshape(shape)
+
     def evaluate(self, **inputs):
         inputs = self.check_inputs(**inputs)
         out = self.calculate(**inputs)
         return self.coerce_output(out)
 
+    def evaluate_many(self, **inputs) -> np.ndarray:
+        """Evaluate the calculation for columns of inputs at once.
+
+        Inputs are validated once for the whole batch rather than per value,
+        and calculations that support it are computed fully vectorized.
+        Returns a NumPy array of outputs with the declared output dtype.
+        """
+        import numpy as np
+
+        inputs = self.check_inputs_many(**inputs)
+        out = self.coerce_output_many(self.calculate_many(**inputs))
+        if inputs:
+            # E.g., a constant formula gives a scalar for the whole batch
+            shape = next(iter(inputs.values())).shape
+            out = np.broadcast_to(out, shape).copy()
+        return out
+
     def coerce_output(self, val):
         if isinstance(self.output, Output):
             return DTYPES[self.output.dtype](val)
         else:
             return DTYPES[DEFAULT_OUT_TYPE](val)
 
+    def coerce_output_many(self, vals) -> np.ndarray:
+        import numpy as np
+
+        if isinstance(self.output, Output):
+            return np.asarray(vals).astype(NP_DTYPES[self.output.dtype])
+        else:
+            return np.asarray(vals).astype(NP_DTYPES[DEFAULT_OUT_TYPE])
+
     def evaluate_and_format(self, **inputs) -> str:
-        res = self.evaluate(**inputs)
+        return self.format_output(self.evaluate(**inputs), **inputs)
+
+    def format_output(self, res, **inputs) -> str:
+        """Format an already evaluated output for the given inputs."""
         if isinstance(self.output, Output):
             out_name = self.output.name
             template = self.output.template
@@ -128,6 +228,69 @@ class FormulaParams(BaseModel):
     formula: str
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_formula(formula: str) -> ast.AST:
+    """Parse a formula into the expression tree ``arithmetic_eval`` walks.
+
+    This is what ``arithmetic_eval.evaluate`` does with a string on every
+    call, so parsing once lets repeated evaluations skip it.
+    """
+    try:
+        tree = ast.parse(formula)
+    except SyntaxError as e:
+        raise SyntaxError(f"Invalid expression: {formula}") from e
+    return ast.Expression(tree.body[0].value)  # type: ignore[attr-defined]
+
+
+@functools.lru_cache(maxsize=256)
+def _is_vectorizable(formula: str) -> bool:
+    """Whether a formula only uses arithmetic on names and constants.
+
+    Those operators work element-wise on NumPy arrays, whereas the boolean
+    operators ``arithmetic_eval`` supports call ``bool`` on their operands,
+    which is ambiguous for arrays.
+    """
+    from arithmetic_eval.constants import ARITHMETIC_OPERATIONS
+
+    for node in ast.walk(_compile_formula(formula)):
+        if isinstance(node, ast.BinOp):
+            if not isinstance(node.op, ARITHMETIC_OPERATIONS):
+                return False
+        elif not isinstance(
+            node,
+            (ast.Expression, ast.Name, ast.Constant, ast.Load, ast.operator),
+        ):
+            return False
+    return True
+
+
+def _evaluate_array(node: ast.AST, inputs: dict[str, Any]) -> Any:
+    """Evaluate a vectorizable formula tree on arrays with the semantics of
+    ``arithmetic_eval``, e.g., dividing by zero gives zero.
+    """
+    import numpy as np
+    from arithmetic_eval.constants import ARITHMETIC_OPERATION_TO_OPERATOR
+
+    if isinstance(node, ast.Expression):
+        return _evaluate_array(node.body, inputs)
+    if isinstance(node, ast.Name):
+        try:
+            return inputs[node.id]
+        except KeyError:
+            raise NameError(f"Name '{node.id}' is not defined.")
+    if isinstance(node, ast.Constant):
+        return node.value
+    assert isinstance(node, ast.BinOp)
+    left = _evaluate_array(node.left, inputs)
+    right = _evaluate_array(node.right, inputs)
+    op = ARITHMETIC_OPERATION_TO_OPERATOR[type(node.op)]
+    if not isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)):
+        return op(left, right)
+    # Scalar evaluation maps ZeroDivisionError to zero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.asarray(right) == 0, 0, op(left, right))
+
+
 class Formula(Calculation):
     kind: Literal["formula"] = "formula"
     params: FormulaParams
@@ -135,8 +298,16 @@ class Formula(Calculation):
     def calculate(self, **inputs):
         import arithmetic_eval
 
-        inputs = self.check_inputs(**inputs)
-        return arithmetic_eval.evaluate(self.params.formula, inputs)
+        return arithmetic_eval.evaluate(
+            _compile_formula(self.params.formula), inputs
+        )
+
+    def calculate_many(self, **inputs: np.ndarray) -> Any:
+        # Arithmetic formulas are evaluated once for the whole batch, but
+        # boolean ones need to be evaluated per element
+        if not _is_vectorizable(self.params.formula):
+            return super().calculate_many(**inputs)
+        return _evaluate_array(_compile_formula(self.params.formula), inputs)
 
 
 class LinearParams(BaseModel):
@@ -162,6 +333,10 @@ class Linear(Calculation):
             val += self.params.coeffs[input_name] * input_val
         return val
 
+    def calculate_many(self, **inputs: np.ndarray) -> Any:
+        # Same expression as ``calculate``, which is already element-wise
+        return self.calculate(**inputs)
+
 
 class LookupTableParams(BaseModel):
     x_values: list[float]
@@ -170,11 +345,70 @@ class LookupTableParams(BaseModel):
 
 
 class LookupTable(Calculation):
-    """A 1-D lookup table."""
+    """A 1-D lookup table.
+
+    Inputs outside the range of ``x_values`` are clamped to the first or last
+    value. With the ``round`` method, a value halfway between two ``x_values``
+    takes the lower one.
+    """
 
     kind: Literal["lookup-table"] = "lookup-table"
     params: LookupTableParams
 
+    @model_validator(mode="after")
+    def validate_table(self) -> LookupTable:
+        if len(self.input_names) != 1:
+            raise ValueError("Lookup tables must have exactly one input")
+        x = self.params.x_values
+        if not x or len(x) != len(self.params.y_values):
+            raise ValueError(
+                "x_values and y_values must be non-empty and the same length"
+            )
+        if any(b <= a for a, b in zip(x, x[1:])):
+            raise ValueError("x_values must be strictly increasing")
+        return self
+
+    def calculate(self, **inputs):
+        x = self.params.x_values
+        y = self.params.y_values
+        (val,) = inputs.values()
+        n = len(x)
+        if self.params.method == "floor":
+            return y[min(max(bisect.bisect_right(x, val) - 1, 0), n - 1)]
+        if self.params.method == "ceil":
+            return y[min(bisect.bisect_left(x, val), n - 1)]
+        if val <= x[0]:
+            return y[0]
+        if val >= x[-1]:
+            return y[-1]
+        idx = bisect.bisect_left(x, val)
+        x0, x1 = x[idx - 1], x[idx]
+        if self.params.method == "round":
+            return y[idx - 1] if val - x0 <= x1 - val else y[idx]
+        frac = (val - x0) / (x1 - x0)
+        return y[idx - 1] + frac * (y[idx] - y[idx - 1])
+
+    def calculate_many(self, **inputs: np.ndarray) -> Any:
+        import numpy as np
+
+        x = np.asarray(self.params.x_values, dtype=float)
+        y = np.asarray(self.params.y_values, dtype=float)
+        (vals,) = inputs.values()
+        n = len(x)
+        if n == 1:
+            return np.full(vals.shape, y[0])
+        if self.params.method == "interpolate":
+            return np.interp(vals, x, y)
+        if self.params.method == "floor":
+            idx = np.searchsorted(x, vals, side="right") - 1
+        elif self.params.method == "ceil":
+            idx = np.searchsorted(x, vals, side="left")
+        else:
+            upper = np.clip(np.searchsorted(x, vals, side="left"), 1, n - 1)
+            lower = upper - 1
+            idx = np.where(vals - x[lower] <= x[upper] - vals, lower, upper)
+        return y[np.clip(idx, 0, n - 1)]
+
 
 class HttpRequestParams(BaseModel):
     url: str
@@ -215,6 +449,24 @@ class XGBoostModelParams(BaseModel):
     type: Literal["classifier", "regressor"]
 
 
+@functools.lru_cache(maxsize=16)
+def _load_xgboost_model(model_type: str, path: str, mtime_ns: int):
+    """Load an XGBoost model from JSON.
+
+    ``mtime_ns`` isn't used directly but is part of the cache key, so a
+    model file that has been rewritten is loaded again.
+    """
+    import xgboost
+
+    types = {
+        "classifier": xgboost.XGBClassifier,
+        "regressor": xgboost.XGBRegressor,
+    }
+    model = types[model_type]()
+    model.load_model(path)
+    return model
+
+
 class XGBoostModel(Calculation):
     """Make predictions with an XGBoost model saved as JSON.
 
@@ -227,32 +479,44 @@ class XGBoostModel(Calculation):
     kind: Literal["xgboost"] = "xgboost"
     params: XGBoostModelParams
 
+    def load_model(self):
+        # Models are kept in memory and only reloaded when the file changes
+        mtime_ns = os.stat(self.params.path).st_mtime_ns
+        return _load_xgboost_model(
+            self.params.type, self.params.path, mtime_ns
+        )
+
     def calculate(self, **inputs):
-        # Load model from JSON
-        import xgboost
+        return self.load_model().predict(**inputs)
 
-        # Convert model path to something that can be loaded if running on the
-        # Calkit hub
-        types = {
-            "classifier": xgboost.XGBClassifier,
-            "regressor": xgboost.XGBRegressor,
-        }
-        model = types[self.params.type]().load_model(self.params.path)
-        return model.predict(**inputs)
+    def calculate_many(self, **inputs: np.ndarray) -> Any:
+        import numpy as np
+
+        # Load the model once and predict all rows in a single call, with
+        # one column per input
+        features = np.column_stack([inputs[n] for n in self.input_names])
+        return self.load_model().predict(features)
 
 
 # The calculation kinds that ``parse`` can run, as a discriminated union so
 # ``calkit.yaml`` gets per-kind validation and autocompletion of ``params``
 CalculationType = Annotated[
-    Formula | Linear | LookupTable, Discriminator("kind")
+    Formula | Linear | LookupTable | HttpRequest | XGBoostModel,
+    Discriminator("kind"),
 ]
 
 
-def parse(data: dict) -> Calculation:
+def parse(data: dict | Calculation) -> Calculation:
     if isinstance(data, BaseModel):
         data = data.model_dump()
     # Automatically take keys not in the `kind` and move them into `params`?
-    kinds = {"formula": Formula, "lookup-table": LookupTable, "linear": Linear}
+    kinds: dict[str, type[Calculation]] = {
+        "formula": Formula,
+        "lookup-table": LookupTable,
+        "linear": Linear,
+        "http": HttpRequest,
+        "xgboost": XGBoostModel,
+    }
     return kinds[data["kind"]].model_validate(data)
 
 
@@ -260,5 +524,145 @@ def evaluate(calc_def: dict | Calculation, **inputs) -> dict:
     return parse(calc_def).evaluate(**inputs)
 
 
+def evaluate_many(calc_def: dict | Calculation, **inputs) -> np.ndarray:
+    """Evaluate a calculation for columns of inputs, parsing it only once."""
+    return parse(calc_def).evaluate_many(**inputs)
+
+
 def evaluate_and_format(calc_def: dict | Calculation, **inputs) -> str:
     return parse(calc_def).evaluate_and_format(**inputs)
+
+
+def cache_key(calc_def: dict | Calculation, **inputs) -> str:
+    """Hash a calculation definition and its inputs for the result cache.
+
+    Inputs are checked and coerced first, so e.g. ``x="1"`` and ``x=1.0``
+    share an entry for a float input. If the calculation reads a file, e.g.,
+    an XGBoost model, that file's size and modification time are included
+    so rewriting it invalidates cached results.
+    """
+    calc = parse(calc_def)
+    inputs = calc.check_inputs(**inputs)
+    data: dict[str, Any] = {
+        "calc": calc.model_dump(mode="json"),
+        "inputs": inputs,
+    }
+    path = getattr(calc.params, "path", None)
+    if isinstance(path, str) and os.path.isfile(path):
+        st = os.stat(path)
+        data["file"] = [st.st_size, st.st_mtime_ns]
+    raw = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_path(wdir: str | None) -> str:
+    return os.path.join(wdir, CALC_CACHE_PATH) if wdir else CALC_CACHE_PATH
+
+
+def _cache_open(wdir: str | None) -> sqlite3.Connection:
+    """Open the cache database, creating the local dir on demand.
+
+    ``last_used_at`` is an indexed column so eviction can pick the least
+    recently used entries without reading every stored result.
+    """
+    import calkit
+
+    calkit.ensure_local_dir(wdir)
+    conn = sqlite3.connect(_cache_path(wdir))
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+        "value BLOB, created_at REAL, last_used_at REAL)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS results_last_used_at "
+        "ON results (last_used_at)"
+    )
+    return conn
+
+
+def evaluate_cached(
+    calc_def: dict | Calculation,
+    inputs: dict,
+    *,
+    ttl: str | int | None = None,
+    max_entries: int = DEFAULT_CALC_CACHE_MAX_ENTRIES,
+    wdir: str | None = None,
+):
+    """Evaluate a calculation, reusing a stored result when available.
+
+    Results are stored in ``.calkit/local/calc-cache.sqlite`` keyed by
+    :func:`cache_key`, which is useful for calculations that are expensive
+    to run, e.g., ones that make HTTP requests.
+
+    Parameters
+    ----------
+    calc_def : dict | Calculation
+        The calculation definition.
+    inputs : dict
+        Input values, as would be passed to ``evaluate``.
+    ttl : str | int | None
+        How long a result stays valid, like ``30s``, ``5m``, ``2h``, or a
+        number of seconds. ``None`` or ``0`` means results never expire.
+    max_entries : int
+        Maximum number of results to keep; the least recently used are
+        evicted beyond this.
+    wdir : str | None
+        Project directory. Defaults to the current directory.
+    """
+    from calkit.dependencies import parse_ttl
+
+    ttl_seconds = parse_ttl(ttl) if ttl is not None else 0
+    calc = parse(calc_def)
+    key = cache_key(calc, **inputs)
+    now = time.time()
+    conn = _cache_open(wdir)
+    try:
+        row = conn.execute(
+            "SELECT value, created_at, last_used_at FROM results "
+            "WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is not None and not (
+            ttl_seconds > 0 and now - row[1] > ttl_seconds
+        ):
+            # Only write on a hit when the recorded use is stale enough to
+            # matter for eviction, so repeated hits stay read-only
+            if now - row[2] > CALC_CACHE_TOUCH_INTERVAL_S:
+                with conn:
+                    conn.execute(
+                        "UPDATE results SET last_used_at = ? WHERE key = ?",
+                        (now, key),
+                    )
+            return pickle.loads(row[0])
+        value = calc.evaluate(**inputs)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(key, value, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, pickle.dumps(value), now, now),
+            )
+            (n_entries,) = conn.execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()
+            n_extra = n_entries - max_entries
+            if n_extra > 0:
+                conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM "
+                    "results ORDER BY last_used_at LIMIT ?)",
+                    (n_extra,),
+                )
+        return value
+    finally:
+        conn.close()
+
+
+def clear_cache(wdir: str | None = None) -> None:
+    """Remove all cached calculation results."""
+    if not os.path.isfile(_cache_path(wdir)):
+        return
+    conn = _cache_open(wdir)
+    try:
+        with conn:
+            conn.execute("DELETE FROM results")
+    finally:
+        conn.close()
@@ -910,16 +910,27 @@ def check_docker_env(
     ] = False,
 ) -> None:
     """Check that Docker environment is up-to-date."""
+    from calkit.docker import DockerAPIError, can_build_with_api
+
     if fpath is None and lock_fpath is None:
         raise_error(
             "Lock file output path must be provided if input Dockerfile is not"
         )
 
+    # Talk to the Docker daemon directly if we can, falling back to the CLI
+    client = calkit.docker.get_engine_client()
+
     def get_docker_inspect(obj_id: str = tag) -> dict:
-        # This command returns a list, of which we want the first object
-        out = json.loads(
-            subprocess.check_output(["docker", "inspect", obj_id]).decode()
-        )
+        if client is not None:
+            image = client.inspect_image(obj_id)
+            if image is None:
+                raise DockerAPIError(f"No such image: {obj_id}", status=404)
+            out = [image]
+        else:
+            # This command returns a list, of which we want the first object
+            out = json.loads(
+                subprocess.check_output(["docker", "inspect", obj_id]).decode()
+            )
         # Remove some keys that can change without the important aspects of
         # the image changing
         # Only keep certain keys that are relevant for identifying the
@@ -941,7 +952,7 @@ def check_docker_env(
     # First call Docker inspect
     try:
         inspect = get_docker_inspect()
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, DockerAPIError):
         typer.echo(f"No image with tag {tag} found locally", file=outfile)
         inspect = {}
     if fpath is not None:
@@ -1008,6 +1019,12 @@ def check_docker_env(
         if lock_fpath and os.path.exists(lock_fpath):
             os.remove(lock_fpath)
 
+    def echo_progress(msg: dict) -> None:
+        if "stream" in msg:
+            typer.echo(msg["stream"].rstrip("\n"), file=outfile)
+        elif "status" in msg and "progressDetail" not in msg:
+            typer.echo(msg["status"], file=outfile)
+
     if fpath is not None and rebuild_or_pull:
         dockerfile_dir, dockerfile_name = os.path.split(fpath)
         if not dockerfile_dir:
@@ -1017,8 +1034,19 @@ def check_docker_env(
             cmd += ["--platform", platform]
         cmd.append(".")
         try:
-            subprocess.check_output(cmd, cwd=dockerfile_dir)
-        except subprocess.CalledProcessError:
+            if client is not None and can_build_with_api(
+                dockerfile_dir or ".", fpath
+            ):
+                client.build(
+                    tag,
+                    context_dir=dockerfile_dir or ".",
+                    dockerfile=dockerfile_name,
+                    platform=platform,
+                    on_progress=echo_progress,
+                )
+            else:
+                subprocess.check_output(cmd, cwd=dockerfile_dir)
+        except (subprocess.CalledProcessError, DockerAPIError):
             delete_lock_on_failure()
             raise_error(
                 f"Failed to build Docker image with tag {tag} from {fpath}"
@@ -1034,11 +1062,21 @@ def check_docker_env(
                 cmd = ["docker", "pull", image_with_digest]
                 tag_cmd = ["docker", "tag", image_with_digest, tag]
                 try:
-                    subprocess.check_output(cmd)
-                    # Now tag the pulled image
-                    subprocess.check_output(tag_cmd)
+                    if client is not None:
+                        # No need to pull if we already have this digest
+                        if client.inspect_image(image_with_digest) is None:
+                            client.pull(
+                                image_with_digest,
+                                platform=platform,
+                                on_progress=echo_progress,
+                            )
+                        client.tag(image_with_digest, tag)
+                    else:
+                        subprocess.check_output(cmd)
+                        # Now tag the pulled image
+                        subprocess.check_output(tag_cmd)
                     pulled = True
-                except subprocess.CalledProcessError:
+                except (subprocess.CalledProcessError, DockerAPIError):
                     delete_lock_on_failure()
                     warn(
                         f"Failed to pull image by digest: {image_with_digest}; "
@@ -1049,8 +1087,13 @@ def check_docker_env(
             typer.echo(f"Pulling image: {tag}")
             cmd = ["docker", "pull", tag]
             try:
-                subprocess.check_output(cmd)
-            except subprocess.CalledProcessError:
+                if client is not None:
+                    client.pull(
+                        tag, platform=platform, on_progress=echo_progress
+                    )
+                else:
+                    subprocess.check_output(cmd)
+            except (subprocess.CalledProcessError, DockerAPIError):
                 delete_lock_on_failure()
                 raise_error(f"Failed to pull image: {tag}")
     # Write the lock file
@@ -1144,6 +1187,93 @@ def check_conda_env(
         raise_error(f"Failed to check conda environment: {e}")
 
 
+# Packages pip freeze may leave out of a lock file
+_FREEZE_EXCLUDED = {"pip", "setuptools", "wheel", "distribute"}
+
+
+def _freeze_key(line: str) -> str:
+    """Normalize a ``pip freeze`` line for comparison.
+
+    uv and pip differ in how they spell package names and editable installs.
+    """
+    from urllib.parse import urlparse
+    from urllib.request import url2pathname
+
+    from packaging.utils import canonicalize_name
+
+    line = line.strip()
+    if line.startswith("-e "):
+        url = line[3:].strip()
+        if url.startswith("file://"):
+            url = url2pathname(urlparse(url).path)
+        return "-e " + os.path.normcase(os.path.normpath(url))
+    for sep in ["==", " @ "]:
+        if sep in line:
+            name, rest = line.split(sep, 1)
+            return canonicalize_name(name) + sep + rest.strip()
+    return line
+
+
+def _venv_matches_lock(
+    prefix: str, path: str, lock_fpath: str, python: str | None = None
+) -> bool:
+    """Check whether a venv already matches its spec and lock file.
+
+    This reads the installed packages in-process, so when nothing has
+    changed we can skip running ``pip install`` and ``pip freeze``, which
+    would leave the environment and lock file as they are.
+    """
+    from calkit.conda import _check_list, list_installed_dists
+
+    if not os.path.isfile(path) or not os.path.isfile(lock_fpath):
+        return False
+    if python is not None:
+        cfg_fpath = os.path.join(prefix, "pyvenv.cfg")
+        if not os.path.isfile(cfg_fpath):
+            return False
+        with open(cfg_fpath) as f:
+            cfg = dotenv.dotenv_values(stream=f)
+        version = cfg.get("version_info") or cfg.get("version") or ""
+        if version != python and not version.startswith(python + "."):
+            return False
+    dists = list_installed_dists(prefix)
+    if not dists:
+        return False
+    with open(lock_fpath) as f:
+        locked = {
+            _freeze_key(line)
+            for line in f.read().splitlines()
+            if line.strip() and not line.startswith("#")
+        }
+    installed = {_freeze_key(dist.freeze_line()): dist for dist in dists}
+    if not locked.issubset(installed):
+        return False
+    for key, dist in installed.items():
+        if key not in locked and dist.name.lower() not in _FREEZE_EXCLUDED:
+            return False
+    # Every requirement in the spec must be satisfied too, and we fall back
+    # to pip for anything we can't interpret here, e.g., options or markers.
+    # Extras are left to pip as well, since a newly added one can pull in
+    # dependencies that checking the package itself wouldn't catch
+    pinned = [dist.pinned() for dist in dists]
+    env_spec_dir = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        reqs = f.read().splitlines()
+    for req in reqs:
+        req = req.split(" #", 1)[0].strip()
+        if not req or req.startswith("#"):
+            continue
+        editable = req.startswith("-e ") or req.startswith("--editable ")
+        if (req.startswith("-") and not editable) or ";" in req or "[" in req:
+            return False
+        try:
+            if not _check_list(req, pinned, env_spec_dir=env_spec_dir):
+                return False
+        except Exception:
+            return False
+    return True
+
+
 @check_app.command(name="venv")
 def check_venv(
     path: Annotated[
@@ -1320,6 +1450,15 @@ def check_venv(
                         f"{used_legacy_lock}: {e}"
                     )
 
+    if _venv_matches_lock(
+        prefix=prefix_full_path,
+        path=os.path.join(wdir or ".", path),
+        lock_fpath=os.path.join(wdir or ".", lock_fpath),
+        python=python,
+    ):
+        if verbose:
+            typer.echo(f"{kind} at {prefix} matches {lock_fpath}")
+        return
     # If the lock file exists, try to install with that
     dep_file_txt = f"-r {path}"
     if os.path.isfile(reqs_to_use):
@@ -1478,8 +1617,19 @@ def check_pipeline(
             help="Compile the pipeline to DVC stages and merge into dvc.yaml.",
         ),
     ] = False,
+    detect_io: Annotated[
+        bool,
+        typer.Option(
+            "--detect-io",
+            help=(
+                "Detect each stage's inputs from its code and warn about "
+                "any that aren't declared."
+            ),
+        ),
+    ] = False,
 ) -> None:
     """Check that the project pipeline is defined correctly."""
+    from calkit.models.io import InputsFromStageOutputs
     from calkit.models.pipeline import Pipeline
 
     ck_info = calkit.load_calkit_info()
@@ -1496,6 +1646,32 @@ def check_pipeline(
             raise_error("Stage names cannot start with an underscore")
     message = "✅ This project's pipeline is defined correctly!"
     calkit.echo(message)
+    if detect_io:
+        names = list(pipeline.stages.keys())
+        # Detected in one batch, since parsing many scripts one at a time is
+        # slow
+        io_infos = calkit.detect.detect_io_many(
+            [ck_info["pipeline"]["stages"][name] for name in names]
+        )
+        for name, io_info in zip(names, io_infos):
+            stage = pipeline.stages[name]
+            declared = list(stage.dvc_deps)
+            for i in stage.inputs:
+                if isinstance(i, InputsFromStageOutputs):
+                    other = pipeline.stages.get(i.from_stage_outputs)
+                    if other is not None:
+                        declared += [
+                            out if isinstance(out, str) else next(iter(out))
+                            for out in other.dvc_outs
+                        ]
+            undeclared = calkit.detect.filter_covered_inputs(
+                io_info["inputs"], declared
+            )
+            if undeclared:
+                warn(
+                    f"Stage '{name}' may have undeclared inputs: "
+                    f"{', '.join(undeclared)}"
+                )
     if compile_to_dvc:
         typer.echo("Attempting to compile to DVC stages")
         try:
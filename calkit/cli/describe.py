@@ -8,7 +8,7 @@ from typing import Annotated
 import typer
 
 import calkit
-from calkit.cli import AliasGroup, echo_json, raise_error
+from calkit.cli import AliasGroup, echo_json, raise_error, warn
 from calkit.environments import get_env_lock_fpath
 
 describe_app = typer.Typer(cls=AliasGroup, no_args_is_help=True)
@@ -98,6 +98,91 @@ def describe_envs(
         _echo_description(desc, indent="    ")
 
 
+@describe_app.command(name="runs")
+def describe_runs(
+    stages: Annotated[
+        list[str] | None,
+        typer.Option("--stage", "-s", help="Only describe these stages."),
+    ] = None,
+    last: Annotated[
+        int,
+        typer.Option(
+            "--last",
+            "-n",
+            min=1,
+            help="Number of recent runs of each stage to consider.",
+        ),
+    ] = 10,
+    json_output: Annotated[
+        bool, typer.Option("--json", help="Output result as JSON.")
+    ] = False,
+):
+    """Describe the runtime and resource use of recent stage runs.
+
+    The latest run of each stage is compared with the ones before it, and
+    stages that got noticeably slower are flagged. Peak memory is the most
+    any recent run used, which is a good basis for the stage's resources.
+    """
+    from calkit.profiling import (
+        format_bytes,
+        format_seconds,
+        read_history,
+        summarize_history,
+    )
+
+    summaries = summarize_history(read_history(), last=last, stages=stages)
+    if json_output:
+        echo_json([s.model_dump() for s in summaries])
+        return
+    if not summaries:
+        typer.echo("No stage runs recorded yet; run the pipeline first")
+        return
+    rows = [
+        [
+            "Stage",
+            "Runs",
+            "Wall time",
+            "Change",
+            "Median",
+            "CPU time",
+            "Peak memory",
+            "Read",
+            "Written",
+        ]
+    ]
+    for s in summaries:
+        change = "-"
+        if s.wall_time_change is not None:
+            change = f"{s.wall_time_change:+.0%}"
+            if s.regressed:
+                change += " ⚠️"
+        rows.append(
+            [
+                s.stage,
+                str(s.runs),
+                format_seconds(s.latest.wall_time),
+                change,
+                format_seconds(s.median_wall_time),
+                format_seconds(s.latest.cpu_time),
+                format_bytes(s.max_rss),
+                format_bytes(s.latest.read_bytes),
+                format_bytes(s.latest.write_bytes),
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        typer.echo(
+            "  ".join(
+                val.ljust(width) if i == 0 else val.rjust(width)
+                for i, (val, width) in enumerate(zip(row, widths))
+            ).rstrip()
+        )
+    regressed = [s.stage for s in summaries if s.regressed]
+    if regressed:
+        typer.echo()
+        warn("Slower than usual in the latest run: " + ", ".join(regressed))
+
+
 @describe_app.command(name="schema")
 def describe_schema(
     output: Annotated[
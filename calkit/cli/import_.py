@@ -72,7 +72,6 @@ def import_dataset(
 
     Currently only supports datasets kept in DVC, not Git.
     """
-    import requests
     from tqdm import tqdm
 
     from calkit.dvc import run_dvc_command
@@ -183,7 +182,7 @@ def import_dataset(
                 if url is None:
                     raise_error(f"Could not fetch {f}")
                 # Download from URL
-                resp_dl = requests.get(url, stream=True)
+                resp_dl = calkit.sessions.get_session().get(url, stream=True)
                 try:
                     resp_dl.raise_for_status()
                 except Exception as e:
@@ -366,8 +365,6 @@ def import_from_zenodo(
     ] = False,
 ):
     """Import files from a Zenodo record."""
-    import requests
-
     from calkit.dvc import run_dvc_command
 
     # Ensure destination directory either doesn't exist or is empty
@@ -425,7 +422,7 @@ def import_from_zenodo(
         out_path = os.path.join(dest_dir, fname)  # fname may include subdirs
         os.makedirs(os.path.dirname(out_path), exist_ok=True)
         typer.echo(f"Downloading {fname} to {out_path}")
-        resp = requests.get(url, stream=True)
+        resp = calkit.sessions.get_session().get(url, stream=True)
         try:
             resp.raise_for_status()
         except Exception as e:
@@ -541,9 +541,10 @@ def get_status(
         if "git" in categories:
             try:
                 repo = calkit.git.get_repo()
-                changed_files = calkit.git.get_changed_files(repo=repo)
-                staged_files = calkit.git.get_staged_files(repo=repo)
-                untracked_files = calkit.git.get_untracked_files(repo=repo)
+                git_status = calkit.git.get_status(repo=repo)
+                changed_files = git_status.changed
+                staged_files = git_status.staged
+                untracked_files = git_status.untracked
                 if targets:
                     target_prefixes = [
                         Path(target).as_posix().rstrip("/")
@@ -569,10 +570,8 @@ def get_status(
                         if _matches_target(path)
                     ]
                 status_dict["git"] = {
-                    "branch": None
-                    if repo.head.is_detached
-                    else repo.active_branch.name,
-                    "is_dirty": repo.is_dirty(untracked_files=True),
+                    "branch": git_status.branch,
+                    "is_dirty": git_status.is_dirty,
                     "changed_files": changed_files,
                     "staged_files": staged_files,
                     "untracked_files": untracked_files,
@@ -1752,9 +1751,14 @@ def _concurrent_scheduler_prepass(
     ``dvc repro`` then sees the items as up-to-date and records them,
     preserving granular per-item caching so a failed sweep resumes only the
     failed items. Not used under --force (the caller runs those serially).
+
+    Stages with ``scheduler.array`` set submit their stale items in one call,
+    as a job array, and wait for it here. Each item's own ``dvc repro`` then
+    only records the result of its task.
     """
     import sys
 
+    import calkit.cli.scheduler
     import calkit.pipeline
 
     eligible = calkit.pipeline.get_concurrent_scheduler_stages(ck_info)
@@ -1762,17 +1766,20 @@ def _concurrent_scheduler_prepass(
         eligible = [name for name in eligible if name in targets]
     if not eligible:
         return
+    array_stages = calkit.pipeline.get_array_scheduler_stages(ck_info)
     for stage_name in eligible:
         item_targets, upstream_targets = (
             calkit.pipeline.get_matrix_item_targets(stage_name)
         )
         if not item_targets:
             continue
+        as_array = stage_name in array_stages
         # Each item holds a local polling process for the job's lifetime, so
         # cap the fan-out to avoid exhausting local resources; a sweep larger
-        # than this should be split into multiple runs.
+        # than this should be split into multiple runs. A job array is waited
+        # for by this process alone.
         max_jobs = 100
-        if len(item_targets) > max_jobs:
+        if not as_array and len(item_targets) > max_jobs:
             raise_error(
                 f"Stage '{stage_name}' would submit {len(item_targets)} jobs "
                 f"at once, exceeding the limit of {max_jobs}. Each concurrent "
@@ -1782,6 +1789,7 @@ def _concurrent_scheduler_prepass(
         if not quiet:
             calkit.echo(
                 f"🧵 Submitting {len(item_targets)} '{stage_name}' jobs"
+                + (" as a job array" if as_array else "")
             )
         # Build shared upstreams first; if two items raced to build the same
         # stale dependency, one would fail with an rwlock "busy" error. Go
@@ -1793,13 +1801,31 @@ def _concurrent_scheduler_prepass(
                 raise_error(
                     f"Failed to build dependencies for stage '{stage_name}'"
                 )
-        results = calkit.pipeline.reproduce_targets_concurrently(
-            item_targets, max_workers=len(item_targets)
-        )
-        failed = [t for t, rc in results.items() if rc != 0]
+        n_items = len(item_targets)
+        failed = []
+        max_workers = n_items
+        if as_array:
+            stale = calkit.pipeline.get_stale_targets(item_targets)
+            exit_codes = calkit.cli.scheduler.run_job_arrays(
+                calkit.pipeline.get_target_commands(stale)
+            )
+            # A failed task is reported here rather than resubmitted on its
+            # own by its item's `dvc repro`
+            failed = [
+                t for t, code in exit_codes.items() if code not in (0, None)
+            ]
+            item_targets = [t for t in item_targets if t not in failed]
+            # The rest only record their tasks' results, so they needn't
+            # all run at once
+            max_workers = min(len(item_targets), os.cpu_count() or 1)
+        if item_targets:
+            results = calkit.pipeline.reproduce_targets_concurrently(
+                item_targets, max_workers=max_workers
+            )
+            failed += [t for t, rc in results.items() if rc != 0]
         if failed:
             msg = (
-                f"{len(failed)} of {len(item_targets)} '{stage_name}' jobs "
+                f"{len(failed)} of {n_items} '{stage_name}' jobs "
                 f"failed: {', '.join(failed)}"
             )
             if keep_going:
@@ -1810,6 +1836,133 @@ def _concurrent_scheduler_prepass(
                 )
 
 
+def _parallel_prepass(
+    ck_info: dict,
+    targets: list[str],
+    keep_going: bool,
+    quiet: bool,
+    jobs: int,
+    run_id: str | None = None,
+    system_id: str | None = None,
+) -> None:
+    """Run independent stages concurrently before ``dvc repro``.
+
+    The stage graph comes from the compiled DVC pipeline, with iterated
+    stages expanded into their items. Each stage starts, in its own ``dvc
+    repro --single-item`` process, once the stages it depends on are done,
+    with at most ``jobs`` running at once (no limit if 0). Running stages
+    share a pool of this machine's CPUs and memory, each taking what it
+    declares under ``resources``. Each stage's output goes to its own log,
+    and outcomes are reported per stage, along with the critical path. Each
+    stage's resource use is added to the stage run history. The trailing
+    ``dvc repro`` then sees everything as up-to-date.
+    """
+    import time
+
+    import calkit.pipeline
+    import calkit.profiling
+
+    graph = calkit.pipeline.get_stage_graph(targets=targets or None)
+    if not graph:
+        return
+    stale = calkit.pipeline.get_stale_targets(list(graph))
+    if not stale:
+        return
+    scheduler_stages = set(
+        calkit.pipeline.get_concurrent_scheduler_stages(ck_info)
+    )
+    resources = {}
+    for name in graph:
+        base_name = name.split(":")[-1].split("@")[0]
+        if base_name in scheduler_stages:
+            # These wait on a job scheduler rather than using this machine
+            resources[name] = (0.0, 0)
+        else:
+            resources[name] = calkit.pipeline.get_stage_resources(
+                ck_info, base_name
+            )
+    log_dir = os.path.join(calkit.ensure_local_dir(), "logs", "stages")
+    os.makedirs(log_dir, exist_ok=True)
+    max_workers = len(graph) if jobs == 0 else jobs
+    if not quiet:
+        calkit.echo(
+            f"🧵 Running stages in parallel, up to {max_workers} at once"
+        )
+
+    def run_one(name: str) -> int:
+        if not quiet:
+            typer.echo(f"  ▶️ {name}")
+        profiles: list[calkit.profiling.StageProfile] = []
+        returncode = calkit.pipeline.repro_single_item(
+            name,
+            log_path=calkit.pipeline.get_target_log_path(log_dir, name),
+            on_profile=profiles.append,
+        )
+        calkit.profiling.append_history(
+            [
+                calkit.profiling.make_record(
+                    name,
+                    profile,
+                    returncode=returncode,
+                    run_id=run_id,
+                    system_id=system_id,
+                )
+                for profile in profiles
+            ]
+        )
+        if not quiet:
+            typer.echo(f"  {'✅' if returncode == 0 else '❌'} {name}")
+        return returncode
+
+    start = time.time()
+    results = calkit.pipeline.run_stage_graph(
+        graph,
+        stale=stale,
+        max_workers=max_workers,
+        run_one=run_one,
+        resources=resources,
+        pool=calkit.pipeline.ResourcePool(),
+        keep_going=keep_going,
+    )
+    elapsed = time.time() - start
+    ran = [r for r in results.values() if r.status in ("succeeded", "failed")]
+    failed = [name for name, r in results.items() if r.status == "failed"]
+    skipped = [name for name, r in results.items() if r.status == "skipped"]
+    not_started = [
+        name for name, r in results.items() if r.status == "not-started"
+    ]
+    if not quiet and ran:
+        path, path_time = calkit.pipeline.get_critical_path(graph, results)
+        stage_time = sum(r.duration for r in ran)
+        calkit.echo(
+            f"⏱️ Ran {len(ran)} stages in {elapsed:.1f} s "
+            f"({stage_time:.1f} s of stage time)"
+        )
+        typer.echo(
+            f"Critical path ({path_time:.1f} s): "
+            + " → ".join(
+                f"{name} ({results[name].duration:.1f} s)" for name in path
+            )
+        )
+    if failed:
+        for name in failed:
+            log_path = calkit.pipeline.get_target_log_path(log_dir, name)
+            typer.echo(
+                f"Stage '{name}' failed with exit code "
+                f"{results[name].returncode}; see {log_path}",
+                err=True,
+            )
+        msg = f"{len(failed)} stage(s) failed: {', '.join(failed)}"
+        if skipped:
+            msg += f"; skipped {len(skipped)} that depend on them"
+        if not_started:
+            msg += (
+                f"; {len(not_started)} not started (aborted after failure): "
+                + ", ".join(not_started)
+            )
+        raise_error(msg + ". Successful stages are cached; rerun to resume.")
+
+
 def _get_subproject_targets_for_run(
     subproject_path: str,
     targets: list[str] | None,
@@ -2003,6 +2156,20 @@ def run(
             ),
         ),
     ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            help=(
+                "Run up to this many independent stages at once, as their "
+                "declared resources allow. Use 0 for no limit beyond "
+                "resources. Ignored with --downstream, --pipeline, "
+                "--recursive, --glob, --all-pipelines, --force, or --dry."
+            ),
+            min=0,
+        ),
+    ] = 1,
 ) -> dict:
     """Check requirements and run the pipeline."""
     import dvc.log
@@ -2015,10 +2182,32 @@ def run(
     import calkit.dvc.zip
     import calkit.environments
     import calkit.pipeline
+    import calkit.profiling
     from calkit.cli.overleaf import sync as overleaf_sync
 
     if (target_inputs or target_outputs) and targets:
         raise_error("Cannot specify both targets and inputs")
+    if jobs != 1:
+        # Stages only run in parallel for a plain run, so say which options
+        # make this one serial rather than ignoring --jobs silently
+        serial_options = [
+            option
+            for option, given in [
+                ("--downstream", downstream),
+                ("--pipeline", pipeline),
+                ("--recursive", recursive),
+                ("--glob", glob),
+                ("--all-pipelines", all_pipelines),
+                ("--force", force),
+                ("--dry", dry),
+            ]
+            if given
+        ]
+        if serial_options:
+            warn(
+                f"--jobs is ignored with {', '.join(serial_options)}; "
+                "stages will run one at a time"
+            )
     os.environ["CALKIT_PIPELINE_RUNNING"] = "1"
     # Mock the scheduler for this run (and any subprocesses) so SLURM/PBS
     # stages execute locally; child processes inherit it via os.environ
@@ -2328,6 +2517,7 @@ def run(
     run_is_narrowed = bool(
         downstream or pipeline or recursive or glob or all_pipelines
     )
+    run_id = uuid.uuid4().hex
     if dvc_stages and not dry and not force and not run_is_narrowed:
         _concurrent_scheduler_prepass(
             ck_info=ck_info,
@@ -2335,9 +2525,18 @@ def run(
             keep_going=keep_going,
             quiet=quiet,
         )
+        if jobs != 1:
+            _parallel_prepass(
+                ck_info=ck_info,
+                targets=targets,
+                keep_going=keep_going,
+                quiet=quiet,
+                jobs=jobs,
+                run_id=run_id,
+                system_id=system_info["id"],
+            )
     start_time_no_tz = calkit.utcnow(remove_tz=True)
     start_time = calkit.utcnow(remove_tz=False)
-    run_id = uuid.uuid4().hex
     run_fname_prefix = (
         start_time_no_tz.isoformat(timespec="seconds").replace(":", "-")
         + "-"
@@ -2377,8 +2576,10 @@ def run(
         os.environ["CALKIT_FORCE"] = "1"
     # DVC logs only its own output, so tee each stage process's stdout and
     # stderr into the run log as well as the terminal. DVC's repro is serial,
-    # so stages can't interleave here.
+    # so stages can't interleave here. Each stage's commands are profiled
+    # along the way, so they're attributed to the stage running them.
     orig_run = dvc.stage.run._run
+    stage_profiles = calkit.profiling.DvcStageProfiles()
 
     def _patched_run(executable, cmd, **kwargs):
         kwargs["stdout"] = subprocess.PIPE
@@ -2399,12 +2600,15 @@ def run(
                 if in_main_thread:
                     old_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
                     handler_set = True
-                for line in p.stdout:
-                    sys.stdout.write(line)
-                    sys.stdout.flush()
-                    log_f.write(line)
-                    log_f.flush()
-                p.wait()
+                with calkit.profiling.ProcessProfiler(p) as profiler:
+                    for line in p.stdout:
+                        sys.stdout.write(line)
+                        sys.stdout.flush()
+                        log_f.write(line)
+                        log_f.flush()
+                    profiler.wait()
+                assert profiler.profile is not None
+                stage_profiles.add(profiler.profile, p.returncode)
                 if p.returncode != 0:
                     raise dvc.stage.run.StageCmdFailedError(cmd, p.returncode)
             finally:
@@ -2424,7 +2628,10 @@ def run(
         # releases the repo lock while a stage command runs and re-acquires it
         # the instant it finishes) can all hold it momentarily. Without this,
         # such a collision aborts the whole run with "Unable to acquire lock".
-        with calkit.dvc.dvc_lock_timeout(calkit.dvc.DEFAULT_RUN_LOCK_TIMEOUT):
+        with (
+            calkit.dvc.dvc_lock_timeout(calkit.dvc.DEFAULT_RUN_LOCK_TIMEOUT),
+            stage_profiles.patch(profile_commands=False),
+        ):
             res = _run_dvc_repro(["repro"] + args)
     finally:
         os.environ.pop("CALKIT_FORCE", None)
@@ -2435,6 +2642,21 @@ def run(
         stage_run_info = _stage_run_info_from_log_content(
             log_content, run_finished=True
         )
+    for stage_name, profile in stage_profiles.profiles.items():
+        if stage_name in stage_run_info:
+            stage_run_info[stage_name]["profile"] = profile.model_dump()
+    calkit.profiling.append_history(
+        [
+            calkit.profiling.make_record(
+                stage_name,
+                profile,
+                returncode=stage_profiles.returncodes.get(stage_name),
+                run_id=run_id,
+                system_id=system_info["id"],
+            )
+            for stage_name, profile in stage_profiles.profiles.items()
+        ]
+    )
     if res is None:
         # DVC's exit code was lost to a teardown failure; fall back to the log,
         # which records any stage that failed to reproduce.
@@ -3374,6 +3596,26 @@ def run_calculation(
             "--no-format", help="Do not format output before printing"
         ),
     ] = False,
+    cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache",
+            help=(
+                "Reuse a stored result for the same calculation and inputs, "
+                "storing it if not present."
+            ),
+        ),
+    ] = False,
+    cache_ttl: Annotated[
+        str | None,
+        typer.Option(
+            "--cache-ttl",
+            help=(
+                "How long a cached result stays valid, e.g., 30s, 5m, 2h, 7d. "
+                "Implies --cache. By default, cached results never expire."
+            ),
+        ),
+    ] = None,
 ):
     """Run a project's calculation."""
     ck_info = calkit.load_calkit_info()
@@ -3390,10 +3632,16 @@ def run_calculation(
         iname, ival = i.split("=")
         parsed_inputs[iname] = ival
     try:
+        if cache or cache_ttl is not None:
+            res = calkit.calc.evaluate_cached(
+                calc, parsed_inputs, ttl=cache_ttl
+            )
+        else:
+            res = calc.evaluate(**parsed_inputs)
         if no_formatting:
-            typer.echo(calc.evaluate(**parsed_inputs))
+            typer.echo(res)
         else:
-            typer.echo(calc.evaluate_and_format(**parsed_inputs))
+            typer.echo(calc.format_output(res, **parsed_inputs))
     except Exception as e:
         raise_error(f"Calculation failed: {e}")
 
@@ -3523,7 +3771,14 @@ def call_dvc(
     Useful if Calkit is installed as a tool, e.g., with `uv tool` or `pipx`,
     and DVC is not installed.
     """
-    result = calkit.dvc.run_dvc_command(sys.argv[2:])
+    profile_path = os.environ.get(calkit.profiling.PROFILE_PATH_ENV_VAR)
+    if profile_path:
+        stage_profiles = calkit.profiling.DvcStageProfiles()
+        with stage_profiles.patch():
+            result = calkit.dvc.run_dvc_command(sys.argv[2:])
+        stage_profiles.dump(profile_path)
+    else:
+        result = calkit.dvc.run_dvc_command(sys.argv[2:])
     if result != 0 and len(sys.argv) > 2 and sys.argv[2] == "add":
         typer.secho(
             "Hint: If DVC failed because a .dvc pointer file is git-ignored, "
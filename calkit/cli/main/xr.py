@@ -109,7 +109,7 @@ def execute_and_record(
     from git import InvalidGitRepositoryError
 
     from calkit.detect import (
-        detect_io,
+        detect_io_cached,
         filter_covered_inputs,
         generate_stage_name,
     )
@@ -475,7 +475,7 @@ def execute_and_record(
     detected_outputs = list(docker_override_detected_outputs)
     if not no_detect_io and not (detected_inputs or detected_outputs):
         try:
-            io_info = detect_io(stage)
+            io_info = detect_io_cached(stage)
             detected_inputs = io_info["inputs"]
             detected_outputs = io_info["outputs"]
         except Exception as e:
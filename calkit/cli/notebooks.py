@@ -726,8 +726,6 @@ def _pyodide_provided_packages() -> set[str]:
     """
     import json
 
-    import requests
-
     import calkit
 
     cache_path = (
@@ -737,7 +735,7 @@ def _pyodide_provided_packages() -> set[str]:
     )
     url = "https://wasm.marimo.app/pyodide-lock.json"
     try:
-        resp = requests.get(url, timeout=20)
+        resp = calkit.sessions.get_session().get(url, timeout=20)
         resp.raise_for_status()
         cache_path.parent.mkdir(parents=True, exist_ok=True)
         cache_path.write_text(resp.text)
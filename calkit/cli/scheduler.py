@@ -68,6 +68,27 @@ QUEUE_SLOT_POLL_JITTER = 0.25
 MOCK_ENV_VAR = "CALKIT_MOCK_SCHEDULER"
 
 
+# Resource use of finished jobs, reported by the scheduler's accounting, is
+# kept per stage in its own table of the jobs database, so auto-sizing can
+# request what a stage's jobs have actually needed.
+ACCOUNTING_TABLE = "accounting"
+ACCOUNTING_HISTORY_LENGTH = 50
+# Auto-sizing requests this percentile of what recent successful jobs used,
+# plus a margin, once there are enough of them to go by.
+AUTO_SIZE_PERCENTILE = 95
+AUTO_SIZE_MARGIN = 0.25
+AUTO_SIZE_MIN_JOBS = 3
+# Each job array task finds its job by its index in the array, which the
+# scheduler puts in the task's environment
+ARRAY_INDEX_ENV_VARS = {
+    "slurm": "SLURM_ARRAY_TASK_ID",
+    "pbs": "PBS_ARRAY_INDEX",
+}
+# A job array's own output holds only what the scheduler writes, e.g., that a
+# task hit its time limit, since each task writes to its job's log
+ARRAY_LOGS_DIR = os.path.join(LOCAL_DIR, "scheduler-arrays")
+
+
 # A generous busy timeout lets the many batch processes that fan out an
 # iterated stage wait for the SQLite write lock instead of failing with
 # "database is locked". We keep the default rollback journal (not WAL), which
@@ -138,6 +159,290 @@ def _record_job_result(name: str, exit_code: int) -> None:
         jobs[name] = info
 
 
+def _parse_duration(value: str) -> float | None:
+    """Parse a scheduler duration, like ``1-02:03:04``, ``02:03:04``,
+    ``03:04.5``, or ``UNLIMITED``, into seconds.
+    """
+    value = value.strip()
+    if not value or not value[0].isdigit():
+        return None
+    days = 0
+    if "-" in value:
+        day_part, _, value = value.partition("-")
+        try:
+            days = int(day_part)
+        except ValueError:
+            return None
+    try:
+        parts = [float(p) for p in value.split(":")]
+    except ValueError:
+        return None
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return days * 86400 + seconds
+
+
+def _parse_memory(value: str) -> int | None:
+    """Parse a scheduler memory amount, like ``1234K``, ``4000Mn``,
+    ``4Gc``, or ``123456kb``, into bytes.
+    """
+    match = re.fullmatch(
+        r"\s*(\d+(?:\.\d+)?)\s*([kKmMgGtT]?)[bBwW]?[nNcC]?\s*", value
+    )
+    if match is None:
+        return None
+    number, unit = match.groups()
+    # SLURM's MaxRSS and ReqMem default to KiB and MiB, respectively, but
+    # both are printed with a unit in practice; PBS always gives one
+    factor = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+    return int(float(number) * factor[unit.lower()])
+
+
+def _parse_sacct_accounting(stdout: str) -> dict | None:
+    """Parse ``sacct -n -P -o
+    JobID,State,Elapsed,TotalCPU,MaxRSS,AllocCPUS,ReqMem,Timelimit`` output.
+
+    The first line is the job itself and later lines are its steps. Memory
+    is only reported for steps, so peak memory is the largest of them.
+    """
+    lines = [line for line in stdout.strip().splitlines() if line.strip()]
+    if not lines:
+        return None
+    fields = lines[0].split("|")
+    if len(fields) < 8:
+        return None
+    _, state, elapsed, total_cpu, _, alloc_cpus, req_mem, time_limit = fields[
+        :8
+    ]
+    max_rss = None
+    for line in lines:
+        step_fields = line.split("|")
+        if len(step_fields) < 5:
+            continue
+        rss = _parse_memory(step_fields[4])
+        if rss is not None and (max_rss is None or rss > max_rss):
+            max_rss = rss
+    return {
+        "state": state.split()[0] if state.strip() else None,
+        "elapsed": _parse_duration(elapsed),
+        "cpu_time": _parse_duration(total_cpu),
+        "max_rss": max_rss,
+        "cpus": int(alloc_cpus) if alloc_cpus.strip().isdigit() else None,
+        "requested_memory": _parse_memory(req_mem),
+        "requested_time": _parse_duration(time_limit),
+    }
+
+
+def _parse_pbs_accounting(stdout: str) -> dict | None:
+    """Parse the ``resources_used`` and ``Resource_List`` of ``qstat -x -f``
+    output.
+    """
+    values = {}
+    for line in stdout.splitlines():
+        key, sep, value = line.strip().partition("=")
+        if sep:
+            values[key.strip().lower()] = value.strip()
+    if "resources_used.walltime" not in values:
+        return None
+    ncpus = values.get("resources_used.ncpus") or values.get(
+        "resource_list.ncpus", ""
+    )
+    return {
+        "state": values.get("job_state"),
+        "elapsed": _parse_duration(values["resources_used.walltime"]),
+        "cpu_time": _parse_duration(values.get("resources_used.cput", "")),
+        "max_rss": _parse_memory(values.get("resources_used.mem", "")),
+        "cpus": int(ncpus) if ncpus.isdigit() else None,
+        "requested_memory": _parse_memory(values.get("resource_list.mem", "")),
+        "requested_time": _parse_duration(
+            values.get("resource_list.walltime", "")
+        ),
+    }
+
+
+def _job_accounting(kind: str, job_id: str, name: str) -> dict | None:
+    """Return what a finished job used, as reported by the scheduler, or
+    ``None`` if it's not available.
+    """
+    from datetime import datetime
+
+    if _mock_enabled():
+        # Mock jobs have no accounting, but how long they ran is known from
+        # when they were submitted and when they wrote their exit code
+        info = _load_jobs().get(name, {})
+        try:
+            submitted = datetime.fromisoformat(info["submitted_at"])
+            finished = os.path.getmtime(_mock_status_path(job_id))
+        except (KeyError, OSError, ValueError):
+            return None
+        return {"elapsed": max(finished - submitted.timestamp(), 0.0)}
+    if kind == "slurm":
+        p = subprocess.run(
+            [
+                "sacct",
+                "-j",
+                job_id,
+                "-n",
+                "-P",
+                "-o",
+                "JobID,State,Elapsed,TotalCPU,MaxRSS,AllocCPUS,ReqMem,"
+                "Timelimit",
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if p.returncode != 0:
+            return None
+        return _parse_sacct_accounting(p.stdout)
+    p = subprocess.run(
+        ["qstat", "-x", "-f", job_id],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if p.returncode != 0:
+        return None
+    return _parse_pbs_accounting(p.stdout)
+
+
+def _stage_name(job_name: str) -> str:
+    """Return the stage a job belongs to, which for an iterated stage is
+    the job name without its ``@`` suffix.
+    """
+    return job_name.split("@")[0]
+
+
+def _record_accounting(
+    name: str, job_id: str, kind: str, exit_code: int | None, usage: dict
+) -> None:
+    """Keep a finished job's resource use, pruning the oldest beyond
+    ``ACCOUNTING_HISTORY_LENGTH`` jobs of the same stage.
+    """
+    calkit.ensure_local_dir()
+    stage = _stage_name(name)
+    record = {
+        "stage": stage,
+        "name": name,
+        "job_id": job_id,
+        "kind": kind,
+        "exit_code": exit_code,
+        "finished_at": calkit.utcnow().isoformat(),
+    } | usage
+    with SqliteDict(
+        JOBS_DB_PATH,
+        tablename=ACCOUNTING_TABLE,
+        autocommit=True,
+        timeout=JOBS_DB_TIMEOUT,
+    ) as table:
+        # Keyed by job, so a job that's finalized again (e.g., harvested by
+        # a later run) isn't counted twice
+        table[f"{name}|{job_id}"] = record
+        keys = sorted(
+            (
+                (value["finished_at"], key)
+                for key, value in table.items()
+                if value.get("stage") == stage
+            ),
+        )
+        for _, key in keys[:-ACCOUNTING_HISTORY_LENGTH]:
+            del table[key]
+
+
+def _load_accounting(stage: str | None = None) -> list[dict]:
+    """Return the recorded jobs of a stage, or of all stages, oldest
+    first.
+    """
+    if not os.path.isfile(JOBS_DB_PATH):
+        return []
+    with SqliteDict(
+        JOBS_DB_PATH, tablename=ACCOUNTING_TABLE, timeout=JOBS_DB_TIMEOUT
+    ) as table:
+        records = [
+            value
+            for value in table.values()
+            if stage is None or value.get("stage") == stage
+        ]
+    return sorted(records, key=lambda r: r["finished_at"])
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    # Nearest rank, so the result is always a value that was observed
+    ordered = sorted(values)
+    rank = max(int(-(-percentile * len(ordered) // 100)), 1)
+    return ordered[rank - 1]
+
+
+def _suggest_resources(records: list[dict]) -> dict | None:
+    """Suggest the time (in seconds), memory (in bytes), and CPUs for a
+    stage's jobs from what its recent successful jobs used.
+
+    Returns ``None`` if there are fewer than ``AUTO_SIZE_MIN_JOBS`` to go by.
+    Only what was measured is suggested. CPUs are only suggested when jobs
+    used fewer than they were given, since a job can't use more.
+    """
+    import math
+
+    ok = [r for r in records if r.get("exit_code") == 0]
+    if len(ok) < AUTO_SIZE_MIN_JOBS:
+        return None
+    scale = 1 + AUTO_SIZE_MARGIN
+    suggestion: dict[str, Any] = {"jobs": len(ok)}
+    elapsed = [r["elapsed"] for r in ok if r.get("elapsed") is not None]
+    if elapsed:
+        seconds = _percentile(elapsed, AUTO_SIZE_PERCENTILE) * scale
+        suggestion["time"] = max(math.ceil(seconds / 60), 1) * 60
+    rss = [r["max_rss"] for r in ok if r.get("max_rss")]
+    if rss:
+        mib = _percentile(rss, AUTO_SIZE_PERCENTILE) * scale / 1024**2
+        suggestion["memory"] = max(math.ceil(mib), 1) * 1024**2
+    used_cpus = [
+        r["cpu_time"] / r["elapsed"]
+        for r in ok
+        if r.get("cpu_time") is not None and r.get("elapsed")
+    ]
+    allocated = [r["cpus"] for r in ok if r.get("cpus")]
+    if used_cpus and allocated:
+        cpus = math.ceil(_percentile(used_cpus, AUTO_SIZE_PERCENTILE) * scale)
+        if cpus < max(allocated):
+            suggestion["cpus"] = max(cpus, 1)
+    return suggestion
+
+
+def _format_walltime(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def _auto_size_options(
+    kind: str, suggestion: dict, options: list[str]
+) -> list[str]:
+    """Return the submit options that request the suggested resources.
+
+    These go after any configured options, so they take precedence. CPUs
+    are only set for SLURM jobs that don't set a number of tasks, since the
+    way to request them varies between PBS variants, and a job with several
+    tasks gets CPUs per task.
+    """
+    auto = []
+    if kind == "slurm":
+        if "time" in suggestion:
+            auto.append(f"--time={int(suggestion['time'] // 60)}")
+        if "memory" in suggestion:
+            auto.append(f"--mem={suggestion['memory'] // 1024**2}M")
+        has_tasks = any(opt.startswith(("--ntasks", "-n")) for opt in options)
+        if "cpus" in suggestion and not has_tasks:
+            auto.append(f"--cpus-per-task={suggestion['cpus']}")
+    else:
+        if "time" in suggestion:
+            auto += ["-l", f"walltime={_format_walltime(suggestion['time'])}"]
+        if "memory" in suggestion:
+            auto += ["-l", f"mem={suggestion['memory'] // 1024**2}mb"]
+    return auto
+
+
 def _mock_enabled() -> bool:
     """Whether scheduler commands should run jobs locally.
 
@@ -468,21 +773,24 @@ def _active_job_ids(kind: str, job_ids: list[str]) -> set[str]:
         # Query our own jobs rather than passing `--jobs <ids>`: squeue errors
         # out when any listed id is unknown, and ids do go unknown once the
         # scheduler purges a finished job, which is the common case here.
+        # `-r` lists each task of a job array on its own line, so a pending
+        # array shows as `123_0`, `123_1`, ... rather than `123_[0-9]`.
         p = subprocess.run(
-            ["squeue", "--me", "-h", "-o", "%i"],
+            ["squeue", "--me", "-h", "-r", "-o", "%i"],
             capture_output=True,
             text=True,
             check=False,
         )
         if p.returncode == 0:
             wanted = set(job_ids)
-            # Array and step ids appear as `123_4` and `123.batch`; both
-            # belong to the job we recorded as `123`.
-            active = {
-                line.strip().split("_")[0].split(".")[0]
-                for line in p.stdout.splitlines()
-                if line.strip()
-            }
+            # Array task and step ids appear as `123_4` and `123.batch`. A
+            # task we submitted as part of an array is recorded as `123_4`,
+            # and a job submitted on its own as `123`.
+            active = set()
+            for line in p.stdout.splitlines():
+                job_id = line.strip().split(".")[0]
+                if job_id:
+                    active |= {job_id, job_id.split("_")[0]}
             return wanted & active
         # squeue failed---fall through and ask about each job individually
         # rather than reporting an empty queue we have not confirmed.
@@ -704,8 +1012,30 @@ def _wait_for_output_file(log_path: str, timeout: float = 120.0) -> None:
         time.sleep(1)
 
 
+def _record_finished(
+    name: str, job_id: str, exit_code: int | None, kind: str | None
+) -> None:
+    """Record a finished job's exit code, if known, and, if ``kind`` is
+    given, what it used.
+    """
+    if exit_code is not None:
+        _record_job_result(name, exit_code)
+    if kind is not None:
+        # Accounting is a nicety, so it must never be why a job fails
+        try:
+            usage = _job_accounting(kind, job_id, name)
+            if usage is not None:
+                _record_accounting(name, job_id, kind, exit_code, usage)
+        except Exception as e:
+            warn(f"Could not record resource use for job '{name}': {e}")
+
+
 def _finalize_job(
-    name: str, job_id: str, exit_code: int | None, log_path: str
+    name: str,
+    job_id: str,
+    exit_code: int | None,
+    log_path: str,
+    kind: str | None = None,
 ) -> None:
     """Fail the command if the finished job did not succeed.
 
@@ -717,13 +1047,15 @@ def _finalize_job(
     scheduler never gave us a status) can't be judged, so we warn and let the
     stage's declared outputs be the arbiter; a definite code is persisted so a
     later run reuses it instead of re-polling a possibly-purged record.
+
+    If ``kind`` is given, what the job used is also recorded from the
+    scheduler's accounting, for auto-sizing later jobs of the stage.
     """
     # Persist the verdict the instant we have it, before the (potentially long)
     # wait below: the exit code doesn't depend on the log file, and recording
     # it first means a disconnect mid-wait can't lose the outcome we already
     # observed.
-    if exit_code is not None:
-        _record_job_result(name, exit_code)
+    _record_finished(name, job_id, exit_code, kind)
     # Wait for the job's `-o` log---this stage's declared DVC output---to be
     # staged back before we read from or point at it.
     if not _mock_enabled():
@@ -741,6 +1073,110 @@ def _finalize_job(
         )
 
 
+def _get_scheduler_env(ck_info: dict, environment: str) -> dict:
+    """Return a scheduler environment's config, failing if it isn't one."""
+    if environment == "_system":
+        raise_error(
+            "Scheduler batch submission requires a scheduler environment; "
+            "got '_system'"
+        )
+    env = ck_info.get("environments", {}).get(environment, {})
+    kind = env.get("kind")
+    if kind not in SCHEDULER_KINDS:
+        raise_error(
+            f"Environment '{environment}' is not a scheduler environment "
+            f"(expected one of {', '.join(SCHEDULER_KINDS)}, got "
+            f"'{kind}')"
+        )
+    return env
+
+
+def _apply_env_defaults(
+    env: dict,
+    options: list[str],
+    setup_cmds: list[str],
+    env_default_options: str,
+    env_default_setup: str,
+) -> tuple[list[str], list[str]]:
+    """Apply an environment's default options and setup commands per
+    mode, returning the options and setup commands to submit with.
+    """
+    env_setup_cmds = env.get("default_setup", []) or []
+    if env_default_setup == "merge" and env_setup_cmds:
+        setup_cmds = [s for s in [*env_setup_cmds, *setup_cmds] if s.strip()]
+    elif env_default_setup == "replace" and not setup_cmds:
+        setup_cmds = [s for s in env_setup_cmds if s.strip()]
+    env_default_opts = env.get("default_options", []) or []
+    if env_default_options == "merge" and env_default_opts:
+        options = [opt for opt in [*env_default_opts, *options] if opt.strip()]
+    elif env_default_options == "replace" and not options:
+        options = [opt for opt in env_default_opts if opt.strip()]
+    return options, setup_cmds
+
+
+def _job_unchanged(
+    job_info: dict,
+    target: str,
+    args: list[str],
+    setup_cmds: list[str],
+    dep_md5s: dict[str, str],
+) -> bool:
+    """Return whether a recorded job runs the same command on the same
+    dependencies as would be submitted now.
+    """
+    job_dep_md5s = job_info.get("dep_md5s", {})
+    deps_unchanged = set(job_info.get("deps", [])) == set(dep_md5s) and all(
+        md5 == job_dep_md5s.get(dep) for dep, md5 in dep_md5s.items()
+    )
+    return (
+        deps_unchanged
+        and job_info.get("target") == target
+        and job_info.get("args", []) == args
+        and job_info.get("setup", []) == setup_cmds
+    )
+
+
+def _delete_outs(outs: list[str]) -> None:
+    """Delete a job's non-persistent outputs before it's submitted."""
+    for out in outs:
+        if os.path.exists(out):
+            typer.echo(f"Deleting output path '{out}'")
+            try:
+                if os.path.isfile(out):
+                    os.remove(out)
+                else:
+                    shutil.rmtree(out)
+            except Exception as e:
+                raise_error(f"Error deleting '{out}': {e}")
+
+
+def _get_auto_size_options(
+    kind: str, name: str, options: list[str]
+) -> list[str]:
+    stage = _stage_name(name)
+    records = _load_accounting(stage)
+    if records and records[-1].get("exit_code") != 0:
+        warn(
+            f"The last job of stage '{stage}' failed, so it's not "
+            "auto-sized; using the configured resources"
+        )
+        return []
+    suggestion = _suggest_resources(records)
+    if suggestion is None:
+        typer.echo(
+            f"Not auto-sizing stage '{stage}' until it has "
+            f"{AUTO_SIZE_MIN_JOBS} successful jobs on record"
+        )
+        return []
+    auto = _auto_size_options(kind, suggestion, options)
+    if auto:
+        typer.echo(
+            f"Auto-sizing from {suggestion['jobs']} previous jobs: "
+            + " ".join(auto)
+        )
+    return auto
+
+
 @scheduler_app.command(name="batch")
 def run_batch(
     name: Annotated[
@@ -851,6 +1287,17 @@ def run_batch(
             ),
         ),
     ] = "replace",
+    auto_size: Annotated[
+        bool,
+        typer.Option(
+            "--auto-size",
+            help=(
+                "Request the time, memory, and CPUs that this stage's recent "
+                "jobs used, plus a margin, instead of what the options "
+                "request."
+            ),
+        ),
+    ] = False,
 ) -> None:
     """Submit a batch job through the scheduler associated with the env.
 
@@ -863,6 +1310,12 @@ def run_batch(
     this project has fewer than that many jobs queued or running, so an
     iterated stage does not put all of its jobs into a shared cluster's queue
     at once.
+
+    With ``--auto-size``, once the stage has enough successful jobs on
+    record, the job requests about what they used rather than what the
+    options ask for, so it isn't held in the queue for resources it won't
+    use. If the stage's last job failed, e.g., by running out of time or
+    memory, the options are used as given.
     """
     if args is None:
         args = []
@@ -877,20 +1330,9 @@ def run_batch(
             f"Invalid --env-default-setup value '{env_default_setup}'; "
             f"expected one of {', '.join(valid_modes)}"
         )
-    if environment == "_system":
-        raise_error(
-            "Scheduler batch submission requires a scheduler environment; "
-            "got '_system'"
-        )
     ck_info = calkit.load_calkit_info()
-    env = ck_info.get("environments", {}).get(environment, {})
-    kind = env.get("kind")
-    if kind not in SCHEDULER_KINDS:
-        raise_error(
-            f"Environment '{environment}' is not a scheduler environment "
-            f"(expected one of {', '.join(SCHEDULER_KINDS)}, got "
-            f"'{kind}')"
-        )
+    env = _get_scheduler_env(ck_info, environment)
+    kind = env["kind"]
     if log_path is None:
         log_path = os.path.join(LOGS_DIR, f"{name}.out")
     if is_command is None:
@@ -926,17 +1368,15 @@ def run_batch(
         except (ValueError, subprocess.CalledProcessError) as e:
             raise_error(str(e))
         return
-    # Apply env defaults per mode
-    env_setup_cmds = env.get("default_setup", []) or []
-    if env_default_setup == "merge" and env_setup_cmds:
-        setup_cmds = [s for s in [*env_setup_cmds, *setup_cmds] if s.strip()]
-    elif env_default_setup == "replace" and not setup_cmds:
-        setup_cmds = [s for s in env_setup_cmds if s.strip()]
-    env_default_opts = env.get("default_options", []) or []
-    if env_default_options == "merge" and env_default_opts:
-        options = [opt for opt in [*env_default_opts, *options] if opt.strip()]
-    elif env_default_options == "replace" and not options:
-        options = [opt for opt in env_default_opts if opt.strip()]
+    options, setup_cmds = _apply_env_defaults(
+        env,
+        options=options,
+        setup_cmds=setup_cmds,
+        env_default_options=env_default_options,
+        env_default_setup=env_default_setup,
+    )
+    if auto_size:
+        options = options + _get_auto_size_options(kind, name, options)
     # Build the submit command (kind-specific), or the local job command when
     # the scheduler is mocked.
     if _mock_enabled():
@@ -1051,7 +1491,9 @@ def run_batch(
             if should_wait:
                 typer.echo("Waiting for job to finish")
                 exit_code = _wait_until_done(prev_kind, job_id, name)
-                _finalize_job(name, job_id, exit_code, log_path)
+                _finalize_job(
+                    name, job_id, exit_code, log_path, kind=prev_kind
+                )
                 raise typer.Exit(0)
         elif not os.environ.get("CALKIT_FORCE"):
             # The job has left the queue (e.g. it finished while the master
@@ -1068,34 +1510,20 @@ def run_batch(
             # since its declared outputs exist on disk but may be partial or
             # wrong. Rerunning is the safe choice. Under --force (CALKIT_FORCE)
             # we skip this and always resubmit.
-            job_dep_md5s = job_info.get("dep_md5s", {})
-            deps_unchanged = set(job_deps) == set(deps) and all(
-                current_dep_md5s.get(dep) == job_dep_md5s.get(dep)
-                for dep in deps
-            )
-            command_unchanged = (
-                job_target == target
-                and job_args == args
-                and job_setup == setup_cmds
+            unchanged = _job_unchanged(
+                job_info, target, args, setup_cmds, current_dep_md5s
             )
-            if deps_unchanged and command_unchanged and prev_exit_code == 0:
+            if unchanged and prev_exit_code == 0:
                 typer.echo(
                     f"Job '{name}' already left the queue; using its result"
                 )
-                _finalize_job(name, job_id, prev_exit_code, log_path)
+                _finalize_job(
+                    name, job_id, prev_exit_code, log_path, kind=prev_kind
+                )
                 raise typer.Exit(0)
     # Job is not running or queued, so we can submit. First, delete any
     # non-persistent outputs.
-    for out in outs:
-        if os.path.exists(out):
-            typer.echo(f"Deleting output path '{out}'")
-            try:
-                if os.path.isfile(out):
-                    os.remove(out)
-                else:
-                    shutil.rmtree(out)
-            except Exception as e:
-                raise_error(f"Error deleting '{out}': {e}")
+    _delete_outs(outs)
     # Wait for room in the queue before submitting, if the environment caps
     # how many of this project's jobs may be queued at once. This is done
     # after deleting outputs (which can be slow) so the slot is held only for
@@ -1161,7 +1589,7 @@ def run_batch(
         raise typer.Exit(130)
     typer.echo("Waiting for job to finish")
     exit_code = _wait_until_done(kind, job_id, name)
-    _finalize_job(name, job_id, exit_code, log_path)
+    _finalize_job(name, job_id, exit_code, log_path, kind=kind)
 
 
 def _detect_interpreter(target: str) -> list[str]:
@@ -1267,6 +1695,401 @@ def _build_pbs_submit(
     return cmd, job_script
 
 
+def _array_task_id(kind: str, array_id: str, index: int) -> str:
+    """Return the ID of one task of a job array.
+
+    SLURM addresses a task as ``<array>_<index>``, and PBS Pro as the
+    array's ID with the index in its ``[]``, e.g., ``123[4].server``.
+    """
+    if kind == "pbs" and not _mock_enabled():
+        return array_id.replace("[]", f"[{index}]", 1)
+    return f"{array_id}_{index}"
+
+
+def _build_array_script(kind: str, jobs: list[dict]) -> str:
+    """Build the script for a job array, each task of which runs the job
+    at its index, writing to that job's log.
+    """
+    lines = ["#!/bin/bash"]
+    if kind == "pbs":
+        # PBS jobs start in $HOME; see _build_pbs_submit
+        lines.append('cd "$PBS_O_WORKDIR" || exit 1')
+    lines.append(f'case "${ARRAY_INDEX_ENV_VARS[kind]}" in')
+    for index, job in enumerate(jobs):
+        lines += [
+            f"    {index})",
+            f"        exec > {shlex.quote(job['log_path'])} 2>&1",
+            f"        {job['command']}",
+            "        ;;",
+        ]
+    lines += [
+        "    *)",
+        '        echo "No job for array index" >&2',
+        "        exit 1",
+        "        ;;",
+        "esac",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _build_slurm_array_submit(
+    name: str,
+    size: int,
+    options: list[str],
+    max_jobs: int | None,
+) -> list[str]:
+    array = f"0-{size - 1}"
+    if max_jobs is not None:
+        # Run at most this many tasks at once
+        array += f"%{max_jobs}"
+    # With no script argument, sbatch reads the script from stdin
+    return [
+        "sbatch",
+        "--parsable",
+        "--job-name",
+        name,
+        f"--array={array}",
+        "-o",
+        os.path.join(ARRAY_LOGS_DIR, f"{name}-%A_%a.out"),
+    ] + list(options)
+
+
+def _build_pbs_array_submit(
+    name: str,
+    size: int,
+    options: list[str],
+    max_jobs: int | None,
+) -> list[str]:
+    pbs_name = _sanitize_pbs_job_name(name)
+    cmd = [
+        "qsub",
+        "-N",
+        pbs_name,
+        "-J",
+        f"0-{size - 1}",
+        "-j",
+        "oe",
+        "-o",
+        os.path.join(ARRAY_LOGS_DIR, f"{pbs_name}.^array_index^.out"),
+        "-V",
+    ]
+    if max_jobs is not None:
+        cmd += ["-W", f"max_run_subjobs={max_jobs}"]
+    return cmd + list(options) + ["-"]
+
+
+def _parse_batch_command(command: str) -> dict | None:
+    """Parse a ``calkit scheduler batch`` command into the parameters of
+    ``run_batch``, or return ``None`` if it's not one.
+    """
+    import click
+
+    tokens = shlex.split(command)
+    if (
+        tokens[:1] != ["calkit"]
+        or tokens[1:2] not in (["scheduler"], ["sch"])
+        or tokens[2:3] != ["batch"]
+    ):
+        return None
+    group = typer.main.get_command(scheduler_app)
+    assert isinstance(group, click.Group)
+    batch = group.commands["batch"]
+    try:
+        ctx = batch.make_context("batch", tokens[3:])
+    except click.ClickException:
+        # Left for the command itself to report
+        return None
+    params = dict(ctx.params)
+    for key in ["args", "deps", "outs", "options", "setup_cmds"]:
+        params[key] = list(params.get(key) or [])
+    return params
+
+
+def _prepare_array_job(
+    ck_info: dict, target_name: str, command: str, auto_options: dict
+) -> dict | None:
+    """Resolve a stage item's batch command into the job to run in an array,
+    or ``None`` if it can't go in one.
+
+    ``auto_options`` caches the options to auto-size each stage with, so
+    they're worked out once per stage rather than once per item.
+    """
+    params = _parse_batch_command(command)
+    if params is None:
+        return None
+    name = params["name"]
+    environment = params["environment"]
+    env = _get_scheduler_env(ck_info, environment)
+    kind = env["kind"]
+    # A remote cluster's jobs are submitted from a workspace there, one
+    # batch command at a time
+    if not calkit.environments.host_is_local(env.get("host", "localhost")):
+        return None
+    options, setup_cmds = _apply_env_defaults(
+        env,
+        options=params["options"],
+        setup_cmds=params["setup_cmds"],
+        env_default_options=params["env_default_options"],
+        env_default_setup=params["env_default_setup"],
+    )
+    if params["auto_size"]:
+        key = (kind, _stage_name(name), tuple(options))
+        if key not in auto_options:
+            auto_options[key] = _get_auto_size_options(kind, name, options)
+        options = options + auto_options[key]
+    target = params["target"]
+    args = params["args"]
+    is_command = params["is_command"]
+    if is_command is None:
+        is_command = not os.path.isfile(target)
+    deps = params["deps"]
+    if not is_command and target not in deps:
+        deps = [target] + deps
+    dep_md5s = {}
+    for dep in deps:
+        if not os.path.exists(dep):
+            raise_error(f"Dependency path '{dep}' does not exist.")
+        dep_md5s[dep] = calkit.get_md5(dep)
+    return {
+        "target_name": target_name,
+        "name": name,
+        "kind": kind,
+        "environment": environment,
+        "max_jobs": env.get("max_concurrent_jobs"),
+        "options": options,
+        "target": target,
+        "args": args,
+        "setup": setup_cmds,
+        "deps": deps,
+        "dep_md5s": dep_md5s,
+        "outs": params["outs"],
+        "log_path": params["log_path"]
+        or os.path.join(LOGS_DIR, f"{name}.out"),
+        "command": _build_job_command(
+            target=target,
+            args=args,
+            setup_cmds=setup_cmds,
+            is_command=is_command,
+        ),
+    }
+
+
+def _active_array_tasks(
+    kind: str, array_id: str, task_ids: list[str]
+) -> set[str]:
+    """Return which tasks of a job array are still queued or running."""
+    if kind == "pbs" and not _mock_enabled():
+        # PBS would be asked about each task, so ask about the array instead,
+        # which is active until its last task finishes
+        return set(task_ids) if _is_active(kind, array_id) else set()
+    return _active_job_ids(kind, task_ids)
+
+
+def _finished_exit_code(kind: str, job_id: str) -> int | None:
+    """Return the exit code of a job known to have left the queue."""
+    if _mock_enabled():
+        return _mock_exit_code(job_id)
+    if kind == "slurm":
+        return _slurm_exit_code(job_id)
+    return _poll_job(kind, job_id)[1]
+
+
+def _submit_array(array_name: str, jobs: list[dict]) -> tuple[str, list[str]]:
+    """Submit jobs as one job array, record each as its own job, and return
+    the array's ID and its tasks' IDs.
+    """
+    first = jobs[0]
+    kind = first["kind"]
+    environment = first["environment"]
+    for job in jobs:
+        _delete_outs(job["outs"])
+        logs_dir = os.path.dirname(job["log_path"])
+        if logs_dir:
+            os.makedirs(logs_dir, exist_ok=True)
+    os.makedirs(ARRAY_LOGS_DIR, exist_ok=True)
+    max_jobs = _parse_max_concurrent_jobs(environment, first["max_jobs"])
+    interrupted: list[bool] = []
+    # As in run_batch, don't let Ctrl+C land between submitting the array and
+    # recording its jobs
+    prev_sigint = signal.signal(
+        signal.SIGINT, lambda *_: interrupted.append(True)
+    )
+    try:
+        pids: list[int | None] = [None] * len(jobs)
+        if _mock_enabled():
+            # Mock arrays run each task as its own local job
+            array_id = uuid.uuid4().hex[:12]
+            task_ids = [
+                _array_task_id(kind, array_id, index)
+                for index in range(len(jobs))
+            ]
+            for index, job in enumerate(jobs):
+                pids[index] = _mock_submit(
+                    job_id=task_ids[index],
+                    job_command=job["command"],
+                    log_path=job["log_path"],
+                )
+        else:
+            if kind == "slurm":
+                submit_cmd = _build_slurm_array_submit(
+                    array_name, len(jobs), first["options"], max_jobs
+                )
+            else:
+                submit_cmd = _build_pbs_array_submit(
+                    array_name, len(jobs), first["options"], max_jobs
+                )
+            p = subprocess.run(
+                submit_cmd,
+                input=_build_array_script(kind, jobs),
+                capture_output=True,
+                check=False,
+                text=True,
+                start_new_session=True,
+            )
+            if p.returncode != 0:
+                raise_error(f"Failed to submit job array: {p.stderr}")
+            # On a federated SLURM cluster, --parsable prints `id;cluster`
+            array_id = p.stdout.strip().split(";")[0]
+            task_ids = [
+                _array_task_id(kind, array_id, index)
+                for index in range(len(jobs))
+            ]
+        typer.echo(
+            f"Submitted {len(jobs)} jobs as job array with ID: {array_id}"
+        )
+        submitted_at = calkit.utcnow().isoformat()
+        for index, job in enumerate(jobs):
+            new_job = {
+                "kind": kind,
+                "environment": environment,
+                "job_id": task_ids[index],
+                "array_id": array_id,
+                "deps": job["deps"],
+                "target": job["target"],
+                "args": job["args"],
+                "setup": job["setup"],
+                "dep_md5s": job["dep_md5s"],
+                "submitted_at": submitted_at,
+            }
+            if pids[index] is not None:
+                new_job["pid"] = pids[index]
+            _record_job(job["name"], new_job)
+    finally:
+        signal.signal(signal.SIGINT, prev_sigint)
+    if interrupted:
+        typer.echo(
+            f"Interrupted after submitting job array {array_id}; it will "
+            "keep running. Resume with `calkit run`."
+        )
+        raise typer.Exit(130)
+    return array_id, task_ids
+
+
+def run_job_arrays(commands: dict[str, str]) -> dict[str, int | None]:
+    """Submit the items of an iterated stage as job arrays and wait for
+    them to finish.
+
+    ``commands`` maps each item's DVC target to its ``calkit scheduler
+    batch`` command. Items with the same environment and options are
+    submitted in one call, as a job array, rather than one by one. Each task
+    is recorded as its item's job, with its exit code, so the item's own
+    batch command finds the job finished and reuses its result.
+
+    Returns the exit code (``None`` if unknown) of each item submitted, by
+    target. Items that aren't---ones whose job is already queued or has a
+    result to reuse, ones on a remote cluster, and any that would be alone
+    in their array---are left to their own batch command.
+    """
+    ck_info = calkit.load_calkit_info()
+    auto_options: dict = {}
+    candidates = []
+    for target_name, command in commands.items():
+        job = _prepare_array_job(ck_info, target_name, command, auto_options)
+        if job is not None:
+            candidates.append(job)
+    # Leave out jobs that the batch command would wait for or reuse
+    existing = _load_jobs()
+    ids_by_kind: dict[str, list[str]] = {}
+    for job in candidates:
+        info = existing.get(job["name"])
+        if info is not None:
+            ids_by_kind.setdefault(info.get("kind", job["kind"]), []).append(
+                info["job_id"]
+            )
+    active = set()
+    for kind, job_ids in ids_by_kind.items():
+        active |= _active_job_ids(kind, job_ids)
+    groups: dict[tuple, list[dict]] = {}
+    for job in candidates:
+        info = existing.get(job["name"])
+        if info is not None and (
+            info["job_id"] in active
+            or (
+                info.get("exit_code") == 0
+                and _job_unchanged(
+                    info,
+                    job["target"],
+                    job["args"],
+                    job["setup"],
+                    job["dep_md5s"],
+                )
+            )
+        ):
+            continue
+        key = (job["environment"], tuple(job["options"]))
+        groups.setdefault(key, []).append(job)
+    arrays = []
+    for jobs in groups.values():
+        if len(jobs) < 2:
+            continue
+        array_id, task_ids = _submit_array(_stage_name(jobs[0]["name"]), jobs)
+        arrays.append((array_id, list(zip(jobs, task_ids))))
+    if not arrays:
+        return {}
+    typer.echo("Waiting for job arrays to finish")
+    exit_codes: dict[str, int | None] = {}
+    try:
+        while arrays:
+            running = []
+            for array_id, tasks in arrays:
+                kind = tasks[0][0]["kind"]
+                active = _active_array_tasks(
+                    kind, array_id, [task_id for _, task_id in tasks]
+                )
+                for job, task_id in tasks:
+                    if task_id in active:
+                        continue
+                    exit_code = _finished_exit_code(kind, task_id)
+                    _record_finished(job["name"], task_id, exit_code, kind)
+                    exit_codes[job["target_name"]] = exit_code
+                tasks = [task for task in tasks if task[1] in active]
+                if tasks:
+                    running.append((array_id, tasks))
+            arrays = running
+            if arrays:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        typer.echo("Interrupted; canceling job arrays")
+        for array_id, tasks in arrays:
+            kind = tasks[0][0]["kind"]
+            # Mock arrays are separate local jobs, but a real one is canceled
+            # all at once
+            if _mock_enabled():
+                to_cancel = [task_id for _, task_id in tasks]
+            else:
+                to_cancel = [array_id]
+            for job_id in to_cancel:
+                ok, stderr = _cancel(kind, job_id)
+                if not ok:
+                    typer.echo(f"Failed to cancel job {job_id}: {stderr}")
+            # So the next run resubmits them rather than taking the canceled
+            # jobs for successes
+            for job, _ in tasks:
+                _delete_job(job["name"])
+        raise typer.Exit(130)
+    return exit_codes
+
+
 @scheduler_app.command(name="queue|q")
 def get_queue() -> None:
     """List scheduler jobs submitted via Calkit (across SLURM and PBS)."""
@@ -1304,6 +2127,60 @@ def get_queue() -> None:
             )
 
 
+@scheduler_app.command(name="suggest")
+def suggest_resources(
+    stages: Annotated[
+        list[str] | None,
+        typer.Argument(help="Stages to suggest resources for (all if none)."),
+    ] = None,
+) -> None:
+    """Suggest job resources for stages from what their finished jobs used.
+
+    These are what ``--auto-size`` requests, which stages can use by setting
+    ``scheduler.auto_size``.
+    """
+    from calkit.profiling import format_bytes
+
+    records = _load_accounting()
+    by_stage: dict[str, list[dict]] = {}
+    for record in records:
+        if not stages or record["stage"] in stages:
+            by_stage.setdefault(record["stage"], []).append(record)
+    if not by_stage:
+        typer.echo("No finished jobs on record")
+        raise typer.Exit(0)
+    for stage, stage_records in by_stage.items():
+        suggestion = _suggest_resources(stage_records)
+        ok = [r for r in stage_records if r.get("exit_code") == 0]
+        typer.echo(f"{stage}: {len(ok)} successful job(s) on record")
+        if suggestion is None:
+            typer.echo(
+                f"  Need at least {AUTO_SIZE_MIN_JOBS} to suggest resources"
+            )
+            continue
+        last = stage_records[-1]
+        requested = []
+        if last.get("requested_time") is not None:
+            requested.append(_format_walltime(last["requested_time"]))
+        if last.get("requested_memory") is not None:
+            requested.append(format_bytes(last["requested_memory"]))
+        if last.get("cpus") is not None:
+            requested.append(f"{last['cpus']} CPUs")
+        if requested:
+            typer.echo(f"  Requested: {', '.join(requested)}")
+        suggested = []
+        if "time" in suggestion:
+            suggested.append(_format_walltime(suggestion["time"]))
+        if "memory" in suggestion:
+            suggested.append(format_bytes(suggestion["memory"]))
+        if "cpus" in suggestion:
+            suggested.append(f"{suggestion['cpus']} CPUs")
+        typer.echo(f"  Suggested: {', '.join(suggested)}")
+        options = _auto_size_options(last.get("kind", "slurm"), suggestion, [])
+        if options:
+            typer.echo(f"  Options: {' '.join(options)}")
+
+
 @scheduler_app.command(name="cancel")
 def cancel_jobs(
     names: Annotated[
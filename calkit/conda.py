@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import glob
 import json
 import os
 import re
@@ -11,9 +12,12 @@ import sys
 import warnings
 from pathlib import Path
 from typing import cast
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import toml
 from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
 from packaging.version import InvalidVersion, Version
 from pydantic import BaseModel
 
@@ -138,13 +142,164 @@ def _editable_package_name_from_dir(dir_path: str) -> str:
     raise ValueError(f"Could not determine package name from {dir_path}")
 
 
+def _site_packages_dirs(prefix: str) -> list[str]:
+    """Candidate ``site-packages`` directories inside an env prefix."""
+    return glob.glob(
+        os.path.join(glob.escape(prefix), "lib", "python*", "site-packages")
+    ) + glob.glob(os.path.join(glob.escape(prefix), "Lib", "site-packages"))
+
+
+class InstalledDist(BaseModel):
+    """A Python distribution installed in an env prefix."""
+
+    name: str
+    version: str
+    installer: str | None = None
+    direct_url: dict | None = None
+
+    @property
+    def editable(self) -> bool:
+        if self.direct_url is None:
+            return False
+        return bool(self.direct_url.get("dir_info", {}).get("editable"))
+
+    @property
+    def git_url(self) -> str | None:
+        """The ``git+<url>@<commit>`` this was installed from, if any."""
+        if self.direct_url is None:
+            return None
+        vcs_info = self.direct_url.get("vcs_info", {})
+        if vcs_info.get("vcs") != "git":
+            return None
+        return f"git+{self.direct_url['url']}@{vcs_info['commit_id']}"
+
+    def pinned(self) -> str:
+        """Format as a pinned requirement, keeping the URL of git installs."""
+        git_url = self.git_url
+        if git_url is not None and not self.editable:
+            return f"{self.name} @ {git_url}"
+        return f"{self.name}=={self.version}"
+
+    def freeze_line(self) -> str:
+        """Format this distribution like ``pip freeze`` does."""
+        git_url = self.git_url
+        if self.editable:
+            url = self.direct_url["url"]  # type: ignore[index]
+            if git_url is not None:
+                return f"-e {git_url}#egg={self.name}"
+            if url.startswith("file://"):
+                url = url2pathname(urlparse(url).path)
+            return f"-e {url}"
+        if git_url is not None:
+            return f"{self.name} @ {git_url}"
+        if self.direct_url is not None and "url" in self.direct_url:
+            return f"{self.name} @ {self.direct_url['url']}"
+        return f"{self.name}=={self.version}"
+
+
+def list_installed_dists(prefix: str) -> list[InstalledDist] | None:
+    """List the Python distributions installed in an env prefix.
+
+    This reads package metadata straight from the prefix's ``site-packages``
+    rather than running ``pip freeze`` in a subprocess, including any
+    ``direct_url.json`` recorded for VCS, local, and editable installs.
+
+    Returns None if the prefix has no ``site-packages`` directory.
+    """
+    from importlib.metadata import distributions
+
+    sp_dirs = _site_packages_dirs(prefix)
+    if not sp_dirs:
+        return None
+    res = []
+    seen = set()
+    for dist in distributions(path=sp_dirs):
+        name = dist.metadata["Name"]
+        if not name:
+            continue
+        key = canonicalize_name(name)
+        # Like the import system, the first distribution found shadows others
+        if key in seen:
+            continue
+        seen.add(key)
+        installer = dist.read_text("INSTALLER")
+        direct_url_txt = dist.read_text("direct_url.json")
+        direct_url = None
+        if direct_url_txt:
+            try:
+                direct_url = json.loads(direct_url_txt)
+            except json.JSONDecodeError:
+                pass
+        res.append(
+            InstalledDist(
+                name=name,
+                version=dist.version,
+                installer=installer.strip() if installer else None,
+                direct_url=direct_url,
+            )
+        )
+    return sorted(res, key=lambda d: d.name.lower())
+
+
+def list_conda_packages(prefix: str) -> list[str] | None:
+    """List the conda packages installed in an env prefix as ``name=version``.
+
+    Packages are read from the records in the prefix's ``conda-meta``
+    directory rather than by running ``conda env export``.
+
+    Returns None if the prefix has no ``conda-meta`` directory.
+    """
+    meta_dir = os.path.join(prefix, "conda-meta")
+    if not os.path.isdir(meta_dir):
+        return None
+    res = []
+    for fpath in glob.glob(os.path.join(glob.escape(meta_dir), "*.json")):
+        try:
+            with open(fpath) as f:
+                record = json.load(f)
+            res.append(f"{record['name']}={record['version']}")
+        except (OSError, ValueError, KeyError):
+            continue
+    return sorted(res)
+
+
+def export_env_from_prefix(prefix: str) -> dict | None:
+    """Describe a conda env like ``conda env export --no-builds --json``.
+
+    Packages installed by pip rather than conda go in the pip section, with
+    git installs keeping their URL and exact ref, which ``conda env export``
+    drops.
+
+    Returns None if the prefix is not a conda env.
+    """
+    conda_deps = list_conda_packages(prefix)
+    if conda_deps is None:
+        return None
+    pip_deps = []
+    for dist in list_installed_dists(prefix) or []:
+        if dist.installer != "conda":
+            pip_deps.append(dist.pinned())
+    dependencies: list = list(conda_deps)
+    if pip_deps:
+        dependencies.append({"pip": pip_deps})
+    return {
+        "name": os.path.basename(os.path.normpath(prefix)),
+        "prefix": prefix,
+        "dependencies": dependencies,
+    }
+
+
 def _run_pip_freeze(env_prefix: str) -> list[str]:
     """Run pip freeze inside a conda env and return the list of packages.
 
-    Uses the env's pip executable directly (avoids ``conda run``, which can
-    touch the env directory and invalidate the stored mtime check).
+    The packages are read in-process from the env's metadata when possible,
+    falling back to the env's pip executable (avoiding ``conda run``, which
+    can touch the env directory and invalidate the stored mtime check).
     This captures git URLs and exact refs that ``conda env export`` drops.
     """
+    dists = list_installed_dists(env_prefix)
+    if dists is not None:
+        return [dist.freeze_line() for dist in dists]
     if sys.platform == "win32":
         pip_exe = os.path.join(env_prefix, "Scripts", "pip.exe")
     else:
@@ -347,6 +502,21 @@ def _get_pip_dependency_list(
     return []
 
 
+def _export_env_check(env_prefix: str, export_cmd: list[str]) -> dict:
+    """Describe an existing env for the env check file.
+
+    The env is read from its prefix in-process if possible, falling back to
+    running ``conda env export``.
+    """
+    env_check = export_env_from_prefix(env_prefix)
+    if env_check is None:
+        env_check = json.loads(subprocess.check_output(export_cmd).decode())
+    env_check["mtime"] = os.path.getmtime(
+        os.path.normpath(env_check["prefix"])
+    )
+    return env_check
+
+
 class EnvCheckResult(BaseModel):
     env_exists: bool | None = None
     env_needs_export: bool | None = None
@@ -556,18 +726,13 @@ def check_env(
             log_func(f"Env check file at {env_check_fpath} does not exist")
             env_needs_export = True
         if env_needs_export:
-            log_func(f"Exporting existing env to {env_check_fpath}")
-            env_check = json.loads(
-                subprocess.check_output(export_cmd).decode()
-            )
-            env_check["mtime"] = os.path.getmtime(
-                os.path.normpath(env_check["prefix"])
-            )
+            log_func(f"Reading existing env from {env_prefix_path}")
+            env_check = _export_env_check(env_prefix_path, export_cmd)
         # If the spec has git pip deps, enrich the in-memory env_check pip
         # section so that git refs are compared correctly during the dep check
         # rather than falling back to name-only matching.
         if spec_has_git_pip:
-            log_func("Running pip freeze to enrich git dep comparison")
+            log_func("Listing pip packages to enrich git dep comparison")
             try:
                 early_pip_freeze = _run_pip_freeze(env_prefix_path)
             except Exception as e:
@@ -684,7 +849,7 @@ def check_env(
         if early_pip_freeze and not res.env_needs_rebuild:
             pip_freeze = early_pip_freeze
         else:
-            log_func("Running pip freeze to capture git deps")
+            log_func("Listing pip packages to capture git deps")
             try:
                 pip_freeze = _run_pip_freeze(env_prefix_path)
             except Exception as e:
@@ -693,10 +858,7 @@ def check_env(
                 )
     if env_needs_export:
         log_func(f"Exporting existing env to {env_check_fpath}")
-        env_check = json.loads(subprocess.check_output(export_cmd).decode())
-        env_check["mtime"] = os.path.getmtime(
-            os.path.normpath(env_check["prefix"])
-        )
+        env_check = _export_env_check(env_prefix_path, export_cmd)
         if pip_freeze:
             check_pip = _get_pip_dependency_list(env_check["dependencies"])
             enriched = _enrich_pip_deps_from_freeze(check_pip, pip_freeze)
@@ -399,6 +399,10 @@ class Settings(BaseSettings):
     machine_id: str | None = None
     dataframe_engine: Literal["pandas", "polars"] = "pandas"
     run_history_length: int = 10
+    # Use Git's filesystem monitor and untracked cache for the frequent
+    # status checks of the JupyterLab extension and local server. Off by
+    # default, since the monitor is a daemon and isn't supported everywhere
+    fast_git_status: bool = False
     github_token: KeyringOptionalSecret | None = None
     zenodo_token: KeyringOptionalSecret | None = None
     caltechdata_token: KeyringOptionalSecret | None = None
@@ -960,9 +960,7 @@ def read_file(path: str, as_bytes: bool | None = None) -> str | bytes:
                 return content_bytes.decode()
         # If the response has a URL, we can fetch from that directly
         elif (url := resp.get("url")) is not None:
-            import requests
-
-            resp2 = requests.get(url)
+            resp2 = calkit.sessions.get_session().get(url)
             resp2.raise_for_status()
             if as_bytes:
                 return resp2.content
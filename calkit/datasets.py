@@ -4,12 +4,28 @@ from __future__ import annotations
 
 import base64
 import io
-from typing import Literal
+import operator
+from typing import Any, Literal
 
 import calkit
 import calkit.config
 
 DEFAULT_ENGINE = calkit.config.read().dataframe_engine
+# Supported filter operators, with the ``operator`` functions for those that
+# map onto one
+FILTER_OPS = {
+    "==": "eq",
+    "!=": "ne",
+    "<": "lt",
+    "<=": "le",
+    ">": "gt",
+    ">=": "ge",
+    "in": None,
+    "not in": None,
+}
+CSV_CHUNK_ROWS = 100_000
+# Block size for range requests when reading a remote dataset
+READ_BLOCK_SIZE = 1024 * 1024
 
 
 def _get_df_lib(engine: str):
@@ -31,9 +47,115 @@ def list_datasets() -> list[dict]:
     return ck_info.get("datasets", [])
 
 
+def _check_filters(filters: list[tuple[str, str, Any]]) -> None:
+    for filt in filters:
+        if len(filt) != 3 or filt[1] not in FILTER_OPS:
+            raise ValueError(
+                f"Invalid filter {filt!r}; Expected (column, op, value) with "
+                f"op one of {', '.join(FILTER_OPS)}"
+            )
+
+
+def _filter_expr(filters: list[tuple[str, str, Any]]):
+    """Combine filters into a Polars expression."""
+    import polars as pl
+
+    exprs = []
+    for name, op, value in filters:
+        col = pl.col(name)
+        if op == "in":
+            exprs.append(col.is_in(list(value)))
+        elif op == "not in":
+            exprs.append(~col.is_in(list(value)))
+        else:
+            exprs.append(getattr(operator, FILTER_OPS[op])(col, value))
+    return pl.all_horizontal(exprs)
+
+
+def _filter_mask(df, filters: list[tuple[str, str, Any]]):
+    """Combine filters into a boolean mask for a Pandas DataFrame."""
+    mask = None
+    for name, op, value in filters:
+        col = df[name]
+        if op == "in":
+            m = col.isin(list(value))
+        elif op == "not in":
+            m = ~col.isin(list(value))
+        else:
+            m = getattr(operator, FILTER_OPS[op])(col, value)
+        mask = m if mask is None else mask & m
+    return mask
+
+
+def _read_parquet(
+    source,
+    engine: str,
+    columns: list[str] | None,
+    filters: list[tuple[str, str, Any]] | None,
+    lazy: bool,
+):
+    if engine == "polars" and not hasattr(source, "seek"):
+        # Polars pushes the projection and filters down into its own reader
+        lf = _get_df_lib(engine).scan_parquet(source)
+    elif engine == "polars":
+        # Polars would read a file object in full, whereas PyArrow reads only
+        # the footer and the column chunks of the row groups needed
+        import polars as pl
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(source, columns=columns, filters=filters)
+        df = pl.from_arrow(table)
+        return df.lazy() if lazy else df
+    else:
+        return _get_df_lib(engine).read_parquet(
+            source, columns=columns, filters=filters
+        )
+    if filters:
+        lf = lf.filter(_filter_expr(filters))
+    if columns is not None:
+        lf = lf.select(columns)
+    return lf if lazy else lf.collect()
+
+
+def _read_csv(
+    source,
+    engine: str,
+    columns: list[str] | None,
+    filters: list[tuple[str, str, Any]] | None,
+    lazy: bool,
+):
+    if engine == "polars":
+        if hasattr(source, "read") and not isinstance(source, io.BytesIO):
+            # CSV can't be read in parts, so download it before returning
+            source = io.BytesIO(source.read())
+        lf = _get_df_lib(engine).scan_csv(source)
+        if filters:
+            lf = lf.filter(_filter_expr(filters))
+        if columns is not None:
+            lf = lf.select(columns)
+        return lf if lazy else lf.collect()
+    pd = _get_df_lib(engine)
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys(columns + [f[0] for f in filters or []]))
+    if not filters:
+        return pd.read_csv(source, usecols=usecols)[columns or slice(None)]
+    # Filter chunk by chunk, so only the rows kept are held in memory
+    chunks = [
+        chunk[_filter_mask(chunk, filters)]
+        for chunk in pd.read_csv(
+            source, usecols=usecols, chunksize=CSV_CHUNK_ROWS
+        )
+    ]
+    return pd.concat(chunks, ignore_index=True)[columns or slice(None)]
+
+
 def read_dataset(
     path: str,
     engine: Literal["pandas", "polars"] = DEFAULT_ENGINE,
+    columns: list[str] | None = None,
+    filters: list[tuple[str, str, Any]] | None = None,
+    lazy: bool = False,
 ):
     """Read a dataset from a path.
 
@@ -43,14 +165,27 @@ def read_dataset(
 
     When a project is set via the ``CALKIT_PROJECT`` environmental variable,
     we will use the API to fetch the data.
+
+    Only the given ``columns`` are read, and only the rows matching all
+    ``filters``, given as ``(column, op, value)`` tuples, where ``op`` is one
+    of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``in``, or ``not in``.
+    For Parquet, these are applied while reading, so for a remote dataset
+    only the byte ranges needed are downloaded. With ``lazy=True``, which
+    requires the Polars engine, a ``LazyFrame`` is returned.
     """
+    if lazy and engine != "polars":
+        raise ValueError("Lazy reads require the polars engine")
+    if filters:
+        _check_filters(filters)
+    if path.endswith(".csv"):
+        reader = _read_csv
+    elif path.endswith(".parquet"):
+        reader = _read_parquet
+    else:
+        raise ValueError(f"Unsupported dataset format: {path}")
 
-    def load_from_fobj(fobj, path: str):
-        """Read from a filelike object or path."""
-        if path.endswith(".csv"):
-            return _get_df_lib(engine).read_csv(fobj)
-        elif path.endswith(".parquet"):
-            return _get_df_lib(engine).read_parquet(fobj)
+    def load(source):
+        return reader(source, engine, columns, filters or None, lazy)
 
     project, path = calkit.project_and_path_from_path(path)
     if project is not None:
@@ -61,11 +196,15 @@ def read_dataset(
         if (content := resp.get("content")) is not None:
             # Load the content appropriately
             content_bytes = base64.b64decode(content)
-            return load_from_fobj(io.BytesIO(content_bytes), path=path)
-        # If the response has a URL, we can fetch from that directly
+            return load(io.BytesIO(content_bytes))
+        # If the response has a URL, read it with range requests, so only the
+        # parts needed are downloaded
         elif (url := resp.get("url")) is not None:
-            return load_from_fobj(url, path=path)
+            import fsspec
+
+            with fsspec.open(url, "rb", block_size=READ_BLOCK_SIZE) as f:
+                return load(f)
         else:
             raise ValueError("No content or URL returned from API")
     # Project is None, so let's just read a local file
-    return load_from_fobj(path, path)
+    return load(path)
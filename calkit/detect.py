@@ -5,12 +5,16 @@ notebooks, and commands.
 from __future__ import annotations
 
 import ast
+import functools
+import hashlib
 import json
 import os
 import re
 import shlex
 import sys
-from collections.abc import Iterable
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Literal
 
@@ -517,6 +521,21 @@ def detect_shell_command_io(command: str) -> dict[str, list[str]]:
     return {"inputs": inputs, "outputs": outputs}
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_python_code(code: str) -> ast.Module | None:
+    """Parse Python code, memoized on its content.
+
+    The same helper modules and notebook cells come up over and over when
+    detecting I/O across a whole project, so keep recently parsed trees
+    around rather than parsing them again. Returns ``None`` if the code has
+    a syntax error. Callers must not mutate the returned tree.
+    """
+    try:
+        return ast.parse(code)
+    except SyntaxError:
+        return None
+
+
 def _extract_string_from_node(node: ast.AST) -> str | None:
     """Extract a string value from an AST node if it's a constant string."""
     if isinstance(node, ast.Constant) and isinstance(node.value, str):
@@ -781,9 +800,8 @@ def _detect_python_code_io(
         for line in code.split("\n")
     )
 
-    try:
-        tree = ast.parse(code_for_parsing)
-    except SyntaxError:
+    tree = _parse_python_code(code_for_parsing)
+    if tree is None:
         # If the code cannot be parsed, we cannot reliably detect directory
         # changes; keep the current working_dir unchanged.
         return {"inputs": inputs, "outputs": outputs}
@@ -1518,6 +1536,184 @@ def detect_io(stage: dict) -> dict[str, list[str]]:
     return {"inputs": [], "outputs": []}
 
 
+# Detected I/O keyed by stage, working directory, and script content hash,
+# shared by detect_io_cached and detect_io_many for the life of the process,
+# along with the hashes of the local code the script uses. Ordered from least
+# to most recently used, so long-running processes like the JupyterLab server
+# can evict the oldest entries.
+_IO_CACHE: OrderedDict[
+    str, tuple[dict[str, list[str]], dict[str, str | None]]
+] = OrderedDict()
+_IO_CACHE_LOCK = threading.Lock()
+# Least recently used entries beyond this many are evicted
+IO_CACHE_MAX_ENTRIES = 1000
+# Inputs with these extensions are code a script imports, sources, or
+# includes, which detection may read, so they're checked on a cache hit
+_CODE_EXTENSIONS = {
+    ".py",
+    ".r",
+    ".jl",
+    ".m",
+    ".sh",
+    ".bash",
+    ".ipynb",
+    ".tex",
+}
+
+
+def _io_cache_key(stage: dict) -> str:
+    """Build the cache key for a stage's detected I/O.
+
+    Detection resolves paths relative to the current working directory, so
+    that is part of the key along with the stage definition itself and a
+    hash of the script contents, if any.
+    """
+    script_path = (
+        stage.get("script_path")
+        or stage.get("notebook_path")
+        or stage.get("target_path")
+    )
+    content_hash = _file_hash(script_path) if script_path else None
+    key = json.dumps(
+        [os.getcwd(), stage, content_hash], sort_keys=True, default=str
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _file_hash(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _cache_io(key: str, io_info: dict[str, list[str]]) -> None:
+    code_deps = {
+        path: _file_hash(path)
+        for path in io_info.get("inputs", [])
+        if os.path.splitext(path)[1].lower() in _CODE_EXTENSIONS
+    }
+    with _IO_CACHE_LOCK:
+        _IO_CACHE[key] = (io_info, code_deps)
+        _IO_CACHE.move_to_end(key)
+        while len(_IO_CACHE) > IO_CACHE_MAX_ENTRIES:
+            _IO_CACHE.popitem(last=False)
+
+
+def _get_cached_io(key: str) -> dict[str, list[str]] | None:
+    """Get cached I/O, unless the local code the script uses has changed."""
+    with _IO_CACHE_LOCK:
+        entry = _IO_CACHE.get(key)
+    if entry is None:
+        return None
+    io_info, code_deps = entry
+    if any(_file_hash(path) != h for path, h in code_deps.items()):
+        with _IO_CACHE_LOCK:
+            _IO_CACHE.pop(key, None)
+        return None
+    with _IO_CACHE_LOCK:
+        if key in _IO_CACHE:
+            _IO_CACHE.move_to_end(key)
+    return io_info
+
+
+def _copy_io(io_info: dict[str, list[str]]) -> dict[str, list[str]]:
+    return {k: list(v) for k, v in io_info.items()}
+
+
+def clear_io_cache() -> None:
+    """Clear the in-memory caches of parsed code and detected I/O."""
+    with _IO_CACHE_LOCK:
+        _IO_CACHE.clear()
+    _parse_python_code.cache_clear()
+
+
+def detect_io_cached(stage: dict) -> dict[str, list[str]]:
+    """Detect inputs and outputs for a stage, reusing earlier results.
+
+    Results are cached in memory keyed by the stage definition, the current
+    working directory, and the content hash of the stage's script, so
+    editing a script invalidates its entry, as does editing local code it
+    was detected to import, source, or include. Call ``clear_io_cache`` if
+    local code a script uses may have been created since. Only the
+    ``IO_CACHE_MAX_ENTRIES`` most recently used results are kept.
+    """
+    key = _io_cache_key(stage)
+    io_info = _get_cached_io(key)
+    if io_info is None:
+        io_info = detect_io(stage)
+        _cache_io(key, io_info)
+    return _copy_io(io_info)
+
+
+def detect_io_many(
+    stages: list[dict], max_workers: int | None = None
+) -> list[dict[str, list[str]]]:
+    """Detect inputs and outputs for many stages at once.
+
+    Cached results are reused and the remaining stages are analyzed in a
+    process pool, since parsing is CPU-bound. Results are returned in the
+    same order as ``stages``. A stage whose detection fails gets empty
+    inputs and outputs rather than failing the whole batch.
+
+    Parameters
+    ----------
+    stages : list[dict]
+        Stage configuration dictionaries, as passed to ``detect_io``.
+    max_workers : int | None
+        Maximum number of worker processes. Defaults to the number of CPUs.
+        With one worker, or only one stage to analyze, everything runs in
+        the current process.
+
+    Returns
+    -------
+    list[dict[str, list[str]]]
+        Detected I/O for each stage, in order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    keys = [_io_cache_key(stage) for stage in stages]
+    # Only analyze each distinct uncached stage once. Cached results are held
+    # here too, since a large batch may evict them from the cache.
+    found: dict[str, dict[str, list[str]]] = {}
+    todo = {}
+    for key, stage in zip(keys, stages):
+        if key in found or key in todo:
+            continue
+        io_info = _get_cached_io(key)
+        if io_info is None:
+            todo[key] = stage
+        else:
+            found[key] = io_info
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(todo))
+    if max_workers <= 1:
+        results = [_detect_io_or_none(stage) for stage in todo.values()]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_detect_io_or_none, todo.values()))
+    # Failures aren't cached, since they may be transient
+    for key, io_info in zip(todo.keys(), results):
+        if io_info is not None:
+            _cache_io(key, io_info)
+            found[key] = io_info
+    empty: dict[str, list[str]] = {"inputs": [], "outputs": []}
+    return [_copy_io(found.get(key, empty)) for key in keys]
+
+
+def _detect_io_or_none(stage: dict) -> dict[str, list[str]] | None:
+    """Run ``detect_io``, returning ``None`` on failure.
+
+    This is a module-level function so it can be sent to worker processes.
+    """
+    try:
+        return detect_io(stage)
+    except Exception:
+        return None
+
+
 def _is_stdlib_module(module_name: str) -> bool:
     """Check if a module is part of the Python standard library."""
     # Get the base module name (before any dots)
@@ -2324,6 +2520,125 @@ def list_dvc_tracked_files(wdir: str | None = None) -> list[str]:
         return []
 
 
+def iter_dvc_tracked_files(wdir: str | None = None) -> Iterator[str]:
+    """Lazily yield repo-relative paths of files tracked by DVC.
+
+    Like :func:`list_dvc_tracked_files`, but walks the DVC filesystem one
+    directory at a time so huge DVC-tracked trees never need to be held in
+    memory at once. Yields nothing when DVC isn't available or the project
+    isn't a DVC repo.
+    """
+    from calkit.dvc.core import get_dvc_repo
+
+    try:
+        dvc_repo = get_dvc_repo(wdir)
+    except Exception:
+        return
+    with dvc_repo:
+        fs = dvc_repo.dvcfs
+        try:
+            top = fs.info(fs.from_os_path(""))["name"]
+            for root, _, files in fs.walk(top, dvc_only=True, dvcfiles=True):
+                parts = fs.relparts(root, top)
+                if parts == (".",):
+                    parts = ()
+                for name in files:
+                    yield "/".join((*parts, name))
+        except Exception:
+            return
+
+
+def iter_candidate_files(wdir: str | None = None) -> Iterator[str]:
+    """Yield each artifact detection candidate path once.
+
+    These are the files Git does not ignore followed by the files tracked by
+    DVC. Only the (comparatively small) Git listing is kept in memory to
+    avoid yielding a path twice; DVC-tracked files are streamed.
+    """
+    seen = set()
+    for path in list_repo_files(wdir=wdir):
+        if path not in seen:
+            seen.add(path)
+            yield path
+    for path in iter_dvc_tracked_files(wdir=wdir):
+        if path not in seen:
+            yield path
+
+
+def _classify_artifact(
+    rel_path: str, *, ignore: pathspec.PathSpec | None = None
+) -> str | None:
+    """Classify a path as one of the auto-detected artifact kinds.
+
+    This is equivalent to checking :func:`is_figure_path`,
+    :func:`is_dataset_path`, :func:`is_result_path`, and
+    :func:`is_presentation_path` in turn, but computes the path's extension,
+    ancestor directories, and ignore status only once. Returns the plural
+    kind key used by :func:`detect_project_artifacts`, or ``None``.
+    """
+    if ignore is not None and ignore.match_file(rel_path):
+        return None
+    ancestors = _ancestor_dir_names(rel_path)
+    ext = _path_ext(rel_path)
+    if (ext in FIGURE_EXTENSIONS and ancestors & FIGURE_DIRS) or (
+        ext == ".json" and ancestors & (FIGURE_DIRS - DATA_DIRS)
+    ):
+        return "figures"
+    if ext in DATASET_EXTENSIONS and ancestors & DATA_DIRS:
+        return "datasets"
+    if ext in RESULT_EXTENSIONS and ancestors & RESULT_DIRS:
+        return "results"
+    name = rel_path.rsplit("/", 1)[-1].lower()
+    if name in PRESENTATION_NAMES or (
+        ext in PRESENTATION_EXTENSIONS and ancestors & PRESENTATION_DIRS
+    ):
+        return "presentations"
+    return None
+
+
+def classify_artifacts(
+    candidate_paths: Iterable[str],
+    reserved_paths: list[str] | tuple[str, ...] = (),
+    ignore: pathspec.PathSpec | None = None,
+) -> dict[str, list[str]]:
+    """Sort candidate paths into auto-detected artifact kinds in one pass.
+
+    Gives the same result as running :func:`detect_figures`,
+    :func:`detect_datasets`, :func:`detect_results`, and
+    :func:`detect_presentations` separately, but visits each candidate once,
+    so ``candidate_paths`` may be a lazy iterable. Only the matching paths
+    are kept in memory.
+    """
+    reserved = set(reserved_paths)
+    found: dict[str, set[str]] = {
+        "figures": set(),
+        "datasets": set(),
+        "results": set(),
+        "presentations": set(),
+    }
+    for p in candidate_paths:
+        if _is_hidden_path(p):
+            continue
+        # Check the path and its parents against the reserved set rather
+        # than scanning every reserved path for every candidate
+        if reserved:
+            parts = p.split("/")
+            if any(
+                "/".join(parts[:n]) in reserved
+                for n in range(1, len(parts) + 1)
+            ):
+                continue
+        kind = _classify_artifact(p, ignore=ignore)
+        if kind is not None:
+            found[kind].add(p)
+    return {
+        "figures": sorted(found["figures"]),
+        "datasets": _collapse_dataset_folders(sorted(found["datasets"])),
+        "results": sorted(found["results"]),
+        "presentations": sorted(found["presentations"]),
+    }
+
+
 def _reserved_artifact_paths(
     wdir: str | None = None, ck_info: dict | None = None
 ) -> list[str]:
@@ -2362,29 +2677,8 @@ def detect_project_artifacts(
         ck_info = calkit.load_calkit_info(wdir=wdir)
     ignore = load_detection_ignore(wdir=wdir)
     reserved = _reserved_artifact_paths(wdir=wdir, ck_info=ck_info)
-    candidates = list(
-        dict.fromkeys(
-            [*list_repo_files(wdir=wdir), *list_dvc_tracked_files(wdir=wdir)]
-        )
-    )
-    figures = detect_figures(
-        candidates, reserved_paths=reserved, ignore=ignore
-    )
-    datasets = detect_datasets(
-        candidates,
+    return classify_artifacts(
+        iter_candidate_files(wdir=wdir),
         reserved_paths=reserved,
-        figure_paths=figures,
         ignore=ignore,
     )
-    results = detect_results(
-        candidates, reserved_paths=reserved, ignore=ignore
-    )
-    presentations = detect_presentations(
-        candidates, reserved_paths=reserved, ignore=ignore
-    )
-    return {
-        "figures": figures,
-        "datasets": datasets,
-        "results": results,
-        "presentations": presentations,
-    }
@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
+import http.client
+import io
+import json
 import os
 import re
 import shlex
+import socket
+import tarfile
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from urllib.parse import quote, urlencode
 
 from pydantic import BaseModel
 
@@ -468,3 +476,379 @@ def infer_xr_docker_environment(
     if _uses_entrypoint_command_mode(image):
         env["command_mode"] = "entrypoint"
     return env_name, env
+
+
+class DockerAPIError(Exception):
+    """An error returned by the Docker Engine API."""
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """An HTTP connection over a Unix socket."""
+
+    def __init__(self, socket_path: str, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def _image_ref_key(image: str) -> str:
+    """Normalize an image reference so it can be matched to ``RepoTags``."""
+    image = _normalize_docker_image(image)
+    for prefix in ["docker.io/library/", "docker.io/"]:
+        if image.startswith(prefix):
+            return image.removeprefix(prefix)
+    return image
+
+
+def _tar_build_context(
+    context_dir: str, chunk_size: int = 1024 * 1024
+) -> Iterator[bytes]:
+    """Stream a tar archive of a build context in chunks, so the context is
+    never held in memory.
+    """
+    # Only used to describe files as tar members
+    tar = tarfile.open(fileobj=io.BytesIO(), mode="w")
+    for root, dirs, files in os.walk(context_dir):
+        dirs.sort()
+        rel_root = os.path.relpath(root, context_dir)
+        rel_root = "" if rel_root == "." else Path(rel_root).as_posix()
+        for name in sorted(files):
+            fpath = os.path.join(root, name)
+            rel_path = f"{rel_root}/{name}" if rel_root else name
+            info = tar.gettarinfo(fpath, arcname=rel_path)
+            # Sockets and the like can't be archived
+            if info is None:
+                continue
+            yield info.tobuf(tar.format, tar.encoding, tar.errors)
+            if not info.isreg():
+                continue
+            with open(fpath, "rb") as f:
+                while chunk := f.read(chunk_size):
+                    yield chunk
+            if remainder := info.size % tarfile.BLOCKSIZE:
+                yield tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
+    # The end of the archive is marked by two empty blocks
+    yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+
+def can_build_with_api(context_dir: str, dockerfile_fpath: str) -> bool:
+    """Check if an image can be built through the Engine API, whose legacy
+    builder would otherwise diverge from ``docker build``.
+
+    That's not the case if the Dockerfile needs BuildKit, or if the context
+    has a ``.dockerignore``, whose patterns only the CLI applies faithfully.
+    """
+    return not (
+        os.path.exists(os.path.join(context_dir, ".dockerignore"))
+        or needs_buildkit(dockerfile_fpath)
+    )
+
+
+def needs_buildkit(dockerfile_fpath: str) -> bool:
+    """Check if a Dockerfile uses syntax only BuildKit can build."""
+    with open(dockerfile_fpath) as f:
+        txt = f.read()
+    return bool(
+        re.search(r"^\s*#\s*syntax\s*=", txt, flags=re.MULTILINE | re.I)
+        or re.search(r"--mount=|<<-?\s*[\"']?\w+", txt)
+        or re.search(r"--(?:link|chmod|parents)\b", txt)
+    )
+
+
+class DockerEngineClient:
+    """A lightweight client for the Docker Engine API over a Unix socket.
+
+    Talking to the daemon directly avoids starting a ``docker`` CLI process
+    for every call. Image inspections are cached by image ID, which is a
+    digest of the image's content, so a cached inspection can't go stale.
+
+    ``timeout`` applies to each request, except those streaming progress
+    from builds and pulls, which may go quiet for a long time.
+    """
+
+    def __init__(self, socket_path: str, timeout: float | None = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._conn: _UnixHTTPConnection | None = None
+        self._inspect_cache: dict[str, dict] = {}
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        body: bytes | Callable[[], Iterable[bytes]] | None = None,
+        headers: dict[str, str] | None = None,
+        streaming: bool = False,
+    ) -> http.client.HTTPResponse:
+        """Send a request, raising ``DockerAPIError`` if it fails.
+
+        A callable ``body`` is called for each attempt, so an iterable body
+        can be sent again if an idle connection has to be replaced.
+        """
+        timeout = None if streaming else self.timeout
+        if params:
+            path += "?" + urlencode(
+                {k: v for k, v in params.items() if v is not None}
+            )
+        # Reuse the connection for as long as the daemon keeps it alive
+        while True:
+            reused = self._conn is not None
+            if self._conn is None:
+                self._conn = _UnixHTTPConnection(self.socket_path)
+            self._conn.timeout = timeout
+            if self._conn.sock is not None:
+                self._conn.sock.settimeout(timeout)
+            try:
+                self._conn.request(
+                    method,
+                    path,
+                    body=body() if callable(body) else body,
+                    headers=headers or {},
+                )
+                resp = self._conn.getresponse()
+            except (OSError, http.client.HTTPException) as e:
+                self._conn.close()
+                self._conn = None
+                # Only retry if the daemon closed an idle connection
+                if reused and not isinstance(e, TimeoutError):
+                    continue
+                raise DockerAPIError(
+                    f"Failed to communicate with the Docker daemon: {e}"
+                ) from e
+            if resp.status >= 400:
+                data = resp.read()
+                try:
+                    message = json.loads(data).get("message", "")
+                except ValueError:
+                    message = data.decode(errors="replace")
+                raise DockerAPIError(message, status=resp.status)
+            return resp
+
+    def _get_json(self, path: str, params: dict | None = None):
+        return json.loads(self._request("GET", path, params=params).read())
+
+    def _stream(
+        self,
+        resp: http.client.HTTPResponse,
+        on_progress: Callable[[dict], None] | None = None,
+    ) -> list[dict]:
+        """Read a stream of JSON messages, raising on any error."""
+        messages = []
+        try:
+            for line in resp:
+                line = line.strip()
+                if not line:
+                    continue
+                msg = json.loads(line)
+                if "error" in msg:
+                    # Drain the rest so the connection can be reused
+                    resp.read()
+                    raise DockerAPIError(msg["error"])
+                messages.append(msg)
+                if on_progress is not None:
+                    on_progress(msg)
+        except (OSError, http.client.HTTPException) as e:
+            self.close()
+            raise DockerAPIError(
+                f"Lost connection to the Docker daemon: {e}"
+            ) from e
+        return messages
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def ping(self) -> bool:
+        try:
+            return self._request("GET", "/_ping").read() == b"OK"
+        except (OSError, DockerAPIError, http.client.HTTPException):
+            return False
+
+    def list_images(self) -> list[dict]:
+        """List local images with their IDs, tags, and repo digests."""
+        return self._get_json("/images/json", params={"digests": "true"})
+
+    def _inspect_by_id(self, image_id: str) -> dict:
+        if image_id not in self._inspect_cache:
+            self._inspect_cache[image_id] = self._get_json(
+                f"/images/{quote(image_id, safe='')}/json"
+            )
+        return self._inspect_cache[image_id]
+
+    def inspect_images(self, images: list[str]) -> dict[str, dict | None]:
+        """Inspect a batch of images, returning None for any not found.
+
+        The local images are listed in one request to resolve each reference
+        to an image ID, and only IDs that haven't been inspected before are
+        fetched.
+        """
+        ids = {}
+        for summary in self.list_images():
+            for ref in (summary.get("RepoTags") or []) + (
+                summary.get("RepoDigests") or []
+            ):
+                ids[_image_ref_key(ref)] = summary["Id"]
+        res: dict[str, dict | None] = {}
+        for image in images:
+            image_id = ids.get(_image_ref_key(image))
+            if image_id is None and "@" not in image and "/" not in image:
+                # Could be a (short) image ID
+                image_id = next(
+                    (
+                        i
+                        for i in ids.values()
+                        if i.removeprefix("sha256:").startswith(
+                            image.removeprefix("sha256:")
+                        )
+                    ),
+                    None,
+                )
+            if image_id is None:
+                res[image] = None
+                continue
+            try:
+                res[image] = self._inspect_by_id(image_id)
+            except DockerAPIError as e:
+                if e.status != 404:
+                    raise
+                res[image] = None
+        return res
+
+    def inspect_image(self, image: str) -> dict | None:
+        """Inspect an image, returning None if it isn't found locally."""
+        return self.inspect_images([image])[image]
+
+    def build(
+        self,
+        tag: str,
+        context_dir: str = ".",
+        dockerfile: str = "Dockerfile",
+        platform: str | None = None,
+        on_progress: Callable[[dict], None] | None = None,
+    ) -> list[dict]:
+        """Build an image, streaming progress messages to ``on_progress``.
+
+        The whole context is sent, so use ``can_build_with_api`` to check
+        that the build doesn't need the CLI first.
+        """
+        resp = self._request(
+            "POST",
+            "/build",
+            params={"t": tag, "dockerfile": dockerfile, "platform": platform},
+            body=lambda: _tar_build_context(context_dir),
+            headers={"Content-Type": "application/x-tar"},
+            streaming=True,
+        )
+        return self._stream(resp, on_progress=on_progress)
+
+    def pull(
+        self,
+        image: str,
+        platform: str | None = None,
+        on_progress: Callable[[dict], None] | None = None,
+    ) -> list[dict]:
+        """Pull an image by tag or digest."""
+        if "@" in image:
+            name, ref = image.split("@", 1)
+        else:
+            name, _, ref = _normalize_docker_image(image).rpartition(":")
+        resp = self._request(
+            "POST",
+            "/images/create",
+            params={"fromImage": name, "tag": ref, "platform": platform},
+            streaming=True,
+        )
+        return self._stream(resp, on_progress=on_progress)
+
+    def tag(self, image: str, tag: str) -> None:
+        repo, _, tag_name = _normalize_docker_image(tag).rpartition(":")
+        self._request(
+            "POST",
+            f"/images/{quote(image, safe='')}/tag",
+            params={"repo": repo, "tag": tag_name},
+        ).read()
+
+
+def _docker_context_host() -> str | None:
+    """Get the daemon host of the active ``docker context``, as the CLI
+    resolves it.
+
+    Returns an empty string for the default context, and None if the
+    context's endpoint can't be determined.
+    """
+    config_dir = os.environ.get(
+        "DOCKER_CONFIG", os.path.expanduser("~/.docker")
+    )
+    name = os.environ.get("DOCKER_CONTEXT")
+    if not name:
+        try:
+            with open(os.path.join(config_dir, "config.json")) as f:
+                name = json.load(f).get("currentContext")
+        except (OSError, ValueError, AttributeError):
+            name = None
+    if not name or name == "default":
+        return ""
+    # Context metadata is stored under the SHA-256 of the context's name
+    meta_path = os.path.join(
+        config_dir,
+        "contexts",
+        "meta",
+        hashlib.sha256(name.encode()).hexdigest(),
+        "meta.json",
+    )
+    try:
+        with open(meta_path) as f:
+            return json.load(f)["Endpoints"]["docker"]["Host"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _docker_socket_path() -> str | None:
+    """Get the socket of the daemon the ``docker`` CLI talks to.
+
+    Returns None when that isn't a local socket, e.g., a TCP or SSH host, or
+    when it can't be determined, so the CLI is used instead.
+    """
+    docker_host = os.environ.get("DOCKER_HOST") or _docker_context_host()
+    if docker_host is None:
+        return None
+    if docker_host.startswith("unix://"):
+        return docker_host.removeprefix("unix://")
+    if docker_host:
+        # TCP and SSH hosts are left to the CLI
+        return None
+    if os.path.exists("/var/run/docker.sock"):
+        return "/var/run/docker.sock"
+    return None
+
+
+_ENGINE_CLIENTS: dict[str, DockerEngineClient] = {}
+
+
+def get_engine_client() -> DockerEngineClient | None:
+    """Get a Docker Engine API client if the daemon's socket is reachable.
+
+    Returns None when it isn't, e.g., on Windows or with a remote
+    ``DOCKER_HOST`` or ``docker context``, in which case the ``docker`` CLI
+    should be used.
+    """
+    socket_path = _docker_socket_path()
+    if socket_path is None or not hasattr(socket, "AF_UNIX"):
+        return None
+    if socket_path not in _ENGINE_CLIENTS:
+        client = DockerEngineClient(socket_path)
+        if not client.ping():
+            return None
+        _ENGINE_CLIENTS[socket_path] = client
+    return _ENGINE_CLIENTS[socket_path]
@@ -315,6 +315,53 @@ def _calc_dir_sig_shallow(path: str, max_depth: int = 1) -> str:
     return f"{entry_count}-{total_size}-{latest_mtime}"
 
 
+def _list_env_manifest_fpaths(prefix: str) -> list[str]:
+    """Paths of the package manifests that describe an env prefix.
+
+    These are the conda package records in ``conda-meta``, the ``RECORD`` of
+    each installed Python distribution plus any ``.pth`` files (which is how
+    editable installs are registered), and a Julia ``Manifest.toml``. Any
+    real package change adds, removes, or rewrites one of these.
+    """
+    from calkit.conda import _site_packages_dirs
+
+    fpaths = glob.glob(
+        os.path.join(glob.escape(prefix), "conda-meta", "*.json")
+    )
+    for sp_dir in _site_packages_dirs(prefix):
+        sp_dir = glob.escape(sp_dir)
+        fpaths += glob.glob(os.path.join(sp_dir, "*.dist-info", "RECORD"))
+        fpaths += glob.glob(os.path.join(sp_dir, "*.egg-info", "PKG-INFO"))
+        fpaths += glob.glob(os.path.join(sp_dir, "*.pth"))
+    for name in ["Manifest.toml", "JuliaManifest.toml"]:
+        fpath = os.path.join(prefix, name)
+        if os.path.isfile(fpath):
+            fpaths.append(fpath)
+    return sorted(fpaths)
+
+
+def calc_env_prefix_fingerprint(prefix: str) -> str | None:
+    """Fingerprint an environment prefix from its package manifests.
+
+    This stats a few files per installed package rather than hashing the
+    whole prefix, so it's cheap even for large environments, and isn't
+    thrown off by incidental writes like ``.pyc`` files. Returns ``None`` if
+    the prefix has no recognizable package manifests.
+    """
+    fpaths = _list_env_manifest_fpaths(prefix)
+    if not fpaths:
+        return None
+    h = hashlib.md5()
+    for fpath in fpaths:
+        try:
+            st = os.stat(fpath)
+        except OSError:
+            continue
+        rel = Path(os.path.relpath(fpath, prefix)).as_posix()
+        h.update(f"{rel}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
 def calc_julia_depot_sig() -> str | None:
     """Calculate a cheap machine-state signature for Julia depot changes."""
     packages_dir = get_julia_packages_dir()
@@ -843,6 +890,11 @@ def calc_data_for_env(
         if not os.path.exists(path):
             return None
         if os.path.isdir(path):
+            # Environment prefixes are fingerprinted from their package
+            # manifests, which is much cheaper than hashing every file
+            fingerprint = calc_env_prefix_fingerprint(path)
+            if fingerprint is not None:
+                return "manifest-" + fingerprint
             # Avoid deep recursive walks on every cache check. A shallow
             # signature is enough to decide whether to recompute full MD5.
             shallow_sig = _calc_dir_sig_shallow(path, max_depth=2)
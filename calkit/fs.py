@@ -72,21 +72,44 @@ from __future__ import annotations
 import base64
 import io
 import os
+import re
+import threading
 import time
 import xml.etree.ElementTree as ET
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Callable
 from urllib.parse import urlparse
 
 import requests
 from fsspec import AbstractFileSystem
+from fsspec.caching import BaseCache
 from fsspec.callbacks import DEFAULT_CALLBACK
 from fsspec.spec import AbstractBufferedFile
-from fsspec.utils import stringify_path
+from fsspec.utils import other_paths, stringify_path
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import HTTPError, Timeout
 
 import calkit
 
+# Files moved at once by put, get, and copy
+MAX_TRANSFER_WORKERS = 8
+# Paths per request to the batch op endpoint, matching the most the hub
+# accepts
+OP_INFO_BATCH_SIZE = 500
+# Files whose access info is fetched together, just before they're moved, so
+# presigned URLs don't expire while earlier files are still transferring
+TRANSFER_WINDOW_SIZE = MAX_TRANSFER_WORKERS * 4
+# Random-access reads are cached in blocks of this size, shared by all files
+# open on a filesystem
+READ_BLOCK_SIZE = 1024 * 1024
+BLOCK_CACHE_SIZE = 64 * READ_BLOCK_SIZE
+# Sequential reads fetch ahead, doubling up to this much
+MAX_READAHEAD = 16 * READ_BLOCK_SIZE
+# Paths DVC stores objects at, which carry their MD5
+_DVC_MD5_PATH_RE = re.compile(r"(?:^|/)md5/([0-9a-f]{2})/([0-9a-f]{30})$")
+
 
 def register_filesystem():
     """Register the Calkit filesystem with fsspec's registry.
@@ -160,6 +183,12 @@ class CalkitFileSystem(AbstractFileSystem):
       ``hub``, or the ``default_hub`` config value
     - Defaults to calkit.io when unspecified
 
+    Random-access reads, e.g., of Parquet footers or HDF5 chunks, are served
+    from a cache of fixed-size blocks shared by the files open on the
+    filesystem, holding up to ``block_cache_size`` bytes in memory. When
+    ``block_cache_dir`` is set, blocks of objects with a known MD5 are also
+    kept there, so they're reused across processes.
+
     This design allows for:
 
     - Multiple storage backend support without client-side changes
@@ -182,8 +211,15 @@ class CalkitFileSystem(AbstractFileSystem):
     def __init__(self, *args, **kwargs):
         """Initialize the filesystem."""
         super().__init__(*args, **kwargs)
-        self._session = requests.Session()
+        # Shared with other instances, so connections to storage are kept
+        # alive across them; not retried by the session since operations
+        # have their own retry policy
+        self._session = calkit.sessions.get_session("storage", retries=False)
         self._base_url = kwargs.get("endpoint_url")
+        self._block_cache = BlockCache(
+            max_size=kwargs.get("block_cache_size", BLOCK_CACHE_SIZE),
+            cache_dir=kwargs.get("block_cache_dir"),
+        )
 
     @property
     def base_url(self) -> str:
@@ -199,6 +235,7 @@ class CalkitFileSystem(AbstractFileSystem):
             "size": result.get("size", 0),
             "type": result.get("type", "file"),
             "time_modified": result.get("time_modified"),
+            "md5": result.get("md5"),
         }
 
     def _get_fs_op_info(
@@ -240,6 +277,7 @@ class CalkitFileSystem(AbstractFileSystem):
         operation: str,
         include: list[str] | None = None,
         detail: bool = False,
+        content_lengths: dict[str, int] | None = None,
     ) -> dict:
         """Get batch file operation info from the Calkit API."""
         endpoint = f"/projects/{owner}/{project}/fs/ops/batch"
@@ -250,6 +288,8 @@ class CalkitFileSystem(AbstractFileSystem):
         }
         if include:
             request_body["include"] = include
+        if content_lengths is not None:
+            request_body["content_lengths"] = content_lengths
         resp = calkit.hub.post(
             endpoint, json=request_body, base_url=self.base_url
         )
@@ -259,6 +299,132 @@ class CalkitFileSystem(AbstractFileSystem):
             )
         return resp
 
+    def _get_fs_op_info_many(
+        self,
+        paths: list[str],
+        operation: str,
+        content_lengths: list[int] | None = None,
+    ) -> list[dict | None]:
+        """Get operation info for many paths, in batches per project.
+
+        Entries are ``None`` where the API gave no access info, e.g., from an
+        older hub whose batch endpoint only supports ``exists`` and ``info``,
+        so callers can fall back to fetching it for that path alone.
+        """
+        results: list[dict | None] = [None] * len(paths)
+        grouped: dict[tuple[str, str], list[tuple[int, str]]] = {}
+        for idx, path in enumerate(paths):
+            owner, project, file_path = _parse_path(path)
+            grouped.setdefault((owner, project), []).append((idx, file_path))
+        for (owner, project), entries in grouped.items():
+            for start in range(0, len(entries), OP_INFO_BATCH_SIZE):
+                batch = entries[start : start + OP_INFO_BATCH_SIZE]
+                lengths = None
+                if content_lengths is not None:
+                    lengths = {fp: content_lengths[idx] for idx, fp in batch}
+                try:
+                    resp = self._get_fs_op_info_batch(
+                        owner=owner,
+                        project=project,
+                        paths=[fp for _, fp in batch],
+                        operation=operation,
+                        content_lengths=lengths,
+                    )
+                except HTTPError:
+                    return results
+                batch_results = resp.get("results")
+                if not isinstance(batch_results, dict):
+                    continue
+                for idx, file_path in batch:
+                    value = batch_results.get(file_path)
+                    if isinstance(value, dict) and value.get("access"):
+                        results[idx] = {
+                            "backend": resp["backend"],
+                            "access": value["access"],
+                        }
+        return results
+
+    @staticmethod
+    def _run_transfers(
+        jobs: list[Callable[[], None]], callback=DEFAULT_CALLBACK
+    ) -> None:
+        """Run transfer jobs in a bounded thread pool, counting each one done
+        on ``callback``.
+
+        The first failure is raised once running jobs finish, and jobs not
+        yet started are cancelled.
+        """
+        if not jobs:
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_TRANSFER_WORKERS, len(jobs))
+        ) as pool:
+            futures = [pool.submit(job) for job in jobs]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    callback.relative_update(1)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _abort_multipart_upload(self, access: dict) -> None:
+        """Abort a server-initiated multipart upload, best effort."""
+        abort_url = access.get("abort_url")
+        if not abort_url:
+            return
+        try:
+            self._session.delete(abort_url, timeout=30)
+        except Exception:
+            pass
+
+    def _expand_transfer_paths(
+        self,
+        src,
+        dst,
+        src_fs: AbstractFileSystem,
+        dst_isdir: Callable[[str], bool],
+        recursive: bool = False,
+        maxdepth: int | None = None,
+    ) -> tuple[list[str], list[str]]:
+        """Resolve sources and destinations as fsspec's put, get, and copy do.
+
+        Sources are expanded on ``src_fs``, which may be this filesystem or
+        the local one. Sources that are directories are dropped, since only
+        files are transferred.
+        """
+        from glob import has_magic
+
+        from fsspec.implementations.local import trailing_sep
+
+        if isinstance(src, list) and isinstance(dst, list):
+            return src, dst
+        source_is_str = isinstance(src, str)
+        srcs = src_fs.expand_path(src, recursive=recursive, maxdepth=maxdepth)
+        if source_is_str and (not recursive or maxdepth is not None):
+            # Non-recursive glob does not copy directories
+            srcs = [
+                p for p in srcs if not (trailing_sep(p) or src_fs.isdir(p))
+            ]
+        elif recursive:
+            # Object storage has no directories as such, so a path that's the
+            # parent of another listed one is a directory
+            parents = {os.path.dirname(p.rstrip("/")) for p in srcs}
+            srcs = [p for p in srcs if p.rstrip("/") not in parents]
+        if not srcs:
+            return [], []
+        source_is_file = len(srcs) == 1
+        dest_is_dir = isinstance(dst, str) and (
+            trailing_sep(dst) or dst_isdir(dst)
+        )
+        exists = source_is_str and (
+            (has_magic(src) and source_is_file)
+            or (not has_magic(src) and dest_is_dir and not trailing_sep(src))
+        )
+        dsts = other_paths(srcs, dst, exists=exists, flatten=not source_is_str)
+        return srcs, dsts
+
     def _get_info_for_parsed_path(
         self, owner: str, project: str, file_path: str
     ) -> dict[str, Any]:
@@ -304,6 +470,7 @@ class CalkitFileSystem(AbstractFileSystem):
         file_size: int | None = None,
         headers: dict | None = None,
         callback=DEFAULT_CALLBACK,
+        stream: bool = False,
     ) -> requests.Response:
         """Execute a file operation using the provided operation info.
 
@@ -311,7 +478,8 @@ class CalkitFileSystem(AbstractFileSystem):
         operations. When ``file_obj`` is given it must be a seekable binary
         file-like object and ``file_size`` must be set; part/chunk bodies are
         streamed from it instead of being held in memory, which keeps memory
-        bounded for large uploads.
+        bounded for large uploads. With ``stream``, a presigned or plain HTTP
+        request's response body is left unread for the caller to stream.
         """
         if data is not None and file_obj is not None:
             raise ValueError("Provide data or file_obj, not both")
@@ -393,6 +561,7 @@ class CalkitFileSystem(AbstractFileSystem):
                     params=params,
                     data=_prepare_stream(request_headers),
                     timeout=120,
+                    stream=stream,
                 )
             )
             if operation == "put" and payload_size:
@@ -418,6 +587,7 @@ class CalkitFileSystem(AbstractFileSystem):
                     params=params,
                     data=_prepare_stream(request_headers),
                     timeout=120,
+                    stream=stream,
                 )
             )
             if operation == "put" and payload_size:
@@ -456,53 +626,59 @@ class CalkitFileSystem(AbstractFileSystem):
                     "Insufficient part URLs for multipart upload "
                     f"(need {total_parts_needed}, got {len(part_urls)})"
                 )
-            uploaded_parts: list[tuple[int, str]] = []
-            for part_num in range(1, total_parts_needed + 1):
-                start = (part_num - 1) * part_size
-                end = min(start + part_size, total_bytes)
-                if data is not None:
-                    part_data = data[start:end]
-                else:
-                    file_obj.seek(start)
-                    part_data = file_obj.read(end - start)
-                part_url = part_urls[part_num - 1]
-                part_headers = {}
-                if content_type:
-                    part_headers["Content-Type"] = str(content_type)
-                part_resp = _request_with_retry(
-                    lambda: self._session.put(
-                        part_url,
-                        headers=part_headers,
-                        data=part_data,
-                        timeout=120,
+            # Abort on failure so storage isn't left holding the parts
+            try:
+                uploaded_parts: list[tuple[int, str]] = []
+                for part_num in range(1, total_parts_needed + 1):
+                    start = (part_num - 1) * part_size
+                    end = min(start + part_size, total_bytes)
+                    if data is not None:
+                        part_data = data[start:end]
+                    else:
+                        file_obj.seek(start)
+                        part_data = file_obj.read(end - start)
+                    part_url = part_urls[part_num - 1]
+                    part_headers = {}
+                    if content_type:
+                        part_headers["Content-Type"] = str(content_type)
+                    part_resp = _request_with_retry(
+                        lambda: self._session.put(
+                            part_url,
+                            headers=part_headers,
+                            data=part_data,
+                            timeout=120,
+                        )
                     )
+                    part_resp.raise_for_status()
+                    etag = part_resp.headers.get("ETag")
+                    if not etag:
+                        raise ValueError(
+                            "Missing ETag for uploaded multipart part "
+                            f"{part_num}"
+                        )
+                    uploaded_parts.append((part_num, etag.strip()))
+                    callback.relative_update(len(part_data))
+                complete_root = ET.Element("CompleteMultipartUpload")
+                for part_num, etag in uploaded_parts:
+                    part_el = ET.SubElement(complete_root, "Part")
+                    ET.SubElement(part_el, "PartNumber").text = str(part_num)
+                    ET.SubElement(part_el, "ETag").text = etag
+                complete_body = ET.tostring(
+                    complete_root, encoding="utf-8", xml_declaration=True
                 )
-                part_resp.raise_for_status()
-                etag = part_resp.headers.get("ETag")
-                if not etag:
-                    raise ValueError(
-                        f"Missing ETag for uploaded multipart part {part_num}"
+                complete_resp = _request_with_retry(
+                    lambda: self._session.post(
+                        complete_url,
+                        headers={"Content-Type": "application/xml"},
+                        data=complete_body,
+                        timeout=120,
                     )
-                uploaded_parts.append((part_num, etag.strip()))
-                callback.relative_update(len(part_data))
-            complete_root = ET.Element("CompleteMultipartUpload")
-            for part_num, etag in uploaded_parts:
-                part_el = ET.SubElement(complete_root, "Part")
-                ET.SubElement(part_el, "PartNumber").text = str(part_num)
-                ET.SubElement(part_el, "ETag").text = etag
-            complete_body = ET.tostring(
-                complete_root, encoding="utf-8", xml_declaration=True
-            )
-            complete_resp = _request_with_retry(
-                lambda: self._session.post(
-                    complete_url,
-                    headers={"Content-Type": "application/xml"},
-                    data=complete_body,
-                    timeout=120,
                 )
-            )
-            complete_resp.raise_for_status()
-            return complete_resp
+                complete_resp.raise_for_status()
+                return complete_resp
+            except BaseException:
+                self._abort_multipart_upload(access)
+                raise
         elif kind == "presigned-chunked":
             # GCS resumable upload - requires multiple requests
             if data is None and file_obj is None:
@@ -813,7 +989,7 @@ class CalkitFileSystem(AbstractFileSystem):
         return self._get_exists_for_parsed_path(owner, project, file_path)
 
     def exists_many(self, paths: list[str], **kwargs) -> list[bool]:
-        """Check existence for multiple paths in a batch API call."""
+        """Check existence for multiple paths in batched API calls."""
         if not paths:
             return []
         grouped: dict[tuple[str, str], list[tuple[int, str, str]]] = {}
@@ -823,41 +999,45 @@ class CalkitFileSystem(AbstractFileSystem):
                 (idx, path, file_path)
             )
         results: list[bool | None] = [None] * len(paths)
-        for (owner, project), entries in grouped.items():
-            file_paths = [file_path for _, _, file_path in entries]
-            index_by_file_path = {
-                file_path: [idx for idx, _, fp in entries if fp == file_path]
-                for file_path in set([fp for _, _, fp in entries])
-            }
-            try:
-                resp = self._get_fs_op_info_batch(
-                    owner=owner,
-                    project=project,
-                    paths=file_paths,
-                    operation="exists",
-                    include=["exists"],
-                )
-                batch_results = resp.get("results")
-                if isinstance(batch_results, dict):
-                    for file_path, value in batch_results.items():
-                        exists = bool(
-                            value.get("exists", False)
-                            if isinstance(value, dict)
-                            else value
-                        )
-                        for idx in index_by_file_path.get(file_path, []):
-                            results[idx] = exists
-            except Exception:
-                pass
-            # Fall back to single-path exists for any missing results
-            for idx, _, file_path in entries:
-                if results[idx] is None:
-                    try:
-                        results[idx] = self._get_exists_for_parsed_path(
-                            owner, project, file_path
-                        )
-                    except Exception:
-                        results[idx] = False
+        for (owner, project), project_entries in grouped.items():
+            for start in range(0, len(project_entries), OP_INFO_BATCH_SIZE):
+                entries = project_entries[start : start + OP_INFO_BATCH_SIZE]
+                file_paths = [file_path for _, _, file_path in entries]
+                index_by_file_path = {
+                    file_path: [
+                        idx for idx, _, fp in entries if fp == file_path
+                    ]
+                    for file_path in set([fp for _, _, fp in entries])
+                }
+                try:
+                    resp = self._get_fs_op_info_batch(
+                        owner=owner,
+                        project=project,
+                        paths=file_paths,
+                        operation="exists",
+                        include=["exists"],
+                    )
+                    batch_results = resp.get("results")
+                    if isinstance(batch_results, dict):
+                        for file_path, value in batch_results.items():
+                            exists = bool(
+                                value.get("exists", False)
+                                if isinstance(value, dict)
+                                else value
+                            )
+                            for idx in index_by_file_path.get(file_path, []):
+                                results[idx] = exists
+                except Exception:
+                    pass
+                # Fall back to single-path exists for any missing results
+                for idx, _, file_path in entries:
+                    if results[idx] is None:
+                        try:
+                            results[idx] = self._get_exists_for_parsed_path(
+                                owner, project, file_path
+                            )
+                        except Exception:
+                            results[idx] = False
         return [bool(v) for v in results]
 
     def info(self, path: str, **kwargs) -> dict:
@@ -868,7 +1048,7 @@ class CalkitFileSystem(AbstractFileSystem):
     def info_many(
         self, paths: list[str], **kwargs
     ) -> dict[str, dict[str, Any]]:
-        """Get metadata for multiple paths in a batch API call."""
+        """Get metadata for multiple paths in batched API calls."""
         if not paths:
             return {}
         grouped: dict[tuple[str, str], list[tuple[str, str]]] = {}
@@ -876,45 +1056,49 @@ class CalkitFileSystem(AbstractFileSystem):
         for path in paths:
             owner, project, file_path = _parse_path(path)
             grouped.setdefault((owner, project), []).append((path, file_path))
-        for (owner, project), entries in grouped.items():
-            file_paths = [file_path for _, file_path in entries]
-            paths_by_file_path = {
-                file_path: [p for p, fp in entries if fp == file_path]
-                for file_path in set([fp for _, fp in entries])
-            }
-            try:
-                resp = self._get_fs_op_info_batch(
-                    owner=owner,
-                    project=project,
-                    paths=file_paths,
-                    operation="info",
-                    include=["info", "content"],
-                )
-                batch_results = resp.get("results")
-                if isinstance(batch_results, dict):
-                    for file_path, value in batch_results.items():
-                        if not isinstance(value, dict):
-                            continue
-                        # Batch API returns shape:
-                        # {"info": {...}, "content_base64": "...", ...}
-                        info_payload = value.get("info")
-                        if not isinstance(info_payload, dict):
-                            continue
-                        info = self._normalize_info(file_path, info_payload)
-                        content_b64 = value.get("content_base64")
-                        if isinstance(content_b64, str):
-                            try:
-                                info["content"] = base64.b64decode(
-                                    content_b64, validate=True
-                                )
-                            except Exception:
-                                pass
-                        for original_path in paths_by_file_path.get(
-                            file_path, []
-                        ):
-                            results[original_path] = info
-            except Exception:
-                pass
+        for (owner, project), project_entries in grouped.items():
+            for start in range(0, len(project_entries), OP_INFO_BATCH_SIZE):
+                entries = project_entries[start : start + OP_INFO_BATCH_SIZE]
+                file_paths = [file_path for _, file_path in entries]
+                paths_by_file_path = {
+                    file_path: [p for p, fp in entries if fp == file_path]
+                    for file_path in set([fp for _, fp in entries])
+                }
+                try:
+                    resp = self._get_fs_op_info_batch(
+                        owner=owner,
+                        project=project,
+                        paths=file_paths,
+                        operation="info",
+                        include=["info", "content"],
+                    )
+                    batch_results = resp.get("results")
+                    if isinstance(batch_results, dict):
+                        for file_path, value in batch_results.items():
+                            if not isinstance(value, dict):
+                                continue
+                            # Batch API returns shape:
+                            # {"info": {...}, "content_base64": "...", ...}
+                            info_payload = value.get("info")
+                            if not isinstance(info_payload, dict):
+                                continue
+                            info = self._normalize_info(
+                                file_path, info_payload
+                            )
+                            content_b64 = value.get("content_base64")
+                            if isinstance(content_b64, str):
+                                try:
+                                    info["content"] = base64.b64decode(
+                                        content_b64, validate=True
+                                    )
+                                except Exception:
+                                    pass
+                            for original_path in paths_by_file_path.get(
+                                file_path, []
+                            ):
+                                results[original_path] = info
+                except Exception:
+                    pass
         return results
 
     def cat_file(
@@ -967,6 +1151,38 @@ class CalkitFileSystem(AbstractFileSystem):
         with self.open(path2, "wb") as dst:
             dst.write(data)  # type: ignore[arg-type]
 
+    def copy(
+        self,
+        path1,
+        path2,
+        recursive=False,
+        maxdepth=None,
+        on_error=None,
+        **kwargs,
+    ):
+        """Copy files within the filesystem, many at once."""
+        if on_error is None:
+            on_error = "ignore" if recursive else "raise"
+        paths1, paths2 = self._expand_transfer_paths(
+            path1,
+            path2,
+            self,
+            self.isdir,
+            recursive=recursive,
+            maxdepth=maxdepth,
+        )
+
+        def copy_one(p1: str, p2: str) -> None:
+            try:
+                self.cp_file(p1, p2, **kwargs)
+            except FileNotFoundError:
+                if on_error == "raise":
+                    raise
+
+        self._run_transfers(
+            [partial(copy_one, p1, p2) for p1, p2 in zip(paths1, paths2)]
+        )
+
     def makedir(self, path, create_parents=True, **kwargs):
         """Create a directory (no-op for object storage).
 
@@ -999,16 +1215,26 @@ class CalkitFileSystem(AbstractFileSystem):
         if os.path.isdir(lpath):
             self.makedirs(rpath, exist_ok=True)
             return None
-        owner, project, file_path = _parse_path(rpath)
+        self._put_file(lpath, rpath, callback=callback)
+
+    def _put_file(
+        self,
+        lpath: str,
+        rpath: str,
+        operation_info: dict | None = None,
+        callback=DEFAULT_CALLBACK,
+    ) -> None:
         size = os.path.getsize(lpath)
         callback.set_size(size)
-        operation_info = self._get_fs_op_info(
-            owner,
-            project,
-            file_path,
-            "put",
-            content_length=size,
-        )
+        if operation_info is None:
+            owner, project, file_path = _parse_path(rpath)
+            operation_info = self._get_fs_op_info(
+                owner,
+                project,
+                file_path,
+                "put",
+                content_length=size,
+            )
         # Stream the file from disk rather than loading it into memory. This
         # keeps RAM bounded when DVC pushes many (or very large) files in
         # parallel via its worker pool.
@@ -1022,6 +1248,327 @@ class CalkitFileSystem(AbstractFileSystem):
             )
         resp.raise_for_status()
 
+    def put(
+        self,
+        lpath,
+        rpath,
+        recursive=False,
+        callback=DEFAULT_CALLBACK,
+        maxdepth=None,
+        **kwargs,
+    ):
+        """Upload local files, many at once.
+
+        Files are moved in parallel, a window at a time, with access info
+        for each window fetched in one request just before it starts, rather
+        than with a request per file or all up front, where presigned URLs
+        could expire before they're used.
+        """
+        from fsspec.implementations.local import (
+            LocalFileSystem,
+            make_path_posix,
+        )
+
+        if isinstance(lpath, str):
+            lpath = make_path_posix(lpath)
+        lpaths, rpaths = self._expand_transfer_paths(
+            lpath,
+            rpath,
+            LocalFileSystem(),
+            self.isdir,
+            recursive=recursive,
+            maxdepth=maxdepth,
+        )
+        pairs = [
+            (lp, self._strip_protocol(rp))
+            for lp, rp in zip(lpaths, rpaths)
+            if not os.path.isdir(lp)
+        ]
+        if kwargs.get("mode") == "create":
+            for (_, rp), exists in zip(
+                pairs, self.exists_many([rp for _, rp in pairs])
+            ):
+                if exists:
+                    raise FileExistsError(rp)
+
+        def upload(lp: str, rp: str, info: dict | None, started) -> None:
+            started.set()
+            with callback.branched(lp, rp) as child:
+                self._put_file(lp, rp, operation_info=info, callback=child)
+
+        callback.set_size(len(pairs))
+        for start in range(0, len(pairs), TRANSFER_WINDOW_SIZE):
+            window = pairs[start : start + TRANSFER_WINDOW_SIZE]
+            infos = self._get_fs_op_info_many(
+                [rp for _, rp in window],
+                "put",
+                content_lengths=[os.path.getsize(lp) for lp, _ in window],
+            )
+            started = [threading.Event() for _ in window]
+            try:
+                self._run_transfers(
+                    [
+                        partial(upload, lp, rp, info, event)
+                        for (lp, rp), info, event in zip(
+                            window, infos, started
+                        )
+                    ],
+                    callback=callback,
+                )
+            finally:
+                # Uploads that started abort themselves if they fail, but
+                # those cancelled before starting were still initiated by
+                # the hub
+                for info, event in zip(infos, started):
+                    if (
+                        info is not None
+                        and not event.is_set()
+                        and info["access"].get("kind") == "presigned-multipart"
+                    ):
+                        self._abort_multipart_upload(info["access"])
+
+    def get_file(
+        self, rpath, lpath, callback=DEFAULT_CALLBACK, outfile=None, **kwargs
+    ):
+        """Download a file, streaming it in one request rather than reading
+        it a block at a time.
+        """
+        self._get_file(rpath, lpath, callback=callback, outfile=outfile)
+
+    def _get_file(
+        self,
+        rpath: str,
+        lpath: str | None,
+        operation_info: dict | None = None,
+        callback=DEFAULT_CALLBACK,
+        outfile=None,
+    ) -> None:
+        if operation_info is None:
+            owner, project, file_path = _parse_path(rpath)
+            operation_info = self._get_fs_op_info(
+                owner, project, file_path, "get"
+            )
+        resp = self._execute_operation(operation_info, "get", stream=True)
+        with resp:
+            if resp.status_code == 404:
+                raise FileNotFoundError(rpath)
+            resp.raise_for_status()
+            size = resp.headers.get("Content-Length")
+            if size is not None:
+                callback.set_size(int(size))
+
+            def write(f) -> None:
+                for chunk in resp.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+                    callback.relative_update(len(chunk))
+
+            if outfile is not None:
+                write(outfile)
+            else:
+                assert lpath is not None
+                os.makedirs(os.path.dirname(lpath) or ".", exist_ok=True)
+                with open(lpath, "wb") as f:
+                    write(f)
+
+    def get(
+        self,
+        rpath,
+        lpath,
+        recursive=False,
+        callback=DEFAULT_CALLBACK,
+        maxdepth=None,
+        **kwargs,
+    ):
+        """Download files, many at once.
+
+        Files are moved in parallel, a window at a time, with access info
+        for each window fetched in one request just before it starts, rather
+        than with a request per file or all up front, where presigned URLs
+        could expire before they're used.
+        """
+        from fsspec.implementations.local import make_path_posix
+
+        if isinstance(lpath, str):
+            lpath = make_path_posix(lpath)
+        rpaths, lpaths = self._expand_transfer_paths(
+            rpath,
+            lpath,
+            self,
+            os.path.isdir,
+            recursive=recursive,
+            maxdepth=maxdepth,
+        )
+
+        def download(rp: str, lp: str, info: dict | None) -> None:
+            with callback.branched(rp, lp) as child:
+                self._get_file(rp, lp, operation_info=info, callback=child)
+
+        callback.set_size(len(rpaths))
+        for start in range(0, len(rpaths), TRANSFER_WINDOW_SIZE):
+            window = list(
+                zip(
+                    rpaths[start : start + TRANSFER_WINDOW_SIZE],
+                    lpaths[start : start + TRANSFER_WINDOW_SIZE],
+                )
+            )
+            infos = self._get_fs_op_info_many([rp for rp, _ in window], "get")
+            self._run_transfers(
+                [
+                    partial(download, rp, lp, info)
+                    for (rp, lp), info in zip(window, infos)
+                ],
+                callback=callback,
+            )
+
+
+class BlockCache:
+    """An LRU cache of fixed-size blocks of remote objects.
+
+    Blocks are keyed by an object identity and the block index. Where the
+    identity is an object's MD5 and ``cache_dir`` is set, blocks are also
+    written to disk, since content with a given MD5 never changes.
+    """
+
+    def __init__(
+        self,
+        block_size: int = READ_BLOCK_SIZE,
+        max_size: int = BLOCK_CACHE_SIZE,
+        cache_dir: str | None = None,
+    ):
+        self.block_size = block_size
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self._blocks: OrderedDict[tuple[str, int], bytes] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def _disk_path(self, md5: str, idx: int) -> str:
+        assert self.cache_dir is not None
+        return os.path.join(
+            self.cache_dir, str(self.block_size), md5[:2], md5[2:], str(idx)
+        )
+
+    def get(self, key: str, idx: int, md5: str | None = None) -> bytes | None:
+        with self._lock:
+            block = self._blocks.get((key, idx))
+            if block is not None:
+                self._blocks.move_to_end((key, idx))
+                return block
+        if md5 is None or self.cache_dir is None:
+            return None
+        try:
+            with open(self._disk_path(md5, idx), "rb") as f:
+                block = f.read()
+        except OSError:
+            return None
+        self._put_memory(key, idx, block)
+        return block
+
+    def put(
+        self, key: str, idx: int, block: bytes, md5: str | None = None
+    ) -> None:
+        self._put_memory(key, idx, block)
+        if md5 is None or self.cache_dir is None:
+            return
+        fpath = self._disk_path(md5, idx)
+        tmp_fpath = f"{fpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(fpath), exist_ok=True)
+            with open(tmp_fpath, "wb") as f:
+                f.write(block)
+            os.replace(tmp_fpath, fpath)
+        except OSError:
+            # The disk cache is best effort
+            pass
+
+    def _put_memory(self, key: str, idx: int, block: bytes) -> None:
+        if len(block) > self.max_size:
+            return
+        with self._lock:
+            old = self._blocks.pop((key, idx), None)
+            if old is not None:
+                self._nbytes -= len(old)
+            self._blocks[(key, idx)] = block
+            self._nbytes += len(block)
+            while self._nbytes > self.max_size:
+                _, evicted = self._blocks.popitem(last=False)
+                self._nbytes -= len(evicted)
+
+
+class _BlockReadCache(BaseCache):
+    """Read cache for a single file, backed by its filesystem's block cache.
+
+    Missing blocks are fetched with one range request per contiguous run.
+    Reads that continue where the last one ended are taken as a sequential
+    scan and fetch ahead, with the readahead doubling up to
+    ``MAX_READAHEAD`` while the scan continues.
+    """
+
+    name = "calkit-blocks"
+
+    def __init__(
+        self,
+        blocksize: int,
+        fetcher: Callable[[int, int], bytes],
+        size: int,
+        block_cache: BlockCache,
+        key: str,
+        md5: str | None = None,
+    ):
+        super().__init__(blocksize, fetcher, size)
+        self.block_cache = block_cache
+        self.key = key
+        self.md5 = md5
+        self._last_end: int | None = None
+        self._readahead = 0
+
+    def _fetch(self, start: int | None, stop: int | None) -> bytes:
+        if start is None:
+            start = 0
+        if stop is None or stop > self.size:
+            stop = self.size
+        if start >= stop:
+            return b""
+        self.total_requested_bytes += stop - start
+        bs = self.block_cache.block_size
+        if start == self._last_end:
+            self._readahead = min(max(2 * self._readahead, bs), MAX_READAHEAD)
+        else:
+            self._readahead = 0
+        self._last_end = stop
+        first, last = start // bs, (stop - 1) // bs
+        blocks = {}
+        for idx in range(first, last + 1):
+            block = self.block_cache.get(self.key, idx, md5=self.md5)
+            if block is not None:
+                blocks[idx] = block
+        missing = [i for i in range(first, last + 1) if i not in blocks]
+        if missing:
+            self.miss_count += 1
+            # Fetch ahead only as part of a request that's needed anyway
+            ahead = min(last + self._readahead // bs, (self.size - 1) // bs)
+            for idx in range(last + 1, ahead + 1):
+                if self.block_cache.get(self.key, idx, md5=self.md5):
+                    break
+                missing.append(idx)
+        else:
+            self.hit_count += 1
+        runs: list[list[int]] = []
+        for idx in missing:
+            if runs and runs[-1][-1] == idx - 1:
+                runs[-1].append(idx)
+            else:
+                runs.append([idx])
+        for run in runs:
+            run_start = run[0] * bs
+            data = self.fetcher(run_start, min((run[-1] + 1) * bs, self.size))
+            for idx in run:
+                block = data[(idx - run[0]) * bs : (idx - run[0] + 1) * bs]
+                self.block_cache.put(self.key, idx, block, md5=self.md5)
+                blocks[idx] = block
+        out = b"".join(blocks[idx] for idx in range(first, last + 1))
+        return out[start - first * bs : stop - first * bs]
+
 
 class CalkitFile(AbstractBufferedFile):
     """A file-like object for reading/writing from Calkit hub storage.
@@ -1073,6 +1620,39 @@ class CalkitFile(AbstractBufferedFile):
             cache_options=cache_options,
             **kwargs,
         )
+        block_cache = getattr(fs, "_block_cache", None)
+        if (
+            mode == "rb"
+            and "cache_type" not in kwargs
+            and block_cache is not None
+        ):
+            self.cache = _BlockReadCache(
+                self.blocksize,
+                self._fetch_range,
+                self.size,
+                block_cache=block_cache,
+                **self._cache_identity(),
+            )
+
+    def _cache_identity(self) -> dict[str, Any]:
+        """Identify the object's content for the block cache.
+
+        The MD5 is taken from the object's info or, for DVC objects, its path.
+        Without it, the modification time stands in, and without that, the
+        blocks are only shared within this open file.
+        """
+        details = self.details if isinstance(self.details, dict) else {}
+        md5 = details.get("md5")
+        if md5 is None and (
+            match := _DVC_MD5_PATH_RE.search(self.file_path or "")
+        ):
+            md5 = match.group(1) + match.group(2)
+        if md5 is not None:
+            return {"key": f"md5:{md5}", "md5": md5}
+        time_modified = details.get("time_modified")
+        if time_modified is not None:
+            return {"key": f"{self.path}@{self.size}@{time_modified}"}
+        return {"key": f"{self.path}@{id(self)}"}
 
     def _fetch_range(self, start: int, end: int) -> bytes:
         """Fetch a byte range from the file."""
@@ -10,6 +10,7 @@ from pathlib import Path
 
 import git
 from git.exc import InvalidGitRepositoryError
+from pydantic import BaseModel, Field
 
 __all__ = ["InvalidGitRepositoryError", "get_repo"]
 
@@ -121,6 +122,135 @@ def check_branch_is_current(
     )
 
 
+class GitStatus(BaseModel):
+    """The status of a working tree, from ``git status --porcelain=v2``."""
+
+    # None when HEAD is detached
+    branch: str | None = None
+    # None before the first commit
+    commit: str | None = None
+    upstream: str | None = None
+    commits_ahead: int = 0
+    commits_behind: int = 0
+    # Paths with changes in the index
+    staged: list[str] = Field(default_factory=list)
+    # Paths with changes in the working tree that aren't staged
+    changed: list[str] = Field(default_factory=list)
+    untracked: list[str] = Field(default_factory=list)
+    # Paths with merge conflicts
+    unmerged: list[str] = Field(default_factory=list)
+    # Renamed or copied paths, mapped to their original paths
+    renamed: dict[str, str] = Field(default_factory=dict)
+
+    @property
+    def tracked_changes(self) -> list[str]:
+        """Paths in the index with any kind of change."""
+        return list(
+            dict.fromkeys([*self.staged, *self.changed, *self.unmerged])
+        )
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(
+            self.staged or self.changed or self.untracked or self.unmerged
+        )
+
+
+def parse_porcelain_v2(output: str) -> GitStatus:
+    """Parse the output of ``git status --porcelain=v2 -z --branch``."""
+    status = GitStatus()
+    records = output.split("\0")
+    n = 0
+    while n < len(records):
+        record = records[n]
+        n += 1
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "#":
+            header, _, value = record[2:].partition(" ")
+            if header == "branch.oid" and value != "(initial)":
+                status.commit = value
+            elif header == "branch.head" and value != "(detached)":
+                status.branch = value
+            elif header == "branch.upstream":
+                status.upstream = value
+            elif header == "branch.ab":
+                ahead, behind = value.split(" ")
+                status.commits_ahead = int(ahead.removeprefix("+"))
+                status.commits_behind = int(behind.removeprefix("-"))
+        elif kind == "?":
+            status.untracked.append(record[2:])
+        elif kind == "u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            status.unmerged.append(record.split(" ", 10)[10])
+        elif kind in "12":
+            # 1 XY sub mH mI mW hH hI path
+            # 2 XY sub mH mI mW hH hI Xscore path, then the original path
+            n_fields = 8 if kind == "1" else 9
+            fields = record.split(" ", n_fields)
+            xy, path = fields[1], fields[n_fields]
+            if kind == "2":
+                status.renamed[path] = records[n]
+                n += 1
+            if xy[0] != ".":
+                status.staged.append(path)
+            if xy[1] != ".":
+                status.changed.append(path)
+    return status
+
+
+def get_status(
+    path: str | None = None,
+    repo: git.Repo | None = None,
+    untracked: bool = True,
+    fsmonitor: bool = False,
+    untracked_cache: bool = False,
+) -> GitStatus:
+    """Get the status of the repo at ``path`` or the provided repo, with a
+    single ``git status`` call.
+
+    Optional locks are skipped, so frequent status checks, e.g., from an
+    editor, don't get in the way of Git commands run at the same time.
+    ``fsmonitor`` and ``untracked_cache`` turn on Git's filesystem monitor
+    and untracked cache for the call, which can make status much faster in
+    big repos, where they're supported. A repo that enables them in its own
+    Git config uses them either way.
+    """
+    if repo is None:
+        repo = get_repo(path)
+    cmd = ["git"]
+    if fsmonitor:
+        cmd += ["-c", "core.fsmonitor=true"]
+    if untracked_cache:
+        cmd += ["-c", "core.untrackedCache=true"]
+    cmd += [
+        "--no-optional-locks",
+        "status",
+        "--porcelain=v2",
+        "-z",
+        "--branch",
+        "--untracked-files=all" if untracked else "--untracked-files=no",
+    ]
+    output = repo.git.execute(cmd, strip_newline_in_stdout=False)
+    return parse_porcelain_v2(str(output))
+
+
+def get_status_for_polling(
+    path: str | None = None, repo: git.Repo | None = None
+) -> GitStatus:
+    """Get the status of a repo that's checked often, e.g., to keep an
+    editor up to date, with Git's filesystem monitor and untracked cache if
+    the ``fast_git_status`` setting is on.
+    """
+    import calkit.config
+
+    fast = calkit.config.read().fast_git_status
+    return get_status(
+        path=path, repo=repo, fsmonitor=fast, untracked_cache=fast
+    )
+
+
 def get_staged_files(
     path: str | None = None, repo: git.Repo | None = None
 ) -> list[str]:
@@ -141,22 +271,14 @@ def get_changed_files(
     path: str | None = None, repo: git.Repo | None = None
 ) -> list[str]:
     """Get a list of files that have been changed but not staged."""
-    if repo is None:
-        repo = get_repo(path)
-    return [
-        item.a_path
-        for item in repo.index.diff(None)
-        if item.a_path is not None
-    ]
+    return get_status(path=path, repo=repo, untracked=False).changed
 
 
 def get_untracked_files(
     path: str | None = None, repo: git.Repo | None = None
 ) -> list[str]:
     """Get a list of untracked files."""
-    if repo is None:
-        repo = get_repo(path)
-    return repo.untracked_files
+    return get_status(path=path, repo=repo).untracked
 
 
 def get_staged_files_with_status(
@@ -5,7 +5,6 @@ from functools import partial
 from typing import Literal
 
 import dotenv
-import requests
 from requests.exceptions import HTTPError
 
 import calkit
@@ -39,7 +38,7 @@ def _request(
         headers = {}
     if "Authorization" not in headers:
         headers = headers | {"Authorization": f"Bearer {get_token()}"}
-    func = getattr(requests, kind)
+    func = getattr(calkit.sessions.get_session(), kind)
     resp = func(
         get_base_url() + path,
         params=params,
@@ -19,7 +19,7 @@ import requests
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import HTTPError, Timeout
 
-from . import config
+from . import config, sessions
 
 logger = logging.getLogger(__name__)
 
@@ -316,7 +316,7 @@ def _do_refresh() -> str | None:
         return None
     base_url = get_base_url()
     try:
-        resp = requests.post(
+        resp = _get_session().post(
             base_url + "/login/refresh",
             json={"refresh_token": cfg.refresh_token},
         )
@@ -344,6 +344,11 @@ def _try_refresh() -> str | None:
         return _do_refresh()
 
 
+def _get_session() -> requests.Session:
+    # Not retried by the session, since _request has its own retry policy
+    return sessions.get_session("hub", retries=False)
+
+
 def get_headers(headers: dict | None = None, auth: bool = True) -> dict:
     if auth:
         base_headers = {"Authorization": f"Bearer {get_token()}"}
@@ -373,7 +378,7 @@ def _request(
     # Bound how long a single attempt can hang so stalled connections become
     # retryable timeouts rather than blocking forever. Callers can override.
     kwargs.setdefault("timeout", (10, 120))
-    func = getattr(requests, kind)
+    func = getattr(_get_session(), kind)
     if base_url is None:
         base_url = get_base_url()
     refresh_attempted = False
@@ -5,7 +5,6 @@ from functools import partial
 from typing import Literal
 
 import dotenv
-import requests
 from requests.exceptions import HTTPError
 
 import calkit
@@ -73,7 +72,7 @@ def _request(
         params = {}
     if auth and "access_token" not in params:
         params = params | {"access_token": get_token(service=service)}
-    func = getattr(requests, kind)
+    func = getattr(calkit.sessions.get_session(), kind)
     resp = func(
         get_base_url(service=service) + path,
         params=params,
@@ -1,5 +1,6 @@
 """JupyterLab extension server routes."""
 
+import asyncio
 import glob
 import json
 import os
@@ -7,19 +8,27 @@ import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
 import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable
 
 import tornado
 from dvc.exceptions import NotDvcRepoError
 from jupyter_server.base.handlers import APIHandler as _APIHandler
 from jupyter_server.utils import url_path_join
 from pydantic import BaseModel
+from tornado.iostream import StreamClosedError
 
 import calkit
 import calkit.cli.main
 import calkit.environments
 import calkit.pipeline
+import calkit.watch
 from calkit.cli.new import (
     new_conda_env,
     new_julia_env,
@@ -44,6 +53,139 @@ class APIHandler(_APIHandler):
         self.finish(json.dumps({"error": message}))
 
 
+# Slow work, like checking the pipeline's status, runs on this pool so it
+# doesn't block the server's event loop
+WORKER_THREADS = 4
+# Pipeline runs have their own pool, so a long run can't starve status checks
+# and runs are queued rather than contending for DVC's lock
+PIPELINE_RUN_THREADS = 1
+# How many lines of a failed pipeline run's log to include in its error
+FAILED_RUN_LOG_TAIL = 50
+# How many finished pipeline runs to keep logs for
+MAX_PIPELINE_RUNS = 20
+# How often the event stream checks a pipeline run for new output, in seconds
+RUN_EVENTS_POLL_INTERVAL = 0.25
+# Seconds between keepalive comments on idle status event streams
+STATUS_EVENTS_KEEPALIVE = 15
+
+_executor = ThreadPoolExecutor(
+    max_workers=WORKER_THREADS, thread_name_prefix="calkit-jupyterlab"
+)
+_run_executor = ThreadPoolExecutor(
+    max_workers=PIPELINE_RUN_THREADS,
+    thread_name_prefix="calkit-jupyterlab-run",
+)
+_in_flight: dict[tuple, Future] = {}
+_in_flight_lock = threading.RLock()
+_last_pipeline_status: dict[str, dict] = {}
+
+
+def _run_coalesced(key: tuple, func: Callable, *args) -> asyncio.Future:
+    """Run ``func`` on the worker pool, sharing the result with any callers
+    that ask for the same ``key`` while it's in flight.
+
+    The frontend polls statuses on an interval, so with several tabs open,
+    requests pile up faster than they can be answered if each gets its own
+    computation.
+    """
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is None:
+            future = _executor.submit(func, *args)
+            _in_flight[key] = future
+
+            def forget(f: Future) -> None:
+                with _in_flight_lock:
+                    if _in_flight.get(key) is f:
+                        del _in_flight[key]
+
+            future.add_done_callback(forget)
+    return asyncio.wrap_future(future)
+
+
+class _PipelineRun:
+    """A pipeline run in the background, with its output collected line by
+    line.
+    """
+
+    def __init__(self, wdir: str, targets: list[str]):
+        self.id = uuid.uuid4().hex
+        self.wdir = wdir
+        self.targets = targets
+        self.status = "queued"
+        self.returncode: int | None = None
+        self.lines: list[str] = []
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.future: Future = Future()
+
+    def to_dict(self, log: bool = False) -> dict[str, Any]:
+        res = {
+            "id": self.id,
+            "targets": self.targets,
+            "status": self.status,
+            "returncode": self.returncode,
+            "started": self.started,
+            "finished": self.finished,
+            "n_lines": len(self.lines),
+        }
+        if log:
+            res["log"] = "\n".join(self.lines)
+        return res
+
+    def run(self) -> None:
+        self.status = "running"
+        self.started = time.time()
+        try:
+            process = subprocess.Popen(
+                _pipeline_run_command(self.targets),
+                cwd=self.wdir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                errors="replace",
+            )
+            assert process.stdout is not None
+            for line in process.stdout:
+                self.lines.append(line.rstrip("\n"))
+            self.returncode = process.wait()
+        except Exception as e:
+            self.lines.append(f"Failed to run pipeline: {e}")
+            self.returncode = -1
+        self.finished = time.time()
+        self.status = "succeeded" if self.returncode == 0 else "failed"
+
+
+_pipeline_runs: OrderedDict[str, _PipelineRun] = OrderedDict()
+_pipeline_runs_lock = threading.Lock()
+
+
+def _pipeline_run_command(targets: list[str]) -> list[str]:
+    # Runs happen in a subprocess so their output, including that of stage
+    # commands, can be captured without touching the server's own streams
+    return [sys.executable, "-m", "calkit", "run", *targets]
+
+
+def _start_pipeline_run(wdir: str, targets: list[str]) -> _PipelineRun:
+    job = _PipelineRun(wdir=wdir, targets=targets)
+    with _pipeline_runs_lock:
+        _pipeline_runs[job.id] = job
+        finished = [j.id for j in _pipeline_runs.values() if j.future.done()]
+        for job_id in finished[: max(0, len(finished) - MAX_PIPELINE_RUNS)]:
+            del _pipeline_runs[job_id]
+    job.future = _run_executor.submit(job.run)
+    return job
+
+
+def _active_pipeline_run(wdir: str) -> _PipelineRun | None:
+    with _pipeline_runs_lock:
+        for job in _pipeline_runs.values():
+            if job.wdir == wdir and not job.future.done():
+                return job
+    return None
+
+
 class HelloRouteHandler(APIHandler):
     @tornado.web.authenticated
     def get(self):
@@ -811,141 +953,242 @@ class NotebookStageRunSessionRouteHandler(APIHandler):
         self.finish(json.dumps({"ok": True, "dvc_lock_entry": dvc_lock_entry}))
 
 
-class GitStatusRouteHandler(APIHandler):
-    @tornado.web.authenticated
-    def get(self):
+def _get_git_status(wdir: str) -> tuple[int, dict]:
+    try:
+        repo = calkit.git.get_repo(wdir)
+    except Exception as e:
+        return 500, {"error": f"Not a git repo: {e}"}
+    status = calkit.git.get_status_for_polling(repo=repo)
+    sizes: dict[str, int] = {}
+    for path in dict.fromkeys(
+        [*status.changed, *status.staged, *status.untracked]
+    ):
         try:
-            repo = calkit.git.get_repo()
-        except Exception as e:
-            self.set_status(500)
-            self.finish(json.dumps({"error": f"Not a git repo: {e}"}))
-            return
-        changed = [
-            item.a_path for item in repo.index.diff(None) if item.a_path
-        ]
-        staged = [
-            item.a_path for item in repo.index.diff("HEAD") if item.a_path
-        ]
-        untracked = list(repo.untracked_files)
-        try:
-            tracked = list(
-                {*changed, *staged, *repo.git.ls_files().splitlines()}
-            )
+            sizes[path] = os.path.getsize(os.path.join(repo.working_dir, path))
         except Exception:
-            tracked = list({*changed, *staged})
-        sizes: dict[str, int] = {}
-        for path in {
-            **{p: None for p in changed},
-            **{p: None for p in staged},
-            **{p: None for p in untracked},
-        }:
-            try:
-                sizes[path] = os.path.getsize(path)
-            except Exception:
-                continue
-        ahead = 0
-        behind = 0
-        branch = None
-        remote = None
-        try:
-            branch = repo.active_branch.name
-            tracking = repo.active_branch.tracking_branch()
-            if tracking is not None:
-                remote = str(tracking)
-                # Use --left-right to count ahead/behind
-                commits = repo.git.rev_list(
-                    "--left-right", f"{tracking}...HEAD"
-                ).splitlines()
-                for c in commits:
-                    if c.startswith("<"):
-                        behind += 1
-                    elif c.startswith(">"):
-                        ahead += 1
-        except Exception:
-            pass
-        self.finish(
-            json.dumps(
-                {
-                    "changed": changed,
-                    "staged": staged,
-                    "untracked": untracked,
-                    "tracked": tracked,
-                    "sizes": sizes,
-                    "ahead": ahead,
-                    "behind": behind,
-                    "branch": branch,
-                    "remote": remote,
-                }
-            )
+            continue
+    return 200, {
+        "changed": status.changed,
+        "staged": status.staged,
+        "untracked": status.untracked,
+        # Only paths with changes are looked up here, and they're tracked if
+        # they're in the index, so there's no need to list every file
+        "tracked": status.tracked_changes,
+        "sizes": sizes,
+        "ahead": status.commits_ahead,
+        "behind": status.commits_behind,
+        "branch": status.branch,
+        "remote": status.upstream,
+    }
+
+
+class GitStatusRouteHandler(APIHandler):
+    @tornado.web.authenticated
+    async def get(self):
+        wdir = os.getcwd()
+        code, res = await _run_coalesced(
+            ("git-status", wdir), _get_git_status, wdir
+        )
+        self.set_status(code)
+        self.finish(json.dumps(res))
+
+
+def _get_pipeline_status(wdir: str) -> tuple[int, dict]:
+    try:
+        # First make sure pipeline is compiled
+        ck_info = calkit.load_calkit_info(wdir=wdir)
+        if not ck_info.get("pipeline", {}).get("stages", {}):
+            return 200, {"stale_stages": {}, "is_outdated": False}
+        calkit.pipeline.to_dvc(ck_info=ck_info, wdir=wdir, write=True)
+        # Clean all notebooks in the pipeline
+        calkit.notebooks.clean_all_in_pipeline(ck_info=ck_info)
+        dvc_repo = get_dvc_repo(wdir)
+        raw_status = dvc_repo.status()
+        # Frozen stages are intentionally pinned and hidden from status
+        frozen_stages = calkit.pipeline.frozen_stage_base_names(
+            ck_info=ck_info
+        )
+        pipeline_status = {
+            k.split("dvc.yaml:")[-1]: v
+            for k, v in raw_status.items()
+            if not k.endswith(".dvc")
+            and k.split("dvc.yaml:")[-1].split("@")[0] not in frozen_stages
+        }
+        # Always-run-only stages are surfaced in pipeline_status but do
+        # not count toward is_outdated, matching the CLI's is_stale logic.
+        is_outdated = any(
+            v != ["always changed"] for v in pipeline_status.values()
         )
+        return 200, {
+            "stale_stages": pipeline_status,
+            "is_outdated": is_outdated,
+        }
+    except NotDvcRepoError:
+        return 200, {"stale_stages": {}, "is_outdated": False}
+    except Exception as e:
+        return 500, {
+            "stale_stagess": {},
+            "is_outdated": False,
+            "error": f"Failed to get pipeline status: {e}",
+        }
 
 
 class PipelineStatusRouteHandler(APIHandler):
     @tornado.web.authenticated
-    def get(self):
-        try:
-            # First make sure pipeline is compiled
-            ck_info = calkit.load_calkit_info()
-            if not ck_info.get("pipeline", {}).get("stages", {}):
-                self.finish(
-                    json.dumps({"stale_stages": {}, "is_outdated": False})
-                )
-                return
-            calkit.pipeline.to_dvc(ck_info=ck_info, write=True)
-            # Clean all notebooks in the pipeline
-            calkit.notebooks.clean_all_in_pipeline(ck_info=ck_info)
-            dvc_repo = get_dvc_repo(os.getcwd())
-            raw_status = dvc_repo.status()
-            # Frozen stages are intentionally pinned and hidden from status
-            frozen_stages = calkit.pipeline.frozen_stage_base_names(
-                ck_info=ck_info
-            )
-            pipeline_status = {
-                k.split("dvc.yaml:")[-1]: v
-                for k, v in raw_status.items()
-                if not k.endswith(".dvc")
-                and k.split("dvc.yaml:")[-1].split("@")[0] not in frozen_stages
-            }
-            # Always-run-only stages are surfaced in pipeline_status but do
-            # not count toward is_outdated, matching the CLI's is_stale logic.
-            is_outdated = any(
-                v != ["always changed"] for v in pipeline_status.values()
-            )
-            self.finish(
-                json.dumps(
-                    {
-                        "stale_stages": pipeline_status,
-                        "is_outdated": is_outdated,
-                    }
+    async def get(self):
+        wdir = os.getcwd()
+        job = _active_pipeline_run(wdir)
+        if job is not None:
+            # Compiling and checking the pipeline would contend with the run
+            # for DVC's lock, so report the last status until it finishes
+            res = dict(
+                _last_pipeline_status.get(
+                    wdir, {"stale_stages": {}, "is_outdated": False}
                 )
             )
-        except NotDvcRepoError:
-            self.finish(json.dumps({"stale_stages": {}, "is_outdated": False}))
+            res["run_id"] = job.id
+            self.finish(json.dumps(res))
             return
-        except Exception as e:
+        code, res = await _run_coalesced(
+            ("pipeline-status", wdir), _get_pipeline_status, wdir
+        )
+        if code == 200:
+            _last_pipeline_status[wdir] = res
+        self.set_status(code)
+        self.finish(json.dumps(res))
+
+
+class PipelineStatusEventsRouteHandler(APIHandler):
+    _events: asyncio.Queue | None = None
+
+    @tornado.web.authenticated
+    async def get(self):
+        """Stream pipeline and Git status as server-sent events.
+
+        The current status is sent first, then an update each time files in
+        the project change, so there's no need to poll ``pipeline/status``.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue[dict | None] = asyncio.Queue()
+        self._events = events
+
+        def on_event(event: dict) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        unsubscribe = await asyncio.wrap_future(
+            _executor.submit(calkit.watch.watch_status, os.getcwd(), on_event)
+        )
+        self.set_header("Content-Type", "text/event-stream")
+        self.set_header("Cache-Control", "no-cache")
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        events.get(), timeout=STATUS_EVENTS_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    self.write(": keepalive\n\n")
+                else:
+                    if event is None:
+                        break
+                    self.write(f"event: status\ndata: {json.dumps(event)}\n\n")
+                await self.flush()
+        except StreamClosedError:
+            pass
+        finally:
+            _executor.submit(unsubscribe)
+
+    def on_connection_close(self):
+        # Stop streaming as soon as the client goes away, rather than at the
+        # next write
+        if self._events is not None:
+            self._events.put_nowait(None)
+        super().on_connection_close()
+
+
+class PipelineRunsRouteHandler(APIHandler):
+    @tornado.web.authenticated
+    def get(self):
+        """Get a pipeline run by ID, or list recent runs."""
+        job_id = self.get_query_argument("id", None)
+        if job_id is None:
+            with _pipeline_runs_lock:
+                jobs = list(_pipeline_runs.values())
+            self.finish(json.dumps([job.to_dict() for job in jobs]))
+            return
+        job = _pipeline_runs.get(job_id)
+        if job is None:
+            return self.error(404, f"Pipeline run {job_id} not found")
+        self.finish(json.dumps(job.to_dict(log=True)))
+
+    @tornado.web.authenticated
+    async def post(self):
+        """Start a pipeline run.
+
+        With ``background`` set in the body, this responds right away with
+        the run's ID, and its progress can be followed at
+        ``pipeline/runs/events``. Otherwise, it responds when the run
+        finishes.
+        """
+        body = self.get_json_body() or {}
+        targets = body.get("targets") or []
+        job = _start_pipeline_run(os.getcwd(), targets)
+        if body.get("background"):
+            self.set_status(202)
+            self.finish(json.dumps(job.to_dict()))
+            return
+        await asyncio.wrap_future(job.future)
+        if job.status != "succeeded":
+            # The output was captured rather than printed to the server's
+            # console, so the end of it goes with the error
+            tail = "\n".join(job.lines[-FAILED_RUN_LOG_TAIL:])
             self.set_status(500)
             self.finish(
                 json.dumps(
                     {
-                        "stale_stagess": {},
-                        "is_outdated": False,
-                        "error": f"Failed to get pipeline status: {e}",
+                        "error": f"Failed to run pipeline:\n{tail}",
+                        **job.to_dict(log=True),
                     }
                 )
             )
             return
+        self.finish(json.dumps(job.to_dict(log=True)))
 
 
-class PipelineRunsRouteHandler(APIHandler):
+class PipelineRunsEventsRouteHandler(APIHandler):
     @tornado.web.authenticated
-    def post(self):
-        body = self.get_json_body() or {}
-        targets = body.get("targets")
-        try:
-            res = calkit.cli.main.run(targets=targets)
-        except Exception:
-            return self.error(500, "Failed to run pipeline")
-        self.finish(json.dumps(res))
+    async def get(self):
+        """Stream a pipeline run's log as server-sent events.
+
+        Each line of output is sent as a ``log`` event, starting after
+        ``offset`` lines, and the run's final state is sent as a ``status``
+        event before the stream closes.
+        """
+        job_id = self.get_query_argument("id")
+        offset = int(self.get_query_argument("offset", "0"))
+        job = _pipeline_runs.get(job_id)
+        if job is None:
+            return self.error(404, f"Pipeline run {job_id} not found")
+        self.set_header("Content-Type", "text/event-stream")
+        self.set_header("Cache-Control", "no-cache")
+        while True:
+            done = job.future.done()
+            lines = job.lines[offset:]
+            offset += len(lines)
+            for line in lines:
+                self.write(f"event: log\ndata: {json.dumps(line)}\n\n")
+            if done:
+                self.write(
+                    f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+                )
+            try:
+                await self.flush()
+            except StreamClosedError:
+                return
+            if done:
+                break
+            await asyncio.sleep(RUN_EVENTS_POLL_INTERVAL)
+        self.finish()
 
 
 class GitIgnoreRouteHandler(APIHandler):
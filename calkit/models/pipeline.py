@@ -209,6 +209,34 @@ class StageSchedulerOptions(BaseModel):
     log_storage: Literal["git", "dvc"] | None = Field(
         default="git", description="Where to store the job log."
     )
+    auto_size: bool = Field(
+        default=False,
+        description="Request the time, memory, and CPUs this stage's "
+        "recent jobs used, plus a margin, instead of what 'options' "
+        "request. See 'calkit scheduler suggest'.",
+    )
+    array: bool = Field(
+        default=False,
+        description="Submit the iterations of an iterated stage in one "
+        "call, as a job array, rather than as a job each.",
+    )
+
+
+class StageResources(BaseModel):
+    """Resources a stage needs while it runs.
+
+    When a run executes stages concurrently, these decide how many fit on
+    the machine at once.
+    """
+
+    cpus: float = Field(
+        default=1, gt=0, description="Number of CPUs each run uses."
+    )
+    memory: str | None = Field(
+        default=None,
+        description="Memory each run uses, e.g., '4GB' or '512M'.",
+        pattern=r"^\s*\d+(\.\d+)?\s*([kKmMgGtT]i?[bB]?|[bB])?\s*$",
+    )
 
 
 def _allow_null(schema: dict[str, Any]) -> None:
@@ -300,6 +328,11 @@ class Stage(BaseModel):
         description="Options for running this stage on a job scheduler "
         "(SLURM or PBS).",
     )
+    resources: StageResources | None = Field(
+        default=None,
+        description="CPUs and memory this stage needs, which limit how many "
+        "stages run at once with 'calkit run --jobs'.",
+    )
     # Do not allow extra keys
     model_config = ConfigDict(extra="forbid")
     # Resolved at pipeline-compilation time by set_stage_scheduler_options;
@@ -502,6 +535,8 @@ class Stage(BaseModel):
             cmd += f" --env-default-options {opts.env_default_options}"
         if opts.env_default_setup != "replace":
             cmd += f" --env-default-setup {opts.env_default_setup}"
+        if opts.auto_size:
+            cmd += " --auto-size"
         if self.environment != "_system":
             cmd += f" --environment {self.outer_environment}"
         if opts.log_path is not None:
@@ -110,8 +110,16 @@ def clean_notebook_outputs(path: str):
             cell["metadata"] = {}
     # Clean out notebook-level metadata
     nb["metadata"] = {}
+    content = json.dumps(nb, indent=2)
+    # Only write when something changed, since status checks clean every
+    # notebook in the pipeline, and a write would look like a new change to
+    # anything watching the project
+    if os.path.isfile(fpath_out):
+        with open(fpath_out, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return
     with open(fpath_out, "w", encoding="utf-8") as f:
-        json.dump(nb, f, indent=2)
+        f.write(content)
 
 
 def clean_all_in_pipeline(ck_info: dict | None = None) -> list[str]:
@@ -2,47 +2,466 @@
 
 An op is a process that runs outside the pipeline, e.g., for continuous data
 collection, a task run on a schedule, or a fixed number of iterations.
+
+Any number of ops can be supervised from one process: each op's command runs
+in an asyncio-managed subprocess, so waiting on them costs no threads.
+Continuous ops are restarted when they exit, after a delay that backs off
+exponentially after failures, and scheduled ops sleep until their next cron
+time rather than polling.
 """
 
 from __future__ import annotations
 
+import asyncio
+import os
+import signal
+import sys
+import time
+from datetime import datetime, timedelta
 from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# How often to sample a running op's CPU time and memory usage
+DEFAULT_SAMPLE_INTERVAL_S = 1.0
+# Retries after failures for ops that aren't continuous, unless set
+DEFAULT_MAX_RESTARTS = 3
+# Seconds an op's processes get to exit after SIGTERM before they're killed
+TERMINATE_GRACE_S = 5.0
 
 
 class Op(BaseModel):
-    kind = Literal[
+    kind: Literal[
         "single-shot",
         "continuous",
         "fixed-iterations",
         "scheduled",
-        "event-driven",
-    ]
+    ] = "single-shot"
+    name: str | None = None
     cmd: str
+    wdir: str | None = None
+    # Delay before restarting, doubled for each consecutive failure up to
+    # ``max_backoff_s``
+    backoff_s: float = 1.0
+    max_backoff_s: float = 60.0
+    # Maximum number of times to retry after a failure; if None, unlimited
+    # for continuous ops and ``DEFAULT_MAX_RESTARTS`` for the others
+    max_restarts: int | None = None
+
+    @model_validator(mode="after")
+    def validate_kind(self) -> Op:
+        # Kinds with their own fields need their own classes, so a plain
+        # ``Op`` can't silently run without them
+        required = {
+            "scheduled": ScheduledOp,
+            "fixed-iterations": FixedIterationsOp,
+        }
+        cls = required.get(self.kind)
+        if cls is not None and not isinstance(self, cls):
+            raise ValueError(
+                f"Ops of kind '{self.kind}' must be a {cls.__name__}"
+            )
+        return self
 
 
 class ContinuousOp(Op):
     """Run continuously."""
 
-    pass
+    kind: Literal["continuous"] = "continuous"
 
 
 class ScheduledOp(Op):
-    kind = Literal["scheduled"]
-    schedule: str  # TODO: Be more specific about validation
+    kind: Literal["scheduled"] = "scheduled"
+    schedule: str = Field(
+        description=(
+            "A cron-style schedule with five fields: minute, hour, day of "
+            "month, month, and day of week, e.g., '*/15 * * * *'."
+        )
+    )
+
+    @field_validator("schedule")
+    @classmethod
+    def validate_schedule(cls, v: str) -> str:
+        # Fail early on an invalid schedule
+        parse_cron(v)
+        return v
 
 
 class FixedIterationsOp(Op):
-    kind = Literal["fixed-iterations"]
+    kind: Literal["fixed-iterations"] = "fixed-iterations"
     n_iterations: int
 
 
-def run(op: Op):
+class OpMetrics(BaseModel):
+    """Resource usage and outcomes recorded for an op."""
+
+    n_runs: int = 0
+    n_failures: int = 0
+    n_restarts: int = 0
+    runtime_s: float = 0.0
+    cpu_s: float = 0.0
+    max_rss_bytes: int = 0
+    last_returncode: int | None = None
+
+
+def _parse_cron_field(expr: str, lo: int, hi: int) -> set[int]:
+    values = set()
+    for part in expr.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {step_str}")
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            # A bare value with a step, e.g., '5/15', runs to the end
+            end = hi if step > 1 else start
+        if start < lo or end > hi or start > end:
+            raise ValueError(f"Cron value out of range: {part}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule(BaseModel):
+    """The values allowed by each field of a parsed cron schedule."""
+
+    minutes: set[int]
+    hours: set[int]
+    days: set[int]
+    months: set[int]
+    weekdays: set[int]
+    # Cron matches either the day of the month or the day of the week when
+    # both are restricted, i.e., don't start with '*'
+    days_restricted: bool
+    weekdays_restricted: bool
+
+    def matches_day(self, t: datetime) -> bool:
+        day_ok = t.day in self.days
+        # Python's weekday() is 0 for Monday; cron's is 0 for Sunday
+        weekday_ok = (t.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+
+def parse_cron(schedule: str) -> CronSchedule:
+    """Parse a five-field cron schedule.
+
+    Each field may be ``*``, a value, a range like ``1-5``, a step like
+    ``*/15`` or ``0-30/10``, or a comma-separated list of these. Day of week
+    runs from 0 (Sunday) to 6, with 7 also accepted for Sunday.
+    """
+    fields = schedule.split()
+    if len(fields) != 5:
+        raise ValueError(
+            f"Invalid cron schedule '{schedule}'; expected 5 fields"
+        )
+    minute, hour, day, month, weekday = fields
+    # Allow 7 for Sunday
+    weekdays = _parse_cron_field(weekday, 0, 7)
+    if 7 in weekdays:
+        weekdays = (weekdays - {7}) | {0}
+    return CronSchedule(
+        minutes=_parse_cron_field(minute, 0, 59),
+        hours=_parse_cron_field(hour, 0, 23),
+        days=_parse_cron_field(day, 1, 31),
+        months=_parse_cron_field(month, 1, 12),
+        weekdays=weekdays,
+        days_restricted=not day.startswith("*"),
+        weekdays_restricted=not weekday.startswith("*"),
+    )
+
+
+def next_cron_time(schedule: str, after: datetime) -> datetime:
+    """The first time strictly after ``after`` that matches ``schedule``.
+
+    Rather than checking every minute, this jumps straight past months,
+    days, and hours that can't match.
+    """
+    cron = parse_cron(schedule)
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = after + timedelta(days=366 * 5)
+    while t <= limit:
+        if t.month not in cron.months:
+            if t.month == 12:
+                t = t.replace(
+                    year=t.year + 1, month=1, day=1, hour=0, minute=0
+                )
+            else:
+                t = t.replace(month=t.month + 1, day=1, hour=0, minute=0)
+            continue
+        if not cron.matches_day(t):
+            t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            continue
+        if t.hour not in cron.hours:
+            t = t.replace(minute=0) + timedelta(hours=1)
+            continue
+        if t.minute not in cron.minutes:
+            t += timedelta(minutes=1)
+            continue
+        return t
+    raise ValueError(f"Cron schedule '{schedule}' never matches")
+
+
+def _op_name(op: Op, index: int) -> str:
+    return op.name or f"op-{index}"
+
+
+async def _sample_usage(
+    pid: int, usage: dict[str, float], metrics: OpMetrics, interval_s: float
+) -> None:
+    """Sample the resource usage of a process and its children until it exits.
+
+    The latest total CPU time is kept in ``usage``, since it can't be read
+    once the process has exited, and peak memory goes into ``metrics``.
+    """
+    import psutil
+
+    try:
+        proc = psutil.Process(pid)
+        while True:
+            cpu_s = 0.0
+            rss = 0
+            for p in [proc, *proc.children(recursive=True)]:
+                try:
+                    with p.oneshot():
+                        cpu = p.cpu_times()
+                        cpu_s += cpu.user + cpu.system
+                        rss += p.memory_info().rss
+                except psutil.NoSuchProcess:
+                    continue
+            usage["cpu_s"] = max(usage["cpu_s"], cpu_s)
+            metrics.max_rss_bytes = max(metrics.max_rss_bytes, rss)
+            await asyncio.sleep(interval_s)
+    except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+        pass
+
+
+def _signal_op(proc: asyncio.subprocess.Process, sig: int) -> bool:
+    """Signal an op's command along with any processes it started.
+
+    On POSIX the shell is started in its own session, so signaling its
+    process group reaches the command it runs and their children too.
+    Returns whether any of them were still running.
+    """
+    if sys.platform == "win32":
+        if proc.returncode is not None:
+            return False
+        if sig == signal.SIGTERM:
+            proc.terminate()
+        elif sig != 0:
+            proc.kill()
+        return True
+    try:
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def _stop_op(proc: asyncio.subprocess.Process) -> None:
+    """Terminate an op's processes, killing any still running after
+    ``TERMINATE_GRACE_S``.
+    """
+    _signal_op(proc, signal.SIGTERM)
+    deadline = time.monotonic() + TERMINATE_GRACE_S
+    while time.monotonic() < deadline:
+        # The shell may exit before the processes it started do
+        if proc.returncode is not None and not _signal_op(proc, 0):
+            break
+        await asyncio.sleep(0.05)
+    else:
+        _signal_op(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+    await proc.wait()
+
+
+async def _run_once(
+    op: Op, metrics: OpMetrics, sample_interval_s: float
+) -> int:
+    """Run an op's command once and record its metrics."""
+    start = time.monotonic()
+    proc = await asyncio.create_subprocess_shell(
+        op.cmd, cwd=op.wdir, start_new_session=sys.platform != "win32"
+    )
+    usage = {"cpu_s": 0.0}
+    sampler = asyncio.create_task(
+        _sample_usage(proc.pid, usage, metrics, sample_interval_s)
+    )
+    try:
+        returncode = await proc.wait()
+    except asyncio.CancelledError:
+        await _stop_op(proc)
+        raise
+    finally:
+        sampler.cancel()
+        metrics.cpu_s += usage["cpu_s"]
+        metrics.runtime_s += time.monotonic() - start
+        metrics.n_runs += 1
+    metrics.last_returncode = returncode
+    if returncode != 0:
+        metrics.n_failures += 1
+    return returncode
+
+
+async def _sleep_or_stop(delay_s: float, stop: asyncio.Event) -> bool:
+    """Sleep for ``delay_s`` unless stopped first; return True if stopped."""
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=max(delay_s, 0))
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+async def _supervise_op(
+    op: Op,
+    metrics: OpMetrics,
+    stop: asyncio.Event,
+    sample_interval_s: float,
+) -> None:
+    if op.kind == "scheduled":
+        assert isinstance(op, ScheduledOp)
+        running: asyncio.Task | None = None
+        while not stop.is_set():
+            now = datetime.now()
+            delay_s = (next_cron_time(op.schedule, now) - now).total_seconds()
+            if await _sleep_or_stop(delay_s, stop):
+                break
+            # Skip this run if the last one is still going
+            if running is None or running.done():
+                running = asyncio.create_task(
+                    _run_once(op, metrics, sample_interval_s)
+                )
+        if running is not None and not running.done():
+            running.cancel()
+            await asyncio.gather(running, return_exceptions=True)
+        return
+    n_iterations = None
+    max_restarts = op.max_restarts
+    if op.kind == "fixed-iterations":
+        assert isinstance(op, FixedIterationsOp)
+        n_iterations = op.n_iterations
+    elif op.kind == "single-shot":
+        n_iterations = 1
+    if max_restarts is None and op.kind != "continuous":
+        max_restarts = DEFAULT_MAX_RESTARTS
+    n_succeeded = 0
+    consecutive_failures = 0
+    while not stop.is_set():
+        if n_iterations is not None and n_succeeded >= n_iterations:
+            return
+        run_task = asyncio.create_task(
+            _run_once(op, metrics, sample_interval_s)
+        )
+        stop_task = asyncio.create_task(stop.wait())
+        await asyncio.wait(
+            [run_task, stop_task], return_when=asyncio.FIRST_COMPLETED
+        )
+        stop_task.cancel()
+        if not run_task.done():
+            run_task.cancel()
+            await asyncio.gather(run_task, return_exceptions=True)
+            return
+        if run_task.result() == 0:
+            n_succeeded += 1
+            consecutive_failures = 0
+            # Don't respawn a command that exits right away in a hot loop
+            if n_iterations is None and await _sleep_or_stop(
+                op.backoff_s, stop
+            ):
+                return
+            continue
+        consecutive_failures += 1
+        if max_restarts is not None and metrics.n_restarts >= max_restarts:
+            return
+        metrics.n_restarts += 1
+        delay_s = min(
+            op.backoff_s * 2 ** (consecutive_failures - 1), op.max_backoff_s
+        )
+        if await _sleep_or_stop(delay_s, stop):
+            return
+
+
+async def supervise(
+    ops: list[Op],
+    stop: asyncio.Event | None = None,
+    sample_interval_s: float = DEFAULT_SAMPLE_INTERVAL_S,
+    metrics: dict[str, OpMetrics] | None = None,
+) -> dict[str, OpMetrics]:
+    """Run ops concurrently until they finish or ``stop`` is set.
+
+    Single-shot and fixed-iterations ops finish once they've completed
+    successfully the required number of times; continuous and scheduled ops
+    run until stopped. When stopped, running commands are terminated.
+
+    Returns metrics for each op, keyed by name, falling back to
+    ``op-<index>`` for ops without one. If ``metrics`` is passed, it's
+    filled in as the ops run, so it's still useful if supervision is
+    interrupted.
+    """
+    if stop is None:
+        stop = asyncio.Event()
+    names = [_op_name(op, n) for n, op in enumerate(ops)]
+    if len(set(names)) != len(names):
+        raise ValueError("Op names must be unique")
+    if metrics is None:
+        metrics = {}
+    metrics.update({name: OpMetrics() for name in names})
+    tasks = [
+        asyncio.create_task(
+            _supervise_op(op, metrics[name], stop, sample_interval_s)
+        )
+        for name, op in zip(names, ops)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return metrics
+
+
+def run(op: Op) -> OpMetrics:
     """Run an op."""
-    pass
+    return start([op])[_op_name(op, 0)]
+
+
+async def _supervise_until_interrupted(
+    ops: list[Op], metrics: dict[str, OpMetrics]
+) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+    except (NotImplementedError, RuntimeError):
+        # Not supported on Windows or outside the main thread, so fall back
+        # to KeyboardInterrupt
+        pass
+    try:
+        await supervise(ops, stop=stop, metrics=metrics)
+    finally:
+        try:
+            loop.remove_signal_handler(signal.SIGINT)
+        except (NotImplementedError, RuntimeError):
+            pass
+
 
+def start(ops: list[Op]) -> dict[str, OpMetrics]:
+    """Start and monitor a list of ops.
 
-def start(ops: list[Op]):
-    """Start and monitor a list of ops."""
-    pass
+    Blocks until all ops are finished or the process is interrupted, in
+    which case running commands are terminated and the metrics gathered so
+    far are returned.
+    """
+    metrics: dict[str, OpMetrics] = {}
+    try:
+        asyncio.run(_supervise_until_interrupted(ops, metrics))
+    except KeyboardInterrupt:
+        pass
+    return metrics
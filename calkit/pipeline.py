@@ -18,6 +18,7 @@ from calkit.models.pipeline import (
     PathOutput,
     Pipeline,
 )
+from calkit.profiling import StageProfile
 
 
 def _coerce_bool(value: object) -> bool:
@@ -1718,6 +1719,183 @@ def get_matrix_item_targets(
     )
 
 
+def get_array_scheduler_stages(ck_info: dict) -> list[str]:
+    """Return the iterated scheduler stages whose items are submitted
+    together as job arrays.
+    """
+    stages = ck_info.get("pipeline", {}).get("stages", {})
+    return [
+        name
+        for name in get_concurrent_scheduler_stages(ck_info)
+        if (stages[name].get("scheduler") or {}).get("array")
+    ]
+
+
+def get_target_commands(
+    targets: list[str], wdir: str | None = None
+) -> dict[str, str]:
+    """Return the command of each DVC target, with its matrix values filled
+    in.
+    """
+    import calkit.dvc
+
+    repo = calkit.dvc.get_dvc_repo(wdir)
+    # Stages with a list of commands are left out, since they can't be
+    # submitted as one job
+    return {
+        stage.addressing: stage.cmd
+        for stage in repo.index.stages
+        if stage.addressing in targets and isinstance(stage.cmd, str)
+    }
+
+
+_MEMORY_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+
+def parse_memory(value: str | int) -> int:
+    """Parse an amount of memory like ``'4GB'`` or ``'512M'`` into bytes.
+
+    Units are binary, so ``'1G'``, ``'1GB'`` and ``'1GiB'`` are all
+    1024**3 bytes, which is how job schedulers read them too.
+    """
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(
+        r"\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*", value.lower()
+    )
+    if match is None:
+        raise ValueError(f"Invalid amount of memory: '{value}'")
+    number, unit = match.groups()
+    return int(float(number) * _MEMORY_UNITS[unit])
+
+
+def get_stage_resources(ck_info: dict, stage_name: str) -> tuple[float, int]:
+    """Return the CPUs and bytes of memory a stage declares it needs."""
+    stage = ck_info.get("pipeline", {}).get("stages", {}).get(stage_name, {})
+    resources = stage.get("resources") or {}
+    memory = resources.get("memory")
+    return (
+        float(resources.get("cpus", 1)),
+        parse_memory(memory) if memory is not None else 0,
+    )
+
+
+class ResourcePool:
+    """CPUs and memory shared by stages running at the same time.
+
+    A stage that asks for more than the whole pool gets the whole pool, so it
+    still runs, just alone.
+    """
+
+    def __init__(self, cpus: float | None = None, memory: int | None = None):
+        import threading
+
+        import psutil
+
+        self.cpus = float(cpus if cpus is not None else os.cpu_count() or 1)
+        self.memory = (
+            memory if memory is not None else psutil.virtual_memory().available
+        )
+        self._free_cpus = self.cpus
+        self._free_memory = self.memory
+        self._cond = threading.Condition()
+
+    def _clamp(self, cpus: float, memory: int) -> tuple[float, int]:
+        return min(cpus, self.cpus), min(memory, self.memory)
+
+    def acquire(self, cpus: float, memory: int = 0) -> None:
+        cpus, memory = self._clamp(cpus, memory)
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._free_cpus >= cpus and self._free_memory >= memory
+            )
+            self._free_cpus -= cpus
+            self._free_memory -= memory
+
+    def release(self, cpus: float, memory: int = 0) -> None:
+        cpus, memory = self._clamp(cpus, memory)
+        with self._cond:
+            self._free_cpus += cpus
+            self._free_memory += memory
+            self._cond.notify_all()
+
+
+def get_stale_targets(
+    targets: list[str], wdir: str | None = None
+) -> list[str]:
+    """Return the DVC stage targets that are out of date, ignoring their
+    upstreams.
+    """
+    import calkit.dvc
+
+    if not targets:
+        return []
+    raw_status = calkit.dvc.get_dvc_repo(wdir).status(targets=targets)
+    stale = {key.split("dvc.yaml:")[-1] for key in raw_status}
+    return [t for t in targets if t in raw_status or t in stale]
+
+
+def repro_single_item(
+    target: str,
+    extra_args: list[str] | None = None,
+    wdir: str | None = None,
+    log_path: str | None = None,
+    on_profile: Callable[[StageProfile], None] | None = None,
+) -> int:
+    """Reproduce one DVC target in its own ``dvc repro --single-item``
+    process, returning its exit code.
+
+    If ``log_path`` is given, the process's output is written there rather
+    than to the terminal. If ``on_profile`` is given, it's called with the
+    resources the process used.
+    """
+    import subprocess
+    import sys
+    import tempfile
+
+    from calkit.profiling import PROFILE_PATH_ENV_VAR, DvcStageProfiles
+
+    # Go through `calkit dvc` rather than `dvc` directly so Calkit's DVC
+    # patches (e.g. the ck:// remote scheme) are registered in the
+    # subprocess. `--wait-for-lock` is a top-level DVC flag (must precede
+    # `repro`): each subprocess briefly acquires the repo-level lock for its
+    # status check and dvc.lock update, and DVC's 3s default timeout is too
+    # short when many stages race to acquire it at once.
+    cmd = [
+        sys.executable,
+        "-m",
+        "calkit",
+        "dvc",
+        "--wait-for-lock",
+        "repro",
+        "--single-item",
+    ]
+    cmd += (extra_args or []) + [target]
+    env = None
+    profile_path = None
+    if on_profile is not None:
+        # The stage's commands are profiled in the subprocess, so DVC's own
+        # work there isn't counted against the stage
+        fd, profile_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        env = os.environ | {PROFILE_PATH_ENV_VAR: profile_path}
+    try:
+        if log_path is None:
+            returncode = subprocess.run(cmd, cwd=wdir, env=env).returncode
+        else:
+            with open(log_path, "w") as f:
+                returncode = subprocess.run(
+                    cmd, cwd=wdir, env=env, stdout=f, stderr=subprocess.STDOUT
+                ).returncode
+        if profile_path is not None:
+            for profile, _ in DvcStageProfiles.load(profile_path).values():
+                on_profile(profile)
+    finally:
+        if profile_path is not None:
+            os.remove(profile_path)
+    return returncode
+
+
 def reproduce_targets_concurrently(
     targets: list[str],
     max_workers: int,
@@ -1734,31 +1912,12 @@ def reproduce_targets_concurrently(
     with an rwlock "busy" error, so upstreams must already be built. Returns
     ``{target: returncode}``. ``run_one`` is injectable for testing.
     """
-    import subprocess
-    import sys
     from concurrent.futures import ThreadPoolExecutor
 
     args = extra_args or []
 
-    # Default runner shells out to an isolated `dvc repro --single-item`. Go
-    # through `calkit dvc` rather than `dvc` directly so Calkit's DVC patches
-    # (e.g. the ck:// remote scheme) are registered in the subprocess.
-    # `--wait-for-lock` is a top-level DVC flag (must precede `repro`): each
-    # subprocess briefly acquires the repo-level lock for its status check and
-    # dvc.lock update, and DVC's 3s default timeout is too short when many
-    # iterations race to acquire it at once.
     def _default_run_one(target: str) -> int:
-        cmd = [
-            sys.executable,
-            "-m",
-            "calkit",
-            "dvc",
-            "--wait-for-lock",
-            "repro",
-            "--single-item",
-        ]
-        cmd += args + [target]
-        return subprocess.run(cmd, cwd=wdir).returncode
+        return repro_single_item(target, extra_args=args, wdir=wdir)
 
     runner = run_one if run_one is not None else _default_run_one
     results: dict[str, int] = {}
@@ -1771,6 +1930,206 @@ def reproduce_targets_concurrently(
     return results
 
 
+def get_target_log_path(log_dir: str, target: str) -> str:
+    """Return the path of the log for a target run on its own, e.g., a stage
+    in a parallel run.
+    """
+    return os.path.join(log_dir, re.sub(r"[/\\:]", "_", target) + ".log")
+
+
+def get_stage_graph(
+    targets: list[str] | None = None, wdir: str | None = None
+) -> dict[str, list[str]]:
+    """Return the pipeline's stages, each mapped to the stages it depends on
+    directly, from the compiled DVC pipeline.
+
+    Iterated stages appear as their items, e.g., ``stage@a``. If
+    ``targets`` are given, only they and the stages they depend on are
+    included; a target names a stage, or all items of an iterated stage.
+    """
+    import networkx as nx
+    from dvc.stage import PipelineStage
+
+    import calkit.dvc
+
+    repo = calkit.dvc.get_dvc_repo(wdir)
+    graph = repo.index.graph
+    # In DVC's graph, an edge points from a stage to one it depends on
+    stages = [s for s in graph.nodes if isinstance(s, PipelineStage)]
+    if targets:
+        selected = set()
+        for stage in stages:
+            if any(
+                stage.addressing == target
+                or stage.name == target
+                or stage.name.startswith(target + "@")
+                for target in targets
+            ):
+                selected.add(stage)
+                selected |= nx.descendants(graph, stage)
+        stages = [s for s in stages if s in selected]
+    return {
+        stage.addressing: sorted(
+            dep.addressing
+            for dep in graph.successors(stage)
+            if isinstance(dep, PipelineStage)
+        )
+        for stage in stages
+    }
+
+
+class StageRun(BaseModel):
+    """The outcome of one stage in a parallel run."""
+
+    # "succeeded", "failed", "skipped", "not-started", or "up-to-date"
+    status: str
+    returncode: int | None = None
+    start: float | None = None
+    end: float | None = None
+
+    @property
+    def duration(self) -> float:
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+def run_stage_graph(
+    graph: dict[str, list[str]],
+    stale: list[str],
+    max_workers: int,
+    run_one: Callable[[str], int],
+    resources: dict[str, tuple[float, int]] | None = None,
+    pool: ResourcePool | None = None,
+    keep_going: bool = False,
+) -> dict[str, StageRun]:
+    """Run the stages of a pipeline graph, starting each as soon as the
+    stages it depends on are done, with up to ``max_workers`` at once.
+
+    A stage runs if it's in ``stale`` or any stage it depends on ran, since
+    its inputs may have changed; otherwise it's up-to-date. After a failure,
+    stages that depend on the failed one are skipped, and unless
+    ``keep_going`` is set, no new stages are started; those left are marked
+    not started.
+    """
+    import time
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    stale_set = set(stale)
+    results: dict[str, StageRun] = {}
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    dependents: dict[str, list[str]] = {name: [] for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            if dep in dependents:
+                dependents[dep].append(name)
+            else:
+                # Outside the graph, e.g., not selected, so already done
+                remaining[name].discard(dep)
+
+    def _run(name: str) -> StageRun:
+        cpus, memory = (resources or {}).get(name, (1.0, 0))
+        if pool is not None:
+            pool.acquire(cpus, memory)
+        try:
+            start = time.time()
+            returncode = run_one(name)
+            return StageRun(
+                status="succeeded" if returncode == 0 else "failed",
+                returncode=returncode,
+                start=start,
+                end=time.time(),
+            )
+        finally:
+            if pool is not None:
+                pool.release(cpus, memory)
+
+    def _needs_run(name: str) -> bool:
+        return name in stale_set or any(
+            results[dep].status == "succeeded"
+            for dep in graph[name]
+            if dep in results
+        )
+
+    stopping = False
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while True:
+            # Resolve what can be resolved without running, which may make
+            # more stages ready, and start the rest
+            resolved = True
+            while resolved:
+                resolved = False
+                ready = [
+                    name
+                    for name, deps in remaining.items()
+                    if not deps
+                    and name not in results
+                    and name not in running.values()
+                ]
+                for name in sorted(ready):
+                    failed_deps = [
+                        dep
+                        for dep in graph[name]
+                        if dep in results
+                        and results[dep].status in ("failed", "skipped")
+                    ]
+                    if failed_deps:
+                        results[name] = StageRun(status="skipped")
+                    elif stopping:
+                        results[name] = StageRun(status="not-started")
+                    elif _needs_run(name):
+                        # Only submit what can start now, so a failure stops
+                        # the rest from starting
+                        if len(running) < max(1, max_workers):
+                            running[executor.submit(_run, name)] = name
+                        continue
+                    else:
+                        results[name] = StageRun(status="up-to-date")
+                    resolved = True
+                    for dependent in dependents[name]:
+                        remaining[dependent].discard(name)
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                if results[name].status == "failed" and not keep_going:
+                    stopping = True
+                for dependent in dependents[name]:
+                    remaining[dependent].discard(name)
+    return results
+
+
+def get_critical_path(
+    graph: dict[str, list[str]], results: dict[str, StageRun]
+) -> tuple[list[str], float]:
+    """Return the chain of dependent stages that took the longest in total,
+    and its duration, which bounds how fast the run could have gone.
+    """
+    from graphlib import TopologicalSorter
+
+    best: dict[str, tuple[float, list[str]]] = {}
+    for name in TopologicalSorter(
+        {k: [d for d in v if d in graph] for k, v in graph.items()}
+    ).static_order():
+        duration = results[name].duration if name in results else 0.0
+        prev = max(
+            (best[dep] for dep in graph[name] if dep in best),
+            key=lambda item: item[0],
+            default=(0.0, []),
+        )
+        best[name] = (prev[0] + duration, prev[1] + [name])
+    if not best:
+        return [], 0.0
+    total, path = max(best.values(), key=lambda item: item[0])
+    # Stages that didn't run don't make the path any longer
+    return [
+        name for name in path if results.get(name, StageRun(status="")).end
+    ], total
+
+
 def translate_run_targets(
     targets: list[str],
     ck_info: dict | None = None,
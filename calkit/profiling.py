@@ -0,0 +1,496 @@
+"""Per-stage runtime and resource profiling.
+
+Each stage command that ``calkit run`` starts is watched while it runs: its
+wall time, CPU time, peak memory, and storage I/O are recorded in a local
+history under ``.calkit/local``, which ``calkit describe runs`` summarizes
+so slow or growing stages stand out.
+
+On Linux, CPU time, peak memory, and I/O come from the resource usage the
+kernel reports when the process is reaped, which is exact and includes the
+descendants it waited for. Elsewhere they're sampled with psutil while the
+process runs. Either way, peak memory is at least the largest total RSS
+sampled across the tree, since stages that run several processes at once
+need that much.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+import calkit
+
+HISTORY_FNAME = "stage-history.jsonl"
+# Set for `calkit dvc` to write the profiles of the stages it runs to this
+# path, since its stage commands aren't children of the calling process
+PROFILE_PATH_ENV_VAR = "CALKIT_STAGE_PROFILE_PATH"
+# How many runs of each stage to keep in the history
+HISTORY_LENGTH = 100
+# Runs are appended to the history file, which is only rewritten to drop
+# old runs once it grows past this many bytes
+HISTORY_TRIM_SIZE = 1_000_000
+# Seconds between samples of a running process
+SAMPLE_INTERVAL = 0.5
+# Wall time growth, relative to the typical run, that counts as a regression;
+# it must also be at least REGRESSION_MIN_SECONDS, so noise in short stages
+# isn't flagged
+REGRESSION_THRESHOLD = 0.25
+REGRESSION_MIN_SECONDS = 1.0
+
+_Number = TypeVar("_Number", int, float)
+
+
+class StageProfile(BaseModel):
+    """Resources used by one run of a stage.
+
+    Times are in seconds and sizes in bytes. Values that couldn't be measured
+    on this platform are ``None``.
+    """
+
+    wall_time: float = 0.0
+    cpu_time: float | None = None
+    max_rss: int | None = None
+    read_bytes: int | None = None
+    write_bytes: int | None = None
+
+    def combine(self, other: StageProfile) -> StageProfile:
+        """Combine with the profile of a command run after this one, e.g.,
+        for stages with a list of commands.
+        """
+
+        def add(a: _Number | None, b: _Number | None) -> _Number | None:
+            if a is None or b is None:
+                return a if b is None else b
+            return a + b
+
+        return StageProfile(
+            wall_time=self.wall_time + other.wall_time,
+            cpu_time=add(self.cpu_time, other.cpu_time),
+            max_rss=max(
+                (v for v in (self.max_rss, other.max_rss) if v is not None),
+                default=None,
+            ),
+            read_bytes=add(self.read_bytes, other.read_bytes),
+            write_bytes=add(self.write_bytes, other.write_bytes),
+        )
+
+
+class StageRunRecord(StageProfile):
+    """A profiled stage run, as kept in the run history."""
+
+    stage: str
+    time: str
+    run_id: str | None = None
+    system_id: str | None = None
+    returncode: int | None = None
+
+
+class ProcessProfiler:
+    """Profile a process and its descendants until it exits.
+
+    Use as a context manager around consuming the process's output, then call
+    ``wait`` instead of ``process.wait`` so the kernel's accounting for the
+    process can be collected when it's reaped::
+
+        p = subprocess.Popen(cmd)
+        with ProcessProfiler(p) as profiler:
+            returncode = profiler.wait()
+        profile = profiler.profile
+    """
+
+    def __init__(
+        self, process: subprocess.Popen, interval: float = SAMPLE_INTERVAL
+    ):
+        self.process = process
+        self.interval = interval
+        self.profile: StageProfile | None = None
+        self._start = time.time()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._max_tree_rss = 0
+        # Last counters seen for each process in the tree, by PID, so
+        # processes that exit before the end still count
+        self._cpu: dict[int, float] = {}
+        self._io: dict[int, tuple[int, int]] = {}
+        self._io_supported = True
+
+    def __enter__(self) -> ProcessProfiler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _sample_once(self) -> None:
+        import psutil
+
+        try:
+            root = psutil.Process(self.process.pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return
+        total_rss = 0
+        for proc in procs:
+            try:
+                with proc.oneshot():
+                    total_rss += proc.memory_info().rss
+                    cpu = proc.cpu_times()
+                    self._cpu[proc.pid] = cpu.user + cpu.system
+                    if self._io_supported:
+                        io = proc.io_counters()
+                        self._io[proc.pid] = (io.read_bytes, io.write_bytes)
+            except AttributeError:
+                # No per-process I/O counters on this platform
+                self._io_supported = False
+            except psutil.Error:
+                continue
+        self._max_tree_rss = max(self._max_tree_rss, total_rss)
+
+    def _sample(self) -> None:
+        while True:
+            self._sample_once()
+            if self._stop.wait(self.interval):
+                break
+
+    def wait(self) -> int:
+        """Wait for the process to exit, set ``profile``, and return the
+        process's exit code.
+        """
+        rusage = None
+        cpu_time: float | None
+        max_rss: int | None
+        read_bytes: int | None
+        write_bytes: int | None
+        if sys.platform == "linux":
+            try:
+                _, status, rusage = os.wait4(self.process.pid, 0)
+                self.process.returncode = os.waitstatus_to_exitcode(status)
+            except ChildProcessError:
+                # Already reaped elsewhere
+                rusage = None
+        returncode = self.process.wait()
+        wall_time = time.time() - self._start
+        self._stop.set()
+        self._thread.join()
+        if rusage is not None:
+            cpu_time = rusage.ru_utime + rusage.ru_stime
+            # ru_maxrss is in KiB on Linux
+            max_rss = max(rusage.ru_maxrss * 1024, self._max_tree_rss)
+            # Block counts are in 512-byte units
+            read_bytes = rusage.ru_inblock * 512
+            write_bytes = rusage.ru_oublock * 512
+        else:
+            cpu_time = sum(self._cpu.values()) if self._cpu else None
+            max_rss = self._max_tree_rss or None
+            read_bytes = write_bytes = None
+            if self._io_supported and self._io:
+                read_bytes = sum(r for r, _ in self._io.values())
+                write_bytes = sum(w for _, w in self._io.values())
+        self.profile = StageProfile(
+            wall_time=wall_time,
+            cpu_time=cpu_time,
+            max_rss=max_rss,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+        )
+        return returncode
+
+
+class DvcStageProfiles:
+    """Profiles of the DVC stage commands run in this process, by stage.
+
+    While ``patch`` is active, each command DVC runs for a stage is profiled
+    and attributed to that stage, combining stages with several commands.
+    Code that runs stage commands itself, as ``calkit run`` does to tee their
+    output, can leave ``profile_commands`` off and ``add`` its own profiles.
+    """
+
+    def __init__(self) -> None:
+        self.profiles: dict[str, StageProfile] = {}
+        self.returncodes: dict[str, int] = {}
+        self.current_stage: str | None = None
+
+    def add(self, profile: StageProfile, returncode: int) -> None:
+        name = self.current_stage
+        if name is None:
+            return
+        if name in self.profiles:
+            profile = self.profiles[name].combine(profile)
+        self.profiles[name] = profile
+        self.returncodes[name] = returncode
+
+    @contextmanager
+    def patch(self, profile_commands: bool = True) -> Iterator[None]:
+        import dvc.stage.run
+
+        orig_cmd_run = dvc.stage.run.cmd_run
+        orig_run = dvc.stage.run._run
+
+        def cmd_run(stage: Any, *args: Any, **kwargs: Any) -> Any:
+            self.current_stage = stage.addressing
+            try:
+                return orig_cmd_run(stage, *args, **kwargs)
+            finally:
+                self.current_stage = None
+
+        def run(executable: str | None, cmd: str, **kwargs: Any) -> None:
+            # DVC's own implementation, but waiting through the profiler
+            in_main_thread = (
+                threading.current_thread() is threading.main_thread()
+            )
+            old_handler = None
+            try:
+                p = subprocess.Popen(
+                    dvc.stage.run._make_cmd(executable, cmd), **kwargs
+                )
+                if in_main_thread:
+                    old_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+                with ProcessProfiler(p) as profiler:
+                    returncode = profiler.wait()
+                assert profiler.profile is not None
+                self.add(profiler.profile, returncode)
+                if returncode != 0:
+                    raise dvc.stage.run.StageCmdFailedError(cmd, returncode)
+            finally:
+                if old_handler:
+                    signal.signal(signal.SIGINT, old_handler)
+
+        dvc.stage.run.cmd_run = cmd_run
+        if profile_commands:
+            dvc.stage.run._run = run
+        try:
+            yield
+        finally:
+            dvc.stage.run.cmd_run = orig_cmd_run
+            dvc.stage.run._run = orig_run
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    name: {
+                        "profile": profile.model_dump(),
+                        "returncode": self.returncodes.get(name),
+                    }
+                    for name, profile in self.profiles.items()
+                },
+                f,
+            )
+
+    @staticmethod
+    def load(path: str) -> dict[str, tuple[StageProfile, int | None]]:
+        if not os.path.isfile(path):
+            return {}
+        with open(path) as f:
+            content = f.read()
+        if not content.strip():
+            # Nothing was written, e.g., DVC failed before running anything
+            return {}
+        data = json.loads(content)
+        return {
+            name: (
+                StageProfile.model_validate(item["profile"]),
+                item.get("returncode"),
+            )
+            for name, item in data.items()
+        }
+
+
+def get_history_path(wdir: str | None = None) -> str:
+    return os.path.join(calkit.ensure_local_dir(wdir), HISTORY_FNAME)
+
+
+def read_history(wdir: str | None = None) -> list[StageRunRecord]:
+    """Read the stage run history, oldest first."""
+    path = get_history_path(wdir)
+    if not os.path.isfile(path):
+        return []
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(StageRunRecord.model_validate_json(line))
+            except ValueError:
+                # A line cut short by an interrupted write
+                continue
+    return records
+
+
+_history_lock = threading.Lock()
+# History file path to its size after it was last trimmed in this process,
+# so a history that stays large after trimming isn't rewritten every time
+_trimmed_sizes: dict[str, int] = {}
+
+
+def _trim_history(path: str, wdir: str | None = None) -> None:
+    """Rewrite the history keeping the most recent ``HISTORY_LENGTH`` runs
+    of each stage.
+    """
+    counts: dict[str, int] = {}
+    kept = []
+    for record in reversed(read_history(wdir)):
+        counts[record.stage] = counts.get(record.stage, 0) + 1
+        if counts[record.stage] <= HISTORY_LENGTH:
+            kept.append(record)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        for record in reversed(kept):
+            f.write(record.model_dump_json(exclude_none=True) + "\n")
+    os.replace(tmp_path, path)
+    _trimmed_sizes[path] = os.path.getsize(path)
+
+
+def append_history(
+    records: list[StageRunRecord], wdir: str | None = None
+) -> None:
+    """Add records to the stage run history.
+
+    Old runs beyond the most recent ``HISTORY_LENGTH`` of each stage are
+    dropped once the file has grown past ``HISTORY_TRIM_SIZE``.
+    """
+    if not records:
+        return
+    with _history_lock:
+        path = get_history_path(wdir)
+        # Start on a new line if an interrupted write left a partial one
+        prefix = ""
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    prefix = "\n"
+        with open(path, "a") as f:
+            f.write(
+                prefix
+                + "".join(
+                    record.model_dump_json(exclude_none=True) + "\n"
+                    for record in records
+                )
+            )
+        size = os.path.getsize(path)
+        if size > max(HISTORY_TRIM_SIZE, 2 * _trimmed_sizes.get(path, 0)):
+            _trim_history(path, wdir)
+
+
+def make_record(
+    stage: str,
+    profile: StageProfile,
+    returncode: int | None = None,
+    run_id: str | None = None,
+    system_id: str | None = None,
+) -> StageRunRecord:
+    return StageRunRecord(
+        stage=stage,
+        time=calkit.utcnow(remove_tz=False).isoformat(),
+        run_id=run_id,
+        system_id=system_id,
+        returncode=returncode,
+        **profile.model_dump(),
+    )
+
+
+class StageSummary(BaseModel):
+    """Recent runs of one stage, and how the latest compares to them."""
+
+    stage: str
+    runs: int
+    latest: StageRunRecord
+    median_wall_time: float
+    median_cpu_time: float | None = None
+    max_rss: int | None = None
+    # Change in wall time of the latest run relative to the median of the
+    # runs before it, as a fraction
+    wall_time_change: float | None = None
+    regressed: bool = False
+
+
+def summarize_history(
+    records: list[StageRunRecord],
+    last: int = 10,
+    stages: list[str] | None = None,
+) -> list[StageSummary]:
+    """Summarize the last ``last`` successful runs of each stage, most
+    recently run stages first.
+    """
+    by_stage: dict[str, list[StageRunRecord]] = {}
+    for record in records:
+        if record.returncode not in (0, None):
+            continue
+        if stages and record.stage not in stages:
+            continue
+        by_stage.setdefault(record.stage, []).append(record)
+    summaries = []
+    for stage, runs in by_stage.items():
+        runs = runs[-last:]
+        latest = runs[-1]
+        previous = runs[:-1]
+        cpu_times = [r.cpu_time for r in runs if r.cpu_time is not None]
+        rss = [r.max_rss for r in runs if r.max_rss is not None]
+        change = None
+        regressed = False
+        if previous:
+            typical = statistics.median(r.wall_time for r in previous)
+            if typical > 0:
+                change = latest.wall_time / typical - 1
+            regressed = (
+                latest.wall_time - typical >= REGRESSION_MIN_SECONDS
+                and change is not None
+                and change > REGRESSION_THRESHOLD
+            )
+        summaries.append(
+            StageSummary(
+                stage=stage,
+                runs=len(runs),
+                latest=latest,
+                median_wall_time=statistics.median(r.wall_time for r in runs),
+                median_cpu_time=(
+                    statistics.median(cpu_times) if cpu_times else None
+                ),
+                max_rss=max(rss) if rss else None,
+                wall_time_change=change,
+                regressed=regressed,
+            )
+        )
+    summaries.sort(
+        key=lambda s: datetime.fromisoformat(s.latest.time), reverse=True
+    )
+    return summaries
+
+
+def format_bytes(n: int | None) -> str:
+    if n is None:
+        return "-"
+    size = float(n)
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if size < 1024 or unit == "TB":
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+def format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes:.0f} m {seconds:.0f} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:.0f} h {minutes:.0f} m"
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import os
 import platform
-import re
 import subprocess
 from typing import Literal
 
@@ -16,11 +17,13 @@ import dvc.repo.data
 import dvc.repo.status
 from dvc.exceptions import NotDvcRepoError
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from starlette.middleware.cors import CORSMiddleware
 
 import calkit
 import calkit.jupyter
+import calkit.watch
 from calkit.dvc import get_dvc_repo, run_dvc_command
 
 logger = logging.getLogger(__package__)
@@ -267,25 +270,8 @@ def get_status(
     git_repo = calkit.git.get_repo(project.wdir)
     if fetch_git:
         git_repo.git.fetch()
-    untracked_git_files = git_repo.untracked_files
-    # Get a list of diffs of the working tree to the index
-    git_diff = git_repo.index.diff(None)
-    git_diff_files = [d.a_path for d in git_diff]
-    git_staged = git_repo.index.diff("HEAD")
-    git_staged_files = [d.a_path for d in git_staged]
-    # See if we're ahead and/or behind origin remote
-    # From https://stackoverflow.com/a/52757014/2284865
-    ahead = 0
-    behind = 0
-    # Porcelain v2 is easier to parse, branch shows ahead/behind
-    repo_status = git_repo.git.status(porcelain="v2", branch=True)
-    ahead_behind_match = re.search(
-        r"#\sbranch\.ab\s\+(\d+)\s-(\d+)", repo_status
-    )
-    # If no remotes exist or the HEAD is detached, there is no ahead/behind
-    if ahead_behind_match:
-        ahead = int(ahead_behind_match.group(1))
-        behind = int(ahead_behind_match.group(2))
+    # One porcelain v2 status call gets changes and ahead/behind counts
+    git_status = calkit.git.get_status_for_polling(repo=git_repo)
     # If the DVC remote is not configured properly, we might raise a
     # dvc.config.ConfigError here
     try:
@@ -337,16 +323,59 @@ def get_status(
     return {
         "dvc": dvc_status,
         "git": {
-            "untracked": untracked_git_files,
-            "changed": git_diff_files,
-            "staged": git_staged_files,
-            "commits_ahead": ahead,
-            "commits_behind": behind,
+            "untracked": git_status.untracked,
+            "changed": git_status.changed,
+            "staged": git_status.staged,
+            "commits_ahead": git_status.commits_ahead,
+            "commits_behind": git_status.commits_behind,
         },
         "errors": errors,
     }
 
 
+# Seconds between keepalive comments on idle event streams
+STATUS_EVENTS_KEEPALIVE = 15
+
+
+@app.get("/projects/{owner_name}/{project_name}/status/events")
+async def get_status_events(
+    owner_name: str, project_name: str
+) -> StreamingResponse:
+    """Stream pipeline and Git status as server-sent events.
+
+    The current status is sent first, then an update each time files in the
+    project change, so clients don't need to poll ``status``.
+    """
+    project = get_local_project(
+        owner_name, project_name, get_jupyter_server=False
+    )
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue[dict] = asyncio.Queue()
+
+    def on_event(event: dict) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    unsubscribe = await asyncio.to_thread(
+        calkit.watch.watch_status, project.wdir, on_event
+    )
+
+    async def stream():
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        events.get(), timeout=STATUS_EVENTS_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: status\ndata: {json.dumps(event)}\n\n"
+        finally:
+            await asyncio.to_thread(unsubscribe)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
 class GitIgnorePut(BaseModel):
     path: str
     commit: bool = True
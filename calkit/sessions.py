@@ -0,0 +1,93 @@
+"""Shared HTTP sessions.
+
+A bare ``requests.get`` opens a new connection, and for HTTPS repeats the TLS
+handshake, every time. Requests made through the sessions here reuse pooled
+keep-alive connections instead, which adds up for loops of small calls like
+filesystem operations, release uploads, and dataset imports.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connections kept open per host. More can be in use at once, but the extras
+# are closed rather than kept. Not blocking beyond this avoids deadlock when a
+# thread holding a streamed response makes another request.
+POOL_SIZE = 16
+# Thread pools making requests are bounded to this, so each worker's
+# connection can be kept alive
+MAX_WORKERS = POOL_SIZE
+# Number of hosts with pools kept open at once
+N_POOLS = 8
+MAX_RETRIES = 5
+RETRY_BACKOFF_S = 0.5
+# Statuses worth retrying, since they're usually transient
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Longest a server's Retry-After header can make a request wait
+MAX_RETRY_AFTER_S = 60.0
+
+_sessions: dict[tuple[int, str, bool], requests.Session] = {}
+_lock = threading.Lock()
+
+
+class _Retry(Retry):
+    """A ``Retry`` that waits no longer than ``MAX_RETRY_AFTER_S`` for a
+    ``Retry-After`` header, so a server can't block the CLI for hours.
+    """
+
+    def get_retry_after(self, response) -> float | None:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER_S)
+
+
+def make_retry() -> Retry:
+    """Retry idempotent requests on connection errors and transient statuses.
+
+    Backoff is exponential, and a ``Retry-After`` header is honored, up to
+    ``MAX_RETRY_AFTER_S``. Once retries run out the last response is
+    returned rather than raised, so callers see the status as they would
+    without retries.
+    """
+    return _Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF_S,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def get_session(
+    name: str = "default", retries: bool = True
+) -> requests.Session:
+    """Return the session shared by everything in this process using ``name``.
+
+    Sessions are shared across threads for their connection pools, which
+    are thread-safe. Their cookie jars and headers aren't, so use them for
+    stateless requests, passing any auth or headers per request rather than
+    setting them on the session. Callers that implement their own retry
+    policy should pass ``retries=False`` so retries don't compound.
+    """
+    # Sessions aren't carried over into a forked process, since its pooled
+    # sockets would be shared with the parent
+    key = (os.getpid(), name, retries)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=N_POOLS,
+                pool_maxsize=POOL_SIZE,
+                max_retries=make_retry() if retries else 0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[key] = session
+        return session
@@ -1785,6 +1785,92 @@ def test_use_version_without_uvx(monkeypatch):
     assert "uvx" in (result.output + (result.stderr or ""))
 
 
+def test_run_parallel(tmp_dir):
+    subprocess.check_call(["calkit", "init"])
+    with open("run.sh", "w") as f:
+        # Fail for x==3 only while the FAIL sentinel exists
+        f.write('if [ "$1" = "3" ] && [ -f FAIL ]; then exit 1; fi\n')
+        f.write("sleep 2\n")
+        f.write('cat prep.txt > "out-$1.txt"\n')
+    ck_info = {
+        "pipeline": {
+            "stages": {
+                "prep": {
+                    "kind": "command",
+                    "environment": "_system",
+                    "command": "echo prep > prep.txt",
+                    "outputs": ["prep.txt"],
+                },
+                "sweep": {
+                    "kind": "shell-script",
+                    "script_path": "run.sh",
+                    "environment": "_system",
+                    "args": ["{x}"],
+                    "iterate_over": [
+                        {"arg_name": "x", "values": [1, 2, 3, 4]}
+                    ],
+                    "inputs": ["prep.txt"],
+                    "outputs": ["out-{x}.txt"],
+                    "resources": {"cpus": 0.5, "memory": "1M"},
+                },
+                "collect": {
+                    "kind": "command",
+                    "environment": "_system",
+                    "command": "cat out-1.txt out-2.txt > all.txt",
+                    "inputs": ["out-1.txt", "out-2.txt"],
+                    "outputs": ["all.txt"],
+                },
+                "collect-all": {
+                    "kind": "command",
+                    "environment": "_system",
+                    "command": "cat out-*.txt > all-all.txt",
+                    "inputs": [f"out-{x}.txt" for x in [1, 2, 3, 4]],
+                    "outputs": ["all-all.txt"],
+                },
+            }
+        },
+    }
+    with open("calkit.yaml", "w") as f:
+        calkit.ryaml.dump(ck_info, f)
+    open("FAIL", "w").close()
+    result = subprocess.run(
+        ["calkit", "run", "-j", "4"], capture_output=True, text=True
+    )
+    assert result.returncode != 0
+    # Stages that don't depend on the failed item still ran, and those
+    # that do were skipped
+    assert "1 stage(s) failed: sweep@3; skipped 1" in result.stderr
+    for fname in ["prep.txt", "out-1.txt", "out-2.txt", "out-4.txt"]:
+        assert os.path.exists(fname)
+    assert os.path.exists("all.txt")
+    assert not os.path.exists("all-all.txt")
+    # The items ran at the same time, so the critical path is about as long
+    # as the whole run
+    assert "Critical path" in result.stdout
+    log_path = os.path.join(
+        ".calkit", "local", "logs", "stages", "sweep@3.log"
+    )
+    assert os.path.isfile(log_path)
+    # Resume: only the failed item runs, and then what depends on it
+    os.remove("FAIL")
+    out = subprocess.check_output(["calkit", "run", "-j", "4"], text=True)
+    assert "✅ sweep@3" in out
+    assert "✅ collect-all" in out
+    assert "✅ sweep@1" not in out
+    assert "✅ prep" not in out
+    assert "Ran 2 stages" in out
+    assert os.path.exists("all-all.txt")
+    # Everything was recorded, so a serial run has nothing to do
+    out = subprocess.check_output(["calkit", "run"], text=True)
+    assert "Running stage" not in out
+    # Options that make the run serial say that --jobs is ignored
+    result = subprocess.run(
+        ["calkit", "run", "-j", "4", "--dry"], capture_output=True, text=True
+    )
+    assert result.returncode == 0
+    assert "--jobs is ignored with --dry" in result.stdout
+
+
 @skipif_windows_mock_scheduler
 def test_run_concurrent_scheduler_stage_with_mock(tmp_dir):
     # Exercise the full concurrent-scheduler path on a plain host: an
@@ -1844,6 +1930,64 @@ def test_run_concurrent_scheduler_stage_with_mock(tmp_dir):
     assert "sweep@3" in queue
 
 
+@skipif_windows_mock_scheduler
+def test_run_scheduler_stage_as_job_array_with_mock(tmp_dir):
+    # With scheduler.array, a sweep's items are submitted together as one job
+    # array, each task's result is recorded as its item's job, and a failed
+    # item is resubmitted on the next run like any other
+    from calkit.cli.scheduler import _load_jobs
+
+    env = {**os.environ, "CALKIT_MOCK_SCHEDULER": "1"}
+    subprocess.check_call(["calkit", "init"])
+    with open("run.sh", "w") as f:
+        f.write('if [ "$1" = "3" ] && [ -f FAIL ]; then exit 1; fi\n')
+        f.write('echo "$1" > "out-$1.txt"\n')
+    ck_info = {
+        "environments": {"slurm": {"kind": "slurm"}},
+        "pipeline": {
+            "stages": {
+                "sweep": {
+                    "kind": "shell-script",
+                    "script_path": "run.sh",
+                    "environment": "slurm",
+                    "args": ["{x}"],
+                    "iterate_over": [
+                        {"arg_name": "x", "values": [1, 2, 3, 4]}
+                    ],
+                    "outputs": ["out-{x}.txt"],
+                    "scheduler": {"array": True},
+                }
+            }
+        },
+    }
+    with open("calkit.yaml", "w") as f:
+        calkit.ryaml.dump(ck_info, f)
+    open("FAIL", "w").close()
+    result = subprocess.run(
+        ["calkit", "run"], env=env, capture_output=True, text=True
+    )
+    assert result.returncode != 0
+    assert "Submitting 4 'sweep' jobs as a job array" in result.stdout
+    assert "Submitted 4 jobs as job array" in result.stdout
+    assert "1 of 4 'sweep' jobs failed: sweep@3" in result.stderr
+    for x in [1, 2, 4]:
+        assert os.path.exists(f"out-{x}.txt")
+    assert not os.path.exists("out-3.txt")
+    jobs = _load_jobs()
+    array_ids = {jobs[f"sweep@{x}"]["array_id"] for x in [1, 2, 3, 4]}
+    assert len(array_ids) == 1
+    assert jobs["sweep@3"]["exit_code"] == 1
+    assert jobs["sweep@1"]["job_id"].startswith(array_ids.pop() + "_")
+    # The successful items were recorded, so only the failed one runs again,
+    # which, alone, is submitted on its own
+    os.remove("FAIL")
+    out = subprocess.check_output(["calkit", "run"], env=env, text=True)
+    assert "Submitted 4 jobs" not in out
+    assert "Running stage 'sweep@1'" not in out
+    assert os.path.exists("out-3.txt")
+    assert "array_id" not in _load_jobs()["sweep@3"]
+
+
 @skipif_windows_mock_scheduler
 def test_run_with_mock_scheduler_flag(tmp_dir):
     # The --mock-scheduler/-K flag runs scheduler stages locally without
@@ -9,6 +9,7 @@ import sys
 import pytest
 
 import calkit
+from calkit.cli.check import _venv_matches_lock
 
 
 def test_check_venv(tmp_dir):
@@ -67,6 +68,45 @@ def test_check_venv(tmp_dir):
     )
 
 
+def test_venv_matches_lock(tmp_dir):
+    prefix = ".venv"
+    sp_dir = os.path.join(prefix, "lib", "python3.12", "site-packages")
+    for name, version in [("Requests", "2.32.3"), ("pip", "24.0")]:
+        dist_dir = os.path.join(sp_dir, f"{name}-{version}.dist-info")
+        os.makedirs(dist_dir)
+        with open(os.path.join(dist_dir, "METADATA"), "w") as f:
+            f.write(
+                f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+            )
+    with open(os.path.join(prefix, "pyvenv.cfg"), "w") as f:
+        f.write("home = /usr/bin\nversion_info = 3.12.4\n")
+    with open("reqs.txt", "w") as f:
+        f.write("requests>=2  # HTTP\n")
+    assert not _venv_matches_lock(prefix, "reqs.txt", "lock.txt")
+    # pip doesn't need to be in the lock file
+    with open("lock.txt", "w") as f:
+        f.write("requests==2.32.3\n")
+    assert _venv_matches_lock(prefix, "reqs.txt", "lock.txt")
+    assert _venv_matches_lock(prefix, "reqs.txt", "lock.txt", python="3.12")
+    assert not _venv_matches_lock(prefix, "reqs.txt", "lock.txt", python="3.1")
+    with open("reqs.txt", "w") as f:
+        f.write("requests\npolars")
+    assert not _venv_matches_lock(prefix, "reqs.txt", "lock.txt")
+    # Anything pip would need to interpret falls back to installing
+    with open("reqs.txt", "w") as f:
+        f.write("--index-url https://example.com\nrequests")
+    assert not _venv_matches_lock(prefix, "reqs.txt", "lock.txt")
+    # Adding an extra to an installed package may need new dependencies
+    with open("reqs.txt", "w") as f:
+        f.write("requests[socks]>=2")
+    assert not _venv_matches_lock(prefix, "reqs.txt", "lock.txt")
+    with open("reqs.txt", "w") as f:
+        f.write("requests")
+    with open("lock.txt", "w") as f:
+        f.write("requests==2.31.0\n")
+    assert not _venv_matches_lock(prefix, "reqs.txt", "lock.txt")
+
+
 def test_check_venv_moved(tmp_dir):
     with open("reqs.txt", "w") as f:
         f.write("requests")
@@ -317,3 +357,40 @@ def test_check_envs_preloads_env_vars(tmp_dir, monkeypatch):
     # Should succeed: check envs preloads CALKIT_VAR → path resolves to
     # requirements.txt; without preloading $CALKIT_VAR would not resolve
     subprocess.check_call(["calkit", "check", "envs"])
+
+
+def test_check_pipeline_detect_io(tmp_dir):
+    subprocess.check_call(["calkit", "init"])
+    with open("s1.py", "w") as f:
+        f.write("open('a.txt', 'w')\n")
+    with open("s2.py", "w") as f:
+        f.write("open('a.txt')\nopen('b.txt')\n")
+    ck_info = {
+        "pipeline": {
+            "stages": {
+                "s1": {
+                    "kind": "python-script",
+                    "script_path": "s1.py",
+                    "environment": "_system",
+                    "outputs": ["a.txt"],
+                },
+                "s2": {
+                    "kind": "python-script",
+                    "script_path": "s2.py",
+                    "environment": "_system",
+                    "inputs": [{"from_stage_outputs": "s1"}],
+                },
+            }
+        }
+    }
+    with open("calkit.yaml", "w") as f:
+        calkit.ryaml.dump(ck_info, f)
+    out = subprocess.run(
+        ["calkit", "check", "pipeline", "--detect-io"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    output = out.stdout + out.stderr
+    assert "Stage 's2' may have undeclared inputs: b.txt" in output
+    assert "s1' may" not in output
@@ -1,6 +1,7 @@
 """Tests for ``cli.describe``."""
 
 import json
+import os
 import subprocess
 
 import calkit
@@ -76,3 +77,64 @@ def test_describe_environments(tmp_dir):
     )
     assert proc.returncode != 0
     assert "not found" in proc.stderr
+
+
+def test_describe_runs(tmp_dir):
+    subprocess.check_call(["calkit", "init"])
+    out = subprocess.check_output(["calkit", "describe", "runs"], text=True)
+    assert "No stage runs recorded yet" in out
+    ck_info = {
+        "pipeline": {
+            "stages": {
+                "a": {
+                    "kind": "command",
+                    "environment": "_system",
+                    "command": "sleep 0.5 && echo {n} > a.txt",
+                    "outputs": ["a.txt"],
+                },
+                "b": {
+                    "kind": "command",
+                    "environment": "_system",
+                    "command": "echo {n} > b.txt",
+                    "outputs": ["b.txt"],
+                },
+            }
+        },
+    }
+    for n, jobs in enumerate(["1", "2"]):
+        info = ck_info["pipeline"]["stages"]
+        with open("calkit.yaml", "w") as f:
+            calkit.ryaml.dump(
+                {
+                    "pipeline": {
+                        "stages": {
+                            name: stage
+                            | {"command": stage["command"].format(n=n)}
+                            for name, stage in info.items()
+                        }
+                    }
+                },
+                f,
+            )
+        subprocess.check_call(["calkit", "run", "-j", jobs])
+    # Serial runs record each stage's profile with the run info
+    runs_dir = os.path.join(".calkit", "local", "runs")
+    run_infos = []
+    for fname in sorted(os.listdir(runs_dir)):
+        with open(os.path.join(runs_dir, fname)) as f:
+            run_infos.append(json.load(f))
+    assert run_infos[0]["stages"]["a"]["profile"]["wall_time"] >= 0.5
+    out = subprocess.check_output(
+        ["calkit", "describe", "runs", "--json"], text=True
+    )
+    summaries = {s["stage"]: s for s in json.loads(out)}
+    assert set(summaries) == {"a", "b"}
+    assert summaries["a"]["runs"] == 2
+    assert summaries["a"]["latest"]["wall_time"] >= 0.5
+    assert summaries["a"]["max_rss"] > 0
+    out = subprocess.check_output(
+        ["calkit", "describe", "runs", "-s", "a"], text=True
+    )
+    assert out.splitlines()[0].split()[:3] == ["Stage", "Runs", "Wall"]
+    assert out.splitlines()[1].split()[:2] == ["a", "2"]
+    assert len(out.splitlines()) == 2
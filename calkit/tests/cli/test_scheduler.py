@@ -9,26 +9,41 @@ from concurrent.futures import ThreadPoolExecutor
 import pytest
 import typer
 
+import calkit
 import calkit.cli.scheduler as sched
 from calkit.cli.scheduler import (
     _active_job_ids,
+    _array_task_id,
+    _auto_size_options,
+    _build_array_script,
     _build_job_command,
+    _build_pbs_array_submit,
     _build_pbs_submit,
+    _build_slurm_array_submit,
     _build_slurm_submit,
     _count_queued_jobs,
     _finalize_job,
+    _get_auto_size_options,
     _is_active,
+    _load_accounting,
     _load_jobs,
     _mock_enabled,
     _mock_submit,
+    _parse_batch_command,
+    _parse_duration,
+    _parse_memory,
+    _parse_pbs_accounting,
+    _parse_sacct_accounting,
     _parse_slurm_exit_code,
     _poll_job,
     _record_job,
     _record_job_result,
     _sanitize_pbs_job_name,
     _slurm_exit_code,
+    _suggest_resources,
     _wait_for_output_file,
     _wait_until_done,
+    run_job_arrays,
 )
 
 
@@ -471,6 +486,9 @@ def test_active_job_ids_slurm(monkeypatch):
     # Array and step ids belong to the job we recorded.
     result.update(returncode=0, stdout="7_2\n8.batch\n")
     assert _active_job_ids("slurm", ["7", "8"]) == {"7", "8"}
+    # Tasks of an array, each listed on its own line, are recorded as such
+    assert "-r" in calls[-1]
+    assert _active_job_ids("slurm", ["7_1", "7_2", "7_3"]) == {"7_2"}
     # If squeue fails we fall back to polling each job rather than reporting
     # an empty queue we never confirmed---which would let submissions through.
     calls.clear()
@@ -609,3 +627,259 @@ def test_queue_lock_is_exclusive(tmp_dir):
     # Whoever went first finished before the other started.
     assert order[0].startswith("enter")
     assert order[1] == order[0].replace("enter", "exit")
+
+
+def test_parse_accounting():
+    assert _parse_duration("1-02:03:04") == 93784
+    assert _parse_duration("02:03:04") == 7384
+    assert _parse_duration("03:04.500") == 184.5
+    assert _parse_duration("UNLIMITED") is None
+    assert _parse_memory("2048K") == 2 * 1024**2
+    assert _parse_memory("4000Mn") == 4000 * 1024**2
+    assert _parse_memory("4Gc") == 4 * 1024**3
+    assert _parse_memory("123456kb") == 123456 * 1024
+    assert _parse_memory("") is None
+    usage = _parse_sacct_accounting(
+        "12|COMPLETED|00:10:00|00:15:00||4|16G|04:00:00\n"
+        "12.batch|COMPLETED|00:10:00|00:14:59|3145728K|4||\n"
+        "12.extern|COMPLETED|00:10:00|00:00:01|1024K|4||\n"
+    )
+    assert usage == {
+        "state": "COMPLETED",
+        "elapsed": 600,
+        "cpu_time": 900,
+        "max_rss": 3 * 1024**3,
+        "cpus": 4,
+        "requested_memory": 16 * 1024**3,
+        "requested_time": 14400,
+    }
+    assert _parse_sacct_accounting("") is None
+    usage = _parse_pbs_accounting(
+        "Job Id: 7.server\n"
+        "    job_state = F\n"
+        "    resources_used.cput = 00:20:00\n"
+        "    resources_used.mem = 2097152kb\n"
+        "    resources_used.ncpus = 2\n"
+        "    resources_used.walltime = 00:10:00\n"
+        "    Resource_List.mem = 8gb\n"
+        "    Resource_List.walltime = 02:00:00\n"
+    )
+    assert usage == {
+        "state": "F",
+        "elapsed": 600,
+        "cpu_time": 1200,
+        "max_rss": 2 * 1024**3,
+        "cpus": 2,
+        "requested_memory": 8 * 1024**3,
+        "requested_time": 7200,
+    }
+    assert _parse_pbs_accounting("job_state = Q\n") is None
+
+
+def test_suggest_resources():
+    records = [
+        {
+            "exit_code": 0,
+            "elapsed": elapsed,
+            "cpu_time": elapsed * 1.5,
+            "max_rss": 1000 * 1024**2,
+            "cpus": 8,
+        }
+        for elapsed in [600, 620, 640, 4800]
+    ]
+    # Failed jobs aren't counted
+    records.append({"exit_code": 1, "elapsed": 14400, "max_rss": 10})
+    assert _suggest_resources(records[:2]) is None
+    suggestion = _suggest_resources(records)
+    assert suggestion["jobs"] == 4
+    # The 95th percentile of 4 jobs is the slowest, plus the margin, rounded
+    # up to the minute
+    assert suggestion["time"] == 100 * 60
+    assert suggestion["memory"] == 1250 * 1024**2
+    assert suggestion["cpus"] == 2
+    assert _auto_size_options("slurm", suggestion, []) == [
+        "--time=100",
+        "--mem=1250M",
+        "--cpus-per-task=2",
+    ]
+    # CPUs aren't set per task for jobs with several tasks
+    assert _auto_size_options("slurm", suggestion, ["--ntasks=16"]) == [
+        "--time=100",
+        "--mem=1250M",
+    ]
+    assert _auto_size_options("pbs", suggestion, []) == [
+        "-l",
+        "walltime=01:40:00",
+        "-l",
+        "mem=1250mb",
+    ]
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32",
+    reason="TODO: mock scheduler invokes a .sh script directly; not portable to Windows",
+)
+def test_auto_size_from_finished_jobs(tmp_dir, monkeypatch):
+    monkeypatch.setenv("CALKIT_MOCK_SCHEDULER", "1")
+    for n in range(4):
+        name = f"sweep@{n}"
+        exit_code = 3 if n == 3 else 0
+        with open("job.sh", "w") as f:
+            f.write(f"sleep 0.2\nexit {exit_code}\n")
+        command = _build_job_command(
+            "job.sh", [], setup_cmds=[], is_command=False
+        )
+        job_id = f"job{n}"
+        submitted_at = calkit.utcnow().isoformat()
+        pid = _mock_submit(
+            job_id=job_id, job_command=command, log_path="job.log"
+        )
+        _record_job(
+            name,
+            {
+                "job_id": job_id,
+                "pid": pid,
+                "kind": "slurm",
+                "submitted_at": submitted_at,
+            },
+        )
+        exit_code = _wait_until_done("slurm", job_id, name)
+        if n < 3:
+            _finalize_job(name, job_id, exit_code, "job.log", kind="slurm")
+            # Finalizing again doesn't count the job twice
+            _finalize_job(name, job_id, exit_code, "job.log", kind="slurm")
+            assert len(_load_accounting("sweep")) == n + 1
+            if n == 1:
+                # Not enough jobs on record yet
+                assert _get_auto_size_options("slurm", "sweep@9", []) == []
+        else:
+            with pytest.raises(typer.Exit):
+                _finalize_job(name, job_id, exit_code, "job.log", kind="slurm")
+            records = _load_accounting("sweep")
+            assert records[-1]["exit_code"] == 3
+        if n == 2:
+            records = _load_accounting("sweep")
+            assert all(0.2 <= r["elapsed"] < 5 for r in records)
+            assert _get_auto_size_options("slurm", "sweep@9", []) == [
+                "--time=1"
+            ]
+    # After a failure, the configured resources are used as they are
+    assert _get_auto_size_options("slurm", "sweep@9", []) == []
+
+
+def test_parse_batch_command():
+    params = _parse_batch_command(
+        "calkit scheduler batch --name sweep@1 --environment slurm "
+        "--dep run.sh --out out-1.txt --option --time=10 "
+        "--setup 'module load x' --auto-size -- run.sh 1 --flag"
+    )
+    assert params["name"] == "sweep@1"
+    assert params["environment"] == "slurm"
+    assert params["target"] == "run.sh"
+    assert params["args"] == ["1", "--flag"]
+    assert params["deps"] == ["run.sh"]
+    assert params["outs"] == ["out-1.txt"]
+    assert params["options"] == ["--time=10"]
+    assert params["setup_cmds"] == ["module load x"]
+    assert params["auto_size"]
+    assert params["env_default_options"] == "replace"
+    assert _parse_batch_command("python run.py") is None
+    # Invalid commands are left for the batch command to report
+    assert _parse_batch_command("calkit scheduler batch run.sh") is None
+
+
+def test_build_array_submit():
+    jobs = [
+        {"log_path": "logs/sweep@1.out", "command": "run.sh 1"},
+        {"log_path": "logs/sweep@2.out", "command": "run.sh 2"},
+    ]
+    script = _build_array_script("slurm", jobs)
+    assert script.startswith("#!/bin/bash\n")
+    assert 'case "$SLURM_ARRAY_TASK_ID" in' in script
+    assert "    1)\n        exec > logs/sweep@2.out 2>&1\n" in script
+    assert "        run.sh 2\n" in script
+    script = _build_array_script("pbs", jobs)
+    assert 'cd "$PBS_O_WORKDIR" || exit 1' in script
+    assert 'case "$PBS_ARRAY_INDEX" in' in script
+    cmd = _build_slurm_array_submit("sweep", 2, ["--time=10"], None)
+    assert cmd[:5] == [
+        "sbatch",
+        "--parsable",
+        "--job-name",
+        "sweep",
+        "--array=0-1",
+    ]
+    assert cmd[-1] == "--time=10"
+    cmd = _build_slurm_array_submit("sweep", 8, [], 3)
+    assert "--array=0-7%3" in cmd
+    cmd = _build_pbs_array_submit("sweep", 8, ["-l", "walltime=1:00:00"], 3)
+    assert cmd[:5] == ["qsub", "-N", "sweep", "-J", "0-7"]
+    assert cmd[cmd.index("-W") + 1] == "max_run_subjobs=3"
+    assert cmd[-3:] == ["-l", "walltime=1:00:00", "-"]
+    assert _array_task_id("slurm", "42", 3) == "42_3"
+    assert _array_task_id("pbs", "42[].server", 3) == "42[3].server"
+
+
+def test_run_job_arrays(tmp_dir, monkeypatch):
+    monkeypatch.delenv("CALKIT_MOCK_SCHEDULER", raising=False)
+    with open("calkit.yaml", "w") as f:
+        f.write("environments:\n  hpc:\n    kind: slurm\n")
+    with open("run.sh", "w") as f:
+        f.write("echo $1\n")
+    calls = []
+
+    def _fake_run(cmd, *args, **kwargs):
+        calls.append((cmd, kwargs.get("input")))
+        stdout = ""
+        if cmd[0] == "sbatch":
+            stdout = "42\n"
+        elif cmd[0] == "squeue":
+            # Only the job submitted before is still queued
+            stdout = "7\n"
+        elif cmd[0] == "scontrol":
+            task = cmd[-1].split("_")[1]
+            code = "2:0" if task == "1" else "0:0"
+            state = "FAILED" if task == "1" else "COMPLETED"
+            stdout = f"JobState={state} ExitCode={code}\n"
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(sched.subprocess, "run", _fake_run)
+    # Accounting isn't what's tested here
+    monkeypatch.setattr(sched, "_job_accounting", lambda *args: None)
+    commands = {
+        f"sweep@{x}": (
+            f"calkit scheduler batch --name sweep@{x} --environment hpc "
+            f"--option --time=10 -- run.sh {x}"
+        )
+        for x in range(3)
+    }
+    # One with its own options goes alone, so it's left to its own command
+    commands["sweep@big"] = (
+        "calkit scheduler batch --name sweep@big --environment hpc "
+        "--option --time=600 -- run.sh big"
+    )
+    # One already queued is waited for by its own command
+    _record_job("sweep@queued", {"kind": "slurm", "job_id": "7"})
+    commands["sweep@queued"] = (
+        "calkit scheduler batch --name sweep@queued --environment hpc "
+        "--option --time=10 -- run.sh queued"
+    )
+    exit_codes = run_job_arrays(commands)
+    assert exit_codes == {"sweep@0": 0, "sweep@1": 2, "sweep@2": 0}
+    submits = [(cmd, script) for cmd, script in calls if cmd[0] == "sbatch"]
+    assert len(submits) == 1
+    cmd, script = submits[0]
+    assert "--array=0-2" in cmd
+    assert "--time=10" in cmd
+    assert "run.sh 2" in script
+    jobs = sched._load_jobs()
+    assert jobs["sweep@1"]["job_id"] == "42_1"
+    assert jobs["sweep@1"]["array_id"] == "42"
+    assert jobs["sweep@1"]["exit_code"] == 2
+    assert jobs["sweep@0"]["deps"] == ["run.sh"]
+    assert "sweep@big" not in jobs
+    assert jobs["sweep@queued"]["job_id"] == "7"
+    # Run again, finished jobs with results to reuse aren't resubmitted
+    calls.clear()
+    run_job_arrays({k: commands[k] for k in ["sweep@0", "sweep@2"]})
+    assert not [cmd for cmd, _ in calls if cmd[0] == "sbatch"]
@@ -1,6 +1,15 @@
 """Tests for JupyterLab extension server routes."""
 
+import asyncio
 import json
+import sys
+import threading
+import time
+
+import pytest
+import tornado
+
+from calkit.jupyterlab import routes
 
 
 async def test_hello(jp_fetch):
@@ -14,3 +23,118 @@ async def test_hello(jp_fetch):
             " Try visiting me in your browser!"
         ),
     }
+
+
+async def test_pipeline_status_is_coalesced(jp_fetch, monkeypatch):
+    calls = []
+    started = threading.Event()
+
+    def get_pipeline_status(wdir):
+        calls.append(wdir)
+        started.set()
+        time.sleep(0.5)
+        return 200, {"stale_stages": {"a": ["changed"]}, "is_outdated": True}
+
+    monkeypatch.setattr(routes, "_get_pipeline_status", get_pipeline_status)
+    first = asyncio.ensure_future(jp_fetch("calkit", "pipeline", "status"))
+    # The event loop stays free while the status is computed
+    while not started.is_set():
+        await asyncio.sleep(0.01)
+    response = await jp_fetch("calkit", "hello")
+    assert response.code == 200
+    responses = await asyncio.gather(
+        first, *[jp_fetch("calkit", "pipeline", "status") for _ in range(4)]
+    )
+    assert len(calls) == 1
+    for response in responses:
+        assert json.loads(response.body)["is_outdated"]
+
+
+async def test_pipeline_runs(jp_fetch, monkeypatch):
+    script = (
+        "import sys, time\n"
+        "for n in range(3):\n"
+        "    print('line', n, flush=True)\n"
+        "    time.sleep(0.1)\n"
+        "sys.exit(1 if 'bad' in sys.argv else 0)\n"
+    )
+    monkeypatch.setattr(
+        routes,
+        "_pipeline_run_command",
+        lambda targets: [sys.executable, "-c", script, *targets],
+    )
+    response = await jp_fetch(
+        "calkit",
+        "pipeline",
+        "runs",
+        method="POST",
+        body=json.dumps({"targets": ["good"], "background": True}),
+    )
+    assert response.code == 202
+    run = json.loads(response.body)
+    assert run["status"] in ["queued", "running"]
+    response = await jp_fetch(
+        "calkit", "pipeline", "runs", "events", params={"id": run["id"]}
+    )
+    assert response.headers["Content-Type"] == "text/event-stream"
+    events = [
+        block.split("\n")
+        for block in response.body.decode().strip().split("\n\n")
+    ]
+    assert [json.loads(e[1].removeprefix("data: ")) for e in events[:-1]] == [
+        "line 0",
+        "line 1",
+        "line 2",
+    ]
+    assert events[-1][0] == "event: status"
+    assert json.loads(events[-1][1].removeprefix("data: "))["status"] == (
+        "succeeded"
+    )
+    response = await jp_fetch(
+        "calkit", "pipeline", "runs", params={"id": run["id"]}
+    )
+    assert json.loads(response.body)["log"] == "line 0\nline 1\nline 2"
+    # Without running in the background, the response waits for the run
+    with pytest.raises(tornado.httpclient.HTTPClientError) as e:
+        await jp_fetch(
+            "calkit",
+            "pipeline",
+            "runs",
+            method="POST",
+            body=json.dumps({"targets": ["bad"]}),
+        )
+    assert e.value.code == 500
+    # The error carries the end of the run's output
+    assert e.value.response is not None
+    error = json.loads(e.value.response.body)
+    assert error["status"] == "failed"
+    assert error["error"].endswith("line 0\nline 1\nline 2")
+
+
+async def test_pipeline_status_events(jp_fetch, monkeypatch):
+    unsubscribed = threading.Event()
+
+    def watch_status(wdir, callback):
+        callback({"seq": 0, "pipeline": {"stale_stages": {}}})
+        callback({"seq": 1, "pipeline": {"stale_stages": {"a": {}}}})
+        return unsubscribed.set
+
+    monkeypatch.setattr(routes.calkit.watch, "watch_status", watch_status)
+    chunks = []
+    with pytest.raises(tornado.httpclient.HTTPClientError):
+        await jp_fetch(
+            "calkit",
+            "pipeline",
+            "status",
+            "events",
+            streaming_callback=chunks.append,
+            request_timeout=1,
+        )
+    events = b"".join(chunks).decode().strip().split("\n\n")
+    assert [json.loads(e.split("data: ")[1])["seq"] for e in events] == [0, 1]
+    # The subscription ends when the client goes away
+    for _ in range(50):
+        if unsubscribed.is_set():
+            break
+        await asyncio.sleep(0.1)
+    assert unsubscribed.is_set()
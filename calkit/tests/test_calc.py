@@ -1,5 +1,8 @@
 """Tests for ``calkit.calc``."""
 
+import os
+import time
+
 import pytest
 
 import calkit
@@ -43,14 +46,120 @@ def test_formula():
 
 
 def test_lookuptable():
-    _ = calkit.calc.LookupTable(
-        inputs=["x"],
-        output="something",
-        params=calkit.calc.LookupTableParams(
-            x_values=[1, 2, 3], y_values=[4, 5, 6]
-        ),
+    np = pytest.importorskip("numpy")
+    xs = [0.5, 1, 1.5, 2, 2.5, 3, 3.5]
+    expected = {
+        "floor": [4, 4, 4, 5, 5, 6, 6],
+        "ceil": [4, 4, 5, 5, 6, 6, 6],
+        "round": [4, 4, 4, 5, 5, 6, 6],
+        "interpolate": [4, 4, 4.5, 5, 5.5, 6, 6],
+    }
+    for method, ys in expected.items():
+        calc = calkit.calc.LookupTable(
+            inputs=["x"],
+            output="something",
+            params=calkit.calc.LookupTableParams(
+                x_values=[1, 2, 3], y_values=[4, 5, 6], method=method
+            ),
+        )
+        assert [calc.evaluate(x=x) for x in xs] == ys
+        res = calc.evaluate_many(x=np.array(xs))
+        np.testing.assert_array_equal(res, ys)
+    with pytest.raises(ValueError):
+        calkit.calc.LookupTable(
+            inputs=["x"],
+            output="y",
+            params=calkit.calc.LookupTableParams(
+                x_values=[2, 1], y_values=[4, 5]
+            ),
+        )
+
+
+def test_evaluate_many():
+    np = pytest.importorskip("numpy")
+    calc = calkit.calc.Formula(
+        params=dict(formula="0.2151 * x + y**2"),
+        inputs=[{"name": "x"}, {"name": "y", "max": 2}],
+        output="z",
     )
-    # TODO: Implement this
+    x = np.linspace(0, 10, 5)
+    res = calc.evaluate_many(x=x, y=[0.1, 0.2, 0.3, 0.4, 0.5])
+    assert res.dtype == np.float64
+    expected = [
+        calc.evaluate(x=xi, y=yi)
+        for xi, yi in zip(x, [0.1, 0.2, 0.3, 0.4, 0.5])
+    ]
+    np.testing.assert_allclose(res, expected)
+    # Scalars broadcast against columns
+    res = calkit.calc.evaluate_many(calc, x=x, y=1)
+    np.testing.assert_allclose(res, 0.2151 * x + 1)
+    with pytest.raises(ValueError):
+        calc.evaluate_many(x=x)
+    with pytest.raises(ValueError, match="is too large"):
+        calc.evaluate_many(x=x, y=[0, 1, 2, 3, 4])
+    calc = calkit.calc.Linear(
+        params=calkit.calc.LinearParams(coeffs=dict(a=2, b=3), offset=1),
+        inputs=["a", "b"],
+        output=calkit.calc.Output(name="c", dtype="int"),
+    )
+    res = calc.evaluate_many(a=[1, 2, 3], b=[0, 1, 2])
+    assert res.dtype == np.int64
+    np.testing.assert_array_equal(res, [3, 8, 13])
+
+
+def test_formula_evaluate_many_matches_evaluate():
+    np = pytest.importorskip("numpy")
+    x = [-1.0, 0.0, 2.0]
+    y = [0.0, 1.0, 0.0]
+    for formula in [
+        "1 / x",
+        "x // y",
+        "x % y",
+        "x and y",
+        "x or y",
+        "not x",
+        "x * 2 and not y",
+    ]:
+        calc = calkit.calc.Formula(
+            params=dict(formula=formula), inputs=["x", "y"], output="z"
+        )
+        res = calc.evaluate_many(x=x, y=y)
+        expected = [calc.evaluate(x=xi, y=yi) for xi, yi in zip(x, y)]
+        np.testing.assert_array_equal(res, expected, err_msg=formula)
+
+
+def test_xgboost_evaluate_many(tmp_dir, monkeypatch):
+    np = pytest.importorskip("numpy")
+    predictions = []
+
+    class Model:
+        def predict(self, features):
+            predictions.append(features)
+            return features.sum(axis=1)
+
+    loads = []
+
+    def load_model(model_type, path, mtime_ns):
+        loads.append(path)
+        return Model()
+
+    monkeypatch.setattr(calkit.calc, "_load_xgboost_model", load_model)
+    with open("model.json", "w") as f:
+        f.write("{}")
+    calc = calkit.calc.XGBoostModel(
+        params=dict(path="model.json", type="regressor"),
+        inputs=[{"name": "a"}, {"name": "b", "min": 0}],
+        output="y",
+    )
+    res = calc.evaluate_many(a=[1, 2, 3], b=0.5)
+    np.testing.assert_allclose(res, [1.5, 2.5, 3.5])
+    # The model is loaded and called once for the whole batch, with one
+    # column per input in declaration order
+    assert loads == ["model.json"]
+    assert len(predictions) == 1
+    np.testing.assert_allclose(predictions[0], [[1, 0.5], [2, 0.5], [3, 0.5]])
+    with pytest.raises(ValueError, match="is too small"):
+        calc.evaluate_many(a=[1, 2, 3], b=[0, -1, 0])
 
 
 def test_linear():
@@ -67,3 +176,100 @@ def test_linear():
     assert (
         res2 == "For input input_voltage=-0.5, the output is load_lbf=-0.54."
     )
+
+
+def test_evaluate_cached(tmp_dir, monkeypatch):
+    calc = calkit.calc.Formula(
+        params=dict(formula="2 * x"), inputs=["x"], output="y"
+    )
+    calls = []
+    calculate = calkit.calc.Formula.calculate
+
+    def counting_calculate(self, **inputs):
+        calls.append(inputs)
+        return calculate(self, **inputs)
+
+    monkeypatch.setattr(calkit.calc.Formula, "calculate", counting_calculate)
+    assert calkit.calc.evaluate_cached(calc, {"x": 2}) == 4
+    # Equivalent inputs after coercion hit the same entry
+    assert calkit.calc.evaluate_cached(calc, {"x": "2.0"}) == 4
+    assert len(calls) == 1
+    assert os.path.isfile(calkit.calc.CALC_CACHE_PATH)
+    # Changing the definition changes the key
+    calc2 = calc.model_copy(
+        update={"params": calkit.calc.FormulaParams(formula="3 * x")}
+    )
+    assert calkit.calc.evaluate_cached(calc2, {"x": 2}) == 6
+    assert len(calls) == 2
+    # Expired entries are recomputed
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert calkit.calc.evaluate_cached(calc, {"x": 2}, ttl="1m") == 4
+    assert len(calls) == 3
+    assert calkit.calc.evaluate_cached(calc, {"x": 2}, ttl="1h") == 4
+    assert len(calls) == 3
+    # Least recently used entries are evicted
+    calkit.calc.evaluate_cached(calc, {"x": 5}, max_entries=2)
+    calkit.calc.evaluate_cached(calc2, {"x": 2})
+    assert len(calls) == 5
+    calkit.calc.clear_cache()
+    calkit.calc.evaluate_cached(calc, {"x": 2})
+    assert len(calls) == 6
+
+
+def test_evaluate_cached_http_request(tmp_dir, monkeypatch):
+    import requests
+
+    calls = []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return float(calls[-1]["params"]["x"]) * 10
+
+    def get(url, **kwargs):
+        calls.append(dict(url=url, **kwargs))
+        return Response()
+
+    monkeypatch.setattr(requests, "get", get)
+    calc_def = {
+        "kind": "http",
+        "params": {"url": "https://example.com/calc"},
+        "inputs": ["x"],
+        "output": "y",
+    }
+    assert calkit.calc.evaluate_cached(calc_def, {"x": 2}) == 20
+    assert calkit.calc.evaluate_cached(calc_def, {"x": 2}) == 20
+    assert len(calls) == 1
+    assert calls[0]["url"] == "https://example.com/calc"
+    assert calkit.calc.evaluate_cached(calc_def, {"x": 3}) == 30
+    assert len(calls) == 2
+
+
+def test_evaluate_cached_touch_interval(tmp_dir, monkeypatch):
+    calc = calkit.calc.Formula(
+        params=dict(formula="2 * x"), inputs=["x"], output="y"
+    )
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    calkit.calc.evaluate_cached(calc, {"x": 2})
+
+    def last_used_at():
+        conn = calkit.calc._cache_open(None)
+        try:
+            return conn.execute("SELECT last_used_at FROM results").fetchone()[
+                0
+            ]
+        finally:
+            conn.close()
+
+    # Hits soon after the last recorded use don't write to the database
+    monkeypatch.setattr(time, "time", lambda: now + 10)
+    assert calkit.calc.evaluate_cached(calc, {"x": 2}) == 4
+    assert last_used_at() == now
+    interval = calkit.calc.CALC_CACHE_TOUCH_INTERVAL_S
+    monkeypatch.setattr(time, "time", lambda: now + interval + 1)
+    assert calkit.calc.evaluate_cached(calc, {"x": 2}) == 4
+    assert last_used_at() == now + interval + 1
@@ -13,9 +13,12 @@ from calkit.conda import (
     _check_single,
     _enrich_pip_deps_from_freeze,
     _get_pip_dependency_list,
+    _run_pip_freeze,
     _split_env_dependencies,
     check_env,
+    export_env_from_prefix,
     find_conda_exe,
+    list_installed_dists,
 )
 
 ENV_NAME = "main"
@@ -132,6 +135,94 @@ def test_get_pip_dependency_list():
     assert dependencies[-1]["pip"] == ["sqlalchemy==2.0.39"]
 
 
+def _write_dist(
+    sp_dir: str,
+    name: str,
+    version: str,
+    installer: str = "pip",
+    direct_url: str | None = None,
+):
+    dist_dir = os.path.join(sp_dir, f"{name}-{version}.dist-info")
+    os.makedirs(dist_dir)
+    with open(os.path.join(dist_dir, "METADATA"), "w") as f:
+        f.write(f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n")
+    with open(os.path.join(dist_dir, "INSTALLER"), "w") as f:
+        f.write(installer + "\n")
+    if direct_url is not None:
+        with open(os.path.join(dist_dir, "direct_url.json"), "w") as f:
+            f.write(direct_url)
+
+
+def test_list_installed_dists(tmp_dir):
+    prefix = os.path.abspath("env")
+    assert list_installed_dists(prefix) is None
+    assert export_env_from_prefix(prefix) is None
+    sp_dir = os.path.join(prefix, "lib", "python3.12", "site-packages")
+    os.makedirs(sp_dir)
+    os.makedirs(os.path.join(prefix, "conda-meta"))
+    for name, version in [("python", "3.12.1"), ("numpy", "2.0.1")]:
+        with open(
+            os.path.join(prefix, "conda-meta", f"{name}-{version}-0.json"),
+            "w",
+        ) as f:
+            f.write(f'{{"name": "{name}", "version": "{version}"}}')
+    _write_dist(sp_dir, "numpy", "2.0.1", installer="conda")
+    _write_dist(sp_dir, "SQLAlchemy", "2.0.39")
+    _write_dist(
+        sp_dir,
+        "pyxdsm",
+        "0.4.0",
+        direct_url=(
+            '{"url": "https://github.com/rebeccamccabe/pyXDSM.git", '
+            '"vcs_info": {"vcs": "git", "commit_id": "fc0b49b1234"}}'
+        ),
+    )
+    _write_dist(
+        sp_dir,
+        "mypackage",
+        "0.1.0",
+        direct_url=(
+            '{"url": "file:///home/me/mypackage", '
+            '"dir_info": {"editable": true}}'
+        ),
+    )
+    dists = list_installed_dists(prefix)
+    assert dists is not None
+    assert [d.name for d in dists] == [
+        "mypackage",
+        "numpy",
+        "pyxdsm",
+        "SQLAlchemy",
+    ]
+    assert dists[0].editable
+    freeze = _run_pip_freeze(prefix)
+    assert freeze == [
+        "-e /home/me/mypackage",
+        "numpy==2.0.1",
+        "pyxdsm @ git+https://github.com/rebeccamccabe/pyXDSM.git@fc0b49b1234",
+        "SQLAlchemy==2.0.39",
+    ]
+    export = export_env_from_prefix(prefix)
+    assert export is not None
+    assert export["prefix"] == prefix
+    conda_deps, pip_deps = _split_env_dependencies(export["dependencies"])
+    assert conda_deps == ["numpy=2.0.1", "python=3.12.1"]
+    # Packages installed by conda don't show up in the pip section, and
+    # editable installs are listed by version so they can be checked
+    assert pip_deps == [
+        "mypackage==0.1.0",
+        "pyxdsm @ git+https://github.com/rebeccamccabe/pyXDSM.git@fc0b49b1234",
+        "SQLAlchemy==2.0.39",
+    ]
+    assert _check_list(
+        "pyxdsm @ git+https://github.com/rebeccamccabe/pyXDSM.git@fc0b49b",
+        pip_deps,
+        env_spec_dir=".",
+    )
+    assert _check_list("sqlalchemy>=2", pip_deps, env_spec_dir=".")
+    assert _check_list("python=3.12", conda_deps, env_spec_dir=".", conda=True)
+
+
 def delete_env(name: str):
     conda = find_conda_exe() or "conda"
     subprocess.check_call([conda, "env", "remove", "-y", "-n", name])
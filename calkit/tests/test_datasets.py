@@ -0,0 +1,131 @@
+"""Tests for ``calkit.datasets``."""
+
+import http.server
+import threading
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import calkit
+from calkit.datasets import read_dataset
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serves one file, honoring range requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_headers(self, status, length, extra=None):
+        self.send_response(status)
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._send_headers(200, len(self.server.data))
+
+    def do_GET(self):
+        data = self.server.data
+        range_header = self.headers.get("Range")
+        if range_header is None:
+            self._send_headers(200, len(data))
+            body = data
+        else:
+            start, end = range_header.removeprefix("bytes=").split("-")
+            end = int(end) if end else len(data) - 1
+            body = data[int(start) : end + 1]
+            self._send_headers(
+                206,
+                len(body),
+                {"Content-Range": f"bytes {start}-{end}/{len(data)}"},
+            )
+        try:
+            self.wfile.write(body)
+            self.server.bytes_sent += len(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client only wanted the headers
+            pass
+
+
+@pytest.fixture
+def file_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    server.daemon_threads = True
+    server.data = b""
+    server.bytes_sent = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield server, f"http://{host}:{port}/data.parquet?signature=abc"
+    server.shutdown()
+    server.server_close()
+
+
+def _make_table(n_rows=1000):
+    return pa.table(
+        {
+            "id": list(range(n_rows)),
+            "group": [["a", "b", "c"][i % 3] for i in range(n_rows)],
+            "value": [i / 10 for i in range(n_rows)],
+        }
+    )
+
+
+def test_read_dataset(tmp_dir):
+    table = _make_table()
+    pq.write_table(table, "data.parquet", row_group_size=100)
+    table.to_pandas().to_csv("data.csv", index=False)
+    filters = [("id", ">=", 900), ("group", "in", ["a", "b"])]
+    for path in ["data.parquet", "data.csv"]:
+        df = read_dataset(path, engine="pandas")
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == 1000
+        df = read_dataset(
+            path, engine="pandas", columns=["value"], filters=filters
+        )
+        assert list(df.columns) == ["value"]
+        assert len(df) == 67
+        assert df["value"].min() == 90.0
+        df = read_dataset(
+            path, engine="polars", columns=["value"], filters=filters
+        )
+        assert isinstance(df, pl.DataFrame)
+        assert df.columns == ["value"]
+        assert df.height == 67
+        lf = read_dataset(path, engine="polars", lazy=True)
+        assert isinstance(lf, pl.LazyFrame)
+        assert lf.filter(pl.col("group") == "c").collect().height == 333
+    with pytest.raises(ValueError, match="polars"):
+        read_dataset("data.csv", engine="pandas", lazy=True)
+    with pytest.raises(ValueError, match="Invalid filter"):
+        read_dataset("data.csv", filters=[("id", "~", 1)])
+
+
+def test_read_dataset_remote(file_server, monkeypatch):
+    server, url = file_server
+    path = "someone/some-project:data.parquet"
+    pa_buf = pa.BufferOutputStream()
+    pq.write_table(_make_table(200_000), pa_buf, row_group_size=10_000)
+    server.data = pa_buf.getvalue().to_pybytes()
+    monkeypatch.setattr(calkit.hub, "get", lambda endpoint: {"url": url})
+    for engine in ["pandas", "polars"]:
+        server.bytes_sent = 0
+        df = read_dataset(
+            path,
+            engine=engine,
+            columns=["value"],
+            filters=[("id", ">=", 195_000)],
+        )
+        assert len(df) == 5000
+        # Only the footer and a column chunk or two are downloaded
+        assert server.bytes_sent < len(server.data) / 4
+    lf = read_dataset(path, engine="polars", lazy=True, columns=["group"])
+    assert lf.collect().height == 200_000
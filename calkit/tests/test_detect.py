@@ -5,12 +5,16 @@ import os
 
 import pytest
 
+import calkit.detect
 from calkit.detect import (
+    clear_io_cache,
     create_julia_project_file,
     create_python_requirements_file,
     create_r_description_file,
     detect_dependencies_from_notebook,
     detect_io,
+    detect_io_cached,
+    detect_io_many,
     detect_julia_dependencies,
     detect_julia_script_io,
     detect_jupyter_notebook_io,
@@ -801,6 +805,77 @@ writedlm("result.csv", data)
     assert "output.csv" in result["outputs"]
 
 
+def test_detect_io_cached(tmp_dir):
+    clear_io_cache()
+    with open("process.py", "w") as f:
+        f.write("open('a.txt')\n")
+    stage = {"kind": "python-script", "script_path": "process.py"}
+    assert detect_io_cached(stage)["inputs"] == ["a.txt"]
+    # Mutating a returned result must not corrupt the cache
+    detect_io_cached(stage)["inputs"].append("junk")
+    assert detect_io_cached(stage)["inputs"] == ["a.txt"]
+    # Editing the script invalidates its entry
+    with open("process.py", "w") as f:
+        f.write("open('b.txt')\n")
+    assert detect_io_cached(stage)["inputs"] == ["b.txt"]
+    # So does editing a sourced R file
+    with open("util.R", "w") as f:
+        f.write("read.csv('x.csv')\n")
+    with open("main.R", "w") as f:
+        f.write("source('util.R')\n")
+    stage = {"kind": "r-script", "script_path": "main.R"}
+    assert detect_io_cached(stage)["inputs"] == ["util.R", "x.csv"]
+    with open("util.R", "w") as f:
+        f.write("read.csv('y.csv')\n")
+    assert detect_io_cached(stage)["inputs"] == ["util.R", "y.csv"]
+
+
+def test_detect_io_cache_is_bounded(tmp_dir, monkeypatch):
+    clear_io_cache()
+    monkeypatch.setattr(calkit.detect, "IO_CACHE_MAX_ENTRIES", 2)
+    stages = [
+        {"kind": "shell-command", "command": f"cp in{i}.dat out{i}.dat"}
+        for i in range(3)
+    ]
+    detect_io_cached(stages[0])
+    detect_io_cached(stages[1])
+    # Using the first entry makes the second the least recently used
+    detect_io_cached(stages[0])
+    detect_io_cached(stages[2])
+    keys = [calkit.detect._io_cache_key(stage) for stage in stages]
+    assert list(calkit.detect._IO_CACHE) == [keys[0], keys[2]]
+    # A batch larger than the cache still returns every result
+    results = detect_io_many(stages, max_workers=1)
+    assert [r["inputs"] for r in results] == [[f"in{i}.dat"] for i in range(3)]
+    assert len(calkit.detect._IO_CACHE) == 2
+    clear_io_cache()
+
+
+def test_detect_io_many(tmp_dir):
+    clear_io_cache()
+    stages = []
+    for i in range(4):
+        with open(f"script{i}.py", "w") as f:
+            f.write(f"open('in{i}.txt')\nopen('out{i}.txt', 'w')\n")
+        stages.append(
+            {"kind": "python-script", "script_path": f"script{i}.py"}
+        )
+    stages.append({"kind": "shell-command", "command": "cp x.dat y.dat"})
+    # Duplicates are fine and come back in order
+    stages.append(stages[0])
+    for max_workers in [1, 2]:
+        results = detect_io_many(stages, max_workers=max_workers)
+        assert len(results) == len(stages)
+        for i in range(4):
+            assert results[i] == {
+                "inputs": [f"in{i}.txt"],
+                "outputs": [f"out{i}.txt"],
+            }
+        assert results[4] == {"inputs": ["x.dat"], "outputs": ["y.dat"]}
+        assert results[5] == results[0]
+        clear_io_cache()
+
+
 # Dependency detection tests
 
 
@@ -1311,6 +1386,83 @@ def test_detect_project_artifacts_includes_results_and_presentations(tmp_dir):
     assert "slides/deck.pdf" in out["presentations"]
 
 
+def test_classify_artifacts():
+    """classify_artifacts matches the separate per-kind detectors."""
+    from calkit.detect import (
+        classify_artifacts,
+        detect_datasets,
+        detect_figures,
+        detect_presentations,
+        detect_results,
+        load_detection_ignore,
+    )
+
+    candidates = [
+        "figures/a.png",
+        "figs/b.pdf",
+        "figures/plot.json",
+        "data/figures/x.json",
+        "data/a.csv",
+        "data/sub/b.csv",
+        "data/sub/c.csv",
+        "results/metrics.json",
+        "results/plot.png",
+        "results/data/d.csv",
+        "slides/deck.pdf",
+        "presentation.pdf",
+        "docs/talk.pdf",
+        "paper/main.tex",
+        ".venv/data/e.csv",
+        "reserved/figures/f.png",
+        "notes.txt",
+    ]
+    reserved = ["reserved", "results/metrics.json"]
+    figures = detect_figures(candidates, reserved_paths=reserved)
+    expected = {
+        "figures": figures,
+        "datasets": detect_datasets(
+            candidates, reserved_paths=reserved, figure_paths=figures
+        ),
+        "results": detect_results(candidates, reserved_paths=reserved),
+        "presentations": detect_presentations(
+            candidates, reserved_paths=reserved
+        ),
+    }
+    # Candidates can be any iterable, e.g., a generator
+    out = classify_artifacts((p for p in candidates), reserved_paths=reserved)
+    assert out == expected
+    assert out["datasets"] == ["data/a.csv", "data/sub", "results/data/d.csv"]
+    assert load_detection_ignore() is None
+
+
+def test_iter_candidate_files(tmp_dir):
+    """Candidates include Git files and streamed DVC-tracked files once."""
+    import subprocess
+
+    from calkit.detect import iter_candidate_files, iter_dvc_tracked_files
+
+    subprocess.check_call(["git", "init", "-q"])
+    subprocess.check_call(["dvc", "init", "-q"])
+    os.makedirs("data/sub")
+    os.makedirs("figures")
+    for fpath in ["data/sub/a.csv", "data/sub/b.csv", "figures/c.png"]:
+        with open(fpath, "w") as f:
+            f.write(fpath)
+    subprocess.check_call(["dvc", "add", "-q", "data", "figures/c.png"])
+    with open("script.py", "w") as f:
+        f.write("")
+    assert sorted(iter_dvc_tracked_files()) == [
+        "data/sub/a.csv",
+        "data/sub/b.csv",
+        "figures/c.png",
+    ]
+    candidates = list(iter_candidate_files())
+    assert len(candidates) == len(set(candidates))
+    assert "script.py" in candidates
+    assert "data/sub/a.csv" in candidates
+    assert "figures/c.png" in candidates
+
+
 def test_detection_ignore(tmp_dir):
     from calkit.detect import (
         detect_artifact_kind,
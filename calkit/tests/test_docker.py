@@ -1,10 +1,29 @@
 """Tests for ``calkit.docker``."""
 
+import hashlib
+import http.server
+import io
+import json
+import os
+import socketserver
+import tarfile
+import threading
+import time
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pytest
+
 from calkit.docker import (
+    DockerAPIError,
+    DockerEngineClient,
+    _docker_socket_path,
     _image_name_without_tag_or_digest,
+    _image_ref_key,
     _parse_docker_run_command,
     _parse_volume_spec,
     _uses_entrypoint_command_mode,
+    can_build_with_api,
+    needs_buildkit,
 )
 
 
@@ -68,3 +87,238 @@ def test_parse_docker_run_command_with_common_and_unknown_flags():
     assert parsed is not None
     assert parsed["image"] == "minlag/mermaid-cli:latest"
     assert parsed["command"] == ["-i", "in.mmd", "-o", "out.svg"]
+
+
+class _FakeDockerHandler(http.server.BaseHTTPRequestHandler):
+    """Stands in for the Docker daemon, with images kept by the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def address_string(self):
+        return "fake-docker"
+
+    def _send_json(self, obj, status=200):
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, messages):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for msg in messages:
+            data = json.dumps(msg).encode() + b"\r\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b""
+        while size := int(self.rfile.readline().strip(), 16):
+            body += self.rfile.read(size)
+            self.rfile.readline()
+        self.rfile.readline()
+        return body
+
+    def _add_image(self, tag, layers):
+        image_id = "sha256:" + hashlib.sha256(str(layers).encode()).hexdigest()
+        for image in self.server.images.values():
+            if tag in image["RepoTags"]:
+                image["RepoTags"].remove(tag)
+        image = self.server.images.setdefault(
+            image_id,
+            {
+                "Id": image_id,
+                "RepoTags": [],
+                "RepoDigests": [],
+                "RootFS": {"Type": "layers", "Layers": layers},
+            },
+        )
+        image["RepoTags"].append(tag)
+        return image
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.requests.append(("GET", url.path))
+        if url.path == "/slow":
+            time.sleep(0.5)
+            self._send_json({})
+        elif url.path == "/_ping":
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"OK")
+        elif url.path == "/images/json":
+            self._send_json(list(self.server.images.values()))
+        elif url.path.startswith("/images/") and url.path.endswith("/json"):
+            image_id = unquote(url.path.split("/")[2])
+            if image_id in self.server.images:
+                self._send_json(self.server.images[image_id])
+            else:
+                self._send_json({"message": "No such image"}, status=404)
+        else:
+            self._send_json({"message": "page not found"}, status=404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.server.requests.append(("POST", url.path))
+        body = self._read_body()
+        if url.path == "/build":
+            with tarfile.open(fileobj=io.BytesIO(body)) as tar:
+                names = sorted(tar.getnames())
+                dockerfile = tar.extractfile(query["dockerfile"][0]).read()
+            if b"FAIL" in dockerfile:
+                self._send_stream([{"error": "build failed"}])
+                return
+            if b"SLOW" in dockerfile:
+                # A build step that prints nothing for a while
+                time.sleep(0.5)
+            self._add_image(query["t"][0], names)
+            self._send_stream(
+                [{"stream": "Step 1/1\n"}, {"stream": "Successfully built\n"}]
+            )
+        elif url.path == "/images/create":
+            image = _image_ref_key(
+                query["fromImage"][0] + ":" + query["tag"][0]
+            )
+            self._add_image(image, ["pulled"])
+            self._send_stream([{"status": "Pulling"}, {"status": "Done"}])
+        elif url.path.endswith("/tag"):
+            ref = _image_ref_key(unquote(url.path.split("/")[2]))
+            for image in self.server.images.values():
+                if ref in image["RepoTags"]:
+                    image["RepoTags"].append(
+                        query["repo"][0] + ":" + query["tag"][0]
+                    )
+            self.send_response(201)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json({"message": "page not found"}, status=404)
+
+
+@pytest.fixture
+def fake_docker(tmp_dir):
+    server = socketserver.ThreadingUnixStreamServer(
+        "docker.sock", _FakeDockerHandler
+    )
+    server.daemon_threads = True
+    server.block_on_close = False
+    server.images = {}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_docker_engine_client(fake_docker):
+    client = DockerEngineClient("docker.sock")
+    assert client.ping()
+    assert client.inspect_image("my-image") is None
+    os.makedirs("sub")
+    with open("Dockerfile", "w") as f:
+        f.write("FROM ubuntu\n")
+    with open("sub/big.dat", "wb") as f:
+        f.write(os.urandom(3 * 1024 * 1024 + 5))
+    progress = []
+    client.build("my-image", on_progress=progress.append)
+    assert progress[-1] == {"stream": "Successfully built\n"}
+    res = client.inspect_images(["my-image", "my-image:latest", "nope"])
+    assert res["nope"] is None
+    assert res["my-image"] == res["my-image:latest"]
+    assert res["my-image"]["RootFS"]["Layers"] == ["Dockerfile", "sub/big.dat"]
+    # Inspections are cached by image ID, so only the listing is repeated
+    n_requests = len(fake_docker.requests)
+    assert client.inspect_image("my-image") == res["my-image"]
+    assert fake_docker.requests[n_requests:] == [("GET", "/images/json")]
+    with open("Dockerfile", "w") as f:
+        f.write("FAIL\n")
+    with pytest.raises(DockerAPIError, match="build failed"):
+        client.build("my-image")
+    # The connection is still usable after an error
+    client.pull("docker.io/library/ubuntu:22.04")
+    client.tag("ubuntu:22.04", "my-ubuntu")
+    res = client.inspect_images(["ubuntu:22.04", "my-ubuntu"])
+    assert res["ubuntu:22.04"]["RootFS"]["Layers"] == ["pulled"]
+    assert res["my-ubuntu"] == res["ubuntu:22.04"]
+    client.close()
+
+
+def test_docker_engine_client_timeout(fake_docker):
+    """Timeouts apply to requests, but not to streamed build progress."""
+    client = DockerEngineClient("docker.sock", timeout=0.2)
+    with open("Dockerfile", "w") as f:
+        f.write("FROM ubuntu\nRUN SLOW\n")
+    client.build("my-image")
+    assert client.inspect_image("my-image") is not None
+    with pytest.raises(DockerAPIError):
+        client._get_json("/slow")
+    # The client recovers with a new connection
+    assert client.ping()
+    client.close()
+
+
+def test_docker_socket_path_uses_context(tmp_dir, monkeypatch):
+    config_dir = os.path.abspath("docker-config")
+    monkeypatch.setenv("DOCKER_CONFIG", config_dir)
+    monkeypatch.delenv("DOCKER_HOST", raising=False)
+    monkeypatch.delenv("DOCKER_CONTEXT", raising=False)
+
+    def write_context(name, host):
+        meta_dir = os.path.join(
+            config_dir,
+            "contexts",
+            "meta",
+            hashlib.sha256(name.encode()).hexdigest(),
+        )
+        os.makedirs(meta_dir)
+        with open(os.path.join(meta_dir, "meta.json"), "w") as f:
+            json.dump(
+                {"Name": name, "Endpoints": {"docker": {"Host": host}}}, f
+            )
+
+    write_context("colima", "unix:///home/me/.colima/docker.sock")
+    write_context("remote", "ssh://me@server")
+    with open(os.path.join(config_dir, "config.json"), "w") as f:
+        json.dump({"currentContext": "colima"}, f)
+    assert _docker_socket_path() == "/home/me/.colima/docker.sock"
+    # Remote and unknown contexts are left to the CLI
+    monkeypatch.setenv("DOCKER_CONTEXT", "remote")
+    assert _docker_socket_path() is None
+    monkeypatch.setenv("DOCKER_CONTEXT", "missing")
+    assert _docker_socket_path() is None
+    # DOCKER_HOST takes precedence
+    monkeypatch.setenv("DOCKER_HOST", "unix:///tmp/docker.sock")
+    assert _docker_socket_path() == "/tmp/docker.sock"
+
+
+def test_can_build_with_api(tmp_dir):
+    with open("Dockerfile", "w") as f:
+        f.write("FROM ubuntu\n")
+    assert can_build_with_api(".", "Dockerfile")
+    with open(".dockerignore", "w") as f:
+        f.write("data\n")
+    assert not can_build_with_api(".", "Dockerfile")
+
+
+def test_needs_buildkit(tmp_dir):
+    with open("Dockerfile", "w") as f:
+        f.write("FROM ubuntu\nRUN echo hi\n")
+    assert not needs_buildkit("Dockerfile")
+    with open("Dockerfile", "w") as f:
+        f.write("FROM ubuntu\nRUN --mount=type=cache,target=/root echo hi\n")
+    assert needs_buildkit("Dockerfile")
+    with open("Dockerfile", "w") as f:
+        f.write("# syntax=docker/dockerfile:1\nFROM ubuntu\n")
+    assert needs_buildkit("Dockerfile")
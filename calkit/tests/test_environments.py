@@ -119,6 +119,61 @@ def test_cache_uses_dir_signature_for_conda_prefix(tmp_dir, monkeypatch):
     assert not calkit.environments.check_cache(env_name="myenv", env=env)
 
 
+def test_env_prefix_fingerprint(tmp_dir, monkeypatch):
+    env = {"kind": "uv-venv", "path": "requirements.txt", "prefix": ".venv"}
+    with open("requirements.txt", "w") as f:
+        f.write("requests\n")
+    sp_dir = os.path.join(".venv", "lib", "python3.13", "site-packages")
+    os.makedirs(os.path.join(sp_dir, "requests-2.32.0.dist-info"))
+    with open(
+        os.path.join(sp_dir, "requests-2.32.0.dist-info", "RECORD"), "w"
+    ) as f:
+        f.write("requests/__init__.py,,\n")
+    lock_fpath = calkit.environments.get_env_lock_fpath(
+        env=env, env_name="py", as_posix=False
+    )
+    assert lock_fpath is not None
+    os.makedirs(os.path.dirname(lock_fpath), exist_ok=True)
+    with open(lock_fpath, "w") as f:
+        f.write("lock")
+    fp = calkit.environments.calc_env_prefix_fingerprint(".venv")
+    assert fp is not None
+    # The prefix itself is never hashed when it has package manifests
+    real_get_md5 = calkit.get_md5
+
+    def _get_md5(path):
+        assert os.path.abspath(path) != os.path.abspath(".venv")
+        return real_get_md5(path)
+
+    monkeypatch.setattr(calkit, "get_md5", _get_md5)
+    calkit.environments.save_cache(env_name="py", env=env, success=True)
+    assert calkit.environments.check_cache(env_name="py", env=env)
+    # Incidental writes, e.g., bytecode, don't change the fingerprint
+    os.makedirs(os.path.join(sp_dir, "requests", "__pycache__"))
+    with open(
+        os.path.join(sp_dir, "requests", "__pycache__", "x.pyc"), "w"
+    ) as f:
+        f.write("bytecode")
+    assert calkit.environments.calc_env_prefix_fingerprint(".venv") == fp
+    assert calkit.environments.check_cache(env_name="py", env=env)
+    # Installing a package does
+    os.makedirs(os.path.join(sp_dir, "polars-1.0.0.dist-info"))
+    with open(
+        os.path.join(sp_dir, "polars-1.0.0.dist-info", "RECORD"), "w"
+    ) as f:
+        f.write("polars/__init__.py,,\n")
+    assert calkit.environments.calc_env_prefix_fingerprint(".venv") != fp
+    assert not calkit.environments.check_cache(env_name="py", env=env)
+    # So do conda package records
+    os.makedirs(os.path.join(".conda", "conda-meta"))
+    assert calkit.environments.calc_env_prefix_fingerprint(".conda") is None
+    with open(
+        os.path.join(".conda", "conda-meta", "python-3.13.0-h0.json"), "w"
+    ) as f:
+        f.write("{}")
+    assert calkit.environments.calc_env_prefix_fingerprint(".conda")
+
+
 def test_cache_tracks_julia_manifest(tmp_dir):
     os.makedirs("juliaenv", exist_ok=True)
     with open("juliaenv/Project.toml", "w") as f:
@@ -1,12 +1,17 @@
 """Tests for the Calkit filesystem implementation."""
 
+import hashlib
+import http.server
+import json
 import os
 import subprocess
+import threading
+import time
 import uuid
 from unittest.mock import MagicMock, patch
 
 import pytest
-from requests.exceptions import Timeout
+from requests.exceptions import HTTPError, Timeout
 
 import calkit
 from calkit import fs as ckfs
@@ -121,6 +126,33 @@ def test_execute_operation_presigned_multipart_progress():
     assert sum(calls) == total
 
 
+def test_execute_operation_presigned_multipart_aborts_on_failure():
+    """A multipart upload that fails part way is aborted."""
+    session = MagicMock()
+    part_resp = MagicMock()
+    part_resp.status_code = 403
+    part_resp.raise_for_status.side_effect = HTTPError("Forbidden")
+    session.put.return_value = part_resp
+    fs = ckfs.CalkitFileSystem.__new__(ckfs.CalkitFileSystem)
+    fs._session = session
+    operation_info = {
+        "access": {
+            "kind": "presigned-multipart",
+            "upload_id": "uid-123",
+            "part_urls": ["https://s3.example.com/part1"],
+            "complete_url": "https://s3.example.com/complete",
+            "abort_url": "https://s3.example.com/abort",
+            "part_size_bytes": 5,
+        }
+    }
+    with pytest.raises(HTTPError):
+        fs._execute_operation(operation_info, "put", data=b"B" * 5)
+    session.post.assert_not_called()
+    session.delete.assert_called_once_with(
+        "https://s3.example.com/abort", timeout=30
+    )
+
+
 def test_put_file_uses_callback(tmp_path):
     """put_file reports progress via callback based on actual upload bytes."""
     data = b"C" * 20
@@ -155,6 +187,221 @@ def test_put_file_uses_callback(tmp_path):
     assert sum(calls) == len(data)
 
 
+class _FakeHubHandler(http.server.BaseHTTPRequestHandler):
+    """Stands in for the hub's batch ops endpoint and its object storage."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _access(self, path, operation):
+        host, port = self.server.server_address
+        return {
+            "kind": "presigned-url",
+            "url": f"http://{host}:{port}/storage/{path}",
+            "http_method": operation.upper(),
+        }
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if "paths" not in body:
+            path = body["path"]
+            resp = {"backend": "gcs"}
+            if body["operation"] == "info":
+                data = self.server.objects[path]
+                resp["result"] = {
+                    "name": path,
+                    "size": len(data),
+                    "md5": hashlib.md5(data).hexdigest(),
+                }
+            else:
+                resp["access"] = self._access(path, body["operation"])
+            self._send(200, json.dumps(resp).encode())
+            return
+        self.server.batch_requests.append(body)
+        results = {
+            path: {"access": self._access(path, body["operation"])}
+            for path in body["paths"]
+        }
+        self._send(
+            200, json.dumps({"backend": "gcs", "results": results}).encode()
+        )
+
+    def _track(self, delta):
+        with self.server.lock:
+            self.server.in_flight += delta
+            self.server.max_in_flight = max(
+                self.server.max_in_flight, self.server.in_flight
+            )
+
+    def do_PUT(self):
+        self._track(1)
+        data = self.rfile.read(int(self.headers["Content-Length"]))
+        # Stand in for storage latency, so transfers overlap
+        time.sleep(0.002)
+        self.server.objects[self.path.removeprefix("/storage/")] = data
+        self._track(-1)
+        self._send(200)
+
+    def do_GET(self):
+        data = self.server.objects.get(self.path.removeprefix("/storage/"))
+        if data is None:
+            self._send(404)
+            return
+        status = 200
+        if (range_header := self.headers.get("Range")) is not None:
+            self.server.range_requests.append(range_header)
+            start, end = range_header.removeprefix("bytes=").split("-")
+            data = data[int(start) : int(end) + 1]
+            status = 206
+        self._send(status, data, content_type="application/octet-stream")
+
+
+@pytest.fixture
+def fake_hub(monkeypatch):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FakeHubHandler)
+    server.daemon_threads = True
+    server.batch_requests = []
+    server.objects = {}
+    server.range_requests = []
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    monkeypatch.setitem(calkit.hub._tokens, calkit.hub.get_base_url(), "token")
+    yield server, f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_put_and_get_many_files(fake_hub, tmp_path):
+    """Many small files are moved with batched op info and in parallel."""
+    server, url = fake_hub
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    n_files = 1000
+    for n in range(n_files):
+        parent = src / "sub" if n % 2 else src
+        (parent / f"{n}.txt").write_text(f"file {n}")
+    fs = ckfs.CalkitFileSystem(endpoint_url=url, skip_instance_cache=True)
+    with patch.object(fs, "isdir", return_value=True):
+        fs.put(str(src) + "/", "ck://owner/project/data", recursive=True)
+    assert len(server.objects) == n_files
+    assert server.objects["data/sub/1.txt"] == b"file 1"
+    assert server.objects["data/0.txt"] == b"file 0"
+    # Access info is fetched a window at a time rather than once per file
+    window = ckfs.TRANSFER_WINDOW_SIZE
+    assert len(server.batch_requests) == -(-n_files // window)
+    assert all(len(r["paths"]) <= window for r in server.batch_requests)
+    assert server.batch_requests[0]["content_lengths"]["data/0.txt"] == 6
+    assert server.max_in_flight > 1
+    # Downloads are batched too
+    server.batch_requests.clear()
+    dst = tmp_path / "dst"
+    rpaths = [f"ck://owner/project/data/sub/{n}.txt" for n in range(1, 9, 2)]
+    lpaths = [str(dst / f"{n}.txt") for n in range(1, 9, 2)]
+    fs.get(rpaths, lpaths)
+    assert len(server.batch_requests) == 1
+    assert (dst / "7.txt").read_text() == "file 7"
+
+
+def test_put_aborts_multipart_uploads_not_started(
+    fake_hub, monkeypatch, tmp_path
+):
+    """After a failed upload, access for later windows isn't fetched and
+    multipart uploads initiated for files that never started are aborted.
+    """
+    _, url = fake_hub
+    monkeypatch.setattr(ckfs, "MAX_TRANSFER_WORKERS", 1)
+    src = tmp_path / "src"
+    src.mkdir()
+    n_files = ckfs.TRANSFER_WINDOW_SIZE + 5
+    for n in range(n_files):
+        (src / f"{n:03d}.txt").write_text(f"file {n}")
+    fs = ckfs.CalkitFileSystem(endpoint_url=url, skip_instance_cache=True)
+
+    def get_infos(paths, operation, content_lengths=None):
+        return [
+            {
+                "backend": "s3",
+                "access": {
+                    "kind": "presigned-multipart",
+                    "abort_url": f"https://s3.example.com/abort/{path}",
+                },
+            }
+            for path in paths
+        ]
+
+    with (
+        patch.object(fs, "isdir", return_value=True),
+        patch.object(
+            fs, "_get_fs_op_info_many", side_effect=get_infos
+        ) as mock_infos,
+        patch.object(fs, "_put_file", side_effect=HTTPError("Forbidden")),
+        patch.object(fs, "_abort_multipart_upload") as mock_abort,
+        pytest.raises(HTTPError),
+    ):
+        fs.put(str(src) + "/", "ck://owner/project/data", recursive=True)
+    assert mock_infos.call_count == 1
+    # The first upload started, and aborts itself in _execute_operation
+    aborted = [c.args[0]["abort_url"] for c in mock_abort.call_args_list]
+    assert len(aborted) == ckfs.TRANSFER_WINDOW_SIZE - 1
+    assert not any(u.endswith("/000.txt") for u in aborted)
+
+
+def test_calkitfile_block_cache(fake_hub, tmp_path):
+    """Reads are served from cached blocks, fetched ahead when sequential."""
+    server, url = fake_hub
+    block_size = ckfs.READ_BLOCK_SIZE
+    data = os.urandom(20 * block_size - 123)
+    server.objects["data/big.bin"] = data
+    cache_dir = str(tmp_path / "cache")
+    fs = ckfs.CalkitFileSystem(
+        endpoint_url=url, skip_instance_cache=True, block_cache_dir=cache_dir
+    )
+    with fs.open("ck://owner/project/data/big.bin", "rb") as f:
+        # Small reads near each other, like a Parquet footer
+        f.seek(-8, 2)
+        assert f.read(8) == data[-8:]
+        f.seek(-1000, 2)
+        assert f.read(992) == data[-1000:-8]
+        assert len(server.range_requests) == 1
+        # A sequential scan reads ahead, so needs far fewer requests than
+        # blocks
+        server.range_requests.clear()
+        f.seek(0)
+        chunks = []
+        while chunk := f.read(64 * 1024):
+            chunks.append(chunk)
+        assert b"".join(chunks) == data
+        assert len(server.range_requests) < 10
+    # Blocks are kept on disk by MD5, so another process can reuse them
+    server.range_requests.clear()
+    fs2 = ckfs.CalkitFileSystem(
+        endpoint_url=url, skip_instance_cache=True, block_cache_dir=cache_dir
+    )
+    with fs2.open("ck://owner/project/data/big.bin", "rb") as f:
+        f.seek(5 * block_size - 10)
+        assert f.read(20) == data[5 * block_size - 10 : 5 * block_size + 10]
+    assert server.range_requests == []
+    # The memory cache is bounded
+    cache = ckfs.BlockCache(block_size=4, max_size=8)
+    for idx in range(3):
+        cache.put("key", idx, b"abcd")
+    assert cache.get("key", 0) is None
+    assert cache.get("key", 2) == b"abcd"
+
+
 def test_execute_operation_retries_transient_timeout_across_upload_paths():
     """Retries transient timeout for both simple and chunked upload flows."""
     import io
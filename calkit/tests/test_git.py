@@ -591,3 +591,89 @@ def test_ensure_path_is_not_filtered(tmp_dir):
     assert calkit.git.get_filter_driver(repo, path) is None
     rule = f"{path} -filter"
     assert attributes.read_text().splitlines().count(rule) == 1
+
+
+def test_get_status(tmp_dir):
+    import calkit.git
+
+    repo = git.Repo.init(tmp_dir, initial_branch="main")
+    status = calkit.git.get_status(repo=repo)
+    assert status.branch == "main"
+    assert status.commit is None
+    assert not status.is_dirty
+    for fname in ["a.txt", "b.txt", "c.txt", "with space.txt"]:
+        with open(fname, "w") as f:
+            f.write(f"{fname}\n")
+    repo.git.add(".")
+    repo.git.commit(["-m", "First"])
+    repo.git.mv("b.txt", "b2.txt")
+    with open("a.txt", "w") as f:
+        f.write("changed\n")
+    with open("c.txt", "w") as f:
+        f.write("staged\n")
+    repo.git.add("c.txt")
+    with open("c.txt", "w") as f:
+        f.write("staged then changed\n")
+    os.remove("with space.txt")
+    os.makedirs("new dir")
+    with open("new dir/new.txt", "w") as f:
+        f.write("new\n")
+    status = calkit.git.get_status(repo=repo)
+    assert status.commit == repo.head.commit.hexsha
+    assert status.staged == ["b2.txt", "c.txt"]
+    assert status.changed == ["a.txt", "c.txt", "with space.txt"]
+    assert status.untracked == ["new dir/new.txt"]
+    assert status.renamed == {"b2.txt": "b.txt"}
+    assert status.is_dirty
+    # This matches what GitPython reports
+    assert sorted(status.changed) == sorted(
+        d.a_path for d in repo.index.diff(None)
+    )
+    assert status.untracked == repo.untracked_files
+    assert calkit.git.get_status(repo=repo, untracked=False).untracked == []
+    # Ahead/behind counts come from the same call
+    clone = repo.clone(os.path.join(tmp_dir, "clone"))
+    with open(os.path.join(clone.working_dir, "d.txt"), "w") as f:
+        f.write("d\n")
+    clone.git.add("d.txt")
+    clone.git.commit(["-m", "Second"])
+    status = calkit.git.get_status(repo=clone)
+    assert status.upstream == "origin/main"
+    assert (status.commits_ahead, status.commits_behind) == (1, 0)
+
+
+def test_get_status_for_polling(tmp_dir, monkeypatch):
+    import calkit.config
+    import calkit.git
+
+    repo = git.Repo.init(tmp_dir, initial_branch="main")
+    calls = []
+    get_status = calkit.git.get_status
+
+    def _get_status(**kwargs):
+        calls.append(kwargs)
+        return get_status(**kwargs)
+
+    monkeypatch.setattr(calkit.git, "get_status", _get_status)
+    assert calkit.git.get_status_for_polling(repo=repo).branch == "main"
+    assert not calls[-1]["fsmonitor"] and not calls[-1]["untracked_cache"]
+    prefix = "CALKIT" + calkit.config.get_env_suffix(sep="_") + "_"
+    monkeypatch.setenv(prefix + "FAST_GIT_STATUS", "true")
+    assert calkit.git.get_status_for_polling(repo=repo).branch == "main"
+    assert calls[-1]["fsmonitor"] and calls[-1]["untracked_cache"]
+
+
+def test_parse_porcelain_v2_unmerged():
+    import calkit.git
+
+    output = (
+        "# branch.oid (initial)\0"
+        "# branch.head (detached)\0"
+        "u UU N... 100644 100644 100644 100644 "
+        "aaa bbb ccc conflicted file.txt\0"
+    )
+    status = calkit.git.parse_porcelain_v2(output)
+    assert status.branch is None
+    assert status.commit is None
+    assert status.unmerged == ["conflicted file.txt"]
+    assert status.tracked_changes == ["conflicted file.txt"]
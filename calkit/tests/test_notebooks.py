@@ -1,12 +1,15 @@
 """Tests for ``calkit.notebooks``."""
 
 import json
+import os
 import subprocess
+import time
 
 import pytest
 from git.exc import InvalidGitRepositoryError
 
 import calkit
+import calkit.notebooks
 
 
 def test_declare_notebook(tmp_dir):
@@ -124,3 +127,33 @@ def test_is_marimo_notebook():
         "",
     ]:
         assert not calkit.notebooks.is_marimo_notebook(not_a_notebook)
+
+
+def test_clean_notebook_outputs_only_writes_changes(tmp_dir):
+    nb = {
+        "cells": [
+            {
+                "cell_type": "code",
+                "source": ["print('hi')"],
+                "outputs": [{"output_type": "stream", "text": ["hi"]}],
+                "execution_count": 1,
+                "metadata": {},
+            }
+        ],
+        "metadata": {"kernelspec": {"name": "python3"}},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    with open("nb.ipynb", "w") as f:
+        json.dump(nb, f)
+    calkit.notebooks.clean_notebook_outputs("nb.ipynb")
+    fpath = calkit.notebooks.get_cleaned_notebook_path("nb.ipynb")
+    with open(fpath) as f:
+        cleaned = json.load(f)
+    assert cleaned["cells"][0]["outputs"] == []
+    assert cleaned["metadata"] == {}
+    mtime = os.stat(fpath).st_mtime_ns
+    time.sleep(0.01)
+    # Cleaning again doesn't touch the unchanged file
+    calkit.notebooks.clean_notebook_outputs("nb.ipynb")
+    assert os.stat(fpath).st_mtime_ns == mtime
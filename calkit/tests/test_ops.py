@@ -0,0 +1,192 @@
+"""Tests for ``calkit.ops``."""
+
+import asyncio
+import os
+import signal
+import sys
+import threading
+from datetime import datetime
+
+import pytest
+
+from calkit.ops import (
+    DEFAULT_MAX_RESTARTS,
+    ContinuousOp,
+    FixedIterationsOp,
+    Op,
+    ScheduledOp,
+    next_cron_time,
+    parse_cron,
+    run,
+    start,
+    supervise,
+)
+
+
+def test_parse_cron():
+    cron = parse_cron("*/15 9-17 * * 1-5")
+    assert cron.minutes == {0, 15, 30, 45}
+    assert cron.hours == set(range(9, 18))
+    assert cron.weekdays == {1, 2, 3, 4, 5}
+    assert not cron.days_restricted
+    assert cron.weekdays_restricted
+    # 7 is Sunday too
+    assert parse_cron("0 0 * * 7").weekdays == {0}
+    assert parse_cron("5/20,1 0 * * *").minutes == {1, 5, 25, 45}
+    for bad in ["* * * *", "60 * * * *", "* * 0 * *", "*/0 * * * *"]:
+        with pytest.raises(ValueError):
+            parse_cron(bad)
+    with pytest.raises(ValueError):
+        ScheduledOp(cmd="echo", schedule="nope")
+
+
+def test_next_cron_time():
+    t = datetime(2026, 10, 18, 12, 7, 30)
+    assert next_cron_time("*/15 * * * *", t) == datetime(2026, 10, 18, 12, 15)
+    assert next_cron_time("7 12 * * *", t) == datetime(2026, 10, 19, 12, 7)
+    # 2026-10-18 is a Sunday, so the next weekday morning is Monday
+    assert next_cron_time("0 9 * * 1-5", t) == datetime(2026, 10, 19, 9, 0)
+    assert next_cron_time("0 0 1 1 *", t) == datetime(2027, 1, 1, 0, 0)
+    # With both day fields restricted, either one matching is enough
+    assert next_cron_time("0 0 1 * 2", t) == datetime(2026, 10, 20, 0, 0)
+    with pytest.raises(ValueError):
+        next_cron_time("0 0 31 2 *", t)
+
+
+def test_run(tmp_dir):
+    metrics = run(Op(cmd="echo hi >> out.txt"))
+    assert metrics.n_runs == 1
+    assert metrics.last_returncode == 0
+    assert metrics.runtime_s > 0
+    with open("out.txt") as f:
+        assert f.read().split() == ["hi"]
+    # Failing ops that aren't continuous give up eventually by default
+    metrics = run(Op(cmd="exit 1", backoff_s=0.01))
+    assert metrics.n_runs == DEFAULT_MAX_RESTARTS + 1
+    assert metrics.last_returncode == 1
+
+
+def test_op_kind():
+    """Ops run according to their kind, which must have its fields."""
+    with pytest.raises(ValueError):
+        Op(kind="scheduled", cmd="echo")
+    with pytest.raises(ValueError):
+        Op(kind="fixed-iterations", cmd="echo")
+    with pytest.raises(ValueError):
+        Op(kind="event-driven", cmd="echo")
+
+    async def main():
+        stop = asyncio.Event()
+        # A plain op of kind continuous, as loaded from YAML, is restarted,
+        # but with a delay between runs when it exits right away
+        task = asyncio.create_task(
+            supervise(
+                [Op(name="c", kind="continuous", cmd="true", backoff_s=0.2)],
+                stop=stop,
+            )
+        )
+        await asyncio.sleep(0.5)
+        stop.set()
+        return await asyncio.wait_for(task, timeout=10)
+
+    metrics = asyncio.run(main())["c"]
+    assert 2 <= metrics.n_runs <= 4
+
+
+def test_start(tmp_dir):
+    res = start(
+        [
+            FixedIterationsOp(
+                name="iter", cmd="echo x >> iter.txt", n_iterations=3
+            ),
+            # Fails every time, so it's retried with backoff and then given up
+            ContinuousOp(
+                name="failing",
+                cmd="exit 3",
+                backoff_s=0.01,
+                max_restarts=2,
+            ),
+        ]
+    )
+    assert res["iter"].n_runs == 3
+    with open("iter.txt") as f:
+        assert f.read().split() == ["x", "x", "x"]
+    assert res["failing"].n_runs == 3
+    assert res["failing"].n_failures == 3
+    assert res["failing"].n_restarts == 2
+    assert res["failing"].last_returncode == 3
+    with pytest.raises(ValueError):
+        start([Op(name="a", cmd="echo"), Op(name="a", cmd="echo")])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses SIGINT")
+def test_start_interrupted(tmp_dir):
+    """Interrupting returns the metrics gathered so far."""
+    timer = threading.Timer(0.5, os.kill, (os.getpid(), signal.SIGINT))
+    timer.start()
+    try:
+        res = start([ContinuousOp(name="c", cmd="sleep 10")])
+    finally:
+        timer.cancel()
+    assert res["c"].n_runs == 1
+
+
+def test_supervise_stop(tmp_dir):
+    """Continuous ops run until stopped, and their metrics are recorded."""
+    cmd = (
+        f'{sys.executable} -c "'
+        "x = [0] * 10**6; sum(i * i for i in range(10**6))"
+        '"'
+    )
+
+    async def main():
+        stop = asyncio.Event()
+        task = asyncio.create_task(
+            supervise(
+                [ContinuousOp(name="c", cmd=cmd)],
+                stop=stop,
+                sample_interval_s=0.01,
+            )
+        )
+        await asyncio.sleep(1.5)
+        stop.set()
+        return await asyncio.wait_for(task, timeout=10)
+
+    metrics = asyncio.run(main())["c"]
+    assert metrics.n_runs >= 1
+    assert metrics.n_failures == 0
+    assert metrics.max_rss_bytes > 0
+    assert metrics.cpu_s > 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses a POSIX shell")
+def test_supervise_stop_kills_children(tmp_dir):
+    """Stopping an op also stops the processes its command started."""
+    psutil = pytest.importorskip("psutil")
+
+    async def main():
+        stop = asyncio.Event()
+        task = asyncio.create_task(
+            supervise(
+                [
+                    ContinuousOp(
+                        name="c", cmd="sleep 60 & echo $! > child.pid; wait"
+                    )
+                ],
+                stop=stop,
+            )
+        )
+        for _ in range(100):
+            if os.path.isfile("child.pid"):
+                break
+            await asyncio.sleep(0.05)
+        stop.set()
+        await asyncio.wait_for(task, timeout=10)
+
+    asyncio.run(main())
+    with open("child.pid") as f:
+        pid = int(f.read())
+    try:
+        assert psutil.Process(pid).status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        pass
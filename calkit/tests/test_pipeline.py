@@ -2295,6 +2295,105 @@ def test_reproduce_targets_concurrently():
     assert state["peak"] == 2
 
 
+def test_run_stage_graph_with_resource_pool():
+    import threading
+    import time
+
+    state = {"cpus": 0.0, "peak": 0.0}
+    lock = threading.Lock()
+    resources = {"big-a": (3.0, 0), "big-b": (3.0, 0), "small": (1.0, 0)}
+
+    def run_one(name: str) -> int:
+        with lock:
+            state["cpus"] += resources[name][0]
+            state["peak"] = max(state["peak"], state["cpus"])
+        time.sleep(0.1)
+        with lock:
+            state["cpus"] -= resources[name][0]
+        return 0
+
+    pool = calkit.pipeline.ResourcePool(cpus=4, memory=2**30)
+    results = calkit.pipeline.run_stage_graph(
+        {name: [] for name in resources},
+        stale=list(resources),
+        max_workers=3,
+        run_one=run_one,
+        resources=resources,
+        pool=pool,
+    )
+    assert {r.status for r in results.values()} == {"succeeded"}
+    # The two big stages never ran together
+    assert state["peak"] == 4
+    # Asking for more than the pool has still runs, just alone
+    pool.acquire(8, 2**31)
+    pool.release(8, 2**31)
+    assert calkit.pipeline.parse_memory("512M") == 512 * 1024**2
+    assert calkit.pipeline.parse_memory("1.5 GiB") == int(1.5 * 1024**3)
+    with pytest.raises(ValueError):
+        calkit.pipeline.parse_memory("lots")
+
+
+def test_run_stage_graph():
+    import threading
+    import time
+
+    # A data stage feeding several independent figures, and a paper that
+    # needs all of them
+    graph = {
+        "data": [],
+        "fig-1": ["data"],
+        "fig-2": ["data"],
+        "fig-3": ["data"],
+        "paper": ["fig-1", "fig-2", "fig-3"],
+        "other": [],
+    }
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def run_one(name):
+        with lock:
+            running.append(name)
+            peak.append(len(running))
+        time.sleep(0.2)
+        with lock:
+            running.remove(name)
+        return 1 if name == "fig-2" else 0
+
+    results = calkit.pipeline.run_stage_graph(
+        graph, stale=["data", "other"], max_workers=4, run_one=run_one
+    )
+    assert max(peak) >= 3
+    assert results["data"].status == "succeeded"
+    assert results["fig-2"].status == "failed"
+    assert results["paper"].status == "skipped"
+    # Stages started before the failure still finish
+    assert results["fig-1"].status == "succeeded"
+    # Independent stages not started before a failure aren't started after
+    results = calkit.pipeline.run_stage_graph(
+        {"a": [], "b": []},
+        stale=["a", "b"],
+        max_workers=1,
+        run_one=lambda name: 1 if name == "a" else 0,
+    )
+    assert results["a"].status == "failed"
+    assert results["b"].status == "not-started"
+    # With nothing stale upstream and no dependency rerun, a stage is
+    # up-to-date
+    results = calkit.pipeline.run_stage_graph(
+        graph, stale=["fig-1"], max_workers=4, run_one=lambda name: 0
+    )
+    assert results["data"].status == "up-to-date"
+    assert results["fig-2"].status == "up-to-date"
+    assert results["fig-1"].status == "succeeded"
+    assert results["paper"].status == "succeeded"
+    path, total = calkit.pipeline.get_critical_path(graph, results)
+    assert path == ["fig-1", "paper"]
+    assert total == pytest.approx(
+        results["fig-1"].duration + results["paper"].duration
+    )
+
+
 def test_warn_on_latexmkrc_out_dir_mismatch(tmp_dir):
     os.makedirs("paper")
     rc_path = "paper/.latexmkrc"
@@ -0,0 +1,90 @@
+"""Tests for ``calkit.profiling``."""
+
+import subprocess
+import sys
+
+import calkit
+from calkit.profiling import (
+    ProcessProfiler,
+    StageProfile,
+    append_history,
+    make_record,
+    read_history,
+    summarize_history,
+)
+
+
+def test_process_profiler(tmp_dir):
+    # Hold about 100 MB in a child process, burn some CPU, and write a file
+    code = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', "
+        "'b = bytearray(100_000_000); import time; time.sleep(1)'])\n"
+        "t0 = time.process_time()\n"
+        "while time.process_time() - t0 < 0.5: pass\n"
+        "open('out.bin', 'wb').write(b'x' * 1_000_000)\n"
+        "child.wait()\n"
+    )
+    p = subprocess.Popen([sys.executable, "-c", code])
+    with ProcessProfiler(p, interval=0.1) as profiler:
+        returncode = profiler.wait()
+    assert returncode == 0
+    profile = profiler.profile
+    assert profile.wall_time >= 1
+    assert profile.cpu_time >= 0.5
+    assert profile.max_rss >= 100_000_000
+    assert profile.read_bytes is not None
+    p = subprocess.Popen([sys.executable, "-c", "raise SystemExit(3)"])
+    with ProcessProfiler(p) as profiler:
+        assert profiler.wait() == 3
+
+
+def test_summarize_history(tmp_dir):
+    calkit.ensure_local_dir()
+    for wall_time in [10, 11, 9, 10, 20]:
+        append_history(
+            [
+                make_record(
+                    "slow", StageProfile(wall_time=wall_time, max_rss=100)
+                ),
+                make_record("fast", StageProfile(wall_time=0.1)),
+            ]
+        )
+    append_history(
+        [make_record("fast", StageProfile(wall_time=10), returncode=1)]
+    )
+    records = read_history()
+    assert len(records) == 11
+    summaries = {s.stage: s for s in summarize_history(records)}
+    slow = summaries["slow"]
+    assert slow.runs == 5
+    assert slow.latest.wall_time == 20
+    assert slow.median_wall_time == 10
+    assert slow.wall_time_change == 1.0
+    assert slow.regressed
+    assert slow.max_rss == 100
+    # Failed runs don't count
+    fast = summaries["fast"]
+    assert fast.runs == 5
+    assert fast.wall_time_change == 0
+    assert not fast.regressed
+    summaries = summarize_history(records, last=2, stages=["slow"])
+    assert [s.stage for s in summaries] == ["slow"]
+    assert summaries[0].runs == 2
+
+
+def test_append_history_trims(tmp_dir, monkeypatch):
+    calkit.ensure_local_dir()
+    monkeypatch.setattr(calkit.profiling, "HISTORY_LENGTH", 3)
+    for wall_time in range(5):
+        append_history([make_record("a", StageProfile(wall_time=wall_time))])
+    # Below the trim size runs are only appended
+    assert len(read_history()) == 5
+    # A partial line from an interrupted write doesn't swallow the next run
+    with open(calkit.profiling.get_history_path(), "a") as f:
+        f.write('{"stage": "a", "wall')
+    monkeypatch.setattr(calkit.profiling, "HISTORY_TRIM_SIZE", 1)
+    append_history([make_record("b", StageProfile(wall_time=1))])
+    records = read_history()
+    assert [r.stage for r in records] == ["a", "a", "a", "b"]
+    assert [r.wall_time for r in records] == [2, 3, 4, 1]
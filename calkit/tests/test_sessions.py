@@ -0,0 +1,81 @@
+"""Tests for ``calkit.sessions``."""
+
+import http.server
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+import calkit.sessions
+from calkit.sessions import get_session
+
+
+class _FlakyHandler(http.server.BaseHTTPRequestHandler):
+    """Fails the first request on each path, then succeeds."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        n = self.server.counts.get(self.path, 0)
+        self.server.counts[self.path] = n + 1
+        status = 503 if n == 0 else 200
+        body = b"ok" if status == 200 else b""
+        self.send_response(status)
+        if status == 503:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def flaky_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    server.daemon_threads = True
+    server.counts = {}
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield server, f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_session(flaky_server, monkeypatch):
+    server, url = flaky_server
+    monkeypatch.setattr(calkit.sessions, "RETRY_BACKOFF_S", 0)
+    monkeypatch.setattr(calkit.sessions, "_sessions", {})
+    session = get_session("test")
+    assert get_session("test") is session
+    assert get_session("test", retries=False) is not session
+    # A transient failure is retried
+    resp = session.get(url + "/a", timeout=10)
+    assert resp.status_code == 200
+    assert server.counts["/a"] == 2
+    # Without retries, the failure is returned as is
+    resp = get_session("test", retries=False).get(url + "/b", timeout=10)
+    assert resp.status_code == 503
+    assert server.counts["/b"] == 1
+    # Connections are kept alive and reused
+    server.connections.clear()
+    for path in ["/c", "/d", "/e"]:
+        session.get(url + path, timeout=10)
+    assert len(server.connections) == 1
+
+
+def test_retry_after_is_capped(monkeypatch):
+    monkeypatch.setattr(calkit.sessions, "MAX_RETRY_AFTER_S", 2.0)
+    retry = calkit.sessions.make_retry()
+    resp = MagicMock()
+    resp.headers = {"Retry-After": "36000"}
+    resp.status = 503
+    assert retry.get_retry_after(resp) == 2.0
+    resp.headers = {"Retry-After": "1"}
+    assert retry.get_retry_after(resp) == 1.0
+    # The cap survives each retry's copy of the policy
+    assert type(retry.increment(method="GET", url="/")) is type(retry)
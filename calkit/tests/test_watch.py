@@ -0,0 +1,107 @@
+"""Tests for ``calkit.watch``."""
+
+import queue
+import subprocess
+
+import calkit
+from calkit.watch import StatusWatcher, watch_status
+
+
+def _next_event(events: queue.Queue, condition, timeout: float = 30):
+    while True:
+        event = events.get(timeout=timeout)
+        if condition(event):
+            return event
+
+
+def test_status_watcher(tmp_dir, monkeypatch):
+    subprocess.check_call(["calkit", "init"])
+    ck_info = {
+        "pipeline": {
+            "stages": {
+                "copy": {
+                    "kind": "command",
+                    "environment": "_system",
+                    "command": "cp in.txt out.txt",
+                    "inputs": ["in.txt"],
+                    "outputs": [{"path": "out.txt", "storage": "git"}],
+                },
+                "other": {
+                    "kind": "command",
+                    "environment": "_system",
+                    "command": "cp other-in.txt other-out.txt",
+                    "inputs": ["other-in.txt"],
+                    "outputs": [{"path": "other-out.txt", "storage": "git"}],
+                },
+            }
+        }
+    }
+    with open("calkit.yaml", "w") as f:
+        calkit.ryaml.dump(ck_info, f)
+    for fname in ["in.txt", "other-in.txt"]:
+        with open(fname, "w") as f:
+            f.write("hello\n")
+    subprocess.check_call(["calkit", "run"])
+    subprocess.check_call(["git", "add", "-A"])
+    subprocess.check_call(["git", "commit", "-m", "Run pipeline"])
+    monkeypatch.setattr(calkit.watch, "POLL_INTERVAL", 0.1)
+    watcher = StatusWatcher(".", use_watchdog=False).start()
+    recheck_calls = []
+    recheck_stages = watcher._recheck_stages
+    monkeypatch.setattr(
+        watcher,
+        "_recheck_stages",
+        lambda stages: (recheck_calls.append(stages), recheck_stages(stages)),
+    )
+    events = queue.Queue()
+    try:
+        unsubscribe = watcher.subscribe(events.put)
+        event = events.get(timeout=5)
+        assert event["pipeline"]["stale_stages"] == {}
+        with open("in.txt", "w") as f:
+            f.write("goodbye\n")
+        event = _next_event(events, lambda e: "in.txt" in e["changed_paths"])
+        assert list(event["pipeline"]["stale_stages"]) == ["copy"]
+        assert event["pipeline"]["stale_stages"]["copy"][
+            "modified_inputs"
+        ] == ["in.txt"]
+        assert event["git"]["changed"] == ["in.txt"]
+        # Only the stage with the changed input was rechecked
+        assert recheck_calls == [["copy"]]
+        with open("in.txt", "w") as f:
+            f.write("hello\n")
+        event = _next_event(events, lambda e: "in.txt" in e["changed_paths"])
+        assert event["pipeline"]["stale_stages"] == {}
+        assert event["git"]["changed"] == []
+        unsubscribe()
+    finally:
+        watcher.stop()
+
+
+def test_watch_status_shares_watchers(tmp_dir, monkeypatch):
+    subprocess.check_call(["calkit", "init"])
+    started = []
+
+    stopped = []
+
+    # Starting and stopping don't hold the registry lock
+    def start(self):
+        assert not calkit.watch._watchers_lock.locked()
+        started.append(self)
+        self._started.set()
+        return self
+
+    def stop(self):
+        assert not calkit.watch._watchers_lock.locked()
+        stopped.append(self)
+
+    monkeypatch.setattr(StatusWatcher, "start", start)
+    monkeypatch.setattr(StatusWatcher, "stop", stop)
+    unsubscribe1 = watch_status(".", lambda e: None)
+    unsubscribe2 = watch_status(".", lambda e: None)
+    assert len(started) == 1
+    unsubscribe1()
+    assert calkit.watch._watchers
+    unsubscribe2()
+    assert not calkit.watch._watchers
+    assert stopped == started
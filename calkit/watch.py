@@ -0,0 +1,487 @@
+"""Watching a project for changes and keeping its status up to date.
+
+Editor integrations used to poll for pipeline and Git status, recomputing
+both from scratch each time. A ``StatusWatcher`` instead computes status once,
+watches the project directory, and on each batch of changes rechecks only the
+stages with a changed input or output. Clients subscribe to its events rather
+than polling.
+
+Filesystem events come from ``watchdog`` if it's installed, e.g., with
+``pip install calkit-python[watch]``. Otherwise, the paths the pipeline
+declares, along with the project's config files and Git index, are polled
+with ``os.stat``, which notices the changes that affect pipeline status, but
+not new untracked files elsewhere.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import calkit
+import calkit.dvc
+import calkit.git
+import calkit.pipeline
+
+if TYPE_CHECKING:
+    from watchdog.observers.api import BaseObserver
+
+logger = logging.getLogger(__name__)
+
+# Changes that arrive within this many seconds of each other are handled as
+# one batch
+DEBOUNCE_SECONDS = 0.2
+# How often to stat watched paths when watchdog is not installed
+POLL_INTERVAL = 1.0
+# Changes to these mean the pipeline itself may have changed, so everything
+# is recomputed
+PIPELINE_FILES = ("calkit.yaml", "dvc.yaml", "dvc.lock")
+# Git state that affects ``git status`` output
+GIT_STATE_PATHS = (".git/index", ".git/HEAD", ".git/refs")
+
+Subscriber = Callable[[dict], Any]
+
+
+def _get_git_status(wdir: str) -> dict:
+    status = calkit.git.get_status_for_polling(wdir)
+    return {
+        "untracked": status.untracked,
+        "changed": status.changed,
+        "staged": status.staged,
+        "commits_ahead": status.commits_ahead,
+        "commits_behind": status.commits_behind,
+    }
+
+
+class _StatPoller:
+    """Stat a set of paths on an interval, reporting those that changed."""
+
+    def __init__(
+        self,
+        wdir: str,
+        get_paths: Callable[[], list[str]],
+        on_change: Callable[[list[str]], None],
+        interval: float = POLL_INTERVAL,
+    ):
+        self.wdir = wdir
+        self.get_paths = get_paths
+        self.on_change = on_change
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="calkit-watch-poll", daemon=True
+        )
+        self._stats: dict[str, tuple | None] = {}
+
+    def _stat_tree(self, path: str) -> dict[str, tuple | None]:
+        full_path = os.path.join(self.wdir, path)
+        if not os.path.isdir(full_path):
+            try:
+                st = os.stat(full_path)
+                return {path: (st.st_mtime_ns, st.st_size, st.st_ino)}
+            except OSError:
+                return {path: None}
+        stats: dict[str, tuple | None] = {}
+        for root, _, files in os.walk(full_path):
+            for fname in files:
+                fpath = os.path.join(root, fname)
+                try:
+                    st = os.stat(fpath)
+                except OSError:
+                    continue
+                rel = os.path.relpath(fpath, self.wdir)
+                stats[rel] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return stats
+
+    def _snapshot(self) -> dict[str, tuple | None]:
+        stats = {}
+        for path in self.get_paths():
+            stats.update(self._stat_tree(path))
+        return stats
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            stats = self._snapshot()
+            changed = [
+                path
+                for path in stats.keys() | self._stats.keys()
+                if stats.get(path) != self._stats.get(path)
+            ]
+            self._stats = stats
+            if changed:
+                self.on_change(changed)
+
+    def start(self) -> None:
+        self._stats = self._snapshot()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+def _make_observer(
+    wdir: str, on_change: Callable[[list[str]], None]
+) -> BaseObserver:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event: FileSystemEvent) -> None:
+            if event.event_type in ("opened", "closed_no_write"):
+                return
+            paths = [event.src_path, getattr(event, "dest_path", "")]
+            on_change(
+                [os.path.relpath(p, wdir) for p in paths if p and str(p)]
+            )
+
+    observer = Observer()
+    observer.schedule(Handler(), wdir, recursive=True)
+    return observer
+
+
+class StatusWatcher:
+    """Keep the pipeline and Git status of a project up to date as its files
+    change, and notify subscribers.
+
+    Events are dictionaries with the pipeline status (as
+    ``calkit.pipeline.PipelineStatus`` data), the Git status, the paths that
+    changed, and a sequence number.
+    """
+
+    def __init__(self, wdir: str = ".", use_watchdog: bool | None = None):
+        self.wdir = os.path.abspath(wdir)
+        if use_watchdog is None:
+            try:
+                import watchdog  # noqa: F401
+
+                use_watchdog = True
+            except ImportError:
+                use_watchdog = False
+        self.use_watchdog = use_watchdog
+        self.seq = 0
+        self.pipeline_status: calkit.pipeline.PipelineStatus | None = None
+        self.git: dict | None = None
+        self._lock = threading.Lock()
+        self._subscribers: list[Subscriber] = []
+        self._pending: set[str] = set()
+        self._pending_event = threading.Event()
+        self._stopped = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._observer: Any = None
+        # Set once ``start`` has computed the initial status, or failed to
+        self._started = threading.Event()
+        self._pipeline_digest: str | None = None
+        # Stage name to the input and output paths it declares, relative to
+        # the working directory, for stages in the root pipeline
+        self._stage_paths: dict[str, list[str]] = {}
+        # Paths declared by subproject stages, which are only ever checked
+        # along with everything else
+        self._subproject_paths: list[str] = []
+
+    @property
+    def pipeline(self) -> dict | None:
+        if self.pipeline_status is None:
+            return None
+        return self.pipeline_status.model_dump(mode="json")
+
+    @property
+    def watched_paths(self) -> list[str]:
+        """The paths polled when watchdog isn't available."""
+        paths = set(PIPELINE_FILES) | set(GIT_STATE_PATHS)
+        paths.update(self._subproject_paths)
+        for stage_paths in self._stage_paths.values():
+            paths.update(stage_paths)
+        return sorted(paths)
+
+    def _get_pipeline_digest(self) -> str:
+        md5 = hashlib.md5()
+        for fname in PIPELINE_FILES:
+            try:
+                with open(os.path.join(self.wdir, fname), "rb") as f:
+                    md5.update(f.read())
+            except FileNotFoundError:
+                pass
+            md5.update(b"\0")
+        return md5.hexdigest()
+
+    def _load_stage_paths(self) -> None:
+        from dvc.stage import PipelineStage
+
+        self._stage_paths = {}
+        self._subproject_paths = []
+        try:
+            dvc_repo = calkit.dvc.get_dvc_repo(self.wdir)
+            stages = list(dvc_repo.index.stages)
+        except Exception as e:
+            logger.debug(f"Can't load pipeline stages: {e}")
+            return
+        for stage in stages:
+            if not isinstance(stage, PipelineStage):
+                continue
+            paths = [
+                os.path.relpath(item.fs_path, self.wdir)
+                for item in [*stage.deps, *stage.outs]
+            ]
+            if os.path.relpath(stage.path, self.wdir) == "dvc.yaml":
+                self._stage_paths[stage.name] = paths
+            else:
+                self._subproject_paths.extend(paths)
+
+    def _refresh_pipeline(self) -> None:
+        status = calkit.pipeline.get_status(
+            wdir=self.wdir, check_environments=False
+        )
+        self.pipeline_status = status
+        # Compiling may have rewritten the DVC pipeline, so only note the
+        # pipeline's files afterwards
+        self._pipeline_digest = self._get_pipeline_digest()
+        self._load_stage_paths()
+
+    def _refresh_git(self) -> None:
+        try:
+            self.git = _get_git_status(self.wdir)
+        except Exception as e:
+            logger.debug(f"Can't get Git status: {e}")
+            self.git = None
+
+    @staticmethod
+    def _is_under(path: str, paths: list[str]) -> bool:
+        return any(path == p or path.startswith(p + os.sep) for p in paths)
+
+    def _affected_stages(self, paths: list[str]) -> list[str]:
+        return [
+            stage
+            for stage, stage_paths in self._stage_paths.items()
+            if any(self._is_under(path, stage_paths) for path in paths)
+        ]
+
+    def _recheck_stages(self, stages: list[str]) -> None:
+        """Recheck only the given stages, updating their entries in the
+        pipeline status.
+        """
+        from calkit.pipeline import StaleStage
+
+        assert self.pipeline_status is not None
+        ck_info = calkit.load_calkit_info(wdir=self.wdir)
+        stages_config = ck_info.get("pipeline", {}).get("stages", {})
+        dvc_repo = calkit.dvc.get_dvc_repo(self.wdir)
+        raw_status = dvc_repo.status(targets=stages, with_deps=False)
+        raw_status = calkit.dvc.status_as_posix(raw_status)
+        raw_status = {
+            k.split("dvc.yaml:")[-1]: v for k, v in raw_status.items()
+        }
+        stale_stages = dict(self.pipeline_status.stale_stages)
+        for stage in stages:
+            stage_cfg = stages_config.get(
+                stage, stages_config.get(stage.split("@")[0], {})
+            )
+            if stage not in raw_status or stage_cfg.get("frozen"):
+                stale_stages.pop(stage, None)
+                continue
+            configured_outputs = [
+                output.get("path", str(output))
+                if isinstance(output, dict)
+                else str(output)
+                for output in stage_cfg.get("outputs", [])
+            ]
+            stale_stages[stage] = StaleStage.from_status_data(
+                status_data=raw_status[stage],
+                configured_outputs=configured_outputs,
+                declared_always_run=bool(stage_cfg.get("always_run")),
+            )
+        self.pipeline_status = self.pipeline_status.model_copy(
+            update={"stale_stages": stale_stages}
+        )
+
+    def _is_ignored(self, path: str) -> bool:
+        parts = Path(path).parts
+        if not parts or parts[0] == "..":
+            return True
+        if parts[0] == ".dvc":
+            return True
+        if parts[0] == ".git":
+            return not self._is_under(path, list(GIT_STATE_PATHS))
+        return False
+
+    def _handle(self, paths: list[str]) -> None:
+        # What's left after ignoring internal state may change Git status
+        paths = [p for p in paths if not self._is_ignored(p)]
+        if not paths:
+            return
+        if (
+            self._get_pipeline_digest() != self._pipeline_digest
+            or any(
+                self._is_under(path, self._subproject_paths) for path in paths
+            )
+            or any(
+                # Notebooks are cleaned before their status is checked
+                p.endswith(".ipynb") and Path(p).parts[0] != ".calkit"
+                for p in paths
+            )
+        ):
+            self._refresh_pipeline()
+        else:
+            stages = self._affected_stages(paths)
+            if stages:
+                try:
+                    self._recheck_stages(stages)
+                except Exception as e:
+                    logger.debug(f"Recomputing all stages after error: {e}")
+                    self._refresh_pipeline()
+        self._refresh_git()
+        self._publish(paths)
+
+    def _on_change(self, paths: list[str]) -> None:
+        with self._lock:
+            self._pending.update(paths)
+        self._pending_event.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if not self._pending_event.wait(timeout=0.5):
+                continue
+            # Wait for the burst of changes, e.g., from a stage writing its
+            # outputs, to settle
+            time.sleep(DEBOUNCE_SECONDS)
+            with self._lock:
+                paths = sorted(self._pending)
+                self._pending.clear()
+                self._pending_event.clear()
+            try:
+                self._handle(paths)
+            except Exception as e:
+                logger.warning(f"Failed to update status: {e}")
+
+    def event(self, changed_paths: list[str] | None = None) -> dict:
+        """The current status as an event."""
+        return {
+            "seq": self.seq,
+            "changed_paths": changed_paths or [],
+            "pipeline": self.pipeline,
+            "git": self.git,
+        }
+
+    def _publish(self, changed_paths: list[str]) -> None:
+        self.seq += 1
+        event = self.event(changed_paths)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"Status subscriber failed: {e}")
+
+    def _add_subscriber(self, callback: Subscriber) -> Callable[[], None]:
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Call ``callback`` with each status event, starting with the
+        current status.
+
+        Returns a function that unsubscribes.
+        """
+        unsubscribe = self._add_subscriber(callback)
+        if self.pipeline_status is not None:
+            callback(self.event())
+        return unsubscribe
+
+    @property
+    def n_subscribers(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def start(self) -> "StatusWatcher":
+        """Compute the initial status and start watching."""
+        try:
+            self._refresh_pipeline()
+            self._refresh_git()
+            if self.use_watchdog:
+                self._observer = _make_observer(self.wdir, self._on_change)
+            else:
+                self._observer = _StatPoller(
+                    self.wdir, lambda: self.watched_paths, self._on_change
+                )
+            self._observer.start()
+            self._worker = threading.Thread(
+                target=self._run, name="calkit-watch", daemon=True
+            )
+            self._worker.start()
+        finally:
+            self._started.set()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._observer is not None:
+            self._observer.stop()
+            if self.use_watchdog:
+                self._observer.join()
+        if self._worker is not None:
+            self._worker.join()
+
+
+_watchers: dict[str, StatusWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def watch_status(wdir: str, callback: Subscriber) -> Callable[[], None]:
+    """Subscribe to status events for the project in ``wdir``.
+
+    Subscribers to the same directory share one watcher, which is started on
+    the first subscription and stopped when the last one unsubscribes.
+    Returns a function that unsubscribes.
+    """
+    wdir = os.path.abspath(wdir)
+    # The registry lock only guards adding and removing watchers and their
+    # subscribers; computing the status when starting and joining threads
+    # when stopping happen outside it so other projects aren't blocked
+    with _watchers_lock:
+        watcher = _watchers.get(wdir)
+        created = watcher is None
+        if watcher is None:
+            watcher = StatusWatcher(wdir)
+            _watchers[wdir] = watcher
+        # Registering now keeps a concurrent last unsubscribe from stopping
+        # the watcher before it has started
+        unsubscribe_watcher = watcher._add_subscriber(callback)
+    if created:
+        try:
+            watcher.start()
+        except BaseException:
+            with _watchers_lock:
+                if _watchers.get(wdir) is watcher:
+                    del _watchers[wdir]
+            raise
+    else:
+        watcher._started.wait()
+    if watcher.pipeline_status is not None:
+        callback(watcher.event())
+
+    def unsubscribe() -> None:
+        with _watchers_lock:
+            unsubscribe_watcher()
+            stop = (
+                watcher.n_subscribers == 0 and _watchers.get(wdir) is watcher
+            )
+            if stop:
+                del _watchers[wdir]
+        if stop:
+            watcher.stop()
+
+    return unsubscribe
@@ -0,0 +1,75 @@
+"""Add search indexes to project and dataset
+
+Revision ID: b4c8e1f2a9d7
+Revises: a333fc5aa994
+Create Date: 2026-10-18 10:12:44.519203
+
+Search vectors are generated columns, so they stay in sync with the searched
+columns without any application code. Trigram indexes on the searched
+columns serve substring matches.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "b4c8e1f2a9d7"
+down_revision = "a333fc5aa994"
+branch_labels = None
+depends_on = None
+
+SEARCHED_COLUMNS = {
+    "project": ["name", "title", "description", "git_repo_url"],
+    "dataset": ["path", "title", "description"],
+}
+SEARCH_VECTORS = {
+    "project": (
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ),
+    "dataset": (
+        "setweight(to_tsvector('simple', coalesce(path, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ),
+}
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, columns in SEARCHED_COLUMNS.items():
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(SEARCH_VECTORS[table], persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f"ix_{table}_search_vector",
+            table,
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+        )
+        for column in columns:
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade():
+    for table, columns in SEARCHED_COLUMNS.items():
+        for column in columns:
+            op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
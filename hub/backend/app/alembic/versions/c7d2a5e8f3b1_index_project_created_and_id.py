@@ -0,0 +1,30 @@
+"""Index project created and id
+
+Revision ID: c7d2a5e8f3b1
+Revises: b4c8e1f2a9d7
+Create Date: 2026-10-19 09:41:27.308154
+
+Project listings are paged newest first by keyset on (created, id), so an
+index on those columns serves each page without sorting every project.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c7d2a5e8f3b1"
+down_revision = "b4c8e1f2a9d7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_project_created_id",
+        "project",
+        ["created", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_project_created_id", table_name="project")
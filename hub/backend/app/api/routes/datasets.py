@@ -1,11 +1,12 @@
 """API endpoints for datasets."""
 
 import logging
+import uuid
 
-import sqlalchemy
 from fastapi import APIRouter
 from sqlmodel import SQLModel, and_, func, or_, select
 
+from app import search
 from app.api.deps import CurrentUserOptional, SessionDep
 from app.models import Dataset, Project, ProjectPublic
 
@@ -26,6 +27,12 @@ class DatasetResponse(SQLModel):
 class DatasetsResponse(SQLModel):
     data: list[DatasetResponse]
     count: int
+    # Pass as ``cursor`` to get the next page; None on the last one
+    next_cursor: str | None = None
+
+
+DATASET_SEARCH_COLUMNS = [Dataset.path, Dataset.title, Dataset.description]
+PROJECT_SEARCH_COLUMNS = [Project.name, Project.title, Project.description]
 
 
 @router.get("/datasets")
@@ -36,7 +43,14 @@ def get_datasets(
     offset: int = 0,
     include_imported: bool = False,
     search_for: str | None = None,
+    cursor: str | None = None,
 ) -> DatasetsResponse:
+    """List the datasets visible to the current user.
+
+    Results are ordered by project title, or best match first when
+    searching. Pass the returned ``next_cursor`` as ``cursor`` to get the
+    next page.
+    """
     # TODO: Handle collaborator access for private project datasets
     if current_user is None:
         where_clause = Project.is_public
@@ -45,37 +59,49 @@ def get_datasets(
             Project.is_public,
             Project.owner_account_id == current_user.account.id,
         )
+    if not include_imported:
+        where_clause = and_(where_clause, Dataset.imported_from.is_(None))
+    sort_key = [Project.title, Dataset.project_id, Dataset.path]
+    types: list = [str, uuid.UUID, str]
     if search_for is not None:
-        search_for = f"%{search_for}%"
         where_clause = and_(
             where_clause,
             or_(
-                Dataset.path.ilike(search_for),
-                Dataset.title.ilike(search_for),
-                Dataset.description.ilike(search_for),
-                Project.name.ilike(search_for),
-                Project.title.ilike(search_for),
-                Project.description.ilike(search_for),
+                search.match_clause(
+                    Dataset.search_vector, search_for, DATASET_SEARCH_COLUMNS
+                ),
+                search.match_clause(
+                    Project.search_vector, search_for, PROJECT_SEARCH_COLUMNS
+                ),
             ),
         )
-    count_query = (
+        rank = search.rank(
+            Dataset.search_vector, search_for, DATASET_SEARCH_COLUMNS
+        ) + search.rank(
+            Project.search_vector, search_for, PROJECT_SEARCH_COLUMNS
+        )
+        # Negated, so best matches come first in the ascending order
+        sort_key.insert(0, -rank)
+        types.insert(0, float)
+    count = session.exec(
         select(func.count())
         .select_from(Dataset)
         .join(Project)
         .where(where_clause)
+    ).one()
+    datasets, next_cursor = search.page(
+        session,
+        Dataset,
+        where_clause,
+        sort_key=sort_key,
+        types=types,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        join=Project,
     )
-    if not include_imported:
-        count_query = count_query.filter(Dataset.imported_from.is_(None))
-    count = session.exec(count_query).one()
-    select_query = (
-        select(Dataset)
-        .join(Project)
-        .where(where_clause)
-        .order_by(sqlalchemy.asc(Project.title))
-        .limit(limit)
-        .offset(offset)
+    return DatasetsResponse(
+        data=datasets,  # type: ignore
+        count=count,
+        next_cursor=next_cursor,
     )
-    if not include_imported:
-        select_query = select_query.filter(Dataset.imported_from.is_(None))
-    datasets = session.exec(select_query).all()
-    return DatasetsResponse(data=datasets, count=count)
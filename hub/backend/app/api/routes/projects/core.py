@@ -2,6 +2,7 @@
 
 import base64
 import concurrent.futures
+import hashlib
 import io
 import json
 import logging
@@ -18,7 +19,15 @@ from datetime import datetime, timedelta
 from fnmatch import fnmatch
 from io import StringIO
 from pathlib import Path, PurePosixPath
-from typing import Annotated, Any, Literal, NamedTuple, Optional, cast
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Literal,
+    NamedTuple,
+    Optional,
+    cast,
+)
 from urllib.parse import quote, urlparse
 
 import bibtexparser
@@ -55,6 +64,8 @@ from app import (
     mixpanel,
     orgs,
     pdftext,
+    search,
+    thumbnails,
     users,
     zotero,
 )
@@ -287,6 +298,63 @@ PRESENTATION_DIRS = {
 }
 
 
+PROJECT_SEARCH_COLUMNS = [
+    Project.name,
+    Project.title,
+    Project.description,
+    Project.git_repo_url,
+]
+
+
+def _get_projects_page(
+    session: Session,
+    where_clause,
+    limit: int,
+    offset: int,
+    search_for: str | None,
+    cursor: str | None,
+) -> ProjectsPublic:
+    # Served by the index on (created, id), which Postgres reads backwards
+    # for the descending order, with projects missing a creation time first
+    sort_key = [Project.created, Project.id]
+    types: list = [datetime.fromisoformat, uuid.UUID]
+    if search_for is not None:
+        where_clause = and_(
+            where_clause,
+            search.match_clause(
+                Project.search_vector,  # type: ignore
+                search_for,
+                PROJECT_SEARCH_COLUMNS,
+            ),
+        )
+        rank = search.rank(
+            Project.search_vector,  # type: ignore
+            search_for,
+            PROJECT_SEARCH_COLUMNS,
+        )
+        sort_key.insert(0, rank)
+        types.insert(0, float)
+    count = session.exec(
+        select(func.count()).select_from(Project).where(where_clause)
+    ).one()
+    projects, next_cursor = search.page(
+        session,
+        Project,
+        where_clause,
+        sort_key=sort_key,
+        types=types,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        descending=True,
+    )
+    return ProjectsPublic(
+        data=projects,  # type: ignore
+        count=count,
+        next_cursor=next_cursor,
+    )
+
+
 @router.get("/projects")
 def get_projects(
     session: SessionDep,
@@ -297,7 +365,13 @@ def get_projects(
     owner_name: str | None = None,
     github_repo: str | None = None,
     min_access_level: Literal["read", "write"] = "read",
+    cursor: str | None = None,
 ) -> ProjectsPublic:
+    """List the projects visible to the current user.
+
+    Results are newest first, or best match first when searching. Pass the
+    returned ``next_cursor`` as ``cursor`` to get the next page.
+    """
     if current_user is None:
         if min_access_level != "read":
             raise HTTPException(403, "User is not authenticated")
@@ -314,12 +388,14 @@ def get_projects(
             # A row in the unified access table with either a native Calkit
             # grant (role_id, e.g. an invite redemption) or GitHub-derived
             # access. A row with both null is a cached "no access" result.
-            and_(
-                UserProjectAccess.user_id == current_user.id,
-                or_(
-                    UserProjectAccess.role_id.is_not(None),  # type: ignore
-                    UserProjectAccess.github_access.is_not(None),  # type: ignore
-                ),
+            Project.user_access_records.any(  # type: ignore
+                and_(
+                    UserProjectAccess.user_id == current_user.id,
+                    or_(
+                        UserProjectAccess.role_id.is_not(None),  # type: ignore
+                        UserProjectAccess.github_access.is_not(None),  # type: ignore
+                    ),
+                )
             ),
             Project.owner_account.has(  # type: ignore
                 and_(
@@ -350,36 +426,14 @@ def get_projects(
                 func.lower(Project.git_repo_url) == f"{repo_url.lower()}.git",
             ),
         )
-    if search_for is not None:
-        search_for = f"%{search_for}%"
-        where_clause = and_(
-            where_clause,
-            or_(
-                Project.name.ilike(search_for),  # type: ignore
-                Project.title.ilike(search_for),  # type: ignore
-                Project.description.ilike(search_for),  # type: ignore
-                Project.git_repo_url.ilike(search_for),  # type: ignore
-            ),
-        )
-    count_query = (
-        select(func.count())
-        .select_from(Project)
-        .distinct()
-        .join(Project.user_access_records, isouter=True)  # type: ignore
-        .where(where_clause)
-    )
-    count = session.exec(count_query).one()
-    select_query = (
-        select(Project)
-        .distinct()
-        .join(Project.user_access_records, isouter=True)  # type: ignore
-        .where(where_clause)
-        .order_by(sqlalchemy.desc(Project.created))  # type: ignore
-        .limit(limit)
-        .offset(offset)
+    return _get_projects_page(
+        session,
+        where_clause,
+        limit=limit,
+        offset=offset,
+        search_for=search_for,
+        cursor=cursor,
     )
-    projects = session.exec(select_query).all()
-    return ProjectsPublic(data=projects, count=count)  # type: ignore
 
 
 @router.get("/user/projects")
@@ -390,6 +444,7 @@ def get_owned_projects(
     limit: int = 100,
     offset: int = 0,
     search_for: str | None = None,
+    cursor: str | None = None,
 ) -> ProjectsPublic:
     where_clause = or_(
         Project.owner_account_id == current_user.account.id,
@@ -413,30 +468,14 @@ def get_owned_projects(
             )
         ),
     )
-    if search_for is not None:
-        search_for = f"%{search_for}%"
-        where_clause = and_(
-            where_clause,
-            or_(
-                Project.name.ilike(search_for),  # type: ignore
-                Project.title.ilike(search_for),  # type: ignore
-                Project.description.ilike(search_for),  # type: ignore
-                Project.git_repo_url.ilike(search_for),  # type: ignore
-            ),
-        )
-    count_statement = (
-        select(func.count()).select_from(Project).where(where_clause)
-    )
-    count = session.exec(count_statement).one()
-    statement = (
-        select(Project)
-        .where(where_clause)
-        .order_by(sqlalchemy.desc(Project.created))  # type: ignore
-        .offset(offset)
-        .limit(limit)
+    return _get_projects_page(
+        session,
+        where_clause,
+        limit=limit,
+        offset=offset,
+        search_for=search_for,
+        cursor=cursor,
     )
-    projects = session.exec(statement).all()
-    return ProjectsPublic(data=projects, count=count)  # type: ignore
 
 
 @router.post("/projects")
@@ -1511,22 +1550,36 @@ def get_project_dvc_output_text_diff(
         size = out.get("size")
         if size is not None and size > pdftext.MAX_PDF_BYTES:
             raise HTTPException(413, f"'{path}' is too large to compare")
-        fpath = get_data_fpath_for_md5(
-            owner_name=project.owner_account_name,
-            project_name=project.name,
-            md5=out["md5"],
-            fs=fs,
-        )
-        if fpath is None:
-            raise HTTPException(
-                404, f"'{path}' has not been pushed to storage at {ref}"
+
+        def read_pdf() -> bytes:
+            fpath = get_data_fpath_for_md5(
+                owner_name=project.owner_account_name,
+                project_name=project.name,
+                md5=out["md5"],
+                fs=fs,
             )
-        with fs.open(fpath, "rb") as f:
-            data = f.read(pdftext.MAX_PDF_BYTES + 1)
-        if len(data) > pdftext.MAX_PDF_BYTES:
-            raise HTTPException(413, f"'{path}' is too large to compare")
+            if fpath is None:
+                raise HTTPException(
+                    404, f"'{path}' has not been pushed to storage at {ref}"
+                )
+            with fs.open(fpath, "rb") as f:
+                data = f.read(pdftext.MAX_PDF_BYTES + 1)
+            if len(data) > pdftext.MAX_PDF_BYTES:
+                raise HTTPException(413, f"'{path}' is too large to compare")
+            return data
+
+        # The text is cached by md5, so a build that's already been read is
+        # neither downloaded nor parsed again
         try:
-            return pdftext.extract_text(data)
+            return pdftext.get_normalized_text(
+                md5=out["md5"],
+                read=read_pdf,
+                fs=fs,
+                owner_name=project.owner_account_name,
+                project_name=project.name,
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             logger.warning(f"Failed to read text from {path} at {ref}: {e}")
             raise HTTPException(422, f"Could not read the text of '{path}'")
@@ -2293,6 +2346,48 @@ def _discover_figures(
     )
 
 
+def _figure_source(
+    project: Project,
+    ctx: _FigureContext,
+    path: str,
+    fs,
+) -> tuple[str, str, Callable[[], bytes | None]] | None:
+    """Identify a figure's content by md5 without downloading it.
+
+    Returns the md5, where the figure is stored, and a function that reads
+    its content, or None if it isn't a single file in Git or DVC.
+    """
+    tree = ctx.tree
+    if tree.is_file(path):
+        # Git content is already local, so hashing it is cheap
+        data = tree.read_bytes(path)
+        return hashlib.md5(data).hexdigest(), "git", lambda: data
+    dvc_out = ctx.dvc_lock_outs.get(path)
+    if dvc_out is None and tree.is_file(path + ".dvc"):
+        try:
+            outs = load_yaml_fast(tree.read_bytes(path + ".dvc"))["outs"]
+            dvc_out = outs[0]
+        except Exception:
+            return None
+    md5 = (dvc_out or {}).get("md5") or ""
+    if not md5 or md5.endswith(".dir"):
+        return None
+
+    def _read() -> bytes | None:
+        fp = get_data_fpath_for_md5(
+            owner_name=project.owner_account_name,
+            project_name=project.name,
+            md5=md5,
+            fs=fs,
+        )
+        if fp is None:
+            return None
+        with fs.open(fp, "rb") as f:
+            return f.read()
+
+    return md5, "dvc", _read
+
+
 def _resolve_figures(
     project: Project,
     repo: git.Repo,
@@ -2301,6 +2396,7 @@ def _resolve_figures(
     ctx: _FigureContext,
     figures: list[dict[str, Any]],
     resolve_content: bool = True,
+    use_thumbnails: bool = False,
 ) -> list[Figure]:
     """Resolve content, comment counts and stage status for ``figures``.
 
@@ -2311,6 +2407,11 @@ def _resolve_figures(
     ``resolve_content=False`` skips the object-storage work entirely and
     returns metadata only, for callers that just need to list or pick figures
     by path and never render them.
+
+    ``use_thumbnails=True`` returns a ``thumbnail_url`` instead of content
+    for any figure a preview can be made of, generating the preview the
+    first time it's needed. Figures that can't be previewed, e.g., SVGs,
+    are resolved as usual.
     """
     if not figures:
         return []
@@ -2386,6 +2487,34 @@ def _resolve_figures(
         fig["storage"] = item.storage
         return _annotate(fig)
 
+    fs = get_object_fs() if use_thumbnails else None
+
+    def _resolve_thumbnail(fig: dict[str, Any]) -> dict[str, Any]:
+        path = fig["path"]
+        source = None
+        if thumbnails.can_preview(path):
+            source = _figure_source(project=project, ctx=ctx, path=path, fs=fs)
+        if source is None:
+            return _resolve(fig)
+        md5, storage, read_source = source
+        fp = thumbnails.get_or_create_thumbnail(
+            fs=fs,
+            owner_name=project.owner_account_name,
+            project_name=project.name,
+            md5=md5,
+            ext=posixpath.splitext(path)[-1],
+            read_source=read_source,
+        )
+        if fp is None:
+            return _resolve(fig)
+        fig["thumbnail_url"] = (
+            f"{settings.API_V1_STR}/projects/{project.owner_account_name}/"
+            f"{project.name}/thumbnails/{md5}"
+        )
+        fig["storage"] = storage
+        return _annotate(fig)
+
+    resolve_one = _resolve_thumbnail if use_thumbnails else _resolve
     if not resolve_content:
         resolved = [_annotate(fig) for fig in figures]
     elif len(figures) > 1:
@@ -2397,9 +2526,9 @@ def _resolve_figures(
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=min(8, len(figures))
         ) as pool:
-            resolved = list(pool.map(_resolve, figures))
+            resolved = list(pool.map(resolve_one, figures))
     else:
-        resolved = [_resolve(figures[0])]
+        resolved = [resolve_one(figures[0])]
     return [Figure.model_validate(fig) for fig in resolved]
 
 
@@ -2437,6 +2566,13 @@ def get_project_figures(
             "listing that skips object storage entirely."
         ),
     ),
+    thumbnails: bool = Query(
+        False,
+        description=(
+            "Return a thumbnail URL instead of inlined content for figures "
+            "that can be previewed."
+        ),
+    ),
 ) -> FiguresPage:
     """Get a page of the project's figures.
 
@@ -2444,7 +2580,9 @@ def get_project_figures(
     paginated: a project with hundreds of figures would otherwise take
     minutes and return a payload measured in hundreds of megabytes. Callers
     that only need paths and titles should pass ``include_content=false``,
-    which skips that download entirely.
+    which skips that download entirely. Callers rendering a gallery should
+    pass ``thumbnails=true``, which references small, cacheable previews
+    instead.
     """
     project = app.projects.get_project(
         session=session,
@@ -2482,6 +2620,7 @@ def get_project_figures(
         ctx=ctx,
         figures=page,
         resolve_content=include_content,
+        use_thumbnails=thumbnails,
     )
     return FiguresPage(
         items=items,
@@ -2491,6 +2630,60 @@ def get_project_figures(
     )
 
 
+@router.get("/projects/{owner_name}/{project_name}/thumbnails/{md5}")
+def get_project_thumbnail(
+    owner_name: str,
+    project_name: str,
+    md5: str,
+    current_user: CurrentUserOptional,
+    session: SessionDep,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """Serve a figure thumbnail referenced by the figures listing.
+
+    Thumbnails are keyed by the md5 of the figure's content, so what a URL
+    returns can never change and the browser can cache it forever.
+    """
+    project = app.projects.get_project(
+        owner_name=owner_name,
+        project_name=project_name,
+        session=session,
+        current_user=current_user,
+        min_access_level="read",
+    )
+    if not re.fullmatch(r"[0-9a-f]{32}", md5):
+        raise HTTPException(404)
+    etag = thumbnails.thumbnail_etag(md5)
+    # Private unless the project is public, since this is gated on the read
+    # check above
+    visibility = "public" if project.is_public else "private"
+    headers = {
+        "Cache-Control": f"{visibility}, max-age=31536000, immutable",
+        "ETag": etag,
+    }
+    if if_none_match is not None and (
+        if_none_match.strip() == "*"
+        or etag in [t.strip() for t in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=headers)
+    fs = get_object_fs()
+    fp = thumbnails.thumbnail_fpath(
+        owner_name=project.owner_account_name,
+        project_name=project.name,
+        md5=md5,
+    )
+    try:
+        with fs.open(fp, "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        raise HTTPException(404)
+    return Response(
+        content=content,
+        media_type=thumbnails.THUMBNAIL_MEDIA_TYPE,
+        headers=headers | {"X-Content-Type-Options": "nosniff"},
+    )
+
+
 def _build_results(
     project: Project,
     repo: git.Repo,
@@ -5244,8 +5437,6 @@ def get_user_overleaf_sync(
             )
     candidates = session.exec(
         select(Project)
-        .distinct()
-        .join(Project.user_access_records, isouter=True)  # type: ignore
         .where(app.projects.writable_project_clause(current_user))
         .order_by(sqlalchemy.desc(Project.created))  # type: ignore
     ).all()
@@ -7420,6 +7611,10 @@ def _merge_zotero_changes_into_bib(
         since=since_version,
         include_children=True,
     )
+    if since_version and new_version == since_version and not changed_items:
+        # Nothing has changed on Zotero, so there are no deletions to fetch
+        # and the .bib is left exactly as it is
+        return new_version
     deleted_keys = set(
         zotero.get_deleted_item_keys(
             api_key=api_key,
@@ -94,6 +94,7 @@ class InfoResult(BaseModel):
     size: int
     type: str  # "file" or "directory"
     time_modified: str | None = None
+    md5: str | None = None
 
 
 class OperationResult(BaseModel):
@@ -145,6 +146,104 @@ def _strip_data_prefix(path: str, data_prefix: str) -> str:
     return path
 
 
+def _get_object_md5(info_dict: dict) -> str | None:
+    """Get the hex MD5 of an object's content from its storage info, if the
+    backend reports one, so clients can cache it by content.
+    """
+    md5_b64 = info_dict.get("md5Hash")  # GCS
+    if isinstance(md5_b64, str):
+        try:
+            return base64.b64decode(md5_b64).hex()
+        except ValueError:
+            return None
+    # S3 ETags are the MD5 unless the object was uploaded in parts
+    for key in ["md5", "ETag"]:
+        value = info_dict.get(key)
+        if isinstance(value, str):
+            value = value.strip('"').lower()
+            if re.fullmatch(r"[0-9a-f]{32}", value):
+                return value
+    return None
+
+
+def _make_access(
+    operation: Literal["get", "put"],
+    backend: str,
+    fs,
+    full_path: str,
+    content_length: int | None = None,
+    content_type: str | None = None,
+) -> PresignedUrlAccess | PresignedMultipartAccess | PresignedChunkedAccess:
+    """Create the access instructions to get or put one object."""
+    if operation == "get":
+        url = get_object_url(
+            fpath=full_path,
+            fname=None,
+            expires=3600,
+            fs=fs,
+            method="get",
+        )
+        return PresignedUrlAccess(url=url, http_method="GET")
+    # Determine if we need chunked upload for large puts
+    chunked = storage.upload_should_be_chunked(content_length)
+    if chunked:
+        # At this point, content_length is guaranteed to be not None
+        assert content_length is not None
+        try:
+            upload_info = storage.get_multipart_upload_info(
+                fs=fs,
+                fpath=full_path,
+                upload_size_bytes=content_length,
+                expires=900,
+                content_type=content_type,
+            )
+        except Exception:
+            logger.exception(
+                f"Failed to get multipart upload info for {full_path}"
+            )
+            raise HTTPException(500, "Failed to determine upload method")
+        if backend == "s3":
+            return PresignedMultipartAccess(
+                bucket=upload_info["bucket"],
+                key=upload_info["key"],
+                upload_id=upload_info["upload_id"],
+                part_urls=upload_info["part_urls"],
+                complete_url=upload_info["complete_url"],
+                abort_url=upload_info["abort_url"],
+                part_size_bytes=upload_info["part_size_bytes"],
+                estimated_part_count=len(upload_info["part_urls"]),
+                upload_size_bytes=content_length,
+                content_type=content_type,
+            )
+        elif backend == "gcs":
+            return PresignedChunkedAccess(
+                init_url=upload_info["init_url"],
+                http_method=upload_info["http_method"],
+                chunk_size_bytes=upload_info["chunk_size_bytes"],
+                estimated_chunk_count=upload_info["estimated_chunk_count"],
+                upload_size_bytes=content_length,
+                content_type=content_type,
+                headers={"x-goog-resumable": "start"},
+            )
+        else:
+            raise HTTPException(
+                500, f"Chunked upload not supported for {backend}"
+            )
+    # Regular presigned PUT URL for smaller files
+    try:
+        url = get_object_url(
+            fpath=full_path,
+            fname=None,
+            expires=900,
+            fs=fs,
+            method="put",
+        )
+    except RuntimeError:
+        logger.exception(f"Failed to get presigned URL for {full_path}")
+        raise HTTPException(500, "Failed to get presigned URL")
+    return PresignedUrlAccess(url=url, http_method="PUT", headers=None)
+
+
 @router.post("/projects/{owner_name}/{project_name}/fs/ops")
 def post_project_fs_op(
     owner_name: str,
@@ -235,6 +334,7 @@ def post_project_fs_op(
                 size=info_dict.get("size", 0),
                 type=info_dict.get("type", "file"),
                 time_modified=info_dict.get("time_modified"),
+                md5=_get_object_md5(info_dict),
             ),
         )
     if operation == "list":
@@ -297,98 +397,31 @@ def post_project_fs_op(
             backend=backend,
             result=FsListResult(paths=paths),
         )
-    if operation == "get":
-        url = get_object_url(
-            fpath=full_path,
-            fname=None,
-            expires=3600,
-            fs=fs,
-            method="get",
-        )
-        return FsOpResponse(
-            backend=backend,
-            access=PresignedUrlAccess(
-                url=url,
-                http_method="GET",
-            ),
-        )
-    # We are doing a PUT if we've made it this far
-    assert operation == "put"
-    # Determine if we need chunked upload for large puts
-    chunked = storage.upload_should_be_chunked(content_length)
-    if chunked:
-        # At this point, content_length is guaranteed to be not None
-        assert content_length is not None
-        try:
-            upload_info = storage.get_multipart_upload_info(
-                fs=fs,
-                fpath=full_path,
-                upload_size_bytes=content_length,
-                expires=900,
-                content_type=content_type,
-            )
-        except Exception:
-            logger.exception(
-                f"Failed to get multipart upload info for {full_path}"
-            )
-            raise HTTPException(500, "Failed to determine upload method")
-        if backend == "s3":
-            access = PresignedMultipartAccess(
-                bucket=upload_info["bucket"],
-                key=upload_info["key"],
-                upload_id=upload_info["upload_id"],
-                part_urls=upload_info["part_urls"],
-                complete_url=upload_info["complete_url"],
-                abort_url=upload_info["abort_url"],
-                part_size_bytes=upload_info["part_size_bytes"],
-                estimated_part_count=len(upload_info["part_urls"]),
-                upload_size_bytes=content_length,
-                content_type=content_type,
-            )
-        elif backend == "gcs":
-            access = PresignedChunkedAccess(
-                init_url=upload_info["init_url"],
-                http_method=upload_info["http_method"],
-                chunk_size_bytes=upload_info["chunk_size_bytes"],
-                estimated_chunk_count=upload_info["estimated_chunk_count"],
-                upload_size_bytes=content_length,
-                content_type=content_type,
-                headers={"x-goog-resumable": "start"},
-            )
-        else:
-            raise HTTPException(
-                500, f"Chunked upload not supported for {backend}"
-            )
-    # Regular presigned PUT URL for smaller files
-    else:
-        put_headers = None
-        try:
-            url = get_object_url(
-                fpath=full_path,
-                fname=None,
-                expires=900,
-                fs=fs,
-                method="put",
-            )
-        except RuntimeError:
-            logger.exception(f"Failed to get presigned URL for {full_path}")
-            raise HTTPException(500, "Failed to get presigned URL")
-        access = PresignedUrlAccess(
-            url=url,
-            http_method="PUT",
-            headers=put_headers,
-        )
-    if current_user is not None:
+    access = _make_access(
+        operation=operation,
+        backend=backend,
+        fs=fs,
+        full_path=full_path,
+        content_length=content_length,
+        content_type=content_type,
+    )
+    if operation == "put" and current_user is not None:
         mixpanel.user_performed_fs_op(
             current_user, owner_name, project_name, operation
         )
     return FsOpResponse(backend=backend, access=access)
 
 
+# Put access may initiate a multipart upload per path, so batches are capped
+FS_OP_BATCH_MAX_PATHS = 500
+
+
 class FsOpBatchRequest(BaseModel):
-    operation: Literal["exists", "info"]
-    paths: list[str]
+    operation: Literal["exists", "info", "get", "put"]
+    paths: list[str] = Field(max_length=FS_OP_BATCH_MAX_PATHS)
     include: list[Literal["exists", "info", "content"]] | None = None
+    # Sizes of the files to put, by path, so large ones get chunked uploads
+    content_lengths: dict[str, int] | None = None
 
 
 class FsOpBatchResult(BaseModel):
@@ -397,6 +430,15 @@ class FsOpBatchResult(BaseModel):
     exists: bool | None = None
     info: dict | None = None
     content_base64: str | None = None
+    access: (
+        Annotated[
+            PresignedUrlAccess
+            | PresignedMultipartAccess
+            | PresignedChunkedAccess,
+            Field(discriminator="kind"),
+        ]
+        | None
+    ) = None
 
 
 class FsOpBatchResponse(BaseModel):
@@ -412,12 +454,22 @@ def post_project_fs_batch_op(
     session: SessionDep,
     current_user: CurrentUserOptional,
 ) -> FsOpBatchResponse:
-    """Endpoint for batch file system operations for multiple paths."""
+    """Endpoint for batch file system operations for multiple paths.
+
+    For gets and puts, this returns the access instructions for every path,
+    so a client transferring many files makes one request for all of them
+    rather than one per file.
+    """
     owner_name = owner_name.lower()
     project_name = project_name.lower()
     operation = req.operation
     paths = req.paths
     include = req.include or []
+    content_lengths = req.content_lengths or {}
+    if any(n < 0 for n in content_lengths.values()):
+        raise HTTPException(
+            status_code=422, detail="content_lengths must be >= 0"
+        )
     # Prevent path traversal attacks
     for path in paths:
         if os.path.isabs(path):
@@ -444,6 +496,14 @@ def post_project_fs_batch_op(
     for path in paths:
         full_path = f"{data_prefix}/{owner_name}/{project_name}/{path}"
         path_result = {}
+        if operation in ("get", "put"):
+            path_result["access"] = _make_access(
+                operation=operation,
+                backend=backend,
+                fs=fs,
+                full_path=full_path,
+                content_length=content_lengths.get(path),
+            )
         # Handle exists
         if operation == "exists" or "exists" in include:
             try:
@@ -461,6 +521,7 @@ def post_project_fs_batch_op(
                     "size": info_dict.get("size", 0),
                     "type": info_dict.get("type", "file"),
                     "time_modified": info_dict.get("time_modified"),
+                    "md5": _get_object_md5(info_dict),
                 }
             except FileNotFoundError:
                 path_result["info"] = None
@@ -496,4 +557,8 @@ def post_project_fs_batch_op(
                     detail=f"Error reading file content for path: {path}",
                 ) from exc
         results[path] = FsOpBatchResult(**path_result)
+    if operation == "put" and current_user is not None:
+        mixpanel.user_performed_fs_op(
+            current_user, owner_name, project_name, operation
+        )
     return FsOpBatchResponse(backend=backend, results=results)
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any, Literal, Union
 
 import sqlalchemy
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 from app import utcnow
 
@@ -519,6 +520,51 @@ class NewPassword(SQLModel):
     new_password: str = Field(min_length=8, max_length=40)
 
 
+# Search vectors are generated columns, so the database keeps them in sync
+# with the searched columns on every write; see app.search
+PROJECT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+DATASET_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(path, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def _search_indexes(table: str, columns: list[str]) -> list[sqlalchemy.Index]:
+    """Index a table's search vector, and its searched columns by trigram,
+    so substring matches don't need a sequential scan.
+    """
+    return [
+        sqlalchemy.Index(
+            f"ix_{table}_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        )
+    ] + [
+        sqlalchemy.Index(
+            f"ix_{table}_{column}_trgm",
+            column,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+        for column in columns
+    ]
+
+
+def _search_vector_field(expression: str) -> Any:
+    return Field(
+        default=None,
+        exclude=True,
+        sa_column=sqlalchemy.Column(
+            TSVECTOR, sqlalchemy.Computed(expression, persisted=True)
+        ),
+    )
+
+
 class ProjectBase(SQLModel):
     name: str = Field(min_length=4, max_length=255)
     title: str = Field(min_length=4, max_length=255)
@@ -538,6 +584,13 @@ class ProjectBase(SQLModel):
 
 
 class Project(ProjectBase, table=True):
+    __table_args__ = (
+        *_search_indexes(
+            "project", ["name", "title", "description", "git_repo_url"]
+        ),
+        # Serves paging through projects newest first
+        sqlalchemy.Index("ix_project_created_id", "created", "id"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_account_id: uuid.UUID = Field(foreign_key="account.id")
     # When this project's Overleaf links were last read out of its
@@ -547,6 +600,7 @@ class Project(ProjectBase, table=True):
     parent_project_id: uuid.UUID | None = Field(
         foreign_key="project.id", default=None
     )
+    search_vector: str | None = _search_vector_field(PROJECT_SEARCH_VECTOR)
     # Relationships
     owner_account: Account = Relationship(back_populates="owned_projects")
     user_access_records: list["UserProjectAccess"] = Relationship(
@@ -646,6 +700,8 @@ class ProjectPublic(ProjectBase):
 class ProjectsPublic(SQLModel):
     data: list[ProjectPublic]
     count: int
+    # Pass as ``cursor`` to get the next page; None on the last one
+    next_cursor: str | None = None
 
 
 class ProjectPost(ProjectBase):
@@ -880,6 +936,9 @@ class Figure(SQLModel):
     dataset: str | None = None
     content: str | None = None  # Base64 encoded
     url: str | None = None
+    # API path of a downscaled preview, set instead of content when listing
+    # figures with thumbnails
+    thumbnail_url: str | None = None
     comment_count: int = 0
     storage: Literal["git", "dvc", "dvc-zip"] | None = None
     # TODO: Link to a dataset, or does the pipeline do that?
@@ -1051,9 +1110,13 @@ class DatasetBase(SQLModel):
 
 
 class Dataset(DatasetBase, table=True):
+    __table_args__ = tuple(
+        _search_indexes("dataset", ["path", "title", "description"])
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4)
     # Project in which is was created
     project_id: uuid.UUID = Field(foreign_key="project.id", primary_key=True)
+    search_vector: str | None = _search_vector_field(DATASET_SEARCH_VECTOR)
     # TODO: Track version somehow, and link to DVC remote MD5?
     # TODO: Is this a directory of files?
     # TODO: Track size? -- basically all DVC properties
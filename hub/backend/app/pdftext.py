@@ -12,13 +12,24 @@ worth diffing.
 
 from __future__ import annotations
 
+import bisect
+import concurrent.futures
 import difflib
+import json
+import logging
+import multiprocessing
+import os
 import re
+import tempfile
+import threading
 import unicodedata
-from typing import Literal
+from typing import Callable, Literal
 
+import cachetools
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
 # Bounds on what will be read at all, so one enormous artifact can't tie
 # up a worker.
 MAX_PDF_BYTES = 50_000_000
@@ -26,6 +37,29 @@ MAX_PAGES = 300
 # Words of unchanged text kept either side of a change. Enough to place
 # the change in the document without returning the whole paper twice.
 CONTEXT_WORDS = 12
+# Documents with fewer pages than this are read in-process; spreading them
+# over the pool costs more than it saves
+PARALLEL_MIN_PAGES = 16
+PAGES_PER_TASK = 8
+MAX_EXTRACT_WORKERS = 4
+# Above this many words, diff with patience and Myers rather than difflib,
+# whose matching is quadratic in the worst case
+LONG_DOC_WORDS = 2_000
+# Myers' algorithm is abandoned past this many edits in a region, which is
+# then reported as replaced outright, rather than tie up a worker
+MAX_MYERS_EDITS = 1_000
+# Bump this to invalidate stored text after changing extraction
+TEXT_VERSION = 1
+TEXT_KIND = f"pdf-text-v{TEXT_VERSION}"
+
+# Normalized text of recently read PDFs by md5, along with whether it was
+# truncated. Two builds of a thesis are usually compared several times over.
+_text_cache: cachetools.LRUCache[str, tuple[str, bool]] = cachetools.LRUCache[
+    str, tuple[str, bool]
+](maxsize=64)
+_text_cache_lock = threading.Lock()
+_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
 
 
 class DiffSegment(BaseModel):
@@ -45,19 +79,126 @@ class TextDiff(BaseModel):
     truncated: bool = False
 
 
-def extract_text(data: bytes) -> tuple[str, bool]:
-    """Return a PDF's text, and whether it was cut short at MAX_PAGES."""
+def _extract_pages(source: bytes | str, start: int, stop: int) -> list[str]:
+    """Extract the text of pages ``start`` to ``stop`` of a PDF, given as
+    bytes or as the path of a file.
+    """
     import io
 
     from pypdf import PdfReader
 
-    reader = PdfReader(io.BytesIO(data))
-    pages = reader.pages
-    truncated = len(pages) > MAX_PAGES
-    return (
-        "\n".join(page.extract_text() or "" for page in pages[:MAX_PAGES]),
-        truncated,
+    reader = PdfReader(
+        io.BytesIO(source) if isinstance(source, bytes) else source
     )
+    return [
+        reader.pages[n].extract_text() or ""
+        for n in range(start, min(stop, len(reader.pages)))
+    ]
+
+
+def _get_pool() -> concurrent.futures.ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawn rather than fork, since forking a threaded server can
+            # leave a lock held in the child
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(MAX_EXTRACT_WORKERS, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def extract_text(data: bytes) -> tuple[str, bool]:
+    """Return a PDF's text, and whether it was cut short at MAX_PAGES.
+
+    Extraction is by far the slowest part of comparing two long documents,
+    and each page is independent, so long documents are read a chunk of
+    pages at a time in a process pool. The PDF is written to a temporary
+    file for the workers to read, so each task is sent only its page range
+    rather than a copy of the document.
+    """
+    import io
+
+    from pypdf import PdfReader
+
+    n_pages = len(PdfReader(io.BytesIO(data)).pages)
+    truncated = n_pages > MAX_PAGES
+    n_pages = min(n_pages, MAX_PAGES)
+    if n_pages < PARALLEL_MIN_PAGES:
+        return "\n".join(_extract_pages(data, 0, n_pages)), truncated
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fpath = os.path.join(tmpdir, "doc.pdf")
+        with open(fpath, "wb") as f:
+            f.write(data)
+        futures = [
+            _get_pool().submit(
+                _extract_pages, fpath, start, start + PAGES_PER_TASK
+            )
+            for start in range(0, n_pages, PAGES_PER_TASK)
+        ]
+        try:
+            pages = [page for future in futures for page in future.result()]
+        finally:
+            # The file must outlive every task reading it
+            for future in futures:
+                future.cancel()
+            concurrent.futures.wait(futures)
+    return "\n".join(pages), truncated
+
+
+def get_normalized_text(
+    md5: str,
+    read: Callable[[], bytes],
+    fs=None,
+    owner_name: str | None = None,
+    project_name: str | None = None,
+) -> tuple[str, bool]:
+    """Return a PDF's normalized text, and whether it was truncated.
+
+    The text is cached by the PDF's md5 in memory and, if ``fs`` is given,
+    in object storage next to the project's data, so each build of a
+    document is only downloaded and read once. ``read`` is only called on a
+    cache miss.
+    """
+    with _text_cache_lock:
+        if md5 in _text_cache:
+            return _text_cache[md5]
+    fpath = None
+    if fs is not None and owner_name and project_name:
+        from app.storage import make_derived_fpath
+
+        fpath = make_derived_fpath(
+            owner_name=owner_name,
+            project_name=project_name,
+            kind=TEXT_KIND,
+            md5=md5,
+            ext=".json",
+        )
+        try:
+            with fs.open(fpath, "rb") as f:
+                stored = json.load(f)
+            res = (stored["text"], stored["truncated"])
+            with _text_cache_lock:
+                _text_cache[md5] = res
+            return res
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to read stored PDF text {fpath}: {e}")
+    text, truncated = extract_text(read())
+    res = (normalize(text), truncated)
+    if fpath is not None:
+        try:
+            with fs.open(fpath, "wb") as f:
+                f.write(
+                    json.dumps({"text": res[0], "truncated": res[1]}).encode()
+                )
+        except Exception as e:
+            logger.warning(f"Failed to store PDF text {fpath}: {e}")
+    with _text_cache_lock:
+        _text_cache[md5] = res
+    return res
 
 
 def normalize(text: str) -> str:
@@ -75,6 +216,190 @@ def normalize(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
+def _myers_matches(
+    a: list[int],
+    alo: int,
+    ahi: int,
+    b: list[int],
+    blo: int,
+    bhi: int,
+    out: list[tuple[int, int]],
+) -> None:
+    """Append the matching pairs of a shortest edit script (Myers, 1986).
+
+    Gives up, matching nothing, past ``MAX_MYERS_EDITS``.
+    """
+    n = ahi - alo
+    m = bhi - blo
+    max_d = min(n + m, MAX_MYERS_EDITS)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    for d in range(max_d + 1):
+        trace.append(v[offset - d - 1 : offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                # Walk back through the trace to recover the matches
+                matches = []
+                for d_back in range(d, 0, -1):
+                    prev = trace[d_back]
+                    # prev holds v[-d_back - 1 .. d_back + 1]
+                    k = x - y
+
+                    def pv(kk: int) -> int:
+                        return prev[kk + d_back + 1]
+
+                    if k == -d_back or (k != d_back and pv(k - 1) < pv(k + 1)):
+                        prev_k = k + 1
+                    else:
+                        prev_k = k - 1
+                    prev_x = pv(prev_k)
+                    prev_y = prev_x - prev_k
+                    while x > prev_x and y > prev_y:
+                        x -= 1
+                        y -= 1
+                        matches.append((alo + x, blo + y))
+                    x, y = prev_x, prev_y
+                while x > 0 and y > 0:
+                    x -= 1
+                    y -= 1
+                    matches.append((alo + x, blo + y))
+                out.extend(reversed(matches))
+                return
+
+
+def _unique_anchors(
+    a: list[int], alo: int, ahi: int, b: list[int], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """Words occurring exactly once on each side, in an order both agree on.
+
+    These are patience diff's anchors: the longest increasing subsequence
+    of the pairs of positions of words unique to both ranges.
+    """
+    counts: dict[int, list[int]] = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, 0, i, -1])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+    pairs = sorted(
+        (e[2], e[3]) for e in counts.values() if e[0] == 1 and e[1] == 1
+    )
+    # Longest increasing subsequence by b position, by patience sorting
+    tails: list[int] = []
+    tail_idx: list[int] = []
+    prev: list[int] = []
+    for n, (_, j) in enumerate(pairs):
+        pos = bisect.bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_idx.append(n)
+        else:
+            tails[pos] = j
+            tail_idx[pos] = n
+        prev.append(tail_idx[pos - 1] if pos else -1)
+    res = []
+    n = tail_idx[-1] if tail_idx else -1
+    while n >= 0:
+        res.append(pairs[n])
+        n = prev[n]
+    return res[::-1]
+
+
+def _patience_matches(
+    a: list[int],
+    alo: int,
+    ahi: int,
+    b: list[int],
+    blo: int,
+    bhi: int,
+    out: list[tuple[int, int]],
+    depth: int = 0,
+) -> None:
+    """Append matching pairs between two ranges, by patience diff."""
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        out.append((alo, blo))
+        alo += 1
+        blo += 1
+    suffix = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        suffix.append((ahi, bhi))
+    if alo < ahi and blo < bhi:
+        anchors = (
+            _unique_anchors(a, alo, ahi, b, blo, bhi) if depth < 64 else []
+        )
+        if anchors:
+            i0, j0 = alo, blo
+            for i, j in anchors:
+                _patience_matches(a, i0, i, b, j0, j, out, depth + 1)
+                out.append((i, j))
+                i0, j0 = i + 1, j + 1
+            _patience_matches(a, i0, ahi, b, j0, bhi, out, depth + 1)
+        else:
+            _myers_matches(a, alo, ahi, b, blo, bhi, out)
+    out.extend(reversed(suffix))
+
+
+def _opcodes(
+    base_words: list[str], head_words: list[str]
+) -> list[tuple[str, int, int, int, int]]:
+    """Diff opcodes in the form of ``SequenceMatcher.get_opcodes``.
+
+    Short documents use difflib. Long ones are diffed on word hashes with
+    patience diff, which anchors on words that appear once on each side,
+    and Myers' algorithm between anchors, so the cost grows with the size
+    of the changes rather than the square of the document's length.
+    """
+    if max(len(base_words), len(head_words)) <= LONG_DOC_WORDS:
+        return difflib.SequenceMatcher(
+            None, base_words, head_words, autojunk=False
+        ).get_opcodes()
+    ids: dict[str, int] = {}
+    a = [ids.setdefault(w, len(ids)) for w in base_words]
+    b = [ids.setdefault(w, len(ids)) for w in head_words]
+    matches: list[tuple[int, int]] = []
+    _patience_matches(a, 0, len(a), b, 0, len(b), matches)
+    opcodes = []
+    i = j = 0
+    n = 0
+    while n <= len(matches):
+        mi, mj = matches[n] if n < len(matches) else (len(a), len(b))
+        if mi > i and mj > j:
+            opcodes.append(("replace", i, mi, j, mj))
+        elif mi > i:
+            opcodes.append(("delete", i, mi, j, j))
+        elif mj > j:
+            opcodes.append(("insert", i, i, j, mj))
+        if n == len(matches):
+            break
+        # Extend over the run of consecutive matches
+        run = 1
+        while (
+            n + run < len(matches)
+            and matches[n + run][0] == mi + run
+            and matches[n + run][1] == mj + run
+        ):
+            run += 1
+        opcodes.append(("equal", mi, mi + run, mj, mj + run))
+        i, j = mi + run, mj + run
+        n += run
+    return opcodes
+
+
 def diff(
     base: str, head: str, path: str, base_ref: str, head_ref: str
 ) -> TextDiff:
@@ -86,11 +411,8 @@ def diff(
     """
     base_words = normalize(base).split(" ")
     head_words = normalize(head).split(" ")
-    matcher = difflib.SequenceMatcher(
-        None, base_words, head_words, autojunk=False
-    )
     segments: list[DiffSegment] = []
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in _opcodes(base_words, head_words):
         if tag == "equal":
             words = base_words[i1:i2]
             # Long runs of unchanged text are the bulk of any document;
@@ -74,6 +74,7 @@ from app.storage import (
     get_object_fs,
     get_object_url,
     make_data_fpath,
+    make_derived_fpath,
     remove_gcs_content_type,
 )
 
@@ -113,6 +114,11 @@ _ck_dvc_cache: OrderedDict[str, tuple[float, CkInfoAndOuts]] = OrderedDict()
 # Sync endpoints run in a threadpool, so guard the (cheap) cache read/write
 # sections; the expensive expansion between them runs unlocked.
 _ck_dvc_cache_lock = threading.Lock()
+# The parsed dvc.lock and its expanded outs are also kept in object storage
+# under the same key, so other workers, and this one after a restart, don't
+# re-read every .dir manifest. Only expansions where every .dir manifest was
+# found are kept, since those are fixed by the key and never go stale.
+DVC_OUTS_INDEX_KIND = "dvc-outs-index-v1"
 
 
 def _resolve_github_collaborator_access(
@@ -442,12 +448,14 @@ def writable_project_clause(current_user: User):
     """
     return or_(
         Project.owner_account_id == current_user.account.id,
-        and_(
-            UserProjectAccess.user_id == current_user.id,
-            or_(
-                UserProjectAccess.role_id >= ROLE_IDS["write"],  # type: ignore
-                UserProjectAccess.github_access.in_(["write", "admin"]),  # type: ignore
-            ),
+        Project.user_access_records.any(  # type: ignore
+            and_(
+                UserProjectAccess.user_id == current_user.id,
+                or_(
+                    UserProjectAccess.role_id >= ROLE_IDS["write"],  # type: ignore
+                    UserProjectAccess.github_access.in_(["write", "admin"]),  # type: ignore
+                ),
+            )
         ),
         Project.owner_account.has(  # type: ignore
             and_(
@@ -655,6 +663,39 @@ def normalize_ck_info_paths(ck_info: dict[str, Any]) -> dict[str, Any]:
     return ck_info
 
 
+def _dvc_dir_outs_expanded(dvc_lock: dict, dvc_lock_outs: dict) -> bool:
+    """Whether dvc.lock has directory outs, and all of them were expanded
+    from their .dir manifests.
+    """
+    dir_outs = [
+        out["path"]
+        for stage in (dvc_lock.get("stages") or {}).values()
+        for out in stage.get("outs", [])
+        if str(out.get("md5", "")).endswith(".dir")
+    ]
+    return bool(dir_outs) and all(p in dvc_lock_outs for p in dir_outs)
+
+
+def _read_dvc_outs_index(fs, fpath: str) -> dict | None:
+    try:
+        with fs.open(fpath, "rb") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to read stored DVC outs {fpath}: {e}")
+        return None
+
+
+def _write_dvc_outs_index(fs, fpath: str, index: dict) -> None:
+    try:
+        data = json.dumps(index).encode()
+        with fs.open(fpath, "wb") as f:
+            f.write(data)
+    except Exception as e:
+        logger.warning(f"Failed to store DVC outs {fpath}: {e}")
+
+
 def get_ck_info_and_dvc_outs_from_tree(
     project: Project,
     tree: RepoTree,
@@ -725,16 +766,37 @@ def get_ck_info_and_dvc_outs_from_tree(
     if not isinstance(ck_info, dict):
         ck_info = {}
     normalize_ck_info_paths(ck_info)
-    dvc_lock = (_yaml_load(dvc_bytes) or {}) if dvc_bytes else {}
-    t_parse = time.perf_counter() - t1
-    logger.info(f"Parsed calkit.yaml and dvc.lock in {t_parse * 1000:.0f}ms")
-    t2 = time.perf_counter()
     fs = get_object_fs()
-    dvc_lock_outs = expand_dvc_lock_outs(
-        dvc_lock, owner_name=owner_name, project_name=project_name, fs=fs
+    index_fpath = make_derived_fpath(
+        owner_name=owner_name,
+        project_name=project_name,
+        kind=DVC_OUTS_INDEX_KIND,
+        md5=cache_key,
+        ext=".json",
     )
-    t_expand = time.perf_counter() - t2
-    logger.info(f"Expanded DVC lock outs in {t_expand * 1000:.0f}ms")
+    index = _read_dvc_outs_index(fs, index_fpath) if dvc_bytes else None
+    if index is not None:
+        dvc_lock, dvc_lock_outs = index["dvc_lock"], index["dvc_lock_outs"]
+        t_index = time.perf_counter() - t1
+        logger.info(f"Read stored DVC outs in {t_index * 1000:.0f}ms")
+    else:
+        dvc_lock = (_yaml_load(dvc_bytes) or {}) if dvc_bytes else {}
+        t_parse = time.perf_counter() - t1
+        logger.info(
+            f"Parsed calkit.yaml and dvc.lock in {t_parse * 1000:.0f}ms"
+        )
+        t2 = time.perf_counter()
+        dvc_lock_outs = expand_dvc_lock_outs(
+            dvc_lock, owner_name=owner_name, project_name=project_name, fs=fs
+        )
+        t_expand = time.perf_counter() - t2
+        logger.info(f"Expanded DVC lock outs in {t_expand * 1000:.0f}ms")
+        if _dvc_dir_outs_expanded(dvc_lock, dvc_lock_outs):
+            _write_dvc_outs_index(
+                fs,
+                index_fpath,
+                {"dvc_lock": dvc_lock, "dvc_lock_outs": dvc_lock_outs},
+            )
     zip_path_map: dict = {}
     if zip_bytes:
         try:
@@ -0,0 +1,178 @@
+"""Search over project and dataset metadata.
+
+Searches match whole words through each table's generated ``search_vector``
+column, and substrings through trigram indexes on the searched columns, so
+neither needs a sequential scan. Results are ranked, with closer matches
+first.
+
+Listings are paged by keyset: a cursor holds the sort key of the last row
+returned, and the next page starts after it, rather than counting past an
+offset. Where an index matches the sort key, as for the unfiltered project
+listing, the next page is read straight from the index, so deep pages cost
+about the same as the first one. Ranked searches still sort their matches.
+"""
+
+import base64
+import json
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement
+from sqlmodel import Session, and_, func, or_, select
+
+# Text search configuration for titles and descriptions, which are prose.
+# Names and paths use "simple", since they shouldn't be stemmed.
+TS_CONFIG = "english"
+
+
+def _tsquery(term: str) -> ColumnElement:
+    return func.websearch_to_tsquery(TS_CONFIG, term)
+
+
+def match_clause(
+    search_vector: ColumnElement, term: str, columns: Sequence[Any]
+) -> ColumnElement:
+    """Match rows by words in their search vector, or by substring in any of
+    the given columns.
+    """
+    pattern = f"%{term}%"
+    return or_(
+        search_vector.op("@@")(_tsquery(term)),
+        *[column.ilike(pattern) for column in columns],
+    )
+
+
+def rank(
+    search_vector: ColumnElement, term: str, columns: Sequence[Any]
+) -> ColumnElement:
+    """Rank a match by its word matches and its closest substring match.
+
+    The rank is cast to double precision, since ``ts_rank`` and
+    ``similarity`` return reals, which wouldn't compare equal to the float
+    a cursor holds.
+    """
+    return sqlalchemy.cast(
+        func.ts_rank(search_vector, _tsquery(term), type_=sqlalchemy.Float)
+        + func.greatest(
+            *[
+                func.similarity(
+                    func.coalesce(column, ""), term, type_=sqlalchemy.Float
+                )
+                for column in columns
+            ],
+            type_=sqlalchemy.Float,
+        ),
+        sqlalchemy.Double,
+    )
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page as a cursor."""
+    data = json.dumps([_to_json(v) for v in values])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(
+    cursor: str, types: Sequence[Callable[[Any], Any]]
+) -> list[Any]:
+    """Decode a cursor into a sort key, with each value converted by the
+    corresponding function in ``types``.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(data, list) or len(data) != len(types):
+            raise ValueError
+        return [
+            None if v is None else convert(v)
+            for convert, v in zip(types, data)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(422, "Invalid cursor")
+
+
+def _literal(key: ColumnElement, value: Any) -> ColumnElement:
+    return sqlalchemy.literal(value, type_=key.type)
+
+
+def _equal(key: ColumnElement, value: Any) -> ColumnElement:
+    return key.is_(None) if value is None else key == _literal(key, value)
+
+
+def after_cursor(
+    sort_key: Sequence[ColumnElement], values: Sequence[Any], descending: bool
+) -> ColumnElement:
+    """Select the rows after the given sort key, in the given direction.
+
+    Values are bound with the types of their sort key columns, so they
+    compare exactly. Nulls are ordered as Postgres orders them by default:
+    last when ascending and first when descending. A descending key without
+    nulls is compared as a row, which an index on the sort key serves;
+    otherwise, the comparison is spelled out column by column.
+    """
+    if descending and all(v is not None for v in values):
+        return sqlalchemy.tuple_(*sort_key) < sqlalchemy.tuple_(
+            *[_literal(key, v) for key, v in zip(sort_key, values)]
+        )
+    clauses = []
+    for n, (key, value) in enumerate(zip(sort_key, values)):
+        if value is None:
+            after = key.is_not(None) if descending else sqlalchemy.false()
+        elif descending:
+            after = key < _literal(key, value)
+        else:
+            after = or_(key > _literal(key, value), key.is_(None))
+        clauses.append(
+            and_(*[_equal(k, v) for k, v in zip(sort_key[:n], values)], after)
+        )
+    return or_(*clauses)
+
+
+def page(
+    session: Session,
+    entity: Any,
+    where_clause: ColumnElement,
+    sort_key: Sequence[ColumnElement],
+    types: Sequence[Callable[[Any], Any]],
+    limit: int,
+    offset: int = 0,
+    cursor: str | None = None,
+    descending: bool = False,
+    join: Any = None,
+) -> tuple[list[Any], str | None]:
+    """Select a page of ``entity`` ordered by ``sort_key``, starting after
+    ``cursor`` if given, or at ``offset`` otherwise.
+
+    Returns the page, and the cursor for the next one, which is ``None`` on
+    the last page.
+    """
+    statement = select(
+        entity, *[key.label(f"sort_{n}") for n, key in enumerate(sort_key)]
+    )
+    if join is not None:
+        statement = statement.join(join)
+    statement = statement.where(where_clause)
+    if cursor is not None:
+        values = decode_cursor(cursor, types)
+        statement = statement.where(after_cursor(sort_key, values, descending))
+    else:
+        statement = statement.offset(offset)
+    statement = statement.order_by(
+        *[key.desc() if descending else key.asc() for key in sort_key]
+    ).limit(limit)
+    rows = session.exec(statement).all()
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(list(rows[-1][1:]))
+    return [row[0] for row in rows], next_cursor
@@ -23,6 +23,9 @@ S3_MAX_PARTS = 10000  # S3 multipart upload limit
 # its own folder within the storage root so other kinds can be added
 # alongside it without touching every deployment's config
 DVC_DATA_DIR = "data"
+# Assets derived from project data, e.g., figure thumbnails, which can be
+# regenerated at any time
+DERIVED_DIR = "derived"
 STORAGE_USAGE_CACHE_TTL_SECONDS = 300
 STORAGE_USAGE_CACHE_MAXSIZE = 2048
 
@@ -154,6 +157,24 @@ def make_data_fpath(
         return f"{prefix}/{project_name.lower()}/files/md5/{idx}/{md5}"
 
 
+def make_derived_fpath(
+    owner_name: str,
+    project_name: str,
+    kind: str,
+    md5: str,
+    ext: str,
+) -> str:
+    """Make the path of an asset derived from the file with a given md5.
+
+    These are content-addressed like DVC data, so a derived asset never goes
+    stale and only needs to be generated once.
+    """
+    return (
+        f"{get_storage_root()}/{DERIVED_DIR}/{owner_name.lower()}/"
+        f"{project_name.lower()}/{kind}/{md5[:2]}/{md5[2:]}{ext}"
+    )
+
+
 def _replace_local_object_host(url: str) -> str:
     """Replace the local object storage host in a presigned URL with the
     externally reachable host for local development.
@@ -200,3 +200,70 @@ def test_list_returns_empty_for_missing_prefix(client: TestClient):
     assert response.status_code == 200
     body = response.json()
     assert body["result"]["paths"] == []
+
+
+def test_batch_put_returns_access_for_every_path(client: TestClient):
+    fake_fs = MagicMock()
+    fake_fs.exists.return_value = True
+    with (
+        patch(
+            "app.api.routes.projects.fs.app.projects.get_project",
+            return_value=_fake_project(),
+        ) as mock_get_project,
+        patch(
+            "app.api.routes.projects.fs.storage.get_backend",
+            return_value="s3",
+        ),
+        patch(
+            "app.api.routes.projects.fs.storage.get_object_fs",
+            return_value=fake_fs,
+        ),
+        patch(
+            "app.api.routes.projects.fs.storage.get_data_prefix",
+            return_value="s3://data",
+        ),
+        patch(
+            "app.api.routes.projects.fs.storage.upload_should_be_chunked",
+            return_value=False,
+        ),
+        patch(
+            "app.api.routes.projects.fs.get_object_url",
+            side_effect=lambda fpath, **kwargs: f"https://signed/{fpath}",
+        ),
+    ):
+        response = client.post(
+            f"{FS_OPS_URL}/batch",
+            json={
+                "operation": "put",
+                "paths": ["a.csv", "b/c.csv"],
+                "content_lengths": {"a.csv": 10, "b/c.csv": 20},
+            },
+        )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results["b/c.csv"]["access"] == {
+        "kind": "presigned-url",
+        "url": f"https://signed/s3://data/{OWNER}/{PROJECT}/b/c.csv",
+        "http_method": "PUT",
+        "expires_at": None,
+        "headers": None,
+        "params": None,
+    }
+    assert set(results) == {"a.csv", "b/c.csv"}
+    assert mock_get_project.call_args.kwargs["min_access_level"] == "write"
+
+
+def test_batch_rejects_too_many_paths(client: TestClient):
+    with patch(
+        "app.api.routes.projects.fs.app.projects.get_project",
+        return_value=_fake_project(),
+    ) as mock_get_project:
+        response = client.post(
+            f"{FS_OPS_URL}/batch",
+            json={
+                "operation": "get",
+                "paths": [f"{n}.csv" for n in range(501)],
+            },
+        )
+    assert response.status_code == 422
+    mock_get_project.assert_not_called()
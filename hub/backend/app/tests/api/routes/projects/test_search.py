@@ -0,0 +1,193 @@
+"""Tests for searching and paging project and dataset listings."""
+
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import users
+from app.config import settings
+from app.models import Dataset, Project, UserCreate
+from app.tests import authentication_token_from_email
+
+
+def _make_owner_with_projects(
+    db: Session, client: TestClient, titles: list[str]
+) -> tuple[list[Project], dict[str, str]]:
+    suffix = uuid.uuid4().hex[:8]
+    owner = users.create_user(
+        session=db,
+        user_create=UserCreate(
+            email=f"searcher-{suffix}@example.com",
+            password="searcherpassword123",
+            account_name=f"searcher{suffix}",
+            github_username=f"searcher{suffix}",
+        ),
+    )
+    projects = []
+    for n, title in enumerate(titles):
+        project = Project(
+            name=f"search-{suffix}-{n}",
+            title=title,
+            description=f"Project {n} for {suffix}",
+            git_repo_url=f"https://github.com/searcher{suffix}/p{n}",
+            owner_account_id=owner.account.id,
+            owner_account=owner.account,
+        )
+        db.add(project)
+        projects.append(project)
+    db.commit()
+    for project in projects:
+        db.refresh(project)
+    headers = authentication_token_from_email(
+        client=client, email=owner.email, db=db
+    )
+    return projects, headers
+
+
+def test_search_projects(client: TestClient, db: Session) -> None:
+    projects, headers = _make_owner_with_projects(
+        db,
+        client,
+        [
+            "Turbulent channel flow simulations",
+            "Simulating boundary layers",
+            "Survey of lab practices",
+        ],
+    )
+    suffix = projects[0].name.split("-")[1]
+
+    def _list(**params) -> dict:
+        resp = client.get(
+            f"{settings.API_V1_STR}/user/projects",
+            params=params,
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    # Words match on their stem, so "simulation" also finds "Simulating"
+    data = _list(search_for="simulation")
+    assert {p["name"] for p in data["data"]} == {
+        projects[0].name,
+        projects[1].name,
+    }
+    # Parts of words still match, as before
+    data = _list(search_for="urve")
+    assert [p["name"] for p in data["data"]] == [projects[2].name]
+    # Paging with the cursor visits every match once
+    names = []
+    cursor = None
+    while True:
+        params = {"search_for": suffix, "limit": 1}
+        if cursor is not None:
+            params["cursor"] = cursor
+        data = _list(**params)
+        assert data["count"] == 3
+        names += [p["name"] for p in data["data"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(names) == sorted(p.name for p in projects)
+    resp = client.get(
+        f"{settings.API_V1_STR}/user/projects",
+        params={"cursor": "not-a-cursor"},
+        headers=headers,
+    )
+    assert resp.status_code == 422
+
+
+def test_search_projects_paging_with_tied_ranks(
+    client: TestClient, db: Session
+) -> None:
+    """Rows tied on rank are neither skipped nor repeated across pages."""
+    n_projects = 9
+    projects, headers = _make_owner_with_projects(
+        db, client, ["Tied ranking project"] * n_projects
+    )
+    suffix = projects[0].name.split("-")[1]
+    names = []
+    cursor = None
+    while True:
+        params = {"search_for": suffix, "limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        resp = client.get(
+            f"{settings.API_V1_STR}/user/projects",
+            params=params,
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        names += [p["name"] for p in data["data"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert len(names) == n_projects
+    assert sorted(names) == sorted(p.name for p in projects)
+
+
+def test_projects_paging_newest_first(client: TestClient, db: Session) -> None:
+    """Projects are listed newest first, with those missing a creation time
+    before the rest, and paging visits each once.
+    """
+    projects, headers = _make_owner_with_projects(
+        db, client, [f"Dated project {n}" for n in range(5)]
+    )
+    for n, project in enumerate(projects):
+        project.created = None if n in (1, 3) else datetime(2025, 1, n + 1)
+        db.add(project)
+    db.commit()
+    names = []
+    cursor = None
+    while True:
+        params: dict = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        resp = client.get(
+            f"{settings.API_V1_STR}/user/projects",
+            params=params,
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        names += [p["name"] for p in data["data"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    undated = sorted(
+        [projects[1], projects[3]], key=lambda p: p.id, reverse=True
+    )
+    assert names == [p.name for p in undated] + [
+        projects[4].name,
+        projects[2].name,
+        projects[0].name,
+    ]
+
+
+def test_search_datasets(client: TestClient, db: Session) -> None:
+    projects, headers = _make_owner_with_projects(
+        db, client, ["Public dataset project"]
+    )
+    project = projects[0]
+    project.is_public = True
+    db.add(project)
+    for path, title in [
+        ("data/pressure.csv", "Wall pressure measurements"),
+        ("data/velocity.csv", "Velocity profiles"),
+    ]:
+        db.add(Dataset(path=path, title=title, project_id=project.id))
+    db.commit()
+    resp = client.get(
+        f"{settings.API_V1_STR}/datasets",
+        params={"search_for": "measurement"},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    paths = [
+        d["path"]
+        for d in resp.json()["data"]
+        if d["project"]["id"] == str(project.id)
+    ]
+    assert paths == ["data/pressure.csv"]
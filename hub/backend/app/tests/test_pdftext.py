@@ -77,3 +77,82 @@ def test_diff_insertion_and_deletion() -> None:
     assert [(s.kind, s.text) for s in diff.segments if s.kind != "equal"] == [
         ("delete", "beta")
     ]
+
+
+def test_diff_of_long_documents() -> None:
+    # Long enough to be diffed by patience and Myers rather than difflib,
+    # with repeated words so not everything can be anchored
+    words = [f"w{i % 700}" for i in range(pdftext.LONG_DOC_WORDS + 500)]
+    base = " ".join(words)
+    head_words = list(words)
+    head_words[100:102] = ["changed"]
+    head_words.insert(1500, "added")
+    del head_words[2200]
+    head = " ".join(head_words)
+    diff = pdftext.diff(
+        base=base, head=head, path="p.pdf", base_ref="main", head_ref="branch"
+    )
+    changes = [(s.kind, s.text) for s in diff.segments if s.kind != "equal"]
+    assert changes == [
+        ("delete", "w100 w101"),
+        ("insert", "changed"),
+        ("insert", "added"),
+        ("delete", words[2200]),
+    ]
+    # The opcodes cover both documents, whichever way they're computed
+    base_words = base.split(" ")
+    opcodes = pdftext._opcodes(base_words, head_words)
+    rebuilt = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        rebuilt += head_words[j1:j2] if tag != "equal" else base_words[i1:i2]
+    assert rebuilt == head_words
+    assert opcodes[-1][2:5:2] == (len(base_words), len(head_words))
+
+
+def test_get_normalized_text_is_cached() -> None:
+    calls = []
+
+    def read() -> bytes:
+        calls.append(1)
+        raise AssertionError("cached text should not be read again")
+
+    pdftext._text_cache["abc123"] = ("cached words", False)
+    assert pdftext.get_normalized_text("abc123", read) == (
+        "cached words",
+        False,
+    )
+    assert not calls
+
+
+def test_extract_text_sends_page_ranges(monkeypatch) -> None:
+    """Long documents are read in chunks from a file, not sent whole."""
+    import concurrent.futures
+    import io
+    import os
+
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    n_pages = pdftext.PARALLEL_MIN_PAGES + 3
+    for _ in range(n_pages):
+        writer.add_blank_page(width=72, height=72)
+    buf = io.BytesIO()
+    writer.write(buf)
+    sources = []
+    extract_pages = pdftext._extract_pages
+
+    def record(source, start, stop):
+        sources.append(source)
+        return extract_pages(source, start, stop)
+
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(pdftext, "_get_pool", lambda: pool)
+    monkeypatch.setattr(pdftext, "_extract_pages", record)
+    text, truncated = pdftext.extract_text(buf.getvalue())
+    pool.shutdown()
+    assert text == "\n" * (n_pages - 1)
+    assert not truncated
+    assert len(sources) == -(-n_pages // pdftext.PAGES_PER_TASK)
+    assert all(isinstance(source, str) for source in sources)
+    # The temporary copy is removed afterwards
+    assert not os.path.exists(sources[0])
@@ -734,3 +734,49 @@ def test_find_notebook_paths_in_tree(tmp_path: Path) -> None:
             app.projects.get_repo_tree_for_ref(repo, None)
         )
     )
+
+
+def test_get_ck_info_and_dvc_outs_from_tree_stores_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Expanded DVC outs are kept in object storage, so they're only
+    expanded once per dvc.lock, even after the in-memory cache is cleared.
+    """
+    import fsspec
+
+    from app.git import WorkingTree
+
+    fs = fsspec.filesystem("memory")
+    monkeypatch.setattr(app.projects, "get_object_fs", lambda: fs)
+    (tmp_path / "dvc.lock").write_text(
+        "schema: '2.0'\n"
+        "stages:\n"
+        "  collect:\n"
+        "    cmd: python collect.py\n"
+        "    outs:\n"
+        "    - path: data/raw\n"
+        "      hash: md5\n"
+        "      md5: d0b6bbbdd9a3dcd765978cda2c754fe7.dir\n"
+    )
+    n_expansions = 0
+
+    def fake_expand(dvc_lock, **kwargs):
+        nonlocal n_expansions
+        n_expansions += 1
+        out = dvc_lock["stages"]["collect"]["outs"][0]
+        return {
+            "data/raw": out | {"type": "dir", "dirname": "data"},
+            "data/raw/a.csv": {"path": "data/raw/a.csv", "type": "file"},
+        }
+
+    monkeypatch.setattr(app.projects, "expand_dvc_lock_outs", fake_expand)
+    project = _make_project()
+    tree = WorkingTree(str(tmp_path))
+    first = app.projects.get_ck_info_and_dvc_outs_from_tree(project, tree)
+    app.projects._ck_dvc_cache.clear()
+    second = app.projects.get_ck_info_and_dvc_outs_from_tree(project, tree)
+    assert n_expansions == 1
+    assert second.dvc_lock_outs == first.dvc_lock_outs
+    assert second.dvc_lock == first.dvc_lock
+    assert "data/raw/a.csv" in second.dvc_lock_outs
+    app.projects._ck_dvc_cache.clear()
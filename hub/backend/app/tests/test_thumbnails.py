@@ -0,0 +1,95 @@
+"""Tests for ``app.thumbnails``."""
+
+import io
+
+import fsspec
+from PIL import Image
+
+from app import thumbnails
+
+
+def _png(width: int, height: int) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), color=(200, 30, 30)).save(
+        buf, format="PNG"
+    )
+    return buf.getvalue()
+
+
+def test_make_thumbnail() -> None:
+    thumb = thumbnails.make_thumbnail(_png(3000, 1500), ".png", max_px=300)
+    assert thumb is not None
+    image = Image.open(io.BytesIO(thumb))
+    assert image.format == "PNG"
+    # Downscaled to fit, keeping the aspect ratio
+    assert image.size == (300, 150)
+    # Something small isn't blown up
+    thumb = thumbnails.make_thumbnail(_png(40, 20), ".PNG", max_px=300)
+    assert Image.open(io.BytesIO(thumb)).size == (40, 20)
+    # Not an image at all
+    assert thumbnails.make_thumbnail(b"not an image", ".png") is None
+    assert thumbnails.make_thumbnail(b"<svg/>", ".svg") is None
+    assert thumbnails.can_preview("figures/plot.PDF")
+    assert not thumbnails.can_preview("figures/plot.svg")
+
+
+def test_make_thumbnail_from_pdf() -> None:
+    # A figure that's a single embedded image can be previewed even
+    # without a renderer
+    buf = io.BytesIO()
+    Image.new("RGB", (800, 400), color=(0, 0, 255)).save(buf, format="PDF")
+    thumb = thumbnails.make_thumbnail(buf.getvalue(), ".pdf", max_px=200)
+    assert thumb is not None
+    assert Image.open(io.BytesIO(thumb)).size == (200, 100)
+    assert thumbnails.make_thumbnail(b"%PDF-garbage", ".pdf") is None
+
+
+def test_get_or_create_thumbnail() -> None:
+    fs = fsspec.filesystem("memory")
+    md5 = "0123456789abcdef0123456789abcdef"
+    reads = []
+
+    def read_source() -> bytes:
+        reads.append(1)
+        return _png(1000, 1000)
+
+    fp = thumbnails.get_or_create_thumbnail(
+        fs=fs,
+        owner_name="Someone",
+        project_name="Project",
+        md5=md5,
+        ext=".png",
+        read_source=read_source,
+    )
+    assert fp == thumbnails.thumbnail_fpath("Someone", "Project", md5)
+    assert fp.endswith(f"/someone/project/thumbnails-v1/01/{md5[2:]}.png")
+    assert fs.isfile(fp)
+    # Once it exists, the figure isn't read again
+    for _ in range(2):
+        assert (
+            thumbnails.get_or_create_thumbnail(
+                fs=fs,
+                owner_name="Someone",
+                project_name="Project",
+                md5=md5,
+                ext=".png",
+                read_source=read_source,
+            )
+            == fp
+        )
+    assert len(reads) == 1
+    # Nor is one that can't be previewed, for a while
+    bad_md5 = "f" * 32
+    for _ in range(2):
+        assert (
+            thumbnails.get_or_create_thumbnail(
+                fs=fs,
+                owner_name="Someone",
+                project_name="Project",
+                md5=bad_md5,
+                ext=".png",
+                read_source=lambda: reads.append(1) or b"nope",
+            )
+            is None
+        )
+    assert len(reads) == 2
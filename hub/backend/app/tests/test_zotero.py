@@ -0,0 +1,199 @@
+"""Tests for ``app.zotero``."""
+
+import http.server
+import json
+import threading
+from collections.abc import Iterator
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app import zotero
+
+
+class _FakeZoteroHandler(http.server.BaseHTTPRequestHandler):
+    """Serves one collection of a user library, with versioned items."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, body=None, headers=None) -> None:
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        server = self.server
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        server.requests.append((url.path, query))
+        assert self.headers["Zotero-API-Key"] == "KEY"
+        version = server.version
+        since = self.headers.get("If-Modified-Since-Version")
+        if since is not None and int(since) >= version:
+            self._send(304, headers={"Last-Modified-Version": version})
+            return
+        if url.path == "/users/1/deleted":
+            deleted = [
+                key
+                for key, v in server.deleted.items()
+                if v > int(query["since"])
+            ]
+            self._send(
+                200,
+                {"items": deleted},
+                headers={"Last-Modified-Version": version},
+            )
+            return
+        assert url.path == "/users/1/collections/COLL/items/top"
+        rows = [
+            row
+            for row in server.items
+            if row["version"] > int(query.get("since", 0))
+        ]
+        start = int(query["start"])
+        page = rows[start : start + int(query["limit"])]
+        if start > 0 and server.bump_on_next_page:
+            # Someone edits the library while it's being read
+            server.bump_on_next_page = False
+            server.version += 1
+            version = server.version
+        self._send(
+            200,
+            [
+                {
+                    "key": row["key"],
+                    "version": row["version"],
+                    "bibtex": f"@article{{{row['key']}, title={{T}}}}",
+                    "data": {"key": row["key"]},
+                    "meta": {"numChildren": 0},
+                }
+                for row in page
+            ],
+            headers={
+                "Last-Modified-Version": version,
+                "Total-Results": len(rows),
+            },
+        )
+
+
+@pytest.fixture
+def fake_zotero() -> Iterator[http.server.ThreadingHTTPServer]:
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), _FakeZoteroHandler
+    )
+    server.daemon_threads = True
+    server.requests = []
+    server.version = 250
+    server.items = [
+        {"key": f"K{n:04d}", "version": 1 + n // 2} for n in range(250)
+    ]
+    server.deleted = {"GONE": 200}
+    server.bump_on_next_page = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    with patch.object(zotero, "BASE_URL", f"http://{host}:{port}"):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_collection_items(fake_zotero) -> None:
+    items, version = zotero.get_collection_items(
+        api_key="KEY",
+        library_type="user",
+        library_id="1",
+        collection_key="COLL",
+    )
+    assert version == 250
+    # All three pages, in order
+    assert [it["item_key"] for it in items] == [
+        f"K{n:04d}" for n in range(250)
+    ]
+    assert sorted(q["start"] for _, q in fake_zotero.requests) == [
+        "0",
+        "100",
+        "200",
+    ]
+    # Only what changed since the last sync is requested
+    fake_zotero.requests.clear()
+    items, version = zotero.get_collection_items(
+        api_key="KEY",
+        library_type="user",
+        library_id="1",
+        collection_key="COLL",
+        since=120,
+    )
+    assert [it["item_key"] for it in items] == [
+        f"K{n:04d}" for n in range(240, 250)
+    ]
+    assert fake_zotero.requests[0][1]["since"] == "120"
+    assert zotero.get_deleted_item_keys(
+        api_key="KEY", library_type="user", library_id="1", since=120
+    ) == ["GONE"]
+    # An unchanged library answers without listing anything
+    fake_zotero.requests.clear()
+    assert zotero.get_collection_items(
+        api_key="KEY",
+        library_type="user",
+        library_id="1",
+        collection_key="COLL",
+        since=250,
+    ) == ([], 250)
+    assert (
+        zotero.get_deleted_item_keys(
+            api_key="KEY", library_type="user", library_id="1", since=250
+        )
+        == []
+    )
+    assert len(fake_zotero.requests) == 2
+
+
+def test_get_collection_items_restarts_when_library_changes(
+    fake_zotero,
+) -> None:
+    fake_zotero.bump_on_next_page = True
+    items, version = zotero.get_collection_items(
+        api_key="KEY",
+        library_type="user",
+        library_id="1",
+        collection_key="COLL",
+    )
+    # The listing was read again in full at the new version
+    assert version == 251
+    assert len(items) == 250
+    assert sum(q["start"] == "0" for _, q in fake_zotero.requests) == 2
+
+
+def test_backoff_is_per_api_key(monkeypatch) -> None:
+    class Response:
+        status_code = 200
+
+        def __init__(self, headers: dict) -> None:
+            self.headers = headers
+
+    class Session:
+        def get(self, url, headers, **kwargs):
+            if headers["Zotero-API-Key"] == "SLOW":
+                return Response({"Backoff": "60"})
+            return Response({})
+
+    sleeps = []
+    monkeypatch.setattr(zotero, "_get_session", lambda: Session())
+    monkeypatch.setattr(zotero.time, "sleep", sleeps.append)
+    monkeypatch.setattr(zotero, "_backoff_until", {})
+    zotero._get("https://zotero.invalid/a", "SLOW")
+    # Another user's requests aren't held up by one key's backoff
+    zotero._get("https://zotero.invalid/a", "FAST")
+    assert sleeps == []
+    zotero._get("https://zotero.invalid/a", "SLOW")
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= zotero.MAX_RETRY_WAIT_S
@@ -0,0 +1,220 @@
+"""Downscaled previews of project figures.
+
+A figures page inlining full-size figures sends tens of megabytes and
+downloads every figure from object storage again on each view. Instead, a
+small PNG preview of each figure is generated once and stored next to the
+project's data, keyed by the md5 of the figure's content, which is what DVC
+already records for figures it tracks. Since the key changes whenever the
+figure does, a stored preview never goes stale, and it can be served with
+headers that let the browser cache it indefinitely.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Callable
+
+import cachetools
+
+from app.storage import make_derived_fpath
+
+logger = logging.getLogger(__name__)
+
+# Longest side of a thumbnail in pixels; enough for a card at 2x density
+THUMBNAIL_MAX_PX = 640
+# Bump this to regenerate every thumbnail after changing how they're made
+THUMBNAIL_VERSION = 1
+THUMBNAIL_KIND = f"thumbnails-v{THUMBNAIL_VERSION}"
+THUMBNAIL_MEDIA_TYPE = "image/png"
+RASTER_EXTS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".bmp",
+    ".tif",
+    ".tiff",
+}
+PREVIEW_EXTS = RASTER_EXTS | {".pdf"}
+# Don't try to preview anything bigger than this
+MAX_SOURCE_BYTES = 100_000_000
+PDF_RENDER_TIMEOUT_SECONDS = 30
+
+# Thumbnails known to exist, or to be impossible to make, so listing a
+# page of figures needn't check object storage for each one every time.
+# Failures are only remembered for a while in case they were transient.
+_existing: cachetools.LRUCache[str, bool] = cachetools.LRUCache[str, bool](
+    maxsize=100_000
+)
+_failed: cachetools.TTLCache[str, bool] = cachetools.TTLCache[str, bool](
+    maxsize=10_000, ttl=3600
+)
+# The caches are shared by the threads resolving a page of figures
+_cache_lock = threading.Lock()
+
+
+def can_preview(path: str) -> bool:
+    """Whether a thumbnail can be made for a figure at ``path``."""
+    return os.path.splitext(path)[-1].lower() in PREVIEW_EXTS
+
+
+def _downscale(image, max_px: int) -> bytes:
+    from PIL import Image
+
+    image.thumbnail((max_px, max_px), Image.Resampling.LANCZOS)
+    if image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA")
+    buf = io.BytesIO()
+    image.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def _render_pdf_first_page(data: bytes, max_px: int) -> bytes | None:
+    """Rasterize the first page of a PDF with Poppler's ``pdftoppm``."""
+    exe = shutil.which("pdftoppm")
+    if exe is None:
+        return None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pdf_fpath = os.path.join(tmpdir, "in.pdf")
+        with open(pdf_fpath, "wb") as f:
+            f.write(data)
+        out_prefix = os.path.join(tmpdir, "out")
+        try:
+            subprocess.run(
+                [
+                    exe,
+                    "-png",
+                    "-singlefile",
+                    "-f",
+                    "1",
+                    "-l",
+                    "1",
+                    "-scale-to",
+                    str(max_px),
+                    pdf_fpath,
+                    out_prefix,
+                ],
+                check=True,
+                capture_output=True,
+                timeout=PDF_RENDER_TIMEOUT_SECONDS,
+            )
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.warning(f"Failed to render PDF preview: {e}")
+            return None
+        with open(out_prefix + ".png", "rb") as f:
+            return f.read()
+
+
+def _largest_pdf_image(data: bytes):
+    """The largest raster image embedded in a PDF's first page, if any.
+
+    A fallback for when the PDF can't be rendered, which works for figures
+    that are a single embedded image, but not vector graphics.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    if not reader.pages:
+        return None
+    images = [img.image for img in reader.pages[0].images]
+    images = [img for img in images if img is not None]
+    if not images:
+        return None
+    return max(images, key=lambda img: img.width * img.height)
+
+
+def make_thumbnail(
+    data: bytes, ext: str, max_px: int = THUMBNAIL_MAX_PX
+) -> bytes | None:
+    """Make a PNG thumbnail from an image or the first page of a PDF.
+
+    Returns None if no thumbnail can be made from it.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    ext = ext.lower()
+    try:
+        if ext == ".pdf":
+            rendered = _render_pdf_first_page(data, max_px)
+            if rendered is not None:
+                return rendered
+            image = _largest_pdf_image(data)
+            if image is None:
+                return None
+        elif ext in RASTER_EXTS:
+            image = Image.open(io.BytesIO(data))
+            # Only the first frame of an animation
+            image.seek(0)
+        else:
+            return None
+        return _downscale(image, max_px)
+    except (UnidentifiedImageError, OSError, ValueError) as e:
+        logger.warning(f"Failed to make thumbnail: {e}")
+        return None
+    except Exception as e:
+        # pypdf raises its own errors for malformed PDFs
+        logger.warning(f"Failed to make thumbnail: {type(e).__name__}: {e}")
+        return None
+
+
+def thumbnail_fpath(owner_name: str, project_name: str, md5: str) -> str:
+    return make_derived_fpath(
+        owner_name=owner_name,
+        project_name=project_name,
+        kind=THUMBNAIL_KIND,
+        md5=md5,
+        ext=".png",
+    )
+
+
+def thumbnail_etag(md5: str) -> str:
+    return f'"{md5}-{THUMBNAIL_VERSION}"'
+
+
+def get_or_create_thumbnail(
+    fs,
+    owner_name: str,
+    project_name: str,
+    md5: str,
+    ext: str,
+    read_source: Callable[[], bytes | None],
+) -> str | None:
+    """Return the object-storage path of a figure's thumbnail.
+
+    The thumbnail is generated and stored on first use, reading the figure
+    with ``read_source``. Returns None if a thumbnail can't be made.
+    """
+    fp = thumbnail_fpath(owner_name, project_name, md5)
+    with _cache_lock:
+        if fp in _existing:
+            return fp
+        if fp in _failed:
+            return None
+    try:
+        if fs.exists(fp):
+            with _cache_lock:
+                _existing[fp] = True
+            return fp
+    except Exception as e:
+        logger.warning(f"Failed existence check for {fp}: {e}")
+        return None
+    data = read_source()
+    thumb = None
+    if data is not None and len(data) <= MAX_SOURCE_BYTES:
+        thumb = make_thumbnail(data, ext)
+    if thumb is None:
+        with _cache_lock:
+            _failed[fp] = True
+        return None
+    with fs.open(fp, "wb") as f:
+        f.write(thumb)
+    with _cache_lock:
+        _existing[fp] = True
+    return fp
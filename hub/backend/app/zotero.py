@@ -7,17 +7,21 @@ for a permanent API key. The signing means the browser can't drive this the way
 it does for our OAuth 2 providers.
 """
 
+import concurrent.futures
 import html as html_lib
 import json
 import logging
 import os
 import re
+import threading
+import time
 from collections.abc import Iterator
 from urllib.parse import parse_qsl, urlencode
 
 import bibtexparser
 import requests
 from fastapi import HTTPException
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1Session
 
 from app.config import settings
@@ -102,12 +106,88 @@ API_VERSION = "3"
 PAGE_LIMIT = 100
 # The BibTeX field reference notes live in (Markdown, ``---``-separated).
 NOTE_FIELD = "comment"
+# Pages after the first are fetched this many at a time. Zotero rate limits
+# per API key, so this stays modest.
+MAX_CONCURRENT_REQUESTS = 4
+# How many times a rate-limited request is retried, and the longest we'll
+# wait before each retry.
+MAX_RETRIES = 3
+MAX_RETRY_WAIT_S = 30.0
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+# Zotero can ask clients to hold off with a ``Backoff`` header, even on
+# successful responses; this maps each API key to when that runs out, since
+# rate limits are per key and one user shouldn't slow down another's sync.
+_backoff_until: dict[str, float] = {}
 
 
 def _headers(api_key: str) -> dict[str, str]:
     return {"Zotero-API-Key": api_key, "Zotero-API-Version": API_VERSION}
 
 
+def _get_session() -> requests.Session:
+    """Return a shared session, so requests reuse pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4, pool_maxsize=4 * MAX_CONCURRENT_REQUESTS
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _get(
+    url: str,
+    api_key: str,
+    params: dict | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float = 30,
+) -> requests.Response:
+    """GET from the Web API, waiting out rate limits.
+
+    Requests go through a pooled session. A 429 or 503 is retried after its
+    ``Retry-After`` (or an exponential delay), and a ``Backoff`` header
+    delays subsequent requests.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        wait_s = _backoff_until.get(api_key, 0.0) - time.monotonic()
+        if wait_s > 0:
+            time.sleep(min(wait_s, MAX_RETRY_WAIT_S))
+        resp = _get_session().get(
+            url,
+            headers={**_headers(api_key), **(headers or {})},
+            params=params,
+            timeout=timeout,
+        )
+        backoff = resp.headers.get("Backoff")
+        if backoff:
+            try:
+                now = time.monotonic()
+                until = now + float(backoff)
+            except ValueError:
+                pass
+            else:
+                # Forget backoffs that have run out so the map stays small
+                for key, t in list(_backoff_until.items()):
+                    if t <= now:
+                        _backoff_until.pop(key, None)
+                _backoff_until[api_key] = until
+        if resp.status_code not in (429, 503) or attempt == MAX_RETRIES:
+            return resp
+        try:
+            delay_s = float(resp.headers.get("Retry-After", ""))
+        except ValueError:
+            delay_s = 2.0**attempt
+        logger.info(f"Zotero GET {url} status {resp.status_code}; retrying")
+        time.sleep(min(delay_s, MAX_RETRY_WAIT_S))
+    return resp
+
+
 def _library_prefix(library_type: str, library_id: str) -> str:
     """Build the API path prefix for a library, e.g. ``users/12345``."""
     if library_type == "user":
@@ -117,26 +197,81 @@ def _library_prefix(library_type: str, library_id: str) -> str:
     raise HTTPException(400, "library_type must be 'user' or 'group'")
 
 
-def _get_paginated(url: str, api_key: str, params: dict) -> list[dict]:
-    """Follow Zotero's ``Link: rel="next"`` headers, gathering all rows."""
+def _check_read(resp: requests.Response, url: str) -> None:
+    if resp.status_code != 200:
+        logger.error(f"Zotero GET {url} status {resp.status_code}")
+        raise HTTPException(resp.status_code, "Failed to read from Zotero")
+
+
+def _get_all(
+    url: str,
+    api_key: str,
+    params: dict,
+    if_modified_since: int | None = None,
+    timeout: float = 30,
+) -> tuple[list[dict] | None, int]:
+    """Fetch every row of a listing, and the library version it reflects.
+
+    The first page reports the total, so the remaining pages are requested
+    by offset concurrently rather than by following ``Link`` headers one at
+    a time. If the library changes while the pages are being read, the
+    listing is restarted, so it's never stitched together from two
+    versions.
+
+    With ``if_modified_since`` set, returns ``(None, if_modified_since)``
+    without fetching anything if the library hasn't changed since.
+    """
     params = dict(params, limit=PAGE_LIMIT)
-    results: list[dict] = []
-    next_url: str | None = url
-    while next_url is not None:
-        resp = requests.get(
-            next_url,
-            headers=_headers(api_key),
-            # Params only apply to the first request; the next URL carries its
-            # own query string.
-            params=params if next_url == url else None,
-            timeout=30,
+    headers = {}
+    if if_modified_since is not None:
+        headers["If-Modified-Since-Version"] = str(if_modified_since)
+    for _ in range(MAX_RETRIES + 1):
+        resp = _get(
+            url,
+            api_key,
+            params=dict(params, start=0),
+            headers=headers,
+            timeout=timeout,
         )
-        if resp.status_code != 200:
-            logger.error(f"Zotero GET {url} status {resp.status_code}")
-            raise HTTPException(resp.status_code, "Failed to reach Zotero")
-        results.extend(resp.json())
-        next_url = resp.links.get("next", {}).get("url")
-    return results
+        if resp.status_code == 304 and if_modified_since is not None:
+            return None, if_modified_since
+        _check_read(resp, url)
+        version = resp.headers.get("Last-Modified-Version")
+        rows = list(resp.json())
+        total = int(resp.headers.get("Total-Results", len(rows)))
+        starts = range(PAGE_LIMIT, total, PAGE_LIMIT)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_REQUESTS
+        ) as pool:
+            pages = list(
+                pool.map(
+                    lambda start: _get(
+                        url,
+                        api_key,
+                        params=dict(params, start=start),
+                        timeout=timeout,
+                    ),
+                    starts,
+                )
+            )
+        for page in pages:
+            _check_read(page, url)
+        if any(
+            page.headers.get("Last-Modified-Version") != version
+            for page in pages
+        ):
+            logger.info(f"Zotero library changed while reading {url}")
+            continue
+        for page in pages:
+            rows.extend(page.json())
+        return rows, int(version) if version is not None else 0
+    raise HTTPException(503, "Zotero library kept changing while being read")
+
+
+def _get_paginated(url: str, api_key: str, params: dict) -> list[dict]:
+    """Gather all rows of a listing."""
+    rows, _ = _get_all(url, api_key, params)
+    return rows or []
 
 
 def get_groups(api_key: str, user_id: str) -> list[dict]:
@@ -640,42 +775,23 @@ def get_collection_items(
     prefix = _library_prefix(library_type, library_id)
     suffix = "items" if include_children else "items/top"
     url = f"{BASE_URL}/{prefix}/collections/{collection_key}/{suffix}"
-    items: list[dict] = []
-    library_version = 0
-    start = 0
-    while True:
-        params = {
-            "format": "json",
-            "include": "bibtex,data",
-            "limit": PAGE_LIMIT,
-            "start": start,
+    params: dict = {"format": "json", "include": "bibtex,data"}
+    if since is not None:
+        params["since"] = since
+    # An unchanged library answers 304 to the first request, so a sync with
+    # nothing to pull costs one round trip
+    rows, library_version = _get_all(
+        url, api_key, params=params, if_modified_since=since, timeout=60
+    )
+    items = [
+        {
+            "item_key": row.get("key"),
+            "bibtex": (row.get("bibtex") or "").strip(),
+            "data": row.get("data") or {},
+            "num_children": (row.get("meta") or {}).get("numChildren", 0),
         }
-        if since is not None:
-            params["since"] = since
-        resp = requests.get(
-            url, headers=_headers(api_key), params=params, timeout=60
-        )
-        if resp.status_code != 200:
-            logger.error(f"Zotero items fetch status {resp.status_code}")
-            raise HTTPException(resp.status_code, "Failed to read from Zotero")
-        version_header = resp.headers.get("Last-Modified-Version")
-        if version_header is not None:
-            library_version = int(version_header)
-        for row in resp.json():
-            items.append(
-                {
-                    "item_key": row.get("key"),
-                    "bibtex": (row.get("bibtex") or "").strip(),
-                    "data": row.get("data") or {},
-                    "num_children": (row.get("meta") or {}).get(
-                        "numChildren", 0
-                    ),
-                }
-            )
-        total = int(resp.headers.get("Total-Results", 0))
-        start += PAGE_LIMIT
-        if start >= total:
-            break
+        for row in rows or []
+    ]
     return items, library_version
 
 
@@ -684,15 +800,16 @@ def get_deleted_item_keys(
 ) -> list[str]:
     """List keys of items deleted from the library since a library version."""
     prefix = _library_prefix(library_type, library_id)
-    resp = requests.get(
-        f"{BASE_URL}/{prefix}/deleted",
-        headers=_headers(api_key),
+    url = f"{BASE_URL}/{prefix}/deleted"
+    resp = _get(
+        url,
+        api_key,
         params={"since": since},
-        timeout=30,
+        headers={"If-Modified-Since-Version": str(since)},
     )
-    if resp.status_code != 200:
-        logger.error(f"Zotero deleted fetch status {resp.status_code}")
-        raise HTTPException(resp.status_code, "Failed to read from Zotero")
+    if resp.status_code == 304:
+        return []
+    _check_read(resp, url)
     return resp.json().get("items", [])
 
 
@@ -874,11 +991,10 @@ def get_item_children(
 ) -> list[dict]:
     """Fetch an item's child items (attachments and notes)."""
     prefix = _library_prefix(library_type, library_id)
-    resp = requests.get(
+    resp = _get(
         f"{BASE_URL}/{prefix}/items/{item_key}/children",
-        headers=_headers(api_key),
+        api_key,
         params={"format": "json"},
-        timeout=30,
     )
     if resp.status_code != 200:
         logger.error(f"Zotero children fetch status {resp.status_code}")
@@ -928,20 +1044,26 @@ def build_item_maps(
 ) -> tuple[dict, dict]:
     """Build the citekey->item map and citekey->notes map for a collection.
 
-    Only items reporting children are queried, so most items cost no extra
-    request. ``items_map`` records the Zotero item key plus its PDF attachment
-    and note keys; ``notes_map`` carries each note's HTML for editing.
+    Only items that report children are queried for them, so most items
+    cost no extra request, and those queries run concurrently.
+    ``items_map`` records the Zotero item key plus its PDF attachment and
+    note keys; ``notes_map`` carries each note's HTML for editing.
     """
     items_map: dict = {}
     notes_map: dict = {}
-    for it in items:
-        bib_key = bib_key_of(it["bibtex"])
-        if not bib_key:
-            continue
-        info, notes = build_item_info(api_key, library_type, library_id, it)
-        if notes:
-            notes_map[bib_key] = notes
-        items_map[bib_key] = info
+    keyed = [(bib_key_of(it["bibtex"]), it) for it in items]
+    keyed = [(bib_key, it) for bib_key, it in keyed if bib_key]
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_REQUESTS
+    ) as pool:
+        infos = pool.map(
+            lambda it: build_item_info(api_key, library_type, library_id, it),
+            [it for _, it in keyed],
+        )
+        for (bib_key, _), (info, notes) in zip(keyed, infos):
+            if notes:
+                notes_map[bib_key] = notes
+            items_map[bib_key] = info
     return items_map, notes_map
 
 
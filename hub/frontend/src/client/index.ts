@@ -440,6 +440,10 @@ export type {
   GetProjectTablesErrors,
   GetProjectTablesResponse,
   GetProjectTablesResponses,
+  GetProjectThumbnailData,
+  GetProjectThumbnailError,
+  GetProjectThumbnailErrors,
+  GetProjectThumbnailResponses,
   GetProjectZoteroCollectionsData,
   GetProjectZoteroCollectionsError,
   GetProjectZoteroCollectionsErrors,
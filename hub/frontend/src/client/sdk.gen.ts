@@ -180,6 +180,8 @@ import type {
   GetProjectsResponses,
   GetProjectTablesErrors,
   GetProjectTablesResponses,
+  GetProjectThumbnailErrors,
+  GetProjectThumbnailResponses,
   GetProjectZoteroCollectionsErrors,
   GetProjectZoteroCollectionsResponses,
   GetProjectZoteroItemPdfErrors,
@@ -3269,7 +3271,9 @@ export class ProjectsService {
    * paginated: a project with hundreds of figures would otherwise take
    * minutes and return a payload measured in hundreds of megabytes. Callers
    * that only need paths and titles should pass ``include_content=false``,
-   * which skips that download entirely.
+   * which skips that download entirely. Callers rendering a gallery should
+   * pass ``thumbnails=true``, which references small, cacheable previews
+   * instead.
    */
   public static getProjectFigures<ThrowOnError extends boolean = true>(
     parameters: {
@@ -3280,6 +3284,7 @@ export class ProjectsService {
       offset?: number
       q?: string | null
       include_content?: boolean
+      thumbnails?: boolean
     },
     options?: Options<never, ThrowOnError>,
   ): RequestResult<
@@ -3299,6 +3304,7 @@ export class ProjectsService {
             { in: "query", key: "offset" },
             { in: "query", key: "q" },
             { in: "query", key: "include_content" },
+            { in: "query", key: "thumbnails" },
           ],
         },
       ],
@@ -3316,6 +3322,53 @@ export class ProjectsService {
     })
   }
 
+  /**
+   * Get Project Thumbnail
+   *
+   * Serve a figure thumbnail referenced by the figures listing.
+   *
+   * Thumbnails are keyed by the md5 of the figure's content, so what a URL
+   * returns can never change and the browser can cache it forever.
+   */
+  public static getProjectThumbnail<ThrowOnError extends boolean = true>(
+    parameters: {
+      owner_name: string
+      project_name: string
+      md5: string
+      if_none_match?: string | null
+    },
+    options?: Options<never, ThrowOnError>,
+  ): RequestResult<
+    GetProjectThumbnailResponses,
+    GetProjectThumbnailErrors,
+    ThrowOnError
+  > {
+    const params = buildClientParams(
+      [parameters],
+      [
+        {
+          args: [
+            { in: "path", key: "owner_name" },
+            { in: "path", key: "project_name" },
+            { in: "path", key: "md5" },
+            { in: "headers", key: "if_none_match", map: "if-none-match" },
+          ],
+        },
+      ],
+    )
+    return (options?.client ?? client).get<
+      GetProjectThumbnailResponses,
+      GetProjectThumbnailErrors,
+      ThrowOnError
+    >({
+      responseType: "json",
+      security: [{ scheme: "bearer", type: "http" }],
+      url: "/projects/{owner_name}/{project_name}/thumbnails/{md5}",
+      ...options,
+      ...params,
+    })
+  }
+
   /**
    * Post Project Figure
    */
@@ -1014,6 +1014,10 @@ export type Figure = {
    * Url
    */
   url?: string | null
+  /**
+   * Thumbnail Url
+   */
+  thumbnail_url?: string | null
   /**
    * Comment Count
    */
@@ -8130,6 +8134,12 @@ export type GetProjectFiguresData = {
      * Inline each figure's content. Set false for a metadata-only listing that skips object storage entirely.
      */
     include_content?: boolean
+    /**
+     * Thumbnails
+     *
+     * Return a thumbnail URL instead of inlined content for figures that can be previewed.
+     */
+    thumbnails?: boolean
   }
   url: "/projects/{owner_name}/{project_name}/figures"
 }
@@ -8154,6 +8164,49 @@ export type GetProjectFiguresResponses = {
 export type GetProjectFiguresResponse =
   GetProjectFiguresResponses[keyof GetProjectFiguresResponses]
 
+export type GetProjectThumbnailData = {
+  body?: never
+  headers?: {
+    /**
+     * If-None-Match
+     */
+    "if-none-match"?: string | null
+  }
+  path: {
+    /**
+     * Owner Name
+     */
+    owner_name: string
+    /**
+     * Project Name
+     */
+    project_name: string
+    /**
+     * Md5
+     */
+    md5: string
+  }
+  query?: never
+  url: "/projects/{owner_name}/{project_name}/thumbnails/{md5}"
+}
+
+export type GetProjectThumbnailErrors = {
+  /**
+   * Validation Error
+   */
+  422: HttpValidationError
+}
+
+export type GetProjectThumbnailError =
+  GetProjectThumbnailErrors[keyof GetProjectThumbnailErrors]
+
+export type GetProjectThumbnailResponses = {
+  /**
+   * Successful Response
+   */
+  200: unknown
+}
+
 export type PostProjectFigureData = {
   body: BodyProjectsPostProjectFigure
   path: {
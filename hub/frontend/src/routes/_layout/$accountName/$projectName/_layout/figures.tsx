@@ -35,6 +35,7 @@ import ClearableInput from "../../../../../components/Common/ClearableInput"
 import LoadingSpinner from "../../../../../components/Common/LoadingSpinner"
 
 import { type Figure, ProjectsService } from "../../../../../client"
+import { client } from "../../../../../client/client.gen"
 import { ArtifactCompareModal } from "../../../../../components/Common/ArtifactCompareModal"
 import Markdown from "../../../../../components/Common/Markdown"
 import PdfCanvas from "../../../../../components/Common/PdfCanvas"
@@ -51,8 +52,9 @@ const figuresSearchSchema = z.object({
   q: z.string().optional(),
 })
 
-// Each figure's content is fetched and inlined by the API, so pages are kept
-// small; projects with hundreds of figures otherwise take minutes to load.
+// Figures the API can preview come back as thumbnail URLs, and the rest are
+// inlined, so pages are kept small; projects with hundreds of figures
+// otherwise take minutes to load.
 const FIGURES_PER_PAGE = 20
 
 export const Route = createFileRoute(
@@ -78,6 +80,33 @@ const getIcon = (figure: Figure) => {
   return FiFile
 }
 
+/**
+ * Load a thumbnail the figures listing references as an object URL.
+ *
+ * The request needs the user's token, so it can't be an `<img>` URL. The URL
+ * is keyed by the figure's content hash, so the response is cached for good,
+ * both here and by the browser, and revisiting the page downloads nothing.
+ */
+function useThumbnailSrc(thumbnailUrl?: string | null) {
+  const { data: blob } = useQuery({
+    queryKey: ["thumbnails", thumbnailUrl],
+    queryFn: () =>
+      client.instance
+        .get<Blob>(String(thumbnailUrl), { responseType: "blob" })
+        .then((response) => response.data),
+    enabled: Boolean(thumbnailUrl),
+    staleTime: Number.POSITIVE_INFINITY,
+  })
+  const [src, setSrc] = useState<string>()
+  useEffect(() => {
+    if (!blob) return
+    const objectUrl = URL.createObjectURL(blob)
+    setSrc(objectUrl)
+    return () => URL.revokeObjectURL(objectUrl)
+  }, [blob])
+  return src
+}
+
 /** Small thumbnail card for a figure in the gallery. */
 function FigureThumbnail({
   figure,
@@ -89,8 +118,24 @@ function FigureThumbnail({
   const borderColor = useColorModeValue("gray.200", "gray.600")
   const bg = useColorModeValue("white", "gray.800")
   const hoverBg = useColorModeValue("gray.50", "gray.700")
+  const thumbnailSrc = useThumbnailSrc(figure.thumbnail_url)
 
   const renderThumb = () => {
+    if (figure.thumbnail_url) {
+      return thumbnailSrc ? (
+        <Image
+          src={thumbnailSrc}
+          alt={figure.title}
+          objectFit="contain"
+          width="100%"
+          height="140px"
+        />
+      ) : (
+        <Flex height="140px" align="center" justify="center">
+          <Spinner size="sm" color="gray.400" />
+        </Flex>
+      )
+    }
     const lowerPath = figure.path.toLowerCase()
     if (
       (lowerPath.endsWith(".png") ||
@@ -234,6 +279,9 @@ function ProjectFigures() {
         // Filtering happens server-side, across every figure in the project
         // rather than just the ones on this page.
         q: debouncedSearch || undefined,
+        // Previews are small and cacheable; the full figure is only fetched
+        // when one is opened.
+        thumbnails: true,
       }).then((response) => response.data),
     // Keep the previous page rendered while the next one loads, so paging
     // doesn't flash the empty state.
@@ -285,7 +333,11 @@ function ProjectFigures() {
   const uploadFigureModal = useDisclosure()
   const labelFigureModal = useDisclosure()
 
-  const selectedFigure = figures?.find((f) => f.path === selectedPath) ?? null
+  // A figure listed with only a thumbnail has no content to show in full, so
+  // the modal fetches it instead.
+  const selectedFigure =
+    figures?.find((f) => f.path === selectedPath && (f.content || f.url)) ??
+    null
 
   const openFigure = (figure: Figure) =>
     navigate({
@@ -5,7 +5,7 @@ import { Widget } from "@lumino/widgets";
 import { useEffect, useState } from "react";
 import React from "react";
 import { createRoot } from "react-dom/client";
-import { requestAPI } from "../request";
+import { requestAPI, subscribeStatusEvents } from "../request";
 import type { IPipelineStatus } from "../hooks/useQueries";
 import { pipelineState, type IPipelineOperationState } from "../pipeline-state";
 
@@ -24,10 +24,11 @@ const PipelineStatusIndicator: React.FC<IPipelineStatusIndicatorProps> = ({
     pipelineState.getState(),
   );
 
-  // Poll pipeline status every 2 seconds
+  // Fetch pipeline status, then again whenever the server reports changes
+  // in the project
   useEffect(() => {
     let isMounted = true;
-    const pollStatus = async () => {
+    const fetchStatus = async () => {
       try {
         const data = await requestAPI<IPipelineStatus>("pipeline/status");
         if (isMounted) {
@@ -39,16 +40,15 @@ const PipelineStatusIndicator: React.FC<IPipelineStatusIndicatorProps> = ({
     };
 
     // Initial fetch
-    void pollStatus();
+    void fetchStatus();
 
-    // Poll every 2 seconds
-    const interval = setInterval(() => {
-      void pollStatus();
-    }, 2000);
+    const unsubscribe = subscribeStatusEvents(() => {
+      void fetchStatus();
+    });
 
     return () => {
       isMounted = false;
-      clearInterval(interval);
+      unsubscribe();
     };
   }, []);
 
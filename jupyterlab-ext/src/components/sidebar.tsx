@@ -713,7 +713,8 @@ export const CalkitSidebar: React.FC<ICalkitSidebarProps> = ({
         }
       }
     } catch (error) {
-      const errorMsg = "See output in the server console for details.";
+      // The server includes the end of the run's output in the error
+      const errorMsg = error instanceof Error ? error.message : String(error);
       console.error("Failed to run pipeline:", error);
       await showErrorMessage("Failed to run pipeline", errorMsg);
     } finally {
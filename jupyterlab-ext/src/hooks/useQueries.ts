@@ -88,26 +88,30 @@ export const useProject = () => {
 
 /**
  * Query hook for fetching git status
+ *
+ * Rather than polling, this is invalidated by the server's status events
+ * when files in the project change.
  */
 export const useGitStatus = () => {
   return useQuery<IGitStatus>({
     queryKey: ["git", "status"],
     queryFn: () => requestAPI<IGitStatus>("git/status"),
     staleTime: 10 * 1000, // 10 seconds for git status
-    refetchInterval: 5000, // Refetch every 5 seconds
     enabled: isFeatureEnabled("history"),
   });
 };
 
 /**
  * Query hook for fetching pipeline status
+ *
+ * Rather than polling, this is invalidated by the server's status events
+ * when files in the project change.
  */
 export const usePipelineStatus = () => {
   return useQuery<IPipelineStatus>({
     queryKey: ["pipeline", "status"],
     queryFn: () => requestAPI<IPipelineStatus>("pipeline/status"),
     staleTime: 10 * 1000,
-    refetchInterval: 3000, // Refetch every 3 seconds
   });
 };
 
@@ -39,7 +39,7 @@ import { IGitStatus } from "./hooks/useQueries";
 import { calkitIcon } from "./icons";
 import { pipelineState } from "./pipeline-state";
 import { queryClient } from "./queryClient";
-import { requestAPI } from "./request";
+import { requestAPI, subscribeStatusEvents } from "./request";
 
 // Import CSS
 import "../style/pipeline-status-bar.css";
@@ -78,6 +78,13 @@ const plugin: JupyterFrontEndPlugin<void> = {
   ) => {
     console.log("JupyterLab extension calkit is activated!");
 
+    // Refresh status queries when the server reports changes in the project,
+    // instead of polling for them
+    subscribeStatusEvents(() => {
+      void queryClient.invalidateQueries({ queryKey: ["pipeline", "status"] });
+      void queryClient.invalidateQueries({ queryKey: ["git", "status"] });
+    });
+
     // Create the sidebar widget
     const sidebar = new CalkitSidebarWidget();
     sidebar.id = "calkit-sidebar";
@@ -57,3 +57,65 @@ export async function requestAPI<T>(
 
   return data;
 }
+
+/**
+ * An update from the server's ``pipeline/status/events`` stream
+ */
+export interface IStatusEvent {
+  seq: number;
+  changed_paths: string[];
+  pipeline: Record<string, any> | null;
+  git: Record<string, any> | null;
+}
+
+type StatusEventListener = (event: IStatusEvent) => void;
+
+const statusEventListeners = new Set<StatusEventListener>();
+let statusEventSource: EventSource | null = null;
+
+/**
+ * Listen for status events, which the server sends when files in the
+ * project change, instead of polling for status
+ *
+ * All listeners share one connection, which is closed when the last one
+ * unsubscribes. The browser reconnects it if it drops.
+ *
+ * @param listener Called with each status event
+ * @returns A function that unsubscribes the listener
+ */
+export function subscribeStatusEvents(
+  listener: StatusEventListener,
+): () => void {
+  statusEventListeners.add(listener);
+  if (statusEventSource === null) {
+    const settings = ServerConnection.makeSettings();
+    let url = URLExt.join(
+      settings.baseUrl,
+      "calkit",
+      "pipeline",
+      "status",
+      "events",
+    );
+    if (settings.token) {
+      url += URLExt.objectToQueryString({ token: settings.token });
+    }
+    statusEventSource = new EventSource(url, { withCredentials: true });
+    statusEventSource.addEventListener("status", (message) => {
+      let event: IStatusEvent;
+      try {
+        event = JSON.parse((message as MessageEvent).data);
+      } catch (error) {
+        console.warn("Invalid status event:", error);
+        return;
+      }
+      statusEventListeners.forEach((callback) => callback(event));
+    });
+  }
+  return () => {
+    statusEventListeners.delete(listener);
+    if (statusEventListeners.size === 0 && statusEventSource !== null) {
+      statusEventSource.close();
+      statusEventSource = null;
+    }
+  };
+}